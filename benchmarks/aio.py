@@ -0,0 +1,135 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Asyncio session benchmark
+
+Compares polling with a thread per in-flight call, each thread using
+its own `koji.ClientSession`, against awaiting the same calls on a
+single `koji_types.aio.AsyncClientSession`, using a local stand-in
+hub with a simulated round-trip latency.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/aio.py -n 2000 -c 32``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import asyncio
+import sys
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from threading import enumerate as threads, local
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.aio import AsyncClientSession
+
+
+def client_threads():
+    # the stand-in hub runs a thread per connection, which we don't
+    # want to count
+    return sum(1 for t in threads()
+               if t.name.startswith("ThreadPoolExecutor"))
+
+
+def threaded(url, ids, concurrency):
+    state = local()
+    peak = [0]
+
+    def call(i):
+        session = getattr(state, "session", None)
+        if session is None:
+            session = state.session = ClientSession(url)
+        peak[0] = max(peak[0], client_threads())
+        return session.getBuild(i)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, ids))
+    return peak[0]
+
+
+def asynchronous(url, ids, concurrency):
+    peak = [0]
+
+    async def poll():
+        async with AsyncClientSession(url, max_connections=concurrency) as s:
+            async def call(i):
+                peak[0] = max(peak[0], client_threads())
+                return await s.getBuild(i)
+            await asyncio.gather(*map(call, ids))
+
+    asyncio.run(poll())
+    return peak[0]
+
+
+def cli(options):
+    ids = range(1, options.count + 1)
+
+    with StandInHub(latency=options.latency) as hub:
+        print(f"{'scenario':<24} {'seconds':>9} {'threads':>8}")
+        for label, fn in (("thread per call", threaded),
+                          ("AsyncClientSession", asynchronous)):
+            start = perf_counter()
+            peak = fn(hub.url, ids, options.concurrency)
+            elapsed = perf_counter() - start
+            print(f"{label:<24} {elapsed:>9.3f} {peak:>8}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=2000,
+                        help="number of getBuild calls")
+
+    parser.add_argument("-c", "--concurrency", action="store", type=int,
+                        default=32,
+                        help="number of calls in flight at once")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
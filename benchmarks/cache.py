@@ -0,0 +1,125 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Caching session benchmark
+
+Repeats a set of ``getBuild`` lookups against a local stand-in hub,
+directly and via `koji_types.cache.CachingSession`, both with the
+in-memory cache alone and with a fresh in-memory cache over a warm
+`SQLiteBackend`.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/cache.py -n 500 -r 5``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.cache import CachingSession, SQLiteBackend
+
+
+def timed(fn):
+    start = perf_counter()
+    fn()
+    return perf_counter() - start
+
+
+def cli(options):
+    ids = range(1, options.count + 1)
+
+    def lookups(session):
+        for _ in range(options.repeat):
+            for i in ids:
+                session.getBuild(i)
+
+    with StandInHub(latency=options.latency) as hub, \
+            TemporaryDirectory() as tmpdir:
+
+        session = ClientSession(hub.url)
+        dbfile = join(tmpdir, "cache.sqlite")
+
+        def warm_disk():
+            # populated by a previous run, with an empty memory cache
+            backend = SQLiteBackend(dbfile)
+            lookups(CachingSession(session, backend=backend))
+            backend.close()
+
+        scenarios = (
+            ("uncached", lambda: lookups(session)),
+            ("memory", lambda: lookups(CachingSession(session))),
+            ("cold disk", warm_disk),
+            ("warm disk", warm_disk),
+        )
+
+        print(f"{'scenario':<12} {'seconds':>9} {'requests':>9}")
+        for label, fn in scenarios:
+            before = hub.requests
+            elapsed = timed(fn)
+            print(f"{label:<12} {elapsed:>9.3f}"
+                  f" {hub.requests - before:>9}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=500,
+                        help="number of distinct builds")
+
+    parser.add_argument("-r", "--repeat", action="store", type=int,
+                        default=5,
+                        help="number of times each build is looked up")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
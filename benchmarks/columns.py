@@ -0,0 +1,165 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Memory and operation benchmark for koji_types.columns
+
+Synthetic results are round-tripped through the XML-RPC marshaller so
+that, as with real hub results, every row holds its own copies of the
+repeated strings. The retained memory of the decoded list of dicts is
+compared against a `ColumnTable` built from it, along with the cost of
+filtering and sorting each.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/columns.py -n 100000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import gc
+import sys
+import tracemalloc
+
+from argparse import ArgumentParser
+from time import perf_counter
+from xmlrpc.client import dumps, loads
+
+from koji_types import RPMInfo, TagBuildInfo
+from koji_types.columns import ColumnTable
+from synthetic import synthetic_build, synthetic_rpm
+
+
+SCENARIOS = (
+    ("TagBuildInfo", synthetic_build, TagBuildInfo,
+     "owner_name", "someone", "creation_ts"),
+    ("RPMInfo", synthetic_rpm, RPMInfo,
+     "arch", "x86_64", "size"),
+)
+
+
+def decoded(synth, count):
+    data = dumps(([synth(i) for i in range(count)], ),
+                 methodresponse=True, allow_none=True)
+    return loads(data)[0][0]
+
+
+def retained(fn, *args):
+    """
+    Returns the result of fn and the bytes it still holds once fn has
+    completed
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return result, after - before
+
+
+def timed(fn, *args):
+    start = perf_counter()
+    result = fn(*args)
+    return result, (perf_counter() - start) * 1000
+
+
+def check_where():
+    """
+    Confirms that `ColumnTable.where` agrees with filtering the dicts,
+    for rows whose values are None, missing, or numbers of another type
+    """
+
+    rows = [synthetic_rpm(i) for i in range(8)]
+    rows[1]["arch"] = None
+    del rows[2]["arch"]
+    rows[3]["size"] = float(rows[3]["size"])
+
+    table = ColumnTable(RPMInfo, rows)
+    for key, want in (("arch", "x86_64"), ("arch", None),
+                      ("size", rows[3]["size"]), ("size", 4100),
+                      ("size", 4100.0), ("buildtime", 1.5)):
+        expected = [row for row in rows
+                    if key in row and row[key] == want]
+        found = table.where(**{key: want}).to_dicts()
+        if found != expected:
+            raise AssertionError(f"where({key}={want!r}) found"
+                                 f" {len(found)} rows, not {len(expected)}")
+
+
+def cli(options):
+    count = options.count
+    check_where()
+
+    print(f"{'type':<14} {'form':<8} {'B/row':>8} {'filter ms':>10}"
+          f" {'sort ms':>9}")
+
+    for label, synth, schema, fkey, fval, skey in SCENARIOS:
+        rows, row_mem = retained(decoded, synth, count)
+        _, row_filter = timed(lambda: [r for r in rows if r[fkey] == fval])
+        _, row_sort = timed(lambda: sorted(rows, key=lambda r: r[skey]))
+        del rows
+
+        # decoded again, so that the table is measured as holding the
+        # only references to its values
+        table, tab_mem = retained(
+            lambda: ColumnTable(schema, decoded(synth, count)))
+        _, tab_filter = timed(lambda: table.where(**{fkey: fval}))
+        _, tab_sort = timed(table.sort, skey)
+
+        print(f"{label:<14} {'dicts':<8} {row_mem / count:>8.1f}"
+              f" {row_filter:>10.2f} {row_sort:>9.2f}")
+        print(f"{label:<14} {'columns':<8} {tab_mem / count:>8.1f}"
+              f" {tab_filter:>10.2f} {tab_sort:>9.2f}")
+
+        del table
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=100000,
+                        help="number of synthetic rows per type")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
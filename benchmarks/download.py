@@ -0,0 +1,361 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Download benchmark
+
+Serves the RPMs and archives of a synthetic build from a local
+stand-in of a koji topurl, which honours ``Range`` requests. Downloads
+them one after another with ``koji_cli.lib.download_file`` and
+``download_archive``, and then with a `koji_types.download.Downloader`.
+The downloader is then run again over the finished files, which are
+skipped, and over partial files, which are resumed. Finally the
+stand-in drops every connection halfway through its file, and the
+downloader continues each from where it was cut off.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/download.py -n 16 --size 16``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import hashlib
+import os
+import re
+import sys
+
+from argparse import ArgumentParser
+from glob import glob
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from os.path import basename, getsize, join
+from shutil import rmtree
+from socketserver import ThreadingMixIn
+from tempfile import TemporaryDirectory
+from threading import Lock, Thread
+from time import perf_counter, sleep
+
+from koji import PathInfo
+from koji_cli.lib import download_archive, download_file
+
+from koji_types.download import Downloader
+
+
+MIB = 1024 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.files.connected()
+
+    def do_GET(self):
+        files = self.server.files
+        files.requested()
+
+        filename = join(files.root, self.path.lstrip("/"))
+        if not os.path.isfile(filename):
+            self.send_error(404)
+            return
+
+        size = getsize(filename)
+        start = 0
+        found = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+        if found:
+            start = int(found.group(1))
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range",
+                             f"bytes {start}-{size - 1}/{size}")
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Length", str(size - start))
+        self.end_headers()
+
+        # a dropped transfer stops halfway through the file, and
+        # closes the connection
+        stop = size
+        if files.dropping(self.path) and not start:
+            stop = size // 2
+            self.close_connection = True
+
+        with open(filename, "rb") as fo:
+            fo.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                data = fo.read(min(remaining, MIB))
+                self.wfile.write(data)
+                remaining -= len(data)
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+class StandInFiles:
+    """
+    Context manager serving the files beneath root over HTTP, in the
+    manner of a koji topurl. The ``url`` attribute is suitable for use
+    as a topurl. Counts the requests and connections made.
+
+    While ``drop`` is enabled, the first transfer of each file is cut
+    off halfway through.
+    """
+
+    def __init__(self, root, latency=0.0):
+        self.root = root
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self.drop = False
+        self._dropped = set()
+        self._lock = Lock()
+
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.files = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def connected(self):
+        with self._lock:
+            self.connections += 1
+
+    def requested(self):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            sleep(self.latency)
+
+    def dropping(self, path):
+        with self._lock:
+            if not self.drop or path in self._dropped:
+                return False
+            self._dropped.add(path)
+            return True
+
+    def __enter__(self):
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        return False
+
+
+def rpm_headers():
+    """
+    The smallest layout of an RPM which has a payloadhash: a lead and
+    an empty signature header, followed by an empty header. The
+    payload follows the header.
+    """
+
+    lead = b"\xed\xab\xee\xdb" + bytes(92)
+    magic = b"\x8e\xad\xe8\x01\x00\x00\x00\x00"
+    signature = magic + (0).to_bytes(4, "big") + (0).to_bytes(4, "big")
+    header = magic + (0).to_bytes(4, "big") + (0).to_bytes(4, "big")
+    return lead + signature, header
+
+
+def create_build(topdir, count, size):
+    """
+    Writes a build with count RPMs and count archives of size MiB each
+    beneath topdir, returning its BuildInfo, RPMInfos, and ArchiveInfos
+    """
+
+    build = {"id": 1, "name": "pkg", "version": "1.0", "release": "1",
+             "volume_name": "DEFAULT"}
+    pathinfo = PathInfo(topdir=topdir)
+    block = os.urandom(MIB)
+
+    def content(index):
+        for part in range(size):
+            # vary each block so no two files or blocks are alike
+            yield part.to_bytes(4, "big") + index.to_bytes(4, "big")
+            yield block[8:]
+
+    rpms = []
+    archives = []
+    for index in range(count):
+        rpm = {"id": index + 1, "build_id": 1, "name": f"pkg-sub{index}",
+               "version": "1.0", "release": "1", "arch": "noarch",
+               "epoch": None}
+        filename = join(pathinfo.build(build), pathinfo.rpm(rpm))
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        payload = hashlib.md5()
+        with open(filename, "wb") as fo:
+            lead, header = rpm_headers()
+            fo.write(lead + header)
+            payload.update(header)
+            for data in content(index * 2):
+                fo.write(data)
+                payload.update(data)
+        rpm["payloadhash"] = payload.hexdigest()
+        rpm["size"] = getsize(filename)
+        rpms.append(rpm)
+
+        archive = {"id": index + 1, "build_id": 1, "btype": "generic",
+                   "filename": f"output-{index}.img",
+                   "checksum_type": 2}
+        filename = join(pathinfo.typedir(build, "generic"),
+                        archive["filename"])
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        checksum = hashlib.sha256()
+        with open(filename, "wb") as fo:
+            for data in content(index * 2 + 1):
+                fo.write(data)
+                checksum.update(data)
+        archive["checksum"] = checksum.hexdigest()
+        archive["size"] = getsize(filename)
+        archives.append(archive)
+
+    return build, rpms, archives
+
+
+def cli(options):
+    with TemporaryDirectory() as remote, TemporaryDirectory() as local, \
+            StandInFiles(remote, latency=options.latency) as files:
+
+        build, rpms, archives = create_build(remote, options.count,
+                                             options.size)
+        total = options.count * options.size * 2
+
+        print(f"{'scenario':<16} {'seconds':>9} {'requests':>9}"
+              f" {'connects':>9} {'MiB':>9} {'MiB/s':>9}")
+
+        def report(label, start, before, received):
+            elapsed = perf_counter() - start
+            requests, connections = before
+            mib = received / MIB
+            print(f"{label:<16} {elapsed:>9.3f}"
+                  f" {files.requests - requests:>9}"
+                  f" {files.connections - connections:>9}"
+                  f" {mib:>9.1f} {mib / elapsed:>9.1f}")
+
+        # koji_cli downloads into the current directory
+        cwd = os.getcwd()
+        os.chdir(local)
+        try:
+            pathinfo = PathInfo(topdir=files.url)
+            before, start = (files.requests, files.connections), perf_counter()
+            for rpm in rpms:
+                url = join(pathinfo.build(build), pathinfo.rpm(rpm))
+                download_file(url, basename(url), quiet=True,
+                              filesize=rpm["size"])
+            for archive in archives:
+                download_archive(build, archive, files.url, quiet=True)
+            report("koji_cli", start, before, total * MIB)
+        finally:
+            os.chdir(cwd)
+
+        downloader = Downloader(files.url, dest=join(local, "downloader"),
+                                workers=options.workers)
+        items = ([downloader.rpm(build, rpm) for rpm in rpms] +
+                 [downloader.archive(build, archive) for archive in archives])
+
+        before, start = (files.requests, files.connections), perf_counter()
+        result = downloader.download_all(items)
+        report("downloader", start, before, result.received)
+
+        before, start = (files.requests, files.connections), perf_counter()
+        result = downloader.download_all(items)
+        report("skip present", start, before, result.received)
+        print(f"skipped {result.skipped} of {len(result.results)} files")
+
+        # leave only the first 60% of each file, as though the
+        # downloads had been interrupted
+        for filename in glob(join(local, "downloader", "*")):
+            partial = f"{filename}.part"
+            os.rename(filename, partial)
+            os.truncate(partial, int(getsize(partial) * 0.6))
+
+        before, start = (files.requests, files.connections), perf_counter()
+        result = downloader.download_all(items)
+        report("resumed", start, before, result.received)
+
+        rmtree(join(local, "downloader"))
+        files.drop = True
+
+        before, start = (files.requests, files.connections), perf_counter()
+        result = downloader.download_all(items)
+        report("dropped", start, before, result.received)
+        retried = sum(1 for r in result.results if r.retried)
+        print(f"continued {retried} of {len(result.results)} files")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=16,
+                        help="number of RPMs, and of archives, in the build")
+
+    parser.add_argument("--size", action="store", type=int, default=16,
+                        help="size of each file in MiB")
+
+    parser.add_argument("--workers", action="store", type=int, default=4,
+                        help="number of files downloaded at once")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.05,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
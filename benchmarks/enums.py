@@ -0,0 +1,145 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Bulk enumeration conversion benchmark
+
+Compares converting a large list of integer build states into
+`BuildState` members by calling the enumeration per value, against
+the `from_values` and `count_by_state` class methods. First confirms
+that the literal values of the enumerations still agree with the
+constants of the installed koji.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/enums.py -n 200000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from collections import Counter
+from random import Random
+from time import perf_counter
+
+import koji
+
+from koji_types import (
+    AuthType, BuildrootState, BuildrootType, BuildState, ChecksumType,
+    RepoState, RPMDepType, RPMSigTag, TaskState, UserStatus, UserType, )
+
+
+KOJI_ENUMS = (
+    (AuthType, koji.AUTHTYPES, {"KERB": "KERBEROS"}),
+    (BuildrootState, koji.BR_STATES, {}),
+    (BuildrootType, koji.BR_TYPES, {}),
+    (BuildState, koji.BUILD_STATES, {}),
+    (ChecksumType, koji.CHECKSUM_TYPES,
+     {"MD5": "md5", "SHA1": "sha1", "SHA256": "sha256"}),
+    (RepoState, koji.REPO_STATES, {"EXPIRED": "DELETED"}),
+    (TaskState, koji.TASK_STATES, {}),
+    (UserStatus, koji.USER_STATUS, {}),
+    (UserType, koji.USERTYPES, {}),
+)
+
+
+def check_values():
+    """
+    Confirms that each enumeration member has the value of the koji
+    constant it mirrors
+    """
+
+    expected = []
+    for enum, constants, renamed in KOJI_ENUMS:
+        for member in enum:
+            name = renamed.get(member.name, member.name)
+            expected.append((member, constants[name]))
+
+    expected.extend((member, getattr(koji, f"DEP_{member.name}"))
+                    for member in RPMDepType)
+    expected.extend((member, getattr(koji, f"RPM_SIGTAG_{member.name}"))
+                    for member in RPMSigTag)
+
+    for member, value in expected:
+        if member.value != value:
+            raise AssertionError(f"{member} is {member.value}, but koji"
+                                 f" has {value}")
+
+
+def timed(fn):
+    start = perf_counter()
+    fn()
+    return (perf_counter() - start) * 1000
+
+
+def cli(options):
+    check_values()
+
+    rand = Random(options.count)
+    states = [rand.choice(list(BuildState)).value
+              for _ in range(options.count)]
+    builds = [{"state": state} for state in states]
+
+    scenarios = (
+        ("BuildState(x) per value",
+         lambda: [BuildState(x) for x in states]),
+        ("BuildState.from_values",
+         lambda: BuildState.from_values(states)),
+        ("Counter of BuildState(x)",
+         lambda: Counter(BuildState(b["state"]) for b in builds)),
+        ("BuildState.count_by_state",
+         lambda: BuildState.count_by_state(builds, key="state")),
+    )
+
+    print(f"{'scenario':<28} {'ms':>9}")
+    for label, fn in scenarios:
+        print(f"{label:<28} {timed(fn):>9.2f}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=200000,
+                        help="number of synthetic build states")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
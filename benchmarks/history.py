@@ -0,0 +1,188 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+History change feed benchmark
+
+Serves a synthetic ``tag_listing`` history from a local stand-in hub,
+in which every event tags a build and every third event also untags
+the build tagged two events before. Compares re-reading the whole
+history on each poll against a `koji_types.history.ChangeFeed`, both
+for the initial read and for a poll after more events have happened.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/history.py -n 50000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.history import ChangeFeed
+
+
+def synthetic_listing(event):
+    return {
+        "active": True,
+        "build.state": 1,
+        "build_id": event,
+        "create_event": event,
+        "create_ts": 1704067200.0 + event,
+        "creator_id": 1,
+        "creator_name": "kojiadmin",
+        "epoch": None,
+        "name": f"pkg{event % 500}",
+        "release": "1",
+        "revoke_event": None,
+        "revoke_ts": None,
+        "revoker_id": None,
+        "revoker_name": None,
+        "tag.name": f"tag{event % 20}",
+        "tag_id": event % 20,
+        "version": str(event),
+    }
+
+
+class SyntheticHistory:
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.entries = []
+        self.sent = 0
+        hub.register("getLastEvent", self.getLastEvent)
+        hub.register("queryHistory", self.queryHistory)
+
+    @property
+    def last(self):
+        return len(self.entries)
+
+    def add_events(self, count):
+        for _ in range(count):
+            event = self.last + 1
+            self.entries.append(synthetic_listing(event))
+            if event % 3 == 0:
+                revoked = self.entries[event - 3]
+                revoked.update(active=None, revoke_event=event,
+                               revoke_ts=1704067200.0 + event,
+                               revoker_id=1, revoker_name="kojiadmin")
+
+    def getLastEvent(self, before=None):
+        return {"id": self.last, "ts": 1704067200.0 + self.last}
+
+    def queryHistory(self, tables=None, afterEvent=None, beforeEvent=None,
+                     **kwds):
+        after = afterEvent or 0
+        before = min(beforeEvent or self.last + 1, self.last + 1)
+
+        # entries created within the range, then those revoked within
+        # it which were created before it
+        found = self.entries[after:max(after, before - 1)]
+        for event in range(after + 1, before):
+            if event % 3 == 0 and event - 2 <= after:
+                found.append(self.entries[event - 3])
+
+        self.sent += len(found)
+        return {"tag_listing": found}
+
+
+def cli(options):
+    with StandInHub(latency=options.latency) as hub:
+        history = SyntheticHistory(hub)
+        history.add_events(options.count)
+        session = ClientSession(hub.url)
+
+        print(f"{'scenario':<16} {'seconds':>9} {'requests':>9}"
+              f" {'entries':>9} {'changes':>9}")
+
+        def measure(label, fn):
+            before, sent = hub.requests, history.sent
+            start = perf_counter()
+            changes = fn()
+            print(f"{label:<16} {perf_counter() - start:>9.3f}"
+                  f" {hub.requests - before:>9}"
+                  f" {history.sent - sent:>9} {changes:>9}")
+
+        def full():
+            found = session.queryHistory(tables=["tag_listing"])
+            return len(found["tag_listing"])
+
+        feed = ChangeFeed(session, tables=["tag_listing"], start=0,
+                          batch=options.batch)
+
+        def poll():
+            return sum(len(batch) for batch in feed.poll())
+
+        measure("full read", full)
+        measure("feed read", poll)
+
+        history.add_events(options.added)
+
+        measure("full re-read", full)
+        measure("feed update", poll)
+        measure("feed idle", poll)
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=50000,
+                        help="number of events initially on the hub")
+
+    parser.add_argument("--added", action="store", type=int,
+                        default=300,
+                        help="number of events added before the update")
+
+    parser.add_argument("--batch", action="store", type=int,
+                        default=5000,
+                        help="number of events in each feed query")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
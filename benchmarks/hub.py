@@ -0,0 +1,387 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+A local stand-in koji hub shared by the benchmark scripts
+
+Serves a handful of read-only hub calls over XML-RPC from a thread on
+the loopback interface, returning synthetic results. A fixed latency
+can be added to every request in order to approximate the round-trip
+cost of a remote hub.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import os
+
+from fcntl import LOCK_EX, LOCK_NB, LOCK_UN, lockf
+from io import BytesIO
+from multiprocessing import get_context
+from socketserver import ThreadingMixIn
+from threading import Lock, Thread
+from time import sleep
+from typing import Optional
+from urllib.parse import parse_qs
+from xmlrpc.client import Fault, dumps, loads
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+from zlib import adler32
+
+from koji import GenericError, LockError, decode_args
+from koji.xmlrpcplus import ExtendedMarshaller
+
+from synthetic import synthetic_build
+
+
+__all__ = (
+    "StandInHub",
+)
+
+
+def _encode_int(value):
+    # as the hub does, for sizes which are too large for XML-RPC
+    return value if -2 ** 31 <= value < 2 ** 31 else str(value)
+
+
+class _Handler(SimpleXMLRPCRequestHandler):
+
+    rpc_paths = ("/kojihub", )
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        # rawUpload sends the chunk itself as the request body, with
+        # the call's arguments in the query string
+        path, _, query = self.path.partition("?")
+        upload = getattr(self.server, "upload", None)
+        streams = getattr(self.server, "streams", None)
+        if query and path in self.rpc_paths and upload is not None:
+            self._raw_upload(upload, parse_qs(query))
+        elif streams and path in self.rpc_paths:
+            self._maybe_stream(streams)
+        else:
+            super().do_POST()
+
+    def _maybe_stream(self, streams):
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        params, method = loads(data)
+        if method in streams:
+            self._stream(streams[method], params)
+            return
+
+        # hand the request body we've already read to the usual
+        # dispatch
+        rfile, self.rfile = self.rfile, BytesIO(data)
+        try:
+            super().do_POST()
+        finally:
+            self.rfile = rfile
+
+    def _stream(self, stream, params):
+        # the array result is marshalled and sent one record at a
+        # time, in chunks, so that the stand-in never holds the whole
+        # response
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        buffer = []
+        size = 0
+
+        def flush():
+            nonlocal size
+            data = "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        def write(text):
+            nonlocal size
+            buffer.append(text)
+            size += len(text)
+            if size >= 65536:
+                flush()
+
+        write("<?xml version='1.0'?>\n<methodResponse>\n<params>\n"
+              "<param>\n<value><array><data>\n")
+        marshaller = ExtendedMarshaller("utf-8", allow_none=True)
+        for record in stream(*params):
+            marshaller._dump(record, write)
+        write("</data></array></value>\n</param>\n</params>\n"
+              "</methodResponse>\n")
+        flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _raw_upload(self, upload, args):
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        try:
+            body = dumps((upload(args, data), ), methodresponse=True,
+                         allow_none=True)
+        except Fault as fault:
+            body = dumps(fault, allow_none=True)
+
+        response = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+class _Server(ThreadingMixIn, SimpleXMLRPCServer):
+
+    daemon_threads = True
+
+    # the default backlog of 5 overflows when many clients connect at
+    # once, and the excess connections are reset
+    request_queue_size = 128
+
+
+class StandInHub:
+    """
+    Context manager running a stand-in hub. The ``url`` attribute is
+    suitable for use as the baseurl of a `koji.ClientSession`
+
+    With process enabled, the hub is served from a forked child
+    process rather than a thread, so that it doesn't count towards any
+    memory measured in this process. The ``requests`` count is not
+    available in this case.
+
+    With an uploads directory, the hub also accepts ``rawUpload`` and
+    ``checkUpload`` calls, storing files beneath that directory in the
+    same way as the real hub, and hands out subsessions.
+
+    Methods registered with `register_stream` send their array results
+    as they are produced, rather than marshalling the whole response
+    first.
+    """
+
+    def __init__(self, latency: float = 0.0, tagged: int = 1000,
+                 builds: int = 1000, process: bool = False,
+                 uploads: Optional[str] = None):
+        self.latency = latency
+        self.tagged = tagged
+        self.builds = builds
+        self.process = process
+        self.uploads = uploads
+        self.requests = 0
+
+        self._server = _Server(("127.0.0.1", 0), requestHandler=_Handler,
+                               allow_none=True, logRequests=False,
+                               use_builtin_types=True)
+        self._methods = {}
+
+        self.register("getBuild", self.getBuild)
+        self.register("getLastEvent", self.getLastEvent)
+        self.register("listBuilds", self.listBuilds)
+        self.register("listTagged", self.listTagged)
+        self._server.register_function(self._multiCall, "multiCall")
+        self._thread = None
+
+        if uploads:
+            self._locks = {}
+            self._locks_lock = Lock()
+            self._sessions = 0
+            self._server.upload = self._wrap_upload
+            self.register("checkUpload", self.checkUpload)
+            self.register("subsession", self.subsession)
+            self.register("logout", self.logout)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/kojihub"
+
+    def register(self, name, fn):
+        self._methods[name] = fn
+        self._server.register_function(self._wrap(fn), name)
+
+    def register_stream(self, name, fn):
+        """
+        Registers a hub method whose result is the array of records
+        produced by the iterable that fn returns
+        """
+
+        if getattr(self._server, "streams", None) is None:
+            self._server.streams = {}
+        self._server.streams[name] = self._wrap(fn)
+
+    def _wrap(self, fn):
+        def call(*args):
+            self.requests += 1
+            if self.latency:
+                sleep(self.latency)
+            args, kwds = decode_args(*args)
+            return fn(*args, **kwds)
+        return call
+
+    def _multiCall(self, calls):
+        self.requests += 1
+        if self.latency:
+            sleep(self.latency)
+
+        results = []
+        for call in calls:
+            fn = self._methods.get(call["methodName"])
+            if fn is None:
+                results.append({"faultCode": 1000,
+                                "faultString": "Invalid method: "
+                                f"{call['methodName']}"})
+                continue
+            try:
+                args, kwds = decode_args(*call["params"])
+                results.append([fn(*args, **kwds)])
+            except Fault as fault:
+                results.append({"faultCode": fault.faultCode,
+                                "faultString": fault.faultString})
+        return results
+
+    def _wrap_upload(self, args, data):
+        self.requests += 1
+        if self.latency:
+            sleep(self.latency)
+        return self.rawUpload(args, data)
+
+    def _upload_lock(self, fullpath):
+        with self._locks_lock:
+            return self._locks.setdefault(fullpath, Lock())
+
+    def rawUpload(self, args, data):
+        name = args["filename"][0]
+        path = args.get("filepath", [""])[0]
+        verify = args.get("fileverify", [""])[0]
+        offset = int(args.get("offset", ["0"])[0])
+        overwrite = args.get("overwrite", [""])[0]
+
+        fullpath = os.path.join(self.uploads, path, name)
+        os.makedirs(os.path.dirname(fullpath), exist_ok=True)
+        if os.path.exists(fullpath) and offset == 0 and not overwrite:
+            raise Fault(GenericError.faultCode,
+                        f"upload path exists: {fullpath}")
+
+        # the real hub holds a lockf lock on the file while writing,
+        # which would not conflict between the threads of one process
+        lock = self._upload_lock(fullpath)
+        if not lock.acquire(blocking=False):
+            raise Fault(LockError.faultCode, f"upload locked: {fullpath}")
+
+        fd = os.open(fullpath, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            lockf(fd, LOCK_EX | LOCK_NB)
+            if offset == -1:
+                offset = os.lseek(fd, 0, os.SEEK_END)
+            else:
+                os.ftruncate(fd, offset)
+                os.lseek(fd, offset, os.SEEK_SET)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            lockf(fd, LOCK_UN)
+            os.close(fd)
+            lock.release()
+
+        result = {"size": len(data), "fileverify": verify,
+                  "offset": _encode_int(offset)}
+        if verify:
+            result["hexdigest"] = "%08x" % adler32(data)
+        return result
+
+    def checkUpload(self, path, name, verify=None, tail=None, volume=None):
+        fullpath = os.path.join(self.uploads, path, name)
+        if not os.path.exists(fullpath):
+            return None
+
+        size = os.path.getsize(fullpath)
+        result = {"size": _encode_int(size),
+                  "mtime": os.path.getmtime(fullpath)}
+        if verify:
+            value = adler32(b"")
+            with open(fullpath, "rb") as fo:
+                if tail is not None:
+                    fo.seek(max(0, size - tail))
+                for block in iter(lambda: fo.read(1 << 20), b""):
+                    value = adler32(block, value)
+            result["hexdigest"] = "%08x" % value
+        return result
+
+    def subsession(self):
+        self._sessions += 1
+        return {"session-id": self._sessions + 1,
+                "session-key": f"key-{self._sessions}",
+                "header-auth": True}
+
+    def logout(self, session_id=None):
+        return None
+
+    def getBuild(self, buildInfo, strict=False):
+        if isinstance(buildInfo, int) and buildInfo > 0:
+            return synthetic_build(buildInfo)
+        elif strict:
+            raise Fault(1000, f"No such build: {buildInfo!r}")
+        else:
+            return None
+
+    def getLastEvent(self, before=None):
+        return {"id": 1000, "ts": 1704067200.0}
+
+    def listBuilds(self, packageID=None, userID=None, taskID=None,
+                   prefix=None, state=None, volumeID=None, source=None,
+                   createdBefore=None, createdAfter=None,
+                   completeBefore=None, completeAfter=None, type=None,
+                   typeInfo=None, queryOpts=None, pattern=None, cgID=None,
+                   draft=None):
+        # already in order of id, which is the only order supported
+        opts = queryOpts or {}
+        if opts.get("countOnly"):
+            return self.builds
+
+        start = opts.get("offset") or 0
+        end = self.builds
+        if opts.get("limit") is not None:
+            end = min(end, start + opts["limit"])
+        return [synthetic_build(i) for i in range(start + 1, end + 1)]
+
+    def listTagged(self, tag, event=None, inherit=False, prefix=None,
+                   latest=False, package=None, owner=None, type=None,
+                   strict=True, extra=False, draft=None):
+        # every tag holds the same number of builds, offset by its name
+        base = sum(map(ord, str(tag))) * self.tagged
+        return [synthetic_build(base + i) for i in range(self.tagged)]
+
+    def __enter__(self):
+        if self.process:
+            self._thread = get_context("fork").Process(
+                target=self._server.serve_forever, daemon=True)
+        else:
+            self._thread = Thread(target=self._server.serve_forever,
+                                  daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.process:
+            self._thread.terminate()
+        else:
+            self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        return False
+
+
+# The end.
@@ -0,0 +1,140 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Import-time benchmark for the koji_types package
+
+Uses ``python -X importtime`` in fresh interpreters to measure the cost
+of importing `koji_types` when only the TypedDict declarations are
+wanted, when their hints are also resolved, and when the deferred
+`GOptions` is touched, against the cost of importing koji itself.
+
+Run from the top of the repository, eg.
+``python3 benchmarks/importtime.py -n 20``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from statistics import median
+from subprocess import PIPE, run
+
+
+SCENARIOS = (
+    ("typeddict only",
+     "from koji_types import BuildInfo, TaskInfo, BuildID"),
+    ("resolved hints",
+     "from koji_types import BuildInfo; from typing import get_type_hints;"
+     " get_type_hints(BuildInfo)"),
+    ("with GOptions",
+     "from koji_types import BuildInfo, TaskInfo, BuildID, GOptions"),
+    ("koji alone",
+     "import koji"),
+)
+
+
+def parse_importtime(output, prefix):
+    """
+    Sums the cumulative microseconds of the top-level imports from the
+    given ``-X importtime`` output whose names start with prefix. Also
+    returns the set of every module name that was imported.
+    """
+
+    total = 0
+    names = set()
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _self, cumulative, name = line.split(":", 1)[1].split("|")
+        if not cumulative.strip().isdigit():
+            # this is the header line
+            continue
+
+        names.add(name.strip())
+        if name.startswith(" " + prefix):
+            total += int(cumulative)
+
+    return total, names
+
+
+def measure(python, code, prefix):
+    proc = run([python, "-X", "importtime", "-c", code],
+               stdout=PIPE, stderr=PIPE, universal_newlines=True)
+
+    if proc.returncode:
+        raise Exception(f"failed to run {code!r}:\n{proc.stderr}")
+
+    return parse_importtime(proc.stderr, prefix)
+
+
+def cli(options):
+    print(f"{'scenario':<20} {'median us':>10} {'min us':>10}"
+          f" {'modules':>8}  koji imported")
+
+    for label, code in SCENARIOS:
+        prefix = code.split()[1]
+
+        found = []
+        names = set()
+        for _ in range(options.count):
+            total, names = measure(options.python, code, prefix)
+            found.append(total)
+
+        print(f"{label:<20} {median(found):>10.0f} {min(found):>10}"
+              f" {len(names):>8}  {'koji' in names}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=10,
+                        help="number of fresh interpreters per scenario")
+
+    parser.add_argument("--python", action="store",
+                        default=sys.executable,
+                        help="python interpreter to measure with")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
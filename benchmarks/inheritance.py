@@ -0,0 +1,266 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Tag inheritance benchmark
+
+Finds the full inheritance of every tag of a synthetic tag hierarchy
+served by a local stand-in hub, first with one ``getFullInheritance``
+call per tag, and then locally via
+`koji_types.inheritance.InheritanceResolver`. The stand-in answers
+``getFullInheritance`` with a port of the hub's own algorithm, which is
+first compared with the resolver's over hierarchies using each of the
+link flags. Finally changes the
+links of a single tag and finds the full inheritance of every tag
+again, which only recomputes those affected.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/inheritance.py -n 3000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.inheritance import InheritanceGraph, InheritanceResolver
+
+
+FLAGS = ("maxdepth", "intransitive", "noconfig", "pkg_filter")
+
+
+def synthetic_links(tag, count, flags=FLAGS):
+    """
+    The inheritance links of a tag in a hierarchy of count tags, in
+    which most tags have two parents. Only the named flags are set on
+    any of the links.
+    """
+
+    parents = sorted({tag // 2, tag // 3} - {tag})
+    return [{
+        "child_id": tag, "parent_id": parent, "name": f"tag-{parent}",
+        "priority": index * 10,
+        "maxdepth": 3 if "maxdepth" in flags and
+        (tag + index) % 5 == 0 else None,
+        "intransitive": "intransitive" in flags and (tag + index) % 11 == 0,
+        "noconfig": "noconfig" in flags and (tag + index) % 13 == 0,
+        "pkg_filter": "^pkg1" if "pkg_filter" in flags and
+        (tag + index) % 17 == 0 else "",
+    } for index, parent in enumerate(parents) if parent < count]
+
+
+def hub_full_inheritance(links, tag_id):
+    """
+    A port of the hub's ``readFullInheritance`` over the given links
+    of each tag, as from ``getInheritanceData``. This is kept apart
+    from `koji_types.inheritance`, so that the two may be compared.
+    """
+
+    order = []
+    hub_full_inheritance_recurse(links, tag_id, order, {}, {}, 0, None,
+                                 False, [])
+    return order
+
+
+def hub_full_inheritance_recurse(links, tag_id, order, top, hist,
+                                 currdepth, maxdepth, noconfig, pfilter):
+    """
+    A port of the hub's ``readFullInheritanceRecurse``, without the
+    reverse case
+    """
+
+    if maxdepth is not None and maxdepth < 1:
+        return
+    currdepth += 1
+    top = top.copy()
+    top[tag_id] = 1
+
+    node = sorted((dict(link) for link in links[tag_id]),
+                  key=lambda link: link["priority"])
+    for link in node:
+        id = link["parent_id"]
+        if id in top:
+            continue
+        if link["intransitive"] and len(top) > 1:
+            continue
+
+        nextdepth = link["maxdepth"]
+        if nextdepth is None:
+            if maxdepth is not None:
+                nextdepth = maxdepth - 1
+        elif maxdepth is not None:
+            nextdepth = min(nextdepth, maxdepth) - 1
+        link["nextdepth"] = nextdepth
+        link["currdepth"] = currdepth
+
+        if link["noconfig"]:
+            noconfig = True
+        filter = list(pfilter)
+        pattern = link["pkg_filter"]
+        if pattern:
+            filter.append(pattern)
+        link["filter"] = filter
+
+        if id in hist:
+            rescan = True
+            for previous in hist[id]:
+                sufficient = True
+                lastdepth = previous["nextdepth"]
+                if nextdepth is None:
+                    if lastdepth is not None:
+                        sufficient = False
+                elif lastdepth is not None and nextdepth > lastdepth:
+                    sufficient = False
+                if previous["noconfig"] and not noconfig:
+                    sufficient = False
+                if len(previous["filter"]) > 0:
+                    sufficient = False
+                if sufficient:
+                    rescan = False
+            if not rescan:
+                continue
+        else:
+            hist[id] = []
+        hist[id].append(link)
+        order.append(link)
+
+        hub_full_inheritance_recurse(links, id, order, top, hist, currdepth,
+                                     nextdepth, noconfig, filter)
+
+
+def check_parity(count):
+    """
+    Confirms that `InheritanceGraph.full_inheritance` agrees with the
+    port of the hub for every tag, in hierarchies using no flags, each
+    flag alone, and every flag together
+    """
+
+    for flags in ((), ) + tuple((flag, ) for flag in FLAGS) + (FLAGS, ):
+        links = {tag: synthetic_links(tag, count, flags)
+                 for tag in range(count)}
+        graph = InheritanceGraph()
+        for tag, found in links.items():
+            graph.update(tag, found)
+
+        for tag in range(count):
+            if graph.full_inheritance(tag) != \
+               hub_full_inheritance(links, tag):
+                raise AssertionError(f"inheritance of tag {tag} differs"
+                                     f" with flags {flags}")
+
+
+def register(hub, count):
+    links = {tag: synthetic_links(tag, count) for tag in range(count)}
+
+    def listTags(build=None, package=None, perms=True, queryOpts=None,
+                 pattern=None):
+        return [{"id": tag, "name": f"tag-{tag}"} for tag in range(count)]
+
+    def getInheritanceData(tag, event=None):
+        return links[tag]
+
+    def getFullInheritance(tag, event=None, reverse=False):
+        if reverse:
+            raise ValueError("reverse inheritance is not supported")
+        return hub_full_inheritance(links, tag)
+
+    hub.register("listTags", listTags)
+    hub.register("getInheritanceData", getInheritanceData)
+    hub.register("getFullInheritance", getFullInheritance)
+
+
+def cli(options):
+    tags = range(options.count)
+    check_parity(options.count)
+
+    with StandInHub(latency=options.latency) as hub:
+        register(hub, options.count)
+        session = ClientSession(hub.url)
+
+        print(f"{'scenario':<12} {'seconds':>9} {'requests':>9}")
+
+        def report(label, start, before):
+            print(f"{label:<12} {perf_counter() - start:>9.3f}"
+                  f" {hub.requests - before:>9}")
+
+        before, start = hub.requests, perf_counter()
+        expected = [session.getFullInheritance(tag) for tag in tags]
+        report("per tag", start, before)
+
+        before, start = hub.requests, perf_counter()
+        resolver = InheritanceResolver(session, size=options.size)
+        resolver.load()
+        found = [resolver.full_inheritance(tag) for tag in tags]
+        report("resolver", start, before)
+
+        if found != expected:
+            print("results differ!")
+            return 1
+
+        before, start = hub.requests, perf_counter()
+        graph = resolver.graph()
+        changed = options.count // 2
+        graph.update(changed, graph.parents(changed)[:1])
+        for tag in tags:
+            resolver.full_inheritance(tag)
+        report("invalidated", start, before)
+
+    return 0
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=3000,
+                        help="number of tags")
+
+    parser.add_argument("--size", action="store", type=int,
+                        default=1000,
+                        help="number of calls in each multicall")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        return cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
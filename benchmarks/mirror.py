@@ -0,0 +1,168 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Build mirror benchmark
+
+Populates a `koji_types.mirror.BuildMirror` from a local stand-in hub,
+then adds more builds to the hub and synchronises the mirror again.
+Finally looks up builds by NVR and RPMs by build, both from the hub
+and from the mirror.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/mirror.py -n 5000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from datetime import datetime
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.mirror import BuildMirror
+from synthetic import synthetic_archive, synthetic_build, synthetic_rpm
+
+
+def register(hub):
+
+    def listBuilds(completeAfter=None, queryOpts=None, **kwds):
+        opts = queryOpts or {}
+        first = 1
+        if completeAfter:
+            after = datetime.fromisoformat(completeAfter).timestamp()
+            first = max(1, int(after - 1704067200.0) + 1)
+
+        start = first + (opts.get("offset") or 0)
+        end = hub.builds + 1
+        if opts.get("limit") is not None:
+            end = min(end, start + opts["limit"])
+        return [synthetic_build(i) for i in range(start, end)]
+
+    def listRPMs(buildID=None, **kwds):
+        return [synthetic_rpm(i) for i in range(buildID * 8, buildID * 8 + 8)]
+
+    def listArchives(buildID=None, **kwds):
+        return [synthetic_archive(i)
+                for i in range(buildID * 4, buildID * 4 + 4)]
+
+    def queryHistory(tables=None, **kwds):
+        return {"tag_listing": []}
+
+    hub.register("listBuilds", listBuilds)
+    hub.register("listRPMs", listRPMs)
+    hub.register("listArchives", listArchives)
+    hub.register("queryHistory", queryHistory)
+
+
+def cli(options):
+    with StandInHub(latency=options.latency, builds=options.count) as hub, \
+            TemporaryDirectory() as tmpdir:
+
+        register(hub)
+        session = ClientSession(hub.url)
+        mirror = BuildMirror(join(tmpdir, "mirror.sqlite"))
+
+        print(f"{'scenario':<16} {'seconds':>9} {'requests':>9}")
+
+        def report(label, start, before):
+            print(f"{label:<16} {perf_counter() - start:>9.3f}"
+                  f" {hub.requests - before:>9}")
+
+        before, start = hub.requests, perf_counter()
+        mirror.sync(session, size=options.size)
+        report("initial sync", start, before)
+
+        hub.builds += options.added
+        before, start = hub.requests, perf_counter()
+        found = mirror.sync(session, size=options.size)
+        report("update sync", start, before)
+        print(f"{found.builds} builds updated")
+
+        ids = range(1, options.lookups + 1)
+        nvrs = [synthetic_build(i)["nvr"] for i in ids]
+
+        before, start = hub.requests, perf_counter()
+        for nvr in nvrs:
+            session.getBuild(nvr)
+        for i in ids:
+            session.listRPMs(buildID=i)
+        report("hub lookups", start, before)
+
+        before, start = hub.requests, perf_counter()
+        for nvr in nvrs:
+            mirror.get_build_by_nvr(nvr)
+        for i in ids:
+            mirror.rpms_by_build(i)
+        report("mirror lookups", start, before)
+
+        mirror.close()
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=5000,
+                        help="number of builds initially on the hub")
+
+    parser.add_argument("--added", action="store", type=int,
+                        default=100,
+                        help="number of builds added before the update")
+
+    parser.add_argument("--lookups", action="store", type=int,
+                        default=500,
+                        help="number of builds to look up")
+
+    parser.add_argument("--size", action="store", type=int, default=100,
+                        help="number of calls in each multicall")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -0,0 +1,114 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Multicall batching benchmark
+
+Compares making many individual ``getBuild`` calls against batching
+them via `koji_types.multicall.multicall_map`, with and without
+concurrent workers, using a local stand-in hub with a simulated
+round-trip latency.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/multicall.py -n 2000 --latency 0.02``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.multicall import multicall_map
+
+
+def timed(fn):
+    start = perf_counter()
+    fn()
+    return perf_counter() - start
+
+
+def cli(options):
+    ids = range(1, options.count + 1)
+
+    with StandInHub(latency=options.latency) as hub:
+        session = ClientSession(hub.url)
+
+        def single():
+            return [session.getBuild(i) for i in ids]
+
+        def batched(workers):
+            return list(multicall_map(session,
+                                      lambda mc, i: mc.getBuild(i), ids,
+                                      size=options.size, workers=workers))
+
+        scenarios = [("individual calls", single)]
+        for workers in (1, 4, 8):
+            scenarios.append((f"multicall_map workers={workers}",
+                              lambda w=workers: batched(w)))
+
+        print(f"{'scenario':<28} {'seconds':>9} {'requests':>9}")
+        for label, fn in scenarios:
+            before = hub.requests
+            elapsed = timed(fn)
+            print(f"{label:<28} {elapsed:>9.3f}"
+                  f" {hub.requests - before:>9}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=2000,
+                        help="number of getBuild calls")
+
+    parser.add_argument("--size", action="store", type=int, default=100,
+                        help="calls per multicall")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -0,0 +1,117 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Paginated results benchmark
+
+Compares the peak memory and time of walking every result of a large
+``listBuilds`` call, fetched in one response, against fetching it in
+pages via `koji_types.paging.paginate` with and without prefetching.
+The stand-in hub runs in a separate process, so that only the client
+side is measured.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/paging.py -n 50000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+import tracemalloc
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.paging import paginate
+
+
+def measured(fn):
+    tracemalloc.start()
+    start = perf_counter()
+    fn()
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def cli(options):
+    with StandInHub(builds=options.count, process=True) as hub:
+        session = ClientSession(hub.url)
+
+        def consume(builds):
+            total = 0
+            for bld in builds:
+                total += bld["id"]
+            return total
+
+        def whole():
+            consume(session.listBuilds())
+
+        def paged(prefetch):
+            consume(paginate(session,
+                             lambda s, opts: s.listBuilds(queryOpts=opts),
+                             page_size=options.page_size,
+                             prefetch=prefetch))
+
+        print(f"{'scenario':<20} {'seconds':>9} {'peak MB':>9}")
+        for label, fn in (("single response", whole),
+                          ("paginate", lambda: paged(False)),
+                          ("paginate prefetch", lambda: paged(True))):
+            elapsed, peak = measured(fn)
+            print(f"{label:<20} {elapsed:>9.3f} {peak / 2 ** 20:>9.1f}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=50000,
+                        help="number of builds in the result")
+
+    parser.add_argument("--page-size", action="store", type=int,
+                        default=1000,
+                        help="number of builds in each page")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
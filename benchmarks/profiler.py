@@ -0,0 +1,138 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Call profiler benchmark
+
+Measures the overhead per call of `koji_types.metrics.ProfiledSession`,
+both disabled and enabled, against a session whose hub methods return
+immediately. Then repeats a set of ``getBuild`` and ``listBuilds`` calls
+against a local stand-in hub through a profiled `koji.ClientSession`,
+and prints the collected statistics.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/profiler.py -n 100000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.metrics import CallProfiler, ProfiledSession
+
+
+class NullSession:
+    """
+    Stand-in for a session, with hub methods which do no work
+    """
+
+    def getBuild(self, buildInfo, strict=False):
+        return None
+
+
+def per_call(session, count):
+    """
+    Mean seconds per ``getBuild`` call over count calls
+    """
+
+    start = perf_counter()
+    for _ in range(count):
+        session.getBuild(1)
+    elapsed = perf_counter() - start
+    return elapsed / count
+
+
+def cli(options):
+    null = NullSession()
+    profiler = CallProfiler(enabled=False)
+    profiled = ProfiledSession(null, profiler)
+
+    base = per_call(null, options.count)
+    disabled = per_call(profiled, options.count)
+    profiler.enable()
+    enabled = per_call(profiled, options.count)
+
+    print(f"{'session':<12} {'usec/call':>10} {'overhead':>10}")
+    for label, value in (("direct", base), ("disabled", disabled),
+                         ("enabled", enabled)):
+        print(f"{label:<12} {value * 1e6:>10.3f}"
+              f" {(value - base) * 1e6:>10.3f}")
+
+    profiler = CallProfiler()
+    with StandInHub(latency=options.latency) as hub:
+        session = ProfiledSession(ClientSession(hub.url), profiler)
+        for i in range(1, options.hub_calls + 1):
+            session.getBuild(i)
+        session.listBuilds(queryOpts={"limit": options.hub_calls})
+
+    print()
+    if options.json:
+        print(profiler.to_json(indent=2))
+    else:
+        print(profiler.to_prometheus())
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=200000,
+                        help="number of calls to time for the overhead")
+
+    parser.add_argument("--hub-calls", action="store", type=int,
+                        default=100,
+                        help="number of calls to make to the stand-in hub")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.0,
+                        help="simulated seconds of latency per request")
+
+    parser.add_argument("--json", action="store_true", default=False,
+                        help="print the statistics as JSON rather than"
+                        " in the Prometheus text format")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -0,0 +1,132 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Memory and conversion benchmark for koji_types.records
+
+Builds synthetic ``listTagged``, ``listRPMs`` and ``listArchives``
+style results and reports the container overhead per row of plain
+dicts versus the compact record classes, along with the cost of
+converting in each direction.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/records.py -n 100000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+import tracemalloc
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji_types.records import (
+    ArchiveRecord, RPMRecord, TagBuildRecord, from_dicts, to_dicts, )
+from synthetic import synthetic_archive, synthetic_build, synthetic_rpm
+
+
+SCENARIOS = (
+    ("TagBuildInfo", synthetic_build, TagBuildRecord),
+    ("RPMInfo", synthetic_rpm, RPMRecord),
+    ("ArchiveInfo", synthetic_archive, ArchiveRecord),
+)
+
+
+def traced(fn, *args):
+    """
+    Returns the result of fn and the bytes allocated (and still live)
+    during its invocation
+    """
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return result, after - before
+
+
+def timed(fn, *args):
+    """
+    Returns the result of fn and the seconds it took. Kept separate
+    from `traced` as tracemalloc greatly inflates timings
+    """
+
+    start = perf_counter()
+    result = fn(*args)
+    return result, perf_counter() - start
+
+
+def cli(options):
+    count = options.count
+
+    print(f"{'type':<14} {'dict B/row':>11} {'record B/row':>13}"
+          f" {'ratio':>6} {'from_dict us':>13} {'to_dict us':>11}")
+
+    for label, synth, rcls in SCENARIOS:
+        # the values are generated first, so that the measurements
+        # only include the cost of the containers themselves
+        rows = [tuple(synth(i).items()) for i in range(count)]
+
+        dicts, dict_mem = traced(lambda: [dict(r) for r in rows])
+        recs, rec_mem = traced(from_dicts, rcls, dicts)
+        del recs
+
+        recs, from_t = timed(from_dicts, rcls, dicts)
+        _, to_t = timed(to_dicts, recs)
+
+        print(f"{label:<14} {dict_mem / count:>11.1f}"
+              f" {rec_mem / count:>13.1f}"
+              f" {dict_mem / rec_mem:>6.2f}"
+              f" {from_t / count * 1e6:>13.3f}"
+              f" {to_t / count * 1e6:>11.3f}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=100000,
+                        help="number of synthetic rows per type")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
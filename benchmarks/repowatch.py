@@ -0,0 +1,195 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Repo watching benchmark
+
+Serves a handful of tags from a local stand-in hub, each of whose
+repos is regenerated periodically. Many waiters then each wait for a
+repo of one of the tags, created no earlier than a few events from
+now. The waiters first each run their own ``koji.util.RepoWatcher``
+in a thread, and then all share a single
+`koji_types.repowatch.RepoWatcher`.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/repowatch.py -n 200``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor, wait
+from random import Random
+from time import perf_counter, time
+
+from koji import ClientSession
+from koji.util import RepoWatcher as KojiRepoWatcher
+
+from hub import StandInHub
+from koji_types.repowatch import RepoWatcher
+
+
+RATE = 10
+""" events per second """
+
+
+class SyntheticRepos:
+    """
+    Tags ``tag1`` to ``tagN``, each of whose repos is regenerated
+    every period seconds, at staggered times
+    """
+
+    def __init__(self, hub, tags, period):
+        self.tags = tags
+        self.period = period
+        self.started = time()
+
+        hub.register("getTag", self.getTag)
+        hub.register("getRepo", self.getRepo)
+        hub.register("repo.get", self.repo_get)
+
+    def event(self):
+        return 1000 + int((time() - self.started) * RATE)
+
+    def _tag_id(self, tag):
+        return int(tag[3:]) if isinstance(tag, str) else tag
+
+    def getTag(self, taginfo, strict=False, event=None, blocked=False):
+        tag_id = self._tag_id(taginfo)
+        return {"id": tag_id, "name": f"tag{tag_id}"}
+
+    def getRepo(self, tag, state=None, event=None, dist=False,
+                min_event=None):
+        tag_id = self._tag_id(tag)
+        phase = self.period * tag_id / self.tags
+        count = int((time() - self.started - phase) // self.period)
+        create_event = 1000 + int((count * self.period + phase) * RATE)
+
+        if min_event is not None and create_event < min_event:
+            return None
+        return {
+            "create_event": create_event,
+            "create_ts": self.started + count * self.period + phase,
+            "dist": False,
+            "id": tag_id * 100000 + count,
+            "state": 1,
+            "tag_id": tag_id,
+            "tag_name": f"tag{tag_id}",
+            "task_id": None,
+        }
+
+    def repo_get(self, tag, min_event=None, at_event=None, opts=None):
+        return self.getRepo(tag, min_event=min_event)
+
+
+def cli(options):
+    with StandInHub(latency=options.latency) as hub:
+        repos = SyntheticRepos(hub, options.tags, options.period)
+        rand = Random(options.seed)
+
+        def waits():
+            # waiters mostly want the next repo of their tag, which is
+            # what a min_event of tagLastChangeEvent usually amounts to
+            now = repos.event()
+            offsets = [0, RATE, RATE * 2, int(options.period * RATE)]
+            return [(f"tag{rand.randint(1, options.tags)}",
+                     now + rand.choice(offsets))
+                    for _ in range(options.count)]
+
+        print(f"{'scenario':<16} {'seconds':>9} {'requests':>9}"
+              f" {'waiters':>9} {'distinct':>9}")
+
+        def report(label, start, before, wanted):
+            print(f"{label:<16} {perf_counter() - start:>9.3f}"
+                  f" {hub.requests - before:>9} {len(wanted):>9}"
+                  f" {len(set(wanted)):>9}")
+
+        def wait_one(wanted):
+            tag, min_event = wanted
+            session = ClientSession(hub.url)
+            watcher = KojiRepoWatcher(session, tag, min_event=min_event)
+            watcher.PAUSE = options.interval
+            return watcher.waitrepo(anon=True)
+
+        wanted = waits()
+        before, start = hub.requests, perf_counter()
+        with ThreadPoolExecutor(max_workers=len(wanted)) as pool:
+            list(pool.map(wait_one, wanted))
+        report("koji.util", start, before, wanted)
+
+        wanted = waits()
+        before, start = hub.requests, perf_counter()
+        session = ClientSession(hub.url)
+        with RepoWatcher(session, interval=options.interval) as watcher:
+            futures = [watcher.watch(tag, min_event)
+                       for tag, min_event in wanted]
+            wait(futures)
+        report("shared watcher", start, before, wanted)
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=200,
+                        help="number of waiters")
+
+    parser.add_argument("--tags", action="store", type=int, default=5,
+                        help="number of tags")
+
+    parser.add_argument("--period", action="store", type=float,
+                        default=5.0,
+                        help="seconds between regenerations of a tag's repo")
+
+    parser.add_argument("--interval", action="store", type=float,
+                        default=1.0,
+                        help="seconds between polls")
+
+    parser.add_argument("--seed", action="store", type=int, default=0,
+                        help="random seed for the waiters")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
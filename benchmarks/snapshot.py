@@ -0,0 +1,122 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Event-pinned snapshot benchmark
+
+Simulates repeated jobs which each list the contents of several tags
+as of the same event, using a local stand-in hub. The first job via
+`koji_types.snapshot.SnapshotSession` populates an on-disk store, and
+later jobs (each a fresh session, as if a new process) read from it.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/snapshot.py --tags 10 --tagged 5000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from os.path import getsize, join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.cache import SQLiteBackend
+from koji_types.snapshot import SnapshotSession
+
+
+def cli(options):
+    tags = [f"tag-{i}" for i in range(options.tags)]
+
+    with StandInHub(latency=options.latency,
+                    tagged=options.tagged) as hub, \
+            TemporaryDirectory() as tmpdir:
+
+        session = ClientSession(hub.url)
+        dbfile = join(tmpdir, "snapshot.sqlite")
+        event = session.getLastEvent()["id"]
+
+        def direct():
+            for tag in tags:
+                session.listTagged(tag, event=event)
+
+        def snapshot():
+            backend = SQLiteBackend(dbfile)
+            snap = SnapshotSession(session, event, backend=backend)
+            for tag in tags:
+                snap.listTagged(tag)
+            backend.close()
+
+        print(f"{'job':<16} {'seconds':>9} {'requests':>9}")
+        for label, fn in (("direct", direct),
+                          ("snapshot cold", snapshot),
+                          ("snapshot warm", snapshot),
+                          ("snapshot warm", snapshot)):
+            before = hub.requests
+            start = perf_counter()
+            fn()
+            elapsed = perf_counter() - start
+            print(f"{label:<16} {elapsed:>9.3f}"
+                  f" {hub.requests - before:>9}")
+
+        rows = options.tags * options.tagged
+        print(f"on-disk size {getsize(dbfile) / rows:.1f} bytes per build")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("--tags", action="store", type=int, default=10,
+                        help="number of tags listed by each job")
+
+    parser.add_argument("--tagged", action="store", type=int,
+                        default=5000,
+                        help="number of builds in each tag")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
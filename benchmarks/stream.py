@@ -0,0 +1,146 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Streaming response benchmark
+
+Serves a synthetic ``listTagged`` response of roughly the given size
+from a local stand-in hub, which marshals it a record at a time. Reads
+it with ``ClientSession.listTagged``, and then with a
+`koji_types.stream.StreamingSession`, reporting the time until the
+first record is seen, the total time, and the peak memory of the
+client. Each scenario runs in its own forked process, so that the
+peak of one does not hide the peak of the next.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/stream.py --size 500``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from multiprocessing import get_context
+from resource import RUSAGE_SELF, getrusage
+from time import perf_counter
+
+from koji import ClientSession
+from koji.xmlrpcplus import dumps
+
+from hub import StandInHub
+from koji_types.stream import StreamingSession
+from synthetic import synthetic_build
+
+
+MB = 1024 * 1024
+
+
+def record_size():
+    """
+    The approximate number of bytes of a marshalled synthetic build
+    """
+
+    return len(dumps((synthetic_build(100000), ), methodresponse=True))
+
+
+def measured(fn, url, conn):
+    # ru_maxrss is in KiB on Linux
+    before = getrusage(RUSAGE_SELF).ru_maxrss
+    session = ClientSession(url)
+
+    start = perf_counter()
+    first = None
+    count = 0
+    for build in fn(session):
+        if first is None:
+            first = perf_counter() - start
+        count += 1
+    elapsed = perf_counter() - start
+
+    peak = getrusage(RUSAGE_SELF).ru_maxrss - before
+    conn.send((first or 0.0, elapsed, count, peak * 1024))
+    conn.close()
+
+
+def whole(session):
+    return session.listTagged("f40")
+
+
+def streamed(session):
+    return StreamingSession(session).listTagged("f40")
+
+
+def cli(options):
+    count = options.size * MB // record_size()
+
+    with StandInHub(latency=options.latency) as hub:
+        hub.register_stream(
+            "listTagged",
+            lambda tag, **kwds: (synthetic_build(i) for i in range(count)))
+
+        print(f"{'scenario':<16} {'first':>9} {'seconds':>9}"
+              f" {'records':>9} {'peak MB':>9}")
+
+        context = get_context("fork")
+        for label, fn in (("ClientSession", whole),
+                          ("StreamingSession", streamed)):
+            recv, send = context.Pipe(duplex=False)
+            child = context.Process(target=measured,
+                                    args=(fn, hub.url, send))
+            child.start()
+            first, elapsed, found, peak = recv.recv()
+            child.join()
+            print(f"{label:<16} {first:>9.3f} {elapsed:>9.3f}"
+                  f" {found:>9} {peak / MB:>9.1f}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("--size", action="store", type=int, default=500,
+                        help="approximate size of the response in MB")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -0,0 +1,368 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Typing-performance benchmark suite for the stub packages
+
+Generates synthetic client modules of increasing size which use
+`koji.ClientSession`, `MultiCallSession`, the `koji_types` TypedDicts,
+and the `koji_cli` and `kojihub` stubs, including several of the
+heavily overloaded hub methods. Each module is type-checked cold and
+warm by mypy and, when it is installed, by pyright. The wall time and
+peak memory (maximum resident set size) of each checker process is
+recorded.
+
+mypy's cold runs start from an empty cache, and its warm runs reuse the
+cache of a previous run. pyright keeps no cache between runs, so its
+warm runs only benefit from the operating system's file cache.
+
+The results can be saved with ``--output``, and a later run compared
+against them with ``--baseline``, in which case any measurement which
+has grown by more than the tolerance is reported and the exit code is
+non-zero. eg.
+
+::
+
+    python3 benchmarks/stubcost.py --output before.json
+    # ... change some stubs ...
+    python3 benchmarks/stubcost.py --baseline before.json
+
+Run from the top of the repository.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import json
+import os
+import sys
+
+from argparse import ArgumentParser
+from os.path import abspath, join
+from shutil import rmtree, which
+from statistics import median
+from subprocess import STDOUT, Popen
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+STUB_DIRS = (
+    ("koji", "koji-stubs"),
+    ("koji_cli", "koji_cli-stubs"),
+    ("kojihub", "kojihub-stubs"),
+    ("koji_types", "koji_types"),
+)
+
+
+HEADER = '''
+from koji import ClientSession, MultiCallSession, VirtualCall
+from koji_cli.lib import TaskWatcher, activate_session, watch_tasks
+from koji_types import (
+    BuildInfo, EventID, HostID, QueryOptions, RPMInfo, TagID, TagInfo,
+    TaskID, )
+from kojihub import get_build, readTaggedBuilds
+from typing import Dict, List, Optional, Union
+'''
+
+
+# each is formatted with a unique index, so that a module of any size
+# can be produced by repeating them
+SNIPPETS = (
+    '''
+def build_{n}(session: ClientSession, nvr: str) -> Optional[str]:
+    bld = session.getBuild(nvr)
+    if bld is None:
+        return None
+    return f"{{bld['name']}}-{{bld['version']}}-{{bld['release']}}"
+''',
+    '''
+def count_{n}(session: ClientSession, tag: str) -> int:
+    opts: QueryOptions = {{"order": "-id", "limit": 10}}
+    recent: List[BuildInfo] = session.listBuilds(queryOpts=opts)
+    total: int = session.listBuilds(queryOpts={{"countOnly": True}})
+    return total - len(recent)
+''',
+    '''
+def rpm_{n}(session: ClientSession, nvra: str) -> List[str]:
+    found: Optional[RPMInfo] = session.getRPM(nvra)
+    every: List[RPMInfo] = session.getRPM(nvra, multi=True)
+    return [rpm["arch"] for rpm in every if rpm != found]
+''',
+    '''
+def event_{n}(session: ClientSession, event: EventID,
+              host: HostID) -> float:
+    info = session.getEvent(event, strict=True)
+    when: Optional[float] = session.getLastHostUpdate(host, ts=True)
+    return info["ts"] - (when or 0.0)
+''',
+    '''
+def multicall_{n}(session: ClientSession,
+                  names: List[str]) -> Dict[str, TagID]:
+    with session.multicall(strict=True) as mc:
+        calls: List[VirtualCall[Optional[TagInfo]]] = [
+            mc.getTag(name) for name in names]
+    return {{tag["name"]: tag["id"] for tag in
+             (call.result for call in calls) if tag}}
+''',
+    '''
+def queue_{n}(mc: MultiCallSession,
+              tags: List[Union[str, TagID]]) -> VirtualCall[int]:
+    for tag in tags:
+        mc.listTagged(tag, latest=True)
+    return mc.listBuilds(queryOpts={{"countOnly": True}})
+''',
+    '''
+def watch_{n}(session: ClientSession, task_id: int) -> bool:
+    activate_session(session, {{"authtype": "noauth"}})
+    watcher = TaskWatcher(task_id, session, quiet=True)
+    if not watcher.is_done():
+        watch_tasks(session, [task_id], quiet=True, poll_interval=5)
+    return watcher.is_success()
+''',
+    '''
+def hub_{n}(tag: TagID, task: TaskID) -> List[str]:
+    latest = readTaggedBuilds(tag, latest=True)
+    first = get_build(latest[0]["id"], strict=True) if latest else None
+    found = [bld["nvr"] for bld in latest if bld["task_id"] != task]
+    return found + ([first["nvr"]] if first else [])
+''',
+)
+
+
+def synthetic_client(size):
+    """
+    Source of a client module with size functions
+    """
+
+    parts = [HEADER]
+    for n in range(size):
+        parts.append(SNIPPETS[n % len(SNIPPETS)].format(n=n))
+    return "".join(parts)
+
+
+def prepare(work, sizes):
+    """
+    Create a search path in work with each of the stub packages under
+    the name it's imported as, along with a client module of each size
+    and the configuration for the checkers. Returns a dict of size to
+    module filename.
+    """
+
+    for name, dirname in STUB_DIRS:
+        os.symlink(abspath(dirname), join(work, name))
+
+    with open(join(work, "mypy.ini"), "wt") as f:
+        f.write("[mypy]\nignore_missing_imports = True\n")
+
+    clients = {}
+    for size in sizes:
+        filename = join(work, f"client_{size}.py")
+        with open(filename, "wt") as f:
+            f.write(synthetic_client(size))
+        clients[size] = filename
+
+    return clients
+
+
+def run_checker(cmd, work, env=None):
+    """
+    Run a checker to completion, returning its wall time in seconds
+    and peak memory in MiB. Raises an exception if it finds any
+    errors.
+    """
+
+    with open(join(work, "checker.log"), "w+b") as out:
+        start = perf_counter()
+        proc = Popen(cmd, cwd=work, env=dict(os.environ, **(env or {})),
+                     stdout=out, stderr=STDOUT)
+
+        # wait4 rather than proc.wait, in order to get the resource
+        # usage of this one child
+        _pid, status, usage = os.wait4(proc.pid, 0)
+        elapsed = perf_counter() - start
+
+        if os.WIFEXITED(status):
+            proc.returncode = os.WEXITSTATUS(status)
+        else:
+            proc.returncode = -os.WTERMSIG(status)
+
+        if proc.returncode:
+            out.seek(0)
+            raise Exception(f"{cmd[0]} failed:\n"
+                            f"{out.read().decode('utf-8', 'replace')}")
+
+    # ru_maxrss is in KiB on Linux
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def mypy_checker(python):
+    def check(work, client, cold):
+        cache = join(work, f".mypy-{'cold' if cold else 'warm'}")
+        if cold:
+            rmtree(cache, ignore_errors=True)
+        return run_checker([python, "-m", "mypy",
+                            "--config-file", join(work, "mypy.ini"),
+                            "--cache-dir", cache, client],
+                           work, {"MYPYPATH": work})
+    return check
+
+
+def pyright_checker(pyright):
+    def check(work, client, _cold):
+        config = join(work, "pyrightconfig.json")
+        with open(config, "wt") as f:
+            json.dump({"include": [client],
+                       "extraPaths": [work],
+                       "reportMissingModuleSource": False}, f)
+        return run_checker([pyright, "--project", config], work)
+    return check
+
+
+def measure(check, work, client, count):
+    """
+    Returns the median wall time and peak memory of cold and of warm
+    runs of a checker against a client
+    """
+
+    cold = [check(work, client, True) for _ in range(count)]
+
+    # prime the warm cache, where the checker has one
+    check(work, client, False)
+    warm = [check(work, client, False) for _ in range(count)]
+
+    return {
+        "cold_s": median(t for t, _m in cold),
+        "cold_mib": median(m for _t, m in cold),
+        "warm_s": median(t for t, _m in warm),
+        "warm_mib": median(m for _t, m in warm),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Report each measurement which exceeds its baseline by more than
+    tolerance (a fraction). Returns the number of such regressions.
+    """
+
+    regressions = 0
+    for checker, sizes in results.items():
+        for size, found in sizes.items():
+            before = baseline.get(checker, {}).get(size)
+            if not before:
+                continue
+            for key, value in found.items():
+                limit = before.get(key, 0) * (1 + tolerance)
+                if limit and value > limit:
+                    regressions += 1
+                    print(f"REGRESSION {checker} size {size} {key}:"
+                          f" {before[key]:.3f} -> {value:.3f}")
+    return regressions
+
+
+def cli(options):
+    checkers = [("mypy", mypy_checker(options.python))]
+
+    pyright = which(options.pyright)
+    if pyright:
+        checkers.append(("pyright", pyright_checker(pyright)))
+    else:
+        print(f"{options.pyright} not found, skipping pyright")
+
+    sizes = [int(size) for size in options.sizes.split(",")]
+
+    print(f"{'checker':<8} {'size':>6} {'cold s':>8} {'cold MiB':>9}"
+          f" {'warm s':>8} {'warm MiB':>9}")
+
+    results = {}
+    with TemporaryDirectory() as work:
+        clients = prepare(work, sizes)
+
+        for name, check in checkers:
+            found = results[name] = {}
+            for size in sizes:
+                stats = measure(check, work, clients[size], options.count)
+                found[str(size)] = stats
+                print(f"{name:<8} {size:>6} {stats['cold_s']:>8.3f}"
+                      f" {stats['cold_mib']:>9.1f} {stats['warm_s']:>8.3f}"
+                      f" {stats['warm_mib']:>9.1f}")
+
+    if options.output:
+        with open(options.output, "wt") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        return compare(results, baseline, options.tolerance)
+
+    return 0
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=3,
+                        help="number of cold and of warm runs per module")
+
+    parser.add_argument("--sizes", action="store", default="8,64,512",
+                        help="comma-separated numbers of functions in"
+                        " each synthetic client module")
+
+    parser.add_argument("--python", action="store",
+                        default=sys.executable,
+                        help="python interpreter to run mypy with")
+
+    parser.add_argument("--pyright", action="store", default="pyright",
+                        help="pyright executable")
+
+    parser.add_argument("--output", action="store", default=None,
+                        help="save the results as JSON")
+
+    parser.add_argument("--baseline", action="store", default=None,
+                        help="JSON results of an earlier run to compare"
+                        " against")
+
+    parser.add_argument("--tolerance", action="store", type=float,
+                        default=0.25,
+                        help="fraction a measurement may exceed its"
+                        " baseline by (default: 0.25)")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        regressions = cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -0,0 +1,75 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Synthetic koji results shared by the benchmark scripts
+
+These approximate the shape and value distribution of real hub
+results, with a limited number of distinct package names, owners, and
+arches, and unique IDs, NVRs, and checksums.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+__all__ = (
+    "synthetic_archive",
+    "synthetic_build",
+    "synthetic_rpm",
+)
+
+
+def synthetic_build(i):
+    return {
+        "build_id": i, "id": i, "name": f"pkg{i % 5000}",
+        "version": "1.0", "release": f"{i}.el9", "epoch": None,
+        "nvr": f"pkg{i % 5000}-1.0-{i}.el9", "cg_id": None,
+        "cg_name": None, "completion_time": "2024-01-01 00:00:00",
+        "completion_ts": 1704067200.0 + i, "creation_event_id": i,
+        "creation_time": "2024-01-01 00:00:00",
+        "creation_ts": 1704067200.0 + i, "draft": False, "extra": None,
+        "owner_id": i % 50, "owner_name": "someone",
+        "package_id": i % 5000, "package_name": f"pkg{i % 5000}",
+        "source": None, "start_time": "2024-01-01 00:00:00",
+        "start_ts": 1704067200.0 + i, "state": 1, "task_id": i,
+        "volume_id": 0, "volume_name": "DEFAULT",
+        "tag_id": 1, "tag_name": "some-tag",
+    }
+
+
+def synthetic_rpm(i):
+    return {
+        "arch": "x86_64", "name": f"pkg{i % 5000}", "release": f"{i}.el9",
+        "version": "1.0", "build_id": i // 8, "buildroot_id": i // 8,
+        "buildtime": 1704067200 + i, "epoch": None,
+        "external_repo_id": 0, "external_repo_name": "INTERNAL",
+        "extra": None, "id": i, "metadata_only": False,
+        "nvr": f"pkg{i % 5000}-1.0-{i}.el9",
+        "payloadhash": f"{i:032x}", "size": 4096 + i,
+    }
+
+
+def synthetic_archive(i):
+    return {
+        "btype": "image", "btype_id": 4, "build_id": i // 4,
+        "buildroot_id": i // 4, "checksum": f"{i:064x}",
+        "checksum_type": 2, "extra": None, "filename": f"image-{i}.qcow2",
+        "id": i, "metadata_only": False, "size": 1 << 30,
+        "type_description": "QCOW2 image", "type_extensions": "qcow2",
+        "type_id": 9, "type_name": "qcow2", "arch": "x86_64",
+    }
+
+
+# The end.
@@ -0,0 +1,216 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Latest builds benchmark
+
+Finds the latest builds of every tag in the inheritance of a few base
+tags of a synthetic tag hierarchy served by a local stand-in hub,
+first with one ``getLatestBuilds`` call per tag, and then locally via
+`koji_types.tagged.TagBuildIndex`, from a single ``listTagged``
+snapshot of each base tag, and again from a ``listTagged`` of each
+tag without inheritance. Then looks up the latest build of every
+package of every tag from the index.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/tagged.py -n 10``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from inheritance import synthetic_links
+from koji_types.inheritance import InheritanceGraph
+from koji_types.tagged import TagBuildIndex
+from synthetic import synthetic_build
+
+
+def synthetic_tagged(tag, per_tag, packages):
+    found = []
+    for k in range(per_tag):
+        pkg = (tag * 7 + k) % packages
+        bld = synthetic_build(tag * per_tag + k + 1)
+        bld.update(tag_id=tag, tag_name=f"tag-{tag}", package_id=pkg,
+                   package_name=f"pkg{pkg}", name=f"pkg{pkg}",
+                   nvr=f"pkg{pkg}-1.0-{bld['id']}.el9",
+                   draft=bld["id"] % 9 == 0)
+        found.append(bld)
+    # most recently tagged first
+    found.reverse()
+    return found
+
+
+def synthetic_packages(tag, packages):
+    # every package is listed in the root tag, with some blocked, and
+    # some tags unblock one of them again
+    if tag == 0:
+        listed = [(pkg, pkg % 25 == 0) for pkg in range(packages)]
+    elif tag % 100 == 0:
+        listed = [((tag // 100 * 25) % packages, False)]
+    else:
+        return []
+    return [{"package_id": pkg, "package_name": f"pkg{pkg}",
+             "blocked": blocked, "extra_arches": "", "owner_id": 1,
+             "owner_name": "someone", "tag_id": tag,
+             "tag_name": f"tag-{tag}"} for pkg, blocked in listed]
+
+
+def register(hub, options):
+    graph = InheritanceGraph(1000)
+    full = TagBuildIndex(graph)
+    for tag in range(options.tags):
+        graph.update(tag, synthetic_links(tag, options.tags))
+        graph.add_name(f"tag-{tag}", tag)
+        full.set_tagged(tag, synthetic_tagged(tag, options.per_tag,
+                                              options.packages))
+        full.set_packages(tag, synthetic_packages(tag, options.packages))
+
+    def getInheritanceData(tag, event=None):
+        return graph.parents(tag)
+
+    def getTag(tag, strict=False, event=None, blocked=False):
+        tag_id = graph.resolve(tag)
+        return {"id": tag_id, "name": f"tag-{tag_id}"}
+
+    def listTagged(tag, event=None, inherit=False, prefix=None,
+                   latest=False, package=None, owner=None, type=None,
+                   strict=True, extra=False, draft=None):
+        return full.list_tagged(tag, inherit=inherit, latest=latest,
+                                package=package, draft=draft)
+
+    def getLatestBuilds(tag, event=None, package=None, type=None,
+                        draft=None):
+        return full.latest_builds(tag, package=package, draft=draft)
+
+    def listPackages(tagID=None, userID=None, pkgID=None, prefix=None,
+                     inherited=False, with_dups=False, event=None,
+                     queryOpts=None, with_owners=True, with_blocked=True):
+        if inherited:
+            return list(full.package_list(tagID).values())
+        return full._packages[tagID]
+
+    hub.register("getInheritanceData", getInheritanceData)
+    hub.register("getTag", getTag)
+    hub.register("listTagged", listTagged)
+    hub.register("getLatestBuilds", getLatestBuilds)
+    hub.register("listPackages", listPackages)
+
+
+def by_id(builds):
+    # the order of builds across packages is not preserved when
+    # snapshots overlap, so compare them in a fixed order
+    return sorted(builds, key=lambda bld: bld["id"])
+
+
+def cli(options):
+    bases = range(options.tags - options.count, options.tags)
+
+    with StandInHub(latency=options.latency) as hub:
+        register(hub, options)
+        session = ClientSession(hub.url)
+
+        print(f"{'scenario':<12} {'seconds':>9} {'requests':>9}")
+
+        def report(label, start, before):
+            print(f"{label:<12} {perf_counter() - start:>9.3f}"
+                  f" {hub.requests - before:>9}")
+
+        before, start = hub.requests, perf_counter()
+        index = TagBuildIndex.load(session, bases, size=options.size)
+        tags = index.tags()
+        found = [by_id(index.latest_builds(tag)) for tag in tags]
+        report("inherited", start, before)
+
+        before, start = hub.requests, perf_counter()
+        index = TagBuildIndex.load(session, bases, size=options.size,
+                                   inherit=False)
+        if [by_id(index.latest_builds(tag)) for tag in tags] != found:
+            print("results differ!")
+            return 1
+        report("per tag", start, before)
+
+        before, start = hub.requests, perf_counter()
+        expected = [by_id(session.getLatestBuilds(tag)) for tag in tags]
+        report("hub", start, before)
+
+        if found != expected:
+            print("results differ!")
+            return 1
+
+        before, start = hub.requests, perf_counter()
+        for tag in tags:
+            for pkg in range(options.packages):
+                index.latest_build(tag, f"pkg{pkg}")
+        report("lookups", start, before)
+        print(f"{len(tags)} tags")
+
+    return 0
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=10,
+                        help="number of base tags")
+
+    parser.add_argument("--tags", action="store", type=int, default=1000,
+                        help="number of tags in the hierarchy")
+
+    parser.add_argument("--per-tag", action="store", type=int, default=50,
+                        help="number of builds tagged into each tag")
+
+    parser.add_argument("--packages", action="store", type=int,
+                        default=500,
+                        help="number of distinct packages")
+
+    parser.add_argument("--size", action="store", type=int, default=100,
+                        help="number of calls in each multicall")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        return cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
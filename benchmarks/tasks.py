@@ -0,0 +1,229 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Task watching benchmark
+
+Serves a synthetic build task from a local stand-in hub, which spawns
+its ``buildArch`` subtasks over the first quarter of its run and
+finishes once they all have. Watches it to completion with
+``koji_cli.lib.watch_tasks``, then again with a
+`koji_types.tasks.TaskTreeWatcher`, and compares the number of
+requests each needed.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/tasks.py -n 400``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from time import perf_counter, time
+from xmlrpc.client import Fault
+
+from koji import ClientSession
+from koji_cli.lib import watch_tasks
+
+from hub import StandInHub
+from koji_types.tasks import TaskTreeWatcher
+
+
+class SyntheticTasks:
+    """
+    A build task with ID 1 and count buildArch subtasks, whose states
+    follow the time since `start` was called. Every subtask with an ID
+    divisible by ``fail`` fails, and so does the build.
+    """
+
+    def __init__(self, hub, count, duration, fail=0):
+        self.hub = hub
+        self.count = count
+        self.duration = duration
+        self.fail = fail
+        self.started = 0.0
+
+        hub.register("getTaskInfo", self.getTaskInfo)
+        hub.register("getTaskChildren", self.getTaskChildren)
+        hub.register("getTaskDescendents", self.getTaskDescendents)
+        hub.register("getTaskResult", self.getTaskResult)
+        hub.register("listTasks", self.listTasks)
+
+    def start(self):
+        self.started = time()
+
+    def _created(self, task_id):
+        if task_id == 1:
+            return 0.0
+        return self.duration * 0.25 * (task_id - 1) / self.count
+
+    def _finished(self, task_id):
+        if task_id == 1:
+            return max(self._finished(i) for i in range(2, self.count + 2))
+        spread = ((task_id * 7919) % self.count) / self.count
+        return self._created(task_id) + self.duration * 0.5 * (1 + spread)
+
+    def _failed(self, task_id):
+        if task_id == 1:
+            return any(self._failed(i) for i in range(2, self.count + 2))
+        return bool(self.fail) and task_id % self.fail == 0
+
+    def _exists(self, task_id):
+        return (1 <= task_id <= self.count + 1 and
+                self._created(task_id) <= time() - self.started)
+
+    def _info(self, task_id):
+        elapsed = time() - self.started
+        if elapsed < self._finished(task_id):
+            state = 1
+        elif self._failed(task_id):
+            state = 5
+        else:
+            state = 2
+
+        if task_id == 1:
+            method, parent, arch = "build", None, "noarch"
+            request = ["git+https://example.com/pkg.git#abc", "f40", {}]
+        else:
+            method, parent, arch = "buildArch", 1, f"arch{task_id}"
+            request = ["pkg-1.0-1.src.rpm", 1, arch, False, {}]
+
+        return {
+            "arch": arch,
+            "create_ts": self.started + self._created(task_id),
+            "host_id": None,
+            "id": task_id,
+            "label": None,
+            "method": method,
+            "parent": parent,
+            "request": request,
+            "state": state,
+        }
+
+    def getTaskInfo(self, task_id, request=False, strict=False):
+        if isinstance(task_id, list):
+            return [self.getTaskInfo(t, request, strict) for t in task_id]
+        return self._info(task_id) if self._exists(task_id) else None
+
+    def getTaskChildren(self, task_id, request=False, strict=False):
+        if task_id != 1:
+            return []
+        return [self._info(t) for t in range(2, self.count + 2)
+                if self._exists(t)]
+
+    def getTaskDescendents(self, task_id, request=False):
+        found = {str(task_id): self.getTaskChildren(task_id)}
+        for child in found[str(task_id)]:
+            found[str(child["id"])] = []
+        return found
+
+    def getTaskResult(self, taskId, raise_fault=True):
+        if self._info(taskId)["state"] == 5:
+            raise Fault(1000, f"task {taskId} failed")
+        return None
+
+    def listTasks(self, opts=None, queryOpts=None):
+        opts = opts or {}
+        parents = opts.get("parent") or []
+        after = opts.get("createdAfter") or 0.0
+        if 1 not in parents:
+            return []
+        return [info for info in self.getTaskChildren(1)
+                if info["create_ts"] > after]
+
+
+def cli(options):
+    with StandInHub(latency=options.latency) as hub:
+        tasks = SyntheticTasks(hub, options.count, options.duration,
+                               options.fail)
+        session = ClientSession(hub.url)
+
+        print(f"{'scenario':<16} {'seconds':>9} {'requests':>9}"
+              f" {'tasks':>9} {'success':>9}")
+
+        def report(label, start, before, count, success):
+            print(f"{label:<16} {perf_counter() - start:>9.3f}"
+                  f" {hub.requests - before:>9} {count:>9} {success!s:>9}")
+
+        tasks.start()
+        before, start = hub.requests, perf_counter()
+        rv = watch_tasks(session, [1], quiet=True,
+                         poll_interval=options.interval)
+        report("watch_tasks", start, before, options.count + 1, rv == 0)
+
+        tasks.start()
+        before, start = hub.requests, perf_counter()
+        watcher = TaskTreeWatcher(session, [1], interval=options.interval,
+                                  max_interval=options.interval * 4)
+        for _changes in watcher.watch():
+            pass
+        failures = [task.get_failure() for task in watcher.failed()]
+        report("tree watcher", start, before, len(watcher.tasks),
+               watcher.is_success())
+        if failures:
+            print(f"{len(failures)} failed, eg. {failures[0]}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=200,
+                        help="number of buildArch subtasks")
+
+    parser.add_argument("--duration", action="store", type=float,
+                        default=20.0,
+                        help="seconds the build task runs for")
+
+    parser.add_argument("--interval", action="store", type=float,
+                        default=2.0,
+                        help="seconds between polls")
+
+    parser.add_argument("--fail", action="store", type=int, default=0,
+                        help="fail every subtask whose ID is divisible"
+                        " by this")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
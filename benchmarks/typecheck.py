@@ -0,0 +1,253 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+mypy benchmark for the generated session protocols
+
+Type-checks a small sample client against the stubs and protocols of
+this working tree, and optionally against those of an earlier git
+revision. Each is checked cold (with an empty mypy cache) and warm
+(with the cache from a previous run). The time mypy spent
+processing the ``koji_types.protocols`` modules is taken from its
+``--timing-stats`` output. The ``countOnly`` call of the sample is
+left out for revisions which predate those overloads.
+
+Run from the top of the repository, eg.
+``python3 benchmarks/typecheck.py -n 5 --compare HEAD~1``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from io import BytesIO
+from os import symlink
+from os.path import abspath, join
+from statistics import median
+from subprocess import PIPE, run
+from tarfile import open as open_tar
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+TREE_DIRS = (
+    ("koji", "koji-stubs"),
+    ("koji_cli", "koji_cli-stubs"),
+    ("koji_types", "koji_types"),
+)
+
+
+SAMPLE = '''
+from koji import ClientSession
+from koji_types import BuildInfo, TagInfo, TaskID
+from typing import List, Optional
+
+
+def latest(session: ClientSession, tag: str) -> List[str]:
+    return [bld["nvr"] for bld in session.listTagged(tag, latest=True)]
+
+
+def find(session: ClientSession, nvr: str) -> Optional[BuildInfo]:
+    return session.getBuild(nvr)
+
+
+def parents(session: ClientSession, tag: str) -> List[str]:
+    return [link["name"] for link in session.getFullInheritance(tag)]
+
+
+def tags(session: ClientSession,
+         names: List[str]) -> List[Optional[TagInfo]]:
+    with session.multicall(strict=True) as mc:
+        calls = [mc.getTag(name, strict=True) for name in names]
+    return [call.result for call in calls]
+
+
+def children(session: ClientSession, task_id: TaskID) -> int:
+    return len(session.getTaskChildren(task_id))
+
+
+def hosts(session: ClientSession) -> List[str]:
+    return [host["name"] for host in session.listHosts(enabled=True)]
+
+
+def whoami(session: ClientSession) -> str:
+    return session.getLoggedInUser()["name"]
+'''
+
+
+# only checked against trees whose protocols have the countOnly
+# overloads, which earlier revisions lack
+COUNT_SAMPLE = '''
+
+def counts(session: ClientSession) -> int:
+    return session.listBuilds(queryOpts={"countOnly": True})
+'''
+
+
+def extract_ref(ref, dest):
+    """
+    Extract the stubs and koji_types package from a git revision
+    into dest
+    """
+
+    proc = run(["git", "archive", ref] + [d for _n, d in TREE_DIRS],
+               stdout=PIPE, check=True)
+    with open_tar(fileobj=BytesIO(proc.stdout)) as tar:
+        tar.extractall(dest)
+
+
+def has_count_overloads(root):
+    """
+    Whether the koji_types package from root declares the countOnly
+    query options used by the overloads of its protocols
+    """
+
+    with open(join(root, "koji_types", "__init__.py")) as f:
+        return "class CountOnlyOptions(" in f.read()
+
+
+def prepare(root, work):
+    """
+    Create a search path in work with each of the packages from root
+    under the name it's imported as, and the sample client
+    """
+
+    for name, dirname in TREE_DIRS:
+        symlink(abspath(join(root, dirname)), join(work, name))
+
+    sample = join(work, "sample.py")
+    with open(sample, "wt") as f:
+        f.write(SAMPLE)
+        if has_count_overloads(root):
+            f.write(COUNT_SAMPLE)
+    return sample
+
+
+def protocols_time(filename):
+    """
+    Sum the microseconds mypy spent on the koji_types.protocols
+    modules, from its timing stats output
+    """
+
+    total = 0
+    with open(filename) as f:
+        for line in f:
+            name, micros = line.split()
+            if name == "koji_types.protocols" or \
+               name.startswith("koji_types.protocols."):
+                total += int(micros)
+    return total
+
+
+def check(python, work, sample, cache_dir):
+    stats = join(work, "timing-stats.txt")
+    cmd = [python, "-m", "mypy", "--config-file", "/dev/null",
+           "--cache-dir", cache_dir, "--timing-stats", stats, sample]
+
+    start = perf_counter()
+    proc = run(cmd, cwd=work, env={"MYPYPATH": work}, stdout=PIPE,
+               stderr=PIPE, universal_newlines=True)
+    elapsed = perf_counter() - start
+
+    if proc.returncode:
+        raise Exception(f"mypy failed:\n{proc.stdout}{proc.stderr}")
+
+    return elapsed, protocols_time(stats)
+
+
+def measure(python, root, count):
+    with TemporaryDirectory() as work:
+        sample = prepare(root, work)
+
+        cold = []
+        for index in range(count):
+            cold.append(check(python, work, sample,
+                              join(work, f"cold-{index}")))
+
+        warm = []
+        for _ in range(count):
+            warm.append(check(python, work, sample, join(work, "cold-0")))
+
+    return cold, warm
+
+
+def report(label, cold, warm):
+    print(f"{label:<20}"
+          f" {median(t for t, _p in cold):>10.3f}"
+          f" {median(p for _t, p in cold) / 1000:>14.1f}"
+          f" {median(t for t, _p in warm):>10.3f}")
+
+
+def cli(options):
+    print(f"{'tree':<20} {'cold s':>10} {'protocols ms':>14}"
+          f" {'warm s':>10}")
+
+    if options.compare:
+        with TemporaryDirectory() as older:
+            extract_ref(options.compare, older)
+            counted = has_count_overloads(older)
+            cold, warm = measure(options.python, older, options.count)
+        report(options.compare, cold, warm)
+        if not counted:
+            print(f"({options.compare} lacks the countOnly overloads,"
+                  f" so its sample omits counts)")
+
+    cold, warm = measure(options.python, ".", options.count)
+    report("working tree", cold, warm)
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=3,
+                        help="number of cold and of warm runs per tree")
+
+    parser.add_argument("--compare", action="store", default=None,
+                        help="git revision to compare the working tree"
+                        " against")
+
+    parser.add_argument("--python", action="store",
+                        default=sys.executable,
+                        help="python interpreter to run mypy with")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -0,0 +1,153 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Upload benchmark
+
+Uploads a set of files to a local stand-in hub, first one after
+another with ``ClientSession.fastUpload``, and then with a
+`koji_types.upload.ChunkedUploader`, both memory-mapped and reading
+into a reused buffer. Finally truncates the hub's copy of one file
+and uploads it again, so that the upload is resumed.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/upload.py -n 8 --size 64``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import os
+import sys
+
+from argparse import ArgumentParser
+from os.path import basename, join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from koji import ClientSession
+
+from hub import StandInHub
+from koji_types.upload import ChunkedUploader
+
+
+MIB = 1024 * 1024
+
+
+def create_files(where, count, size):
+    block = os.urandom(MIB)
+    found = []
+    for index in range(count):
+        filename = join(where, f"output-{index}.img")
+        with open(filename, "wb") as fo:
+            for part in range(size):
+                # vary each block so no two files or blocks are alike
+                fo.write(part.to_bytes(4, "big") + index.to_bytes(4, "big"))
+                fo.write(block[8:])
+        found.append(filename)
+    return found
+
+
+def cli(options):
+    with TemporaryDirectory() as local, TemporaryDirectory() as remote, \
+            StandInHub(latency=options.latency, uploads=remote) as hub:
+
+        files = create_files(local, options.count, options.size)
+        total = options.count * options.size
+
+        sinfo = {"session-id": 1, "session-key": "key", "header-auth": True}
+        session = ClientSession(hub.url, sinfo=sinfo)
+
+        print(f"{'scenario':<16} {'seconds':>9} {'requests':>9}"
+              f" {'MiB/s':>9}")
+
+        def report(label, start, before, mib):
+            elapsed = perf_counter() - start
+            print(f"{label:<16} {elapsed:>9.3f}"
+                  f" {hub.requests - before:>9} {mib / elapsed:>9.1f}")
+
+        before, start = hub.requests, perf_counter()
+        for filename in files:
+            session.fastUpload(filename, "fast", overwrite=True)
+        report("fastUpload", start, before, total)
+
+        for label, use_mmap in (("chunked mmap", True),
+                                ("chunked buffer", False)):
+            uploader = ChunkedUploader(session, workers=options.workers,
+                                       chunk_size=options.chunk * MIB,
+                                       use_mmap=use_mmap)
+            before, start = hub.requests, perf_counter()
+            uploader.upload_all(((fn, label) for fn in files),
+                                overwrite=True, resume=False)
+            report(label, start, before, total)
+
+        # leave only the first 60% of one file on the hub, as though
+        # its upload had been interrupted
+        filename = files[0]
+        partial = join(remote, "chunked mmap", basename(filename))
+        os.truncate(partial, int(options.size * MIB * 0.6))
+
+        before, start = hub.requests, perf_counter()
+        result = uploader.upload(filename, "chunked mmap")
+        report("resumed", start, before, options.size)
+        print(f"resumed from {result.resumed} of {result.size} bytes")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=8,
+                        help="number of files to upload")
+
+    parser.add_argument("--size", action="store", type=int, default=64,
+                        help="size of each file in MiB")
+
+    parser.add_argument("--chunk", action="store", type=int, default=8,
+                        help="chunk size of the uploader in MiB")
+
+    parser.add_argument("--workers", action="store", type=int, default=4,
+                        help="number of files uploaded at once")
+
+    parser.add_argument("--latency", action="store", type=float,
+                        default=0.01,
+                        help="simulated seconds of latency per request")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Throughput benchmark for koji_types.validate
+
+Reports the per-record cost of validating synthetic ``listTagged``,
+``listRPMs``, and ``listArchives`` results, with and without
+coercion. Each measurement uses freshly generated rows, as coercion
+modifies the rows in-place.
+
+Run from the top of the repository, eg.
+``PYTHONPATH=. python3 benchmarks/validate.py -n 100000``
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sys
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from koji_types import ArchiveInfo, RPMInfo, TagBuildInfo
+from koji_types.validate import ValidationError, validate_all, validator
+from synthetic import synthetic_archive, synthetic_build, synthetic_rpm
+
+
+SCENARIOS = (
+    ("TagBuildInfo", synthetic_build, TagBuildInfo),
+    ("RPMInfo", synthetic_rpm, RPMInfo),
+    ("ArchiveInfo", synthetic_archive, ArchiveInfo),
+)
+
+MODES = (
+    ("coerce", {"coerce": True}),
+    ("check only", {"coerce": False}),
+)
+
+
+def check_unhashable():
+    """
+    Confirms that a list or dict in an enumeration field is rejected
+    with a `ValidationError`, rather than failing its lookup
+    """
+
+    for value in ([1], {"state": 1}):
+        for _mode, kwds in MODES:
+            row = synthetic_build(1)
+            row["state"] = value
+            try:
+                validator(TagBuildInfo, **kwds)(row)
+            except ValidationError:
+                continue
+            raise AssertionError(f"state of {value!r} was not rejected")
+
+
+def cli(options):
+    count = options.count
+    check_unhashable()
+
+    print(f"{'type':<14} {'mode':<12} {'compile us':>11} {'us/row':>8}")
+
+    for label, synth, schema in SCENARIOS:
+        for mode, kwds in MODES:
+            start = perf_counter()
+            validator(schema, **kwds)
+            compiled = perf_counter() - start
+
+            rows = [synth(i) for i in range(count)]
+            start = perf_counter()
+            validate_all(schema, rows, **kwds)
+            elapsed = perf_counter() - start
+
+            print(f"{label:<14} {mode:<12} {compiled * 1e6:>11.1f}"
+                  f" {elapsed / count * 1e6:>8.3f}")
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("-n", "--count", action="store", type=int,
+                        default=100000,
+                        help="number of synthetic rows per type")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -240,6 +240,7 @@ class ClientSession(ClientSessionProtocol):
     authtype: Optional[str]
     baseurl: str
     exclusive: bool
+    logged_in: bool
     logger: Logger
     multicall: MultiCallHack
     opts: Dict[str, Any]
@@ -272,7 +272,7 @@ class adler32_constructor:
     def hexdigest(self) -> str:
         ...
 
-    def update(self, arg: Union[bytes, str]) -> None:
+    def update(self, arg: Union[bytes, bytearray, memoryview, str]) -> None:
         ...
 
 
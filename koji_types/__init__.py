@@ -23,20 +23,23 @@ enumerations
 """
 
 
+import sys
+
 from datetime import datetime
-from enum import IntEnum
-from koji import (
-    AUTHTYPES, BR_STATES, BR_TYPES, BUILD_STATES, CHECKSUM_TYPES,
-    DEP_CONFLICT, DEP_ENHANCE, DEP_OBSOLETE, DEP_PROVIDE, DEP_RECOMMEND,
-    DEP_REQUIRE, DEP_SUGGEST, DEP_SUPPLEMENT,
-    REPO_STATES, RPM_SIGTAG_DSA, RPM_SIGTAG_GPG, RPM_SIGTAG_MD5,
-    RPM_SIGTAG_PGP, RPM_SIGTAG_RSA, TASK_STATES, USERTYPES, USER_STATUS,
-    ClientSession, PathInfo, )
-from optparse import Values
 from typing import (
-    Any, Callable, Dict, Generic, Iterable, List, NewType, Optional,
-    Tuple, TypeVar, Union, )
-from typing_extensions import TypeAlias, TypedDict
+    TYPE_CHECKING, Any, Dict, List, NewType, Optional, Tuple, Union, )
+from typing_extensions import Literal, TypedDict
+
+from ._enums import (
+    AuthType, AuthTypeValue, BuildrootState, BuildrootStateValue,
+    BuildrootType, BuildrootTypeValue, BuildState, BuildStateValue,
+    ChecksumType, ChecksumTypeValue, RepoState, RepoStateValue,
+    RPMDepType, RPMDepTypeValue, RPMSigTag, RPMSigTagValue, TaskState,
+    TaskStateValue, UserStatus, UserStatusValue, UserType, UserTypeValue, )
+
+
+if TYPE_CHECKING:
+    from ._deferred import GOptions
 
 
 __all__ = (
@@ -56,6 +59,7 @@ __all__ = (
     "BuildrootState",
     "BuildrootType",
     "BuildState",
+    "BuildTargetConfigHistory",
     "BuildSpecifier",
     "BTypeID",
     "BTypeInfo",
@@ -66,6 +70,7 @@ __all__ = (
     "CGID",
     "CGInfo",
     "CGInitInfo",
+    "CountOnlyOptions",
     "CLIHandler",
     "CLIProtocol",
     "ExternalRepoID",
@@ -75,6 +80,7 @@ __all__ = (
     "FilterOptions",
     "GOptions",
     "HistoryEntry",
+    "HistoryRecord",
     "HostID",
     "HostInfo",
     "Identifier",
@@ -107,14 +113,17 @@ __all__ = (
     "TagExternalRepos",
     "TagID",
     "TagInfo",
+    "TagListingHistory",
     "TagInheritance",
     "TagInheritanceEntry",
+    "TagInheritanceHistory",
     "TagGroupID",
     "TagGroupInfo",
     "TagGroupPackage",
     "TagGroupReq",
     "TagPackageInfo",
     "TagPackageSimple",
+    "TagPackagesHistory",
     "TargetID",
     "TargetInfo",
     "TaskID",
@@ -124,6 +133,7 @@ __all__ = (
     "UserGroup",
     "UserID",
     "UserInfo",
+    "UserPermsHistory",
     "UserStatus",
     "UserType",
     "WinInfo",
@@ -171,191 +181,6 @@ class NamedID(TypedDict):
     name: str
 
 
-class AuthType(IntEnum):
-    """
-    Authentication method types
-
-    See `koji.AUTHTYPES`
-    """
-
-    GSSAPI = AUTHTYPES['GSSAPI']
-    """ user authenticated via GSSAPI """
-
-    KERB = AUTHTYPES['KERBEROS']
-    """ user authenticated via a Kerberos ticket """
-
-    NORMAL = AUTHTYPES['NORMAL']
-    """ user authenticated via password """
-
-    SSL = AUTHTYPES['SSL']
-    """ user authenticated via an SSL certificate """
-
-
-AuthTypeValue: TypeAlias = Union[AuthType, int]
-
-
-class BuildrootState(IntEnum):
-    """
-    Values for a BuildrootInfo's br_state
-
-    See `koji.BR_STATES`
-    """
-
-    INIT = BR_STATES['INIT']
-    WAITING = BR_STATES['WAITING']
-    BUILDING = BR_STATES['BUILDING']
-    EXPIRED = BR_STATES['EXPIRED']
-
-
-BuildrootStateValue: TypeAlias = Union[BuildrootState, int]
-
-
-class BuildrootType(IntEnum):
-    """
-    Values for a BuildrootInfo's br_type
-
-    See `koji.BR_TYPES`
-    """
-
-    STANDARD = BR_TYPES['STANDARD']
-    EXTERNAL = BR_TYPES['EXTERNAL']
-
-
-BuildrootTypeValue: TypeAlias = Union[BuildrootType, int]
-
-
-class BuildState(IntEnum):
-    """
-    Values for a BuildInfo's state.
-
-    See `koji.BUILD_STATES`
-    """
-
-    BUILDING = BUILD_STATES["BUILDING"]
-    """
-    The build is still in-progress
-    """
-
-    COMPLETE = BUILD_STATES["COMPLETE"]
-    """
-    The build has been completed successfully
-    """
-
-    DELETED = BUILD_STATES["DELETED"]
-    """
-    The build has been deleted
-    """
-
-    FAILED = BUILD_STATES["FAILED"]
-    """
-    The build did not complete successfully due to an error
-    """
-
-    CANCELED = BUILD_STATES["CANCELED"]
-    """
-    The build did not complete successfully due to cancelation
-    """
-
-
-BuildStateValue: TypeAlias = Union[BuildState, int]
-
-
-class ChecksumType(IntEnum):
-    """
-    Supported checksum types
-    """
-
-    MD5 = CHECKSUM_TYPES['md5']
-    SHA1 = CHECKSUM_TYPES['sha1']
-    SHA256 = CHECKSUM_TYPES['sha256']
-
-
-ChecksumTypeValue: TypeAlias = Union[ChecksumType, int]
-
-
-class RepoState(IntEnum):
-    INIT = REPO_STATES['INIT']
-    READY = REPO_STATES['READY']
-    EXPIRED = REPO_STATES['DELETED']
-    PROBLEM = REPO_STATES['PROBLEM']
-
-
-RepoStateValue: TypeAlias = Union[RepoState, int]
-
-
-class RPMDepType(IntEnum):
-    CONFLICT = DEP_CONFLICT
-    ENHANCE = DEP_ENHANCE
-    OBSOLETE = DEP_OBSOLETE
-    PROVIDE = DEP_PROVIDE
-    RECOMMEND = DEP_RECOMMEND
-    REQUIRE = DEP_REQUIRE
-    SUGGEST = DEP_SUGGEST
-    SUPPLEMENT = DEP_SUPPLEMENT
-
-
-RPMDepTypeValue: TypeAlias = Union[RPMDepType, int]
-
-
-class RPMSigTag(IntEnum):
-    DSA = RPM_SIGTAG_DSA
-    GPG = RPM_SIGTAG_GPG
-    MD5 = RPM_SIGTAG_MD5
-    PGP = RPM_SIGTAG_PGP
-    RSA = RPM_SIGTAG_RSA
-
-
-RPMSigTagValue: TypeAlias = Union[RPMSigTag, int]
-
-
-class TaskState(IntEnum):
-    FREE = TASK_STATES['FREE']
-    OPEN = TASK_STATES['OPEN']
-    CLOSED = TASK_STATES['CLOSED']
-    CANCELED = TASK_STATES['CANCELED']
-    ASSIGNED = TASK_STATES['ASSIGNED']
-    FAILED = TASK_STATES['FAILED']
-
-
-TaskStateValue: TypeAlias = Union[TaskState, int]
-
-
-class UserStatus(IntEnum):
-    """
-    Valid values for the ``'status'`` item of a `UserInfo` dict
-    """
-
-    NORMAL = USER_STATUS['NORMAL']
-    """ account is enabled """
-
-    BLOCKED = USER_STATUS['BLOCKED']
-    """
-    account is blocked. May not call XMLRPC endpoints requiring
-    authentication
-    """
-
-
-UserStatusValue: TypeAlias = Union[UserStatus, int]
-
-
-class UserType(IntEnum):
-    """
-    Valid values for the ``'usertype'`` item of a `UserInfo` dict
-    """
-
-    NORMAL = USERTYPES['NORMAL']
-    """ Account is a normal user """
-
-    HOST = USERTYPES['HOST']
-    """ Account is a build host """
-
-    GROUP = USERTYPES['GROUP']
-    """ Account is a group """
-
-
-UserTypeValue: TypeAlias = Union[UserType, int]
-
-
 class ArchiveInfo(TypedDict):
     """
     Data representing a koji archive. These are typically obtained via
@@ -1257,40 +1082,154 @@ class SearchResult(TypedDict):
     """ result name """
 
 
-class GOptions(Values):
+HistoryEntry = Tuple[int, str, bool, Data]
+
+
+class HistoryRecord(TypedDict):
     """
-    Represents the koji client configuration options as provided by the
-    baseline koji CLI.
+    The fields common to every entry returned by the ``queryHistory``
+    XMLRPC call, describing when the entry was created and, if it has
+    been, when it was revoked
+    """
+
+    active: Optional[bool]
+    """ True if the entry has not been revoked, otherwise None """
+
+    create_event: EventID
+    """ the event at which the entry was created """
+
+    create_ts: float
+    """ UTC timestamp of the create event """
+
+    creator_id: UserID
+    """ the user that created the entry """
+
+    creator_name: str
+    """ the name of the user that created the entry """
+
+    revoke_event: Optional[EventID]
+    """ the event at which the entry was revoked, or None if it is
+    still active """
+
+    revoke_ts: Optional[float]
+    """ UTC timestamp of the revoke event """
+
+    revoker_id: Optional[UserID]
+    """ the user that revoked the entry """
+
+    revoker_name: Optional[str]
+    """ the name of the user that revoked the entry """
+
 
-    `Values` instances with these fields are fed to a `CLIHandler`
+_TagListingNames = TypedDict("_TagListingNames", {
+    "build.state": BuildState,
+    "tag.name": str,
+})
 
-    Returned by the ``get_options`` function from within the koji CLI
-    utility, which cannot be imported normally. Default values for
-    these are pulled from the profile configuration if unspecified as
-    base CLI arguments.
+
+class TagListingHistory(_TagListingNames, HistoryRecord):
+    """
+    A ``tag_listing`` entry from ``queryHistory``, representing a
+    build being tagged into (and possibly later untagged from) a tag
     """
 
-    authtype: str
-    cert: Optional[str]
-    debug: bool
-    force_auth: bool
-    keytab: Optional[str]
-    noauth: bool
-    password: Optional[str]
-    plugin_paths: Optional[str]
-    principal: Optional[str]
-    profile: str
-    quiet: bool
-    runas: Optional[str]
-    server: str
-    skip_main: bool
-    topdir: str
-    topurl: str
-    user: str
-    weburl: str
+    build_id: BuildID
+    """ the tagged build """
+
+    epoch: Optional[int]
+    """ the build's epoch """
 
+    name: str
+    """ the build's package name """
+
+    release: str
+    """ the build's release """
+
+    tag_id: TagID
+    """ the tag the build was tagged into """
+
+    version: str
+    """ the build's version """
+
+
+_TagInheritanceNames = TypedDict("_TagInheritanceNames", {
+    "parent.name": str,
+    "tag.name": str,
+})
+
+
+class TagInheritanceHistory(_TagInheritanceNames, HistoryRecord):
+    """
+    A ``tag_inheritance`` entry from ``queryHistory``, representing a
+    single inheritance link as it was configured between its create
+    and revoke events. Changing any setting of a link revokes the old
+    entry and creates a new one.
+    """
+
+    intransitive: bool
+    maxdepth: Optional[int]
+    noconfig: bool
+
+    parent_id: TagID
+    """ the parent tag of the link """
+
+    pkg_filter: str
+    priority: int
+
+    tag_id: TagID
+    """ the child tag of the link """
+
+
+_TagPackagesNames = TypedDict("_TagPackagesNames", {
+    "package.name": str,
+    "tag.name": str,
+})
+
+
+class TagPackagesHistory(_TagPackagesNames, HistoryRecord):
+    """
+    A ``tag_packages`` entry from ``queryHistory``, representing a
+    package listing or block on a tag
+    """
+
+    blocked: bool
+    extra_arches: Optional[str]
+    package_id: PackageID
+    tag_id: TagID
 
-HistoryEntry = Tuple[int, str, bool, Data]
+
+_BuildTargetConfigNames = TypedDict("_BuildTargetConfigNames", {
+    "build_tag.name": str,
+    "build_target.name": str,
+    "dest_tag.name": str,
+})
+
+
+class BuildTargetConfigHistory(_BuildTargetConfigNames, HistoryRecord):
+    """
+    A ``build_target_config`` entry from ``queryHistory``,
+    representing the build and destination tags of a target
+    """
+
+    build_tag: TagID
+    build_target_id: TargetID
+    dest_tag: TagID
+
+
+_UserPermsNames = TypedDict("_UserPermsNames", {
+    "permission.name": str,
+    "user.name": str,
+})
+
+
+class UserPermsHistory(_UserPermsNames, HistoryRecord):
+    """
+    A ``user_perms`` entry from ``queryHistory``, representing a
+    permission granted to a user
+    """
+
+    perm_id: PermID
+    user_id: UserID
 
 
 class QueryOptions(TypedDict, total=False):
@@ -1307,6 +1246,24 @@ class QueryOptions(TypedDict, total=False):
     offset: int
 
 
+class _CountOnlyOptions(TypedDict, total=False):
+    asList: bool
+    group: str
+    limit: int
+    order: str
+    offset: int
+
+
+class CountOnlyOptions(_CountOnlyOptions):
+    """
+    A `QueryOptions` which requests only the count of the results,
+    rather than the results themselves. API calls given these options
+    return an int.
+    """
+
+    countOnly: Literal[True]
+
+
 class FilterOptions(TypedDict, total=False):
     """
     the ``filterOpts`` argument for for ``filterResults`` and
@@ -1423,4 +1380,48 @@ class RPMDepInfo(TypedDict):
     type: RPMDepType
 
 
+_DEFERRED = frozenset((
+    "GOptions",
+))
+"""
+Names which are provided by the `koji_types._deferred` module, and
+which are only loaded on first access
+"""
+
+
+def _load_deferred() -> None:
+    """
+    Imports the `koji_types._deferred` module (and therefore optparse)
+    and copies its definitions into this module's namespace, so that any
+    further access to them will not need to go through `__getattr__`
+    """
+
+    from . import _deferred
+
+    found = globals()
+    for name in _DEFERRED:
+        found[name] = getattr(_deferred, name)
+
+
+if sys.version_info < (3, 7):
+    # no PEP-562 support, so we have to pay the cost up-front
+    _load_deferred()
+
+elif not TYPE_CHECKING:
+    # hidden from static analysis, which already sees the deferred
+    # names via the import above, and which would otherwise treat
+    # any unknown attribute of this module as Any
+
+    def __getattr__(name: str) -> Any:
+        if name in _DEFERRED:
+            _load_deferred()
+            return globals()[name]
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+    def __dir__():
+        return sorted(set(globals()).union(_DEFERRED))
+
+
 # The end.
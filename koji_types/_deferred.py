@@ -0,0 +1,71 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - deferred definitions
+
+`GOptions` subclasses optparse's `Values`, and is only needed by koji
+CLI plugins. The top-level `koji_types` package does not import this
+module until it is first accessed, so that code which only needs the
+TypedDict and NewType declarations for its annotations does not pay
+for importing optparse.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from optparse import Values
+from typing import Optional
+
+
+__all__ = (
+    "GOptions",
+)
+
+
+class GOptions(Values):
+    """
+    Represents the koji client configuration options as provided by the
+    baseline koji CLI.
+
+    `Values` instances with these fields are fed to a `CLIHandler`
+
+    Returned by the ``get_options`` function from within the koji CLI
+    utility, which cannot be imported normally. Default values for
+    these are pulled from the profile configuration if unspecified as
+    base CLI arguments.
+    """
+
+    authtype: str
+    cert: Optional[str]
+    debug: bool
+    force_auth: bool
+    keytab: Optional[str]
+    noauth: bool
+    password: Optional[str]
+    plugin_paths: Optional[str]
+    principal: Optional[str]
+    profile: str
+    quiet: bool
+    runas: Optional[str]
+    server: str
+    skip_main: bool
+    topdir: str
+    topurl: str
+    user: str
+    weburl: str
+
+
+# The end.
@@ -0,0 +1,324 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - enumerations
+
+IntEnums for the state and type values of the koji hub's records. The
+values are those of the matching constants in the koji package (eg.
+`koji.BUILD_STATES`), but are declared literally here, so that
+importing these does not also import koji. They are imported eagerly
+by `koji_types`, so that the TypedDict declarations which refer to
+them can have their hints resolved by `typing.get_type_hints`.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from collections import Counter
+from enum import IntEnum
+from operator import itemgetter
+from types import MappingProxyType
+from typing import (
+    Any, Dict, Iterable, List, Mapping, Optional, Type, TypeVar, Union, )
+from typing_extensions import TypeAlias
+
+
+__all__ = (
+    "AuthType",
+    "AuthTypeValue",
+    "BuildrootState",
+    "BuildrootStateValue",
+    "BuildrootType",
+    "BuildrootTypeValue",
+    "BuildState",
+    "BuildStateValue",
+    "ChecksumType",
+    "ChecksumTypeValue",
+    "RepoState",
+    "RepoStateValue",
+    "RPMDepType",
+    "RPMDepTypeValue",
+    "RPMSigTag",
+    "RPMSigTagValue",
+    "TaskState",
+    "TaskStateValue",
+    "UserStatus",
+    "UserStatusValue",
+    "UserType",
+    "UserTypeValue",
+)
+
+
+E = TypeVar("E", bound="BulkIntEnum")
+
+
+class BulkIntEnum(IntEnum):
+    """
+    An IntEnum with additional class methods for converting many values
+    at once. Calling the enumeration per value (eg. ``BuildState(1)``)
+    goes through the enum metaclass each time, whereas these use a
+    single value-to-member table.
+    """
+
+    @classmethod
+    def value_map(cls: Type[E]) -> Mapping[int, E]:
+        """
+        A read-only mapping of each value to its enumeration member
+        """
+
+        return MappingProxyType(cls._value2member_map_)  # type: ignore
+
+
+    @classmethod
+    def from_values(cls: Type[E], values: Iterable[int]) -> List[E]:
+        """
+        Convert a sequence of values (eg. a list, or an `array.array`)
+        into a list of enumeration members
+
+        :raises ValueError: if any value is not valid for this
+          enumeration
+        """
+
+        table = cls._value2member_map_
+        try:
+            return list(map(table.__getitem__, values))  # type: ignore
+
+        except KeyError as ke:
+            raise ValueError(f"{ke.args[0]!r} is not a valid"
+                             f" {cls.__name__}") from None
+
+
+    @classmethod
+    def count_by_state(
+            cls: Type[E],
+            values: Iterable[Any],
+            key: Optional[str] = None) -> Dict[E, int]:
+        """
+        Count the occurrences of each enumeration member in values. Every
+        member is present in the result, even if its count is zero.
+
+        :param values: the values to count
+
+        :param key: if specified, values is instead a sequence of dicts
+          (eg. the results of ``listBuilds``) and the value to count is
+          taken from this key of each
+
+        :raises ValueError: if any value is not valid for this
+          enumeration
+        """
+
+        if key is not None:
+            values = map(itemgetter(key), values)
+
+        table = cls._value2member_map_
+        found: Dict[E, int] = dict.fromkeys(cls, 0)
+
+        for value, count in Counter(values).items():
+            member = table.get(value)
+            if member is None:
+                raise ValueError(f"{value!r} is not a valid {cls.__name__}")
+            found[member] += count  # type: ignore
+
+        return found
+
+
+
+class AuthType(BulkIntEnum):
+    """
+    Authentication method types
+
+    See `koji.AUTHTYPES`
+    """
+
+    GSSAPI = 3
+    """ user authenticated via GSSAPI """
+
+    KERB = 1
+    """ user authenticated via a Kerberos ticket """
+
+    NORMAL = 0
+    """ user authenticated via password """
+
+    SSL = 2
+    """ user authenticated via an SSL certificate """
+
+
+AuthTypeValue: TypeAlias = Union[AuthType, int]
+
+
+class BuildrootState(BulkIntEnum):
+    """
+    Values for a BuildrootInfo's br_state
+
+    See `koji.BR_STATES`
+    """
+
+    INIT = 0
+    WAITING = 1
+    BUILDING = 2
+    EXPIRED = 3
+
+
+BuildrootStateValue: TypeAlias = Union[BuildrootState, int]
+
+
+class BuildrootType(BulkIntEnum):
+    """
+    Values for a BuildrootInfo's br_type
+
+    See `koji.BR_TYPES`
+    """
+
+    STANDARD = 0
+    EXTERNAL = 1
+
+
+BuildrootTypeValue: TypeAlias = Union[BuildrootType, int]
+
+
+class BuildState(BulkIntEnum):
+    """
+    Values for a BuildInfo's state.
+
+    See `koji.BUILD_STATES`
+    """
+
+    BUILDING = 0
+    """
+    The build is still in-progress
+    """
+
+    COMPLETE = 1
+    """
+    The build has been completed successfully
+    """
+
+    DELETED = 2
+    """
+    The build has been deleted
+    """
+
+    FAILED = 3
+    """
+    The build did not complete successfully due to an error
+    """
+
+    CANCELED = 4
+    """
+    The build did not complete successfully due to cancelation
+    """
+
+
+BuildStateValue: TypeAlias = Union[BuildState, int]
+
+
+class ChecksumType(BulkIntEnum):
+    """
+    Supported checksum types
+    """
+
+    MD5 = 0
+    SHA1 = 1
+    SHA256 = 2
+
+
+ChecksumTypeValue: TypeAlias = Union[ChecksumType, int]
+
+
+class RepoState(BulkIntEnum):
+    INIT = 0
+    READY = 1
+    EXPIRED = 3
+    PROBLEM = 4
+
+
+RepoStateValue: TypeAlias = Union[RepoState, int]
+
+
+class RPMDepType(BulkIntEnum):
+    CONFLICT = 3
+    ENHANCE = 5
+    OBSOLETE = 2
+    PROVIDE = 1
+    RECOMMEND = 7
+    REQUIRE = 0
+    SUGGEST = 4
+    SUPPLEMENT = 6
+
+
+RPMDepTypeValue: TypeAlias = Union[RPMDepType, int]
+
+
+class RPMSigTag(BulkIntEnum):
+    DSA = 267
+    GPG = 1005
+    MD5 = 1004
+    PGP = 1002
+    RSA = 268
+
+
+RPMSigTagValue: TypeAlias = Union[RPMSigTag, int]
+
+
+class TaskState(BulkIntEnum):
+    FREE = 0
+    OPEN = 1
+    CLOSED = 2
+    CANCELED = 3
+    ASSIGNED = 4
+    FAILED = 5
+
+
+TaskStateValue: TypeAlias = Union[TaskState, int]
+
+
+class UserStatus(BulkIntEnum):
+    """
+    Valid values for the ``'status'`` item of a `UserInfo` dict
+    """
+
+    NORMAL = 0
+    """ account is enabled """
+
+    BLOCKED = 1
+    """
+    account is blocked. May not call XMLRPC endpoints requiring
+    authentication
+    """
+
+
+UserStatusValue: TypeAlias = Union[UserStatus, int]
+
+
+class UserType(BulkIntEnum):
+    """
+    Valid values for the ``'usertype'`` item of a `UserInfo` dict
+    """
+
+    NORMAL = 0
+    """ Account is a normal user """
+
+    HOST = 1
+    """ Account is a build host """
+
+    GROUP = 2
+    """ Account is a group """
+
+
+UserTypeValue: TypeAlias = Union[UserType, int]
+
+
+# The end.
@@ -0,0 +1,452 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - asyncio client session
+
+A minimal asyncio adapter for making koji hub calls without a thread
+per in-flight call. The calls are sent over a small pool of keep-alive
+HTTP connections using asyncio streams, and are encoded and decoded
+using koji's own XML-RPC marshalling.
+
+::
+
+    async with AsyncClientSession(baseurl) as session:
+        tag, builds = await asyncio.gather(
+            session.getTag("f40-build"),
+            session.listTagged("f40-build", latest=True))
+
+During static analysis the session provides every hub method from the
+`koji_types.protocols.AsyncClientSession` protocol, each returning an
+`Awaitable` of its declared result type.
+
+This adapter is intended for anonymous, read-only calls such as
+polling. It does not implement any of the login methods, though it
+will send the session headers when created via
+`AsyncClientSession.from_session`. Hubs which still enforce the
+ordering of the call number of a session may reject concurrent
+authenticated calls.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import asyncio
+import ssl
+
+from koji import GenericError, convertFault, encode_args
+from koji.xmlrpcplus import Fault, dumps, getparser
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, )
+from urllib.parse import urlencode, urlsplit
+
+from .protocols import AsyncClientSession as AsyncClientSessionProtocol
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+
+
+__all__ = (
+    "AsyncClientSession",
+    "ConnectionPool",
+)
+
+
+_CHUNK = 1 << 16
+
+
+class _Connection:
+
+    __slots__ = ("reader", "writer", )
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def usable(self) -> bool:
+        return not (self.writer.transport.is_closing() or
+                    self.reader.at_eof())
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """
+    A bounded pool of keep-alive HTTP/1.1 connections to a single
+    host, for posting requests via asyncio streams.
+    """
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            ssl_context: Optional[ssl.SSLContext] = None,
+            limit: int = 10):
+
+        if limit < 1:
+            raise ValueError(f"invalid connection limit {limit!r}")
+
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.limit = limit
+
+        self._idle: List[_Connection] = []
+
+        # created on first use, so that it belongs to the running loop
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context,
+            limit=_CHUNK)
+        return _Connection(reader, writer)
+
+    def _checkout(self) -> Optional[_Connection]:
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.usable():
+                return conn
+            conn.close()
+        return None
+
+    async def post(
+            self,
+            path: str,
+            headers: List[Tuple[str, str]],
+            body: bytes,
+            feed: Callable[[bytes], Any],
+            accept: Optional[Callable[[int], bool]] = None) -> Tuple[
+                int, str, Dict[str, str]]:
+        """
+        Post body to path, passing each chunk of the response body to
+        feed as it arrives. Returns the response status, reason, and
+        headers (with lower-cased names).
+
+        :param accept: if specified, called with the status of the
+          response. The body of a response which it rejects is read
+          and discarded, rather than passed to feed.
+        """
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.limit)
+
+        async with self._slots:
+            conn = self._checkout()
+            if conn is not None:
+                try:
+                    return await self._exchange(
+                        conn, path, headers, body, feed, accept)
+                except _StaleConnection:
+                    # the hub closed this idle connection before we
+                    # sent our request. Try again with a fresh one.
+                    pass
+
+            # the hub may have run the call before resetting a fresh
+            # connection, so the request is not sent again
+            conn = await self._connect()
+            try:
+                return await self._exchange(
+                    conn, path, headers, body, feed, accept)
+            except _StaleConnection as sc:
+                raise ConnectionError(str(sc)) from None
+
+    async def _exchange(self, conn, path, headers, body, feed, accept):
+        reuse = False
+        answered = False
+        try:
+            request = [f"POST {path} HTTP/1.1",
+                       f"Host: {self.host}:{self.port}",
+                       f"Content-Length: {len(body)}"]
+            request.extend(f"{k}: {v}" for k, v in headers)
+            request.append("\r\n")
+
+            conn.writer.write("\r\n".join(request).encode("latin-1"))
+            conn.writer.write(body)
+            await conn.writer.drain()
+
+            status_line = await conn.reader.readline()
+            if not status_line:
+                raise _StaleConnection("connection closed by hub")
+            answered = True
+
+            version, status, reason = _parse_status(status_line)
+            response = await _read_headers(conn.reader)
+
+            if accept is not None and not accept(status):
+                feed = _discard
+            await _read_body(conn.reader, response, feed)
+
+            reuse = (version == "HTTP/1.1" and
+                     response.get("connection", "").lower() != "close")
+            return status, reason, response
+
+        except (ConnectionResetError, BrokenPipeError):
+            if answered:
+                # some of the response may have been fed already, so
+                # the request cannot be sent again
+                raise
+            raise _StaleConnection("connection reset by hub") from None
+
+        finally:
+            if reuse:
+                self._idle.append(conn)
+            else:
+                conn.close()
+
+    async def close(self):
+        """
+        Close all idle connections
+        """
+
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class _StaleConnection(Exception):
+    pass
+
+
+def _discard(chunk: bytes) -> None:
+    pass
+
+
+def _parse_status(line: bytes) -> Tuple[str, int, str]:
+    parts = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    if len(parts) < 2:
+        raise GenericError(f"malformed HTTP status line {line!r}")
+
+    version = parts[0]
+    status = int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ""
+    return version, status, reason
+
+
+async def _read_headers(reader) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+
+async def _read_body(reader, headers, feed):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0], 16)
+            if size == 0:
+                # discard any trailers
+                await _read_headers(reader)
+                return
+            while size:
+                chunk = await reader.read(min(size, _CHUNK))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(chunk, size)
+                size -= len(chunk)
+                feed(chunk)
+            await reader.readexactly(2)
+
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            chunk = await reader.read(min(remaining, _CHUNK))
+            if not chunk:
+                raise asyncio.IncompleteReadError(chunk, remaining)
+            remaining -= len(chunk)
+            feed(chunk)
+
+    else:
+        # read until the hub closes the connection
+        while True:
+            chunk = await reader.read(_CHUNK)
+            if not chunk:
+                headers["connection"] = "close"
+                return
+            feed(chunk)
+
+
+def _ssl_context(opts: Dict[str, Any]) -> ssl.SSLContext:
+    serverca = opts.get("serverca")
+    if serverca:
+        return ssl.create_default_context(cafile=serverca)
+
+    context = ssl.create_default_context()
+    if opts.get("no_ssl_verify"):
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class _AsyncMethod:
+
+    __slots__ = ("_session", "_name", )
+
+    def __init__(self, session: "AsyncClientSession", name: str):
+        self._session = session
+        self._name = name
+
+    def __getattr__(self, name: str) -> "_AsyncMethod":
+        # supports the host namespace, eg. session.host.getID()
+        return _AsyncMethod(self._session, f"{self._name}.{name}")
+
+    def __call__(self, *args, **kwds):
+        return self._session.callMethod(self._name, *args, **kwds)
+
+    def __repr__(self):
+        return f"<_AsyncMethod {self._name}>"
+
+
+class AsyncClientSession(AsyncClientSessionProtocol):
+    """
+    An asyncio session for making calls against a koji hub. Any hub
+    method may be invoked as an attribute of the session, and the
+    result awaited.
+
+    :param baseurl: the hub URL, as with `koji.ClientSession`
+
+    :param opts: session options. The ``serverca``, ``no_ssl_verify``
+      and ``timeout`` options are honoured.
+
+    :param sinfo: optional session info, as from `koji.ClientSession`
+
+    :param max_connections: the size of the connection pool, and hence
+      the maximum number of concurrent in-flight calls
+    """
+
+    def __init__(
+            self,
+            baseurl: str,
+            opts: Optional[Dict[str, Any]] = None,
+            sinfo: Optional[Dict[str, Any]] = None,
+            max_connections: int = 10):
+
+        self.baseurl = baseurl
+        self.opts = dict(opts or ())
+        self.sinfo = sinfo
+        self.callnum = 0
+
+        url = urlsplit(baseurl)
+        if url.scheme == "https":
+            context: Optional[ssl.SSLContext] = _ssl_context(self.opts)
+            port = url.port or 443
+        elif url.scheme == "http":
+            context = None
+            port = url.port or 80
+        else:
+            raise ValueError(f"unsupported hub URL {baseurl!r}")
+
+        self._path = url.path or "/"
+        self._pool = ConnectionPool(url.hostname or "localhost", port,
+                                    ssl_context=context,
+                                    limit=max_connections)
+
+    @classmethod
+    def from_session(
+            cls,
+            session: "ClientSession",
+            max_connections: int = 10) -> "AsyncClientSession":
+        """
+        Create an asyncio session sharing the hub URL, options, and
+        any session info of an existing `koji.ClientSession`
+        """
+
+        found = cls(session.baseurl, session.opts,
+                    getattr(session, "sinfo", None),
+                    max_connections=max_connections)
+        found.callnum = getattr(session, "callnum", None) or 0
+        return found
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _AsyncMethod(self, name)
+
+    def _prep(self, name, args, kwds):
+        path = self._path
+        headers = [("User-Agent", "koji/1"),
+                   ("Content-Type", "text/xml")]
+
+        sinfo = self.sinfo
+        if sinfo is not None:
+            callnum = self.callnum
+            self.callnum += 1
+            headers.extend((
+                ("Koji-Session-Id", str(sinfo["session-id"])),
+                ("Koji-Session-Key", str(sinfo["session-key"])),
+                ("Koji-Session-Callnum", str(callnum)), ))
+
+            if not sinfo.get("header-auth"):
+                # older hubs only accept the session info in the query
+                query = dict(sinfo, callnum=callnum)
+                path = f"{path}?{urlencode(query)}"
+
+        body = dumps(encode_args(*args, **kwds), name, allow_none=1)
+        return path, headers, body.encode("utf-8")
+
+    async def callMethod(self, name: str, *args, **kwds) -> Any:
+        """
+        Invoke the named hub method, returning its result
+        """
+
+        path, headers, body = self._prep(name, args, kwds)
+        parser, unmarshaller = getparser()
+
+        # the body of an error response is typically HTML or plain
+        # text rather than XML-RPC, so only a 200 is parsed
+        call = self._pool.post(path, headers, body, parser.feed,
+                               accept=lambda status: status == 200)
+
+        timeout = self.opts.get("timeout")
+        if timeout:
+            status, reason, _ = await asyncio.wait_for(call, timeout)
+        else:
+            status, reason, _ = await call
+
+        if status != 200:
+            raise GenericError(f"{status} {reason} for {self.baseurl}")
+
+        parser.close()
+        try:
+            result = unmarshaller.close()
+        except Fault as fault:
+            raise convertFault(fault) from None
+
+        if len(result) == 1:
+            result = result[0]
+        return result
+
+    async def close(self):
+        """
+        Close the pooled connections
+        """
+
+        await self._pool.close()
+
+    async def __aenter__(self) -> "AsyncClientSession":
+        return self
+
+    async def __aexit__(self, _tp, _tv, _tb) -> bool:
+        await self.close()
+        return False
+
+
+# The end.
@@ -0,0 +1,502 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - result caching
+
+Declares which hub calls may have their results cached, and provides
+a read-through caching wrapper for a `koji.ClientSession` which uses
+those declarations.
+
+Each method of the `ClientSession` protocol has one of three
+`Cacheability` values. Methods not listed in `CACHEABILITY` are
+considered `Cacheability.VOLATILE`, and are never cached.
+
+* `Cacheability.IMMUTABLE` methods return the same result every time
+  once that result has reached some final state, eg. ``getBuild`` for
+  a build which is complete. Whether a particular result has reached
+  that state is decided by the method's ``final`` check.
+
+* `Cacheability.EVENT` methods accept an ``event`` argument, and when
+  one is given they describe the state of the hub as of that event,
+  which can never change afterwards.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sqlite3
+
+from collections import OrderedDict
+from enum import Enum
+from hashlib import sha256
+from json import dumps as json_dumps, loads as json_loads
+from threading import Lock
+from time import time
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, NamedTuple, Optional, Tuple, )
+from xmlrpc.client import dumps, loads
+from zlib import compress, decompress
+
+from .protocols import ClientSession as ClientSessionProtocol
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+
+
+__all__ = (
+    "CACHEABILITY",
+    "CacheBackend",
+    "CacheInfo",
+    "Cacheability",
+    "CachingSession",
+    "MethodCaching",
+    "SQLiteBackend",
+    "cache_key",
+    "cacheability",
+    "decode_result",
+    "encode_result",
+    "event_argument",
+)
+
+
+class Cacheability(Enum):
+    """
+    How the results of a hub method may be cached
+    """
+
+    VOLATILE = "volatile"
+    """
+    results may change at any time, and must never be cached
+    """
+
+    IMMUTABLE = "immutable"
+    """
+    results never change once they have reached a final state
+    """
+
+    EVENT = "event"
+    """
+    results never change when pinned to an event via the ``event``
+    argument, and are volatile otherwise
+    """
+
+
+FinalCheck = Callable[[Tuple[Any, ...], Dict[str, Any], Any], bool]
+
+
+class MethodCaching(NamedTuple):
+    """
+    The cacheability declaration for a single hub method
+    """
+
+    cacheability: Cacheability
+
+    final: Optional[FinalCheck] = None
+    """
+    for `Cacheability.IMMUTABLE` methods, a check given the positional
+    args, keyword args, and result of a call, which decides whether
+    the result has reached its final state. When None, every result is
+    final.
+    """
+
+    event_index: Optional[int] = None
+    """
+    for `Cacheability.EVENT` methods, the position of the ``event``
+    parameter when it is given positionally
+    """
+
+
+def _not_none(args, kwds, result) -> bool:
+    return result is not None
+
+
+def _not_empty(args, kwds, result) -> bool:
+    return bool(result)
+
+
+def _build_final(args, kwds, result) -> bool:
+    # a complete build only changes if it is deleted or has its volume
+    # moved, and draft builds are renamed when they are promoted
+    return (result is not None and
+            result["state"] == 1 and  # BuildState.COMPLETE
+            not result.get("draft"))
+
+
+def _task_final(args, kwds, result) -> bool:
+    # TaskState CLOSED, CANCELED, FAILED
+    if isinstance(result, list):
+        return all(t is not None and t["state"] in (2, 3, 5)
+                   for t in result)
+    return result is not None and result["state"] in (2, 3, 5)
+
+
+def _of_build(args, kwds, result) -> bool:
+    # the archives and RPMs of a build are only imported when the
+    # build completes, so a non-empty list for a build won't change
+    if args:
+        build = args[0]
+    else:
+        build = kwds.get("buildID", kwds.get("build"))
+    return build is not None and bool(result)
+
+
+_I = Cacheability.IMMUTABLE
+_E = Cacheability.EVENT
+
+
+CACHEABILITY: Dict[str, MethodCaching] = {
+    "getAllArches": MethodCaching(_I),
+    "getArchive": MethodCaching(_I, _not_none),
+    "getArchiveFile": MethodCaching(_I, _not_none),
+    "getArchiveType": MethodCaching(_I, _not_none),
+    "getArchiveTypes": MethodCaching(_I),
+    "getBuild": MethodCaching(_I, _build_final),
+    "getBuildConfig": MethodCaching(_E, event_index=1),
+    "getBuildTarget": MethodCaching(_E, event_index=1),
+    "getBuildTargets": MethodCaching(_E, event_index=1),
+    "getChangelogEntries": MethodCaching(_I, _not_empty),
+    "getEvent": MethodCaching(_I, _not_none),
+    "getExternalRepo": MethodCaching(_E, event_index=2),
+    "getExternalRepoList": MethodCaching(_E, event_index=1),
+    "getFullInheritance": MethodCaching(_E, event_index=1),
+    "getHost": MethodCaching(_E, event_index=2),
+    "getImageArchive": MethodCaching(_I, _not_none),
+    "getInheritanceData": MethodCaching(_E, event_index=1),
+    "getLatestBuilds": MethodCaching(_E, event_index=1),
+    "getLatestMavenArchives": MethodCaching(_E, event_index=1),
+    "getLatestRPMS": MethodCaching(_E, event_index=3),
+    "getMavenArchive": MethodCaching(_I, _not_none),
+    "getPackageConfig": MethodCaching(_E, event_index=2),
+    "getRPM": MethodCaching(_I, _not_none),
+    "getRPMDeps": MethodCaching(_I, _not_empty),
+    "getRPMFile": MethodCaching(_I, _not_none),
+    "getRPMHeaders": MethodCaching(_I, _not_empty),
+    "getTag": MethodCaching(_E, event_index=2),
+    "getTagExternalRepos": MethodCaching(_E, event_index=2),
+    "getTagGroups": MethodCaching(_E, event_index=1),
+    "getTaskInfo": MethodCaching(_I, _task_final),
+    "getTaskRequest": MethodCaching(_I),
+    "getTaskResult": MethodCaching(_I),
+    "getWinArchive": MethodCaching(_I, _not_none),
+    "listArchiveFiles": MethodCaching(_I, _not_empty),
+    "listArchives": MethodCaching(_I, _of_build),
+    "listBTypes": MethodCaching(_I),
+    "listBuildRPMs": MethodCaching(_I, _of_build),
+    "listChannels": MethodCaching(_E, event_index=1),
+    "listExternalRepos": MethodCaching(_E, event_index=2),
+    "listPackages": MethodCaching(_E, event_index=6),
+    "listRPMFiles": MethodCaching(_I, _not_empty),
+    "listRPMs": MethodCaching(_I, _of_build),
+    "listTagged": MethodCaching(_E, event_index=1),
+    "listTaggedArchives": MethodCaching(_E, event_index=1),
+    "listTaggedRPMS": MethodCaching(_E, event_index=1),
+}
+"""
+The cacheability of the hub methods which may be cached, by name
+"""
+
+
+_VOLATILE = MethodCaching(Cacheability.VOLATILE)
+
+
+def cacheability(method: str) -> MethodCaching:
+    """
+    The cacheability declaration for the named hub method
+    """
+
+    return CACHEABILITY.get(method, _VOLATILE)
+
+
+def event_argument(
+        method: str,
+        args: Tuple[Any, ...],
+        kwds: Dict[str, Any]) -> Optional[int]:
+    """
+    The event given to a call of an event-scoped method, or None if
+    the method is not event-scoped or no event was given
+    """
+
+    found = cacheability(method)
+    if found.event_index is None:
+        return None
+    if len(args) > found.event_index:
+        return args[found.event_index]
+    return kwds.get("event")
+
+
+def cache_key(
+        method: str,
+        args: Tuple[Any, ...],
+        kwds: Dict[str, Any]) -> str:
+    """
+    A stable string identifying a call's method and arguments
+    """
+
+    return json_dumps([method, args, kwds], sort_keys=True,
+                      separators=(",", ":"), default=repr)
+
+
+def encode_result(result: Any) -> bytes:
+    """
+    Encode a result for compact storage. Most results are stored as
+    compressed JSON, which is far quicker to decode than XML-RPC.
+    Results which JSON cannot represent exactly, such as those with
+    binary values or integer dict keys, are instead stored as a
+    compressed XML-RPC response, so that anything the hub could have
+    sent is stored without loss.
+    """
+
+    try:
+        data = json_dumps(result, separators=(",", ":"))
+    except (TypeError, ValueError):
+        pass
+    else:
+        if json_loads(data) == result:
+            return b"J" + compress(data.encode("utf-8"))
+
+    data = dumps((result, ), methodresponse=True, allow_none=True)
+    return b"X" + compress(data.encode("utf-8"))
+
+
+def decode_result(data: bytes) -> Any:
+    """
+    Decode a result stored via `encode_result`
+    """
+
+    form = data[:1]
+    if form == b"J":
+        return json_loads(decompress(data[1:]))
+    elif form == b"X":
+        return loads(decompress(data[1:]), use_builtin_types=True)[0][0]
+    else:
+        raise ValueError(f"unknown result encoding {form!r}")
+
+
+class CacheBackend:
+    """
+    Interface for a persistent store of encoded results, used beneath
+    the in-memory cache of a `CachingSession`
+    """
+
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """
+        The time stored and encoded result for key, or None
+        """
+
+        raise NotImplementedError()
+
+    def set(self, key: str, stored: float, data: bytes) -> None:
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Stores encoded results in a single SQLite database file
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._lock = Lock()
+        self._db = sqlite3.connect(filename, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS results ("
+                             " key BLOB PRIMARY KEY,"
+                             " stored REAL NOT NULL,"
+                             " data BLOB NOT NULL)")
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return sha256(key.encode("utf-8")).digest()
+
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT stored, data FROM results WHERE key = ?",
+                (self._digest(key), ))
+            return cur.fetchone()
+
+    def set(self, key: str, stored: float, data: bytes) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                (self._digest(key), stored, data))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _CachedMethod:
+
+    __slots__ = ("_session", "_name", )
+
+    def __init__(self, session: "CachingSession", name: str):
+        self._session = session
+        self._name = name
+
+    def __call__(self, *args, **kwds):
+        return self._session.callMethod(self._name, *args, **kwds)
+
+    def __repr__(self):
+        return f"<_CachedMethod {self._name}>"
+
+
+class CachingSession(ClientSessionProtocol):
+    """
+    Wraps a `koji.ClientSession`, caching the results of calls to any
+    method which `CACHEABILITY` declares as immutable, or as
+    event-scoped when an event is given. All other calls and
+    attributes are passed through to the wrapped session unchanged.
+
+    Cached results are shared between callers, and so must not be
+    modified.
+
+    :param session: the session to wrap
+
+    :param maxsize: the number of results held in memory, with the
+      least recently used evicted first
+
+    :param ttl: optional number of seconds after which a cached result
+      is discarded. Useful to bound the staleness of the rare changes
+      to immutable results, such as a build being deleted.
+
+    :param backend: optional persistent store, consulted when a
+      result is not in memory
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            maxsize: int = 10000,
+            ttl: Optional[float] = None,
+            backend: Optional[CacheBackend] = None):
+
+        self.session = session
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+
+        self._lock = Lock()
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __getattr__(self, name: str) -> Any:
+        if cacheability(name).cacheability is Cacheability.VOLATILE:
+            return getattr(self.session, name)
+        return _CachedMethod(self, name)
+
+    def _cacheable(self, name, args, kwds) -> bool:
+        found = cacheability(name)
+        if found.cacheability is Cacheability.IMMUTABLE:
+            return True
+        elif found.cacheability is Cacheability.EVENT:
+            return event_argument(name, args, kwds) is not None
+        else:
+            return False
+
+    def _lookup(self, key: str, now: float) -> Tuple[bool, Any]:
+        ttl = self.ttl
+        memory = self._memory
+
+        with self._lock:
+            found = memory.get(key)
+            if found is not None:
+                if ttl is None or now - found[0] < ttl:
+                    memory.move_to_end(key)
+                    self._hits += 1
+                    return True, found[1]
+                del memory[key]
+
+        if self.backend is not None:
+            stored = self.backend.get(key)
+            if stored is not None and (ttl is None or now - stored[0] < ttl):
+                result = decode_result(stored[1])
+                self._remember(key, stored[0], result)
+                with self._lock:
+                    self._hits += 1
+                return True, result
+
+        with self._lock:
+            self._misses += 1
+        return False, None
+
+    def _remember(self, key: str, stored: float, result: Any):
+        memory = self._memory
+        with self._lock:
+            memory[key] = (stored, result)
+            memory.move_to_end(key)
+            while len(memory) > self.maxsize:
+                memory.popitem(last=False)
+
+    def callMethod(self, name: str, *args, **kwds) -> Any:
+        """
+        Invoke the named hub method, using a cached result if one is
+        available
+        """
+
+        if not self._cacheable(name, args, kwds):
+            return self.session.callMethod(name, *args, **kwds)
+
+        key = cache_key(name, args, kwds)
+        now = time()
+
+        hit, result = self._lookup(key, now)
+        if hit:
+            return result
+
+        result = self.session.callMethod(name, *args, **kwds)
+
+        final = cacheability(name).final
+        if final is None or final(args, kwds, result):
+            self._remember(key, now, result)
+            if self.backend is not None:
+                self.backend.set(key, now, encode_result(result))
+
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Statistics for the in-memory cache, in the manner of
+        `functools.lru_cache`
+        """
+
+        with self._lock:
+            return CacheInfo(self._hits, self._misses,
+                             self.maxsize, len(self._memory))
+
+    def cache_clear(self) -> None:
+        """
+        Discard the in-memory cache. Any backend is unaffected.
+        """
+
+        with self._lock:
+            self._memory.clear()
+            self._hits = self._misses = 0
+
+
+# The end.
@@ -0,0 +1,728 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - columnar results
+
+A columnar container for large lists of result dicts, such as those
+from the ``listTagged`` or ``listRPMs`` calls. Rather than one dict per
+row, each key of the TypedDict schema is stored as a single column.
+Integer and float fields are stored in `array.array` instances, and
+the remaining fields are dictionary-encoded so that repeated values
+such as ``owner_name`` or ``arch`` are only held once.
+
+Whole-table operations such as `ColumnTable.filter` and
+`ColumnTable.sort` work on the columns directly, producing a new table
+without creating any per-row dicts.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from array import array
+from enum import IntEnum
+from itertools import compress
+from operator import itemgetter
+from typing import (
+    Any, Callable, Dict, ForwardRef, Generic, Iterable, Iterator, List,
+    Mapping, Optional, Sequence, Tuple, Type, TypeVar, Union, cast, )
+from typing_extensions import get_args, get_origin, is_typeddict
+
+
+__all__ = (
+    "Column",
+    "ColumnTable",
+    "DictColumn",
+    "FloatColumn",
+    "IntColumn",
+    "MISSING",
+    "ObjectColumn",
+    "RowView",
+    "column_kind",
+)
+
+
+T = TypeVar("T")
+C = TypeVar("C", bound="Column")
+
+
+class _Missing:
+    """
+    Marker for a row which did not have a value for a column
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<missing>"
+
+
+MISSING: Any = _Missing()
+
+
+_NUMERIC = (bool, int, float)
+
+
+def _nullsafe(value: Any) -> Tuple[int, Any]:
+    """
+    sorting key which places None and missing values last
+    """
+
+    if value is None or value is MISSING:
+        return (1, 0)
+    else:
+        return (0, value)
+
+
+class Column:
+    """
+    Base class for a single column of a `ColumnTable`
+    """
+
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def __getitem__(self, index: int) -> Any:
+        raise NotImplementedError()
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.__getitem__, range(len(self)))
+
+    def append(self, value: Any) -> None:
+        self.extend((value, ))
+
+    def extend(self, values: Sequence[Any]) -> None:
+        raise NotImplementedError()
+
+    def take(self: C, indices: Sequence[int]) -> C:
+        """
+        Produce a new column of the same type with the values at the
+        given indices, in that order
+        """
+
+        raise NotImplementedError()
+
+    def mask(self, predicate: Callable[[Any], bool]) -> Iterable[bool]:
+        """
+        Produce a truth value for each row, indicating whether the
+        predicate accepts its value
+        """
+
+        return map(predicate, self)
+
+    def sort_keys(self) -> Sequence[Any]:
+        """
+        Produce a value for each row which can be used to sort the rows
+        by this column
+        """
+
+        return list(map(_nullsafe, self))
+
+
+class ObjectColumn(Column):
+    """
+    A column holding arbitrary values in a list. Used for values which
+    are unhashable, such as the ``extra`` dicts.
+    """
+
+    __slots__ = ("_values", )
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self._values: List[Any] = list(values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def extend(self, values: Sequence[Any]) -> None:
+        self._values.extend(values)
+
+    def take(self, indices: Sequence[int]) -> "ObjectColumn":
+        return ObjectColumn(map(self._values.__getitem__, indices))
+
+
+class _ArrayColumn(Column):
+    """
+    A column of numbers held in an `array.array`. Values which cannot
+    be stored in the array (None, missing values, or values of the
+    wrong type) are stored in a sparse patch dict instead, with a zero
+    placeholder in the array.
+    """
+
+    __slots__ = ("_array", "_patch", )
+
+    typecode = "q"
+    accept: Tuple[type, ...] = (int, )
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self._array = array(self.typecode)
+        self._patch: Dict[int, Any] = {}
+        self.extend(list(values))
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, index: int) -> Any:
+        patch = self._patch
+        if patch and index in patch:
+            return patch[index]
+        return self._array[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._patch:
+            return super().__iter__()
+        return iter(self._array)
+
+    @property
+    def array(self) -> array:
+        """
+        The underlying array. Rows with patched values will hold a zero
+        """
+
+        return self._array
+
+    def extend(self, values: Sequence[Any]) -> None:
+        arr = self._array
+        accept = self.accept
+
+        # the common case, where everything fits and we can let the
+        # array do the conversion in a single call
+        if all(type(val) in accept for val in values):
+            try:
+                arr.extend(array(self.typecode, values))
+                return
+            except OverflowError:
+                pass
+
+        patch = self._patch
+        offset = len(arr)
+        for index, val in enumerate(values, offset):
+            if type(val) in accept:
+                try:
+                    arr.append(val)
+                    continue
+                except OverflowError:
+                    pass
+            arr.append(0)
+            patch[index] = val
+
+    def overpatched(self) -> bool:
+        """
+        True if so many values have been patched that the array is no
+        longer any benefit
+        """
+
+        return len(self._patch) > (len(self._array) // 2)
+
+    def take(self, indices: Sequence[int]) -> "_ArrayColumn":
+        col = type(self).__new__(type(self))
+        patch = self._patch
+
+        col._array = array(self.typecode,
+                           map(self._array.__getitem__, indices))
+        col._patch = {new: patch[old] for new, old in enumerate(indices)
+                      if old in patch} if patch else {}
+        return col
+
+    def mask(self, predicate: Callable[[Any], bool]) -> Iterable[bool]:
+        if self._patch:
+            return super().mask(predicate)
+        return map(predicate, self._array)
+
+    def sort_keys(self) -> Sequence[Any]:
+        if self._patch:
+            return super().sort_keys()
+        return self._array
+
+
+class IntColumn(_ArrayColumn):
+    """
+    A column of integers, such as IDs, sizes, and states
+    """
+
+    __slots__ = ()
+
+    typecode = "q"
+    accept = (int, )
+
+
+class FloatColumn(_ArrayColumn):
+    """
+    A column of floats, such as timestamps
+    """
+
+    __slots__ = ()
+
+    typecode = "d"
+    accept = (float, )
+
+
+class DictColumn(Column):
+    """
+    A dictionary-encoded column. Each distinct value is stored once, and
+    each row holds an index into the table of distinct values. This is
+    very effective for strings which repeat between rows, such as
+    names, arches, and tag names.
+    """
+
+    __slots__ = ("_codes", "_index", "_values", )
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self._codes = array("L")
+        self._index: Dict[Any, int] = {}
+        self._values: List[Any] = []
+        self.extend(list(values))
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._values[self._codes[index]]
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._values.__getitem__, self._codes)
+
+    @property
+    def codes(self) -> array:
+        """
+        the per-row indexes into `values`
+        """
+
+        return self._codes
+
+    @property
+    def values(self) -> List[Any]:
+        """
+        the distinct values of this column
+        """
+
+        return self._values
+
+    def _encode(self, value: Any) -> int:
+        # str is the overwhelmingly common case. Otherwise we include the
+        # type in the key, so that eg. True and 1 remain distinct
+        key = value if type(value) is str else (type(value), value)
+
+        code = self._index.get(key)
+        if code is None:
+            code = self._index[key] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def extend(self, values: Sequence[Any]) -> None:
+        # raises TypeError for unhashable values, in which case the
+        # codes are not extended at all
+        distinct = dict.fromkeys(values)
+
+        if any(type(val) in _NUMERIC for val in distinct):
+            # fromkeys will have merged eg. True and 1, so we must
+            # encode each value individually
+            codes = map(self._encode, values)
+
+        else:
+            # only the distinct values need encoding, then the per-row
+            # codes can be looked up from those
+            for val in distinct:
+                distinct[val] = self._encode(val)
+            codes = map(distinct.__getitem__, values)
+
+        self._codes.extend(array("L", codes))
+
+    def take(self, indices: Sequence[int]) -> "DictColumn":
+        col = DictColumn.__new__(DictColumn)
+        col._codes = array("L", map(self._codes.__getitem__, indices))
+
+        # the distinct values are shared rather than re-encoded, as the
+        # table is only ever appended to
+        col._index = self._index
+        col._values = self._values
+        return col
+
+    def mask(self, predicate: Callable[[Any], bool]) -> Iterable[bool]:
+        # the predicate is only invoked once per distinct value
+        accepted = list(map(predicate, self._values))
+        return map(accepted.__getitem__, self._codes)
+
+    def sort_keys(self) -> Sequence[Any]:
+        # rank each distinct value once, and then sort on the ranks
+        values = self._values
+        order = sorted(range(len(values)),
+                       key=lambda i: _nullsafe(values[i]))
+        ranks = [0] * len(values)
+        for rank, code in enumerate(order):
+            ranks[code] = rank
+        return list(map(ranks.__getitem__, self._codes))
+
+
+def column_kind(hint: Any) -> Type[Column]:
+    """
+    Determines the appropriate column type for a TypedDict field's
+    type annotation
+    """
+
+    # unwrap the NewType identifiers, down to their basic type
+    while hasattr(hint, "__supertype__"):
+        hint = hint.__supertype__
+
+    if isinstance(hint, ForwardRef):
+        hint = hint.__forward_arg__
+
+    if isinstance(hint, str):
+        return DictColumn
+
+    if hint is int or (isinstance(hint, type) and issubclass(hint, IntEnum)):
+        return IntColumn
+    elif hint is float:
+        return FloatColumn
+    elif hint in (dict, list, Any):
+        return ObjectColumn
+
+    origin = get_origin(hint)
+    if origin in (dict, list):
+        return ObjectColumn
+
+    elif origin is Union:
+        args = [a for a in get_args(hint) if a is not type(None)]
+        if len(args) == 1:
+            return column_kind(args[0])
+
+    return DictColumn
+
+
+class RowView(Mapping[str, Any]):
+    """
+    A read-only mapping over a single row of a `ColumnTable`. Keys for
+    which the originating dict had no value are omitted.
+    """
+
+    __slots__ = ("_columns", "_index", )
+
+    def __init__(self, columns: Dict[str, Column], index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        val = self._columns[key][self._index]
+        if val is MISSING:
+            raise KeyError(key)
+        return val
+
+    def __iter__(self) -> Iterator[str]:
+        index = self._index
+        for key, col in self._columns.items():
+            if col[index] is not MISSING:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"RowView({dict(self)!r})"
+
+
+def _equals(want: Any) -> Callable[[Any], bool]:
+    # a bound want.__eq__ would return the truthy NotImplemented for
+    # None, missing, and mixed int and float values
+    def predicate(val: Any) -> bool:
+        return val is not MISSING and val == want
+    return predicate
+
+
+class ColumnTable(Generic[T]):
+    """
+    A columnar container of results, keyed on a TypedDict schema.
+
+    Indexing or iterating over the table produces `RowView` instances,
+    which are read-only mappings. For the purposes of static analysis
+    these are presented as the schema's TypedDict, so that they can be
+    passed to code which reads `BuildInfo` or `RPMInfo` dicts. Use
+    `to_dicts` to obtain genuine dicts.
+
+    Keys which are not declared by the schema, but which are found in
+    the rows, are stored in additional columns.
+
+    The tables produced by `take`, `filter`, `where`, and `sort` share
+    their columns with the original table, and only hold an array of
+    the selected row positions. Extending such a table will first give
+    it its own copy of the selected rows.
+
+    :param schema: the TypedDict which describes the rows
+
+    :param rows: initial rows to add to the table
+    """
+
+    def __init__(
+            self,
+            schema: Type[T],
+            rows: Iterable[T] = ()):
+
+        if not is_typeddict(schema):
+            raise TypeError(f"{schema!r} is not a TypedDict")
+
+        self.schema = schema
+        self._length = 0
+        self._selection: Optional[array] = None
+        self._columns: Dict[str, Column] = {
+            key: column_kind(hint)()
+            for key, hint in schema.__annotations__.items()}
+
+        self.extend(rows)
+
+
+    def __len__(self) -> int:
+        if self._selection is None:
+            return self._length
+        else:
+            return len(self._selection)
+
+
+    def __getitem__(self, index: int) -> T:
+        selection = self._selection
+        if selection is None:
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("ColumnTable index out of range")
+        else:
+            index = selection[index]
+
+        return cast(T, RowView(self._columns, index))
+
+
+    def __iter__(self) -> Iterator[T]:
+        columns = self._columns
+        for index in self._positions():
+            yield cast(T, RowView(columns, index))
+
+
+    def __repr__(self):
+        return (f"<ColumnTable {self.schema.__name__} rows={len(self)}"
+                f" columns={len(self._columns)}>")
+
+
+    def _positions(self) -> Sequence[int]:
+        """
+        the positions in the underlying columns of the rows of this table
+        """
+
+        if self._selection is None:
+            return range(self._length)
+        else:
+            return self._selection
+
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """
+        The names of the columns in this table
+        """
+
+        return tuple(self._columns)
+
+
+    def column(self, key: str) -> Column:
+        """
+        The column for the given key. Rows which did not have a value
+        for this key will have the `MISSING` value.
+
+        For a table which is a selection of another, this is a new
+        column holding only the selected values.
+        """
+
+        col = self._columns[key]
+        if self._selection is None:
+            return col
+        else:
+            return col.take(self._selection)
+
+
+    def compact(self) -> None:
+        """
+        If this table is a selection of another, give it its own columns
+        holding only the selected rows
+        """
+
+        selection = self._selection
+        if selection is None:
+            return
+
+        self._columns = {key: col.take(selection)
+                         for key, col in self._columns.items()}
+        self._length = len(selection)
+        self._selection = None
+
+
+    def append(self, row: T) -> None:
+        """
+        Add a single row to this table. When adding many rows, `extend`
+        is considerably faster.
+        """
+
+        self.extend((row, ))
+
+
+    def extend(self, rows: Iterable[T]) -> None:
+        """
+        Add the given rows to this table, column by column
+        """
+
+        data = cast(List[Dict[str, Any]], list(rows))
+        if not data:
+            return
+
+        # we mustn't append to columns which are shared with the table
+        # we were selected from
+        self.compact()
+
+        columns = self._columns
+
+        # any keys not already known get a new column, which is
+        # back-filled as missing for the existing rows
+        known = columns.keys()
+        for row in data:
+            for key in row.keys() - known:
+                columns[key] = ObjectColumn([MISSING] * self._length)
+
+        for key, col in columns.items():
+            try:
+                values = list(map(itemgetter(key), data))
+            except KeyError:
+                values = [row.get(key, MISSING) for row in data]
+            try:
+                col.extend(values)
+            except TypeError:
+                # unhashable values in a dictionary-encoded column, so
+                # we'll just have to convert it to a plain list
+                col = columns[key] = ObjectColumn(col)
+                col.extend(values)
+
+            if isinstance(col, _ArrayColumn) and col.overpatched():
+                # mostly None or mis-typed, so the array isn't helping
+                columns[key] = ObjectColumn(col)
+
+        self._length += len(data)
+
+
+    def _select(self, positions: Iterable[int]) -> "ColumnTable[T]":
+        found: ColumnTable[T] = ColumnTable.__new__(ColumnTable)
+        found.schema = self.schema
+        found._columns = self._columns
+        found._length = self._length
+        found._selection = array("L", positions)
+        return found
+
+
+    def take(self, indices: Iterable[int]) -> "ColumnTable[T]":
+        """
+        Produce a new table with the rows at the given indices, in the
+        given order
+        """
+
+        selection = self._selection
+        if selection is None:
+            return self._select(indices)
+        else:
+            return self._select(map(selection.__getitem__, indices))
+
+
+    def select(self, mask: Iterable[Any]) -> "ColumnTable[T]":
+        """
+        Produce a new table with only those rows for which the mask has
+        a true value
+        """
+
+        return self._select(compress(self._positions(), mask))
+
+
+    def filter(
+            self,
+            key: str,
+            predicate: Callable[[Any], bool]) -> "ColumnTable[T]":
+        """
+        Produce a new table with only those rows whose value for the
+        given key is accepted by the predicate. For dictionary-encoded
+        columns the predicate is invoked once per distinct value rather
+        than once per row.
+        """
+
+        mask = self._columns[key].mask(predicate)
+
+        selection = self._selection
+        if selection is None:
+            return self._select(compress(range(self._length), mask))
+        else:
+            mask = list(mask)
+            return self._select(compress(selection,
+                                         map(mask.__getitem__, selection)))
+
+
+    def where(self, **values: Any) -> "ColumnTable[T]":
+        """
+        Produce a new table with only those rows whose values are equal
+        to all of the given keyword values, eg.
+        ``table.where(arch="x86_64", volume_name="DEFAULT")``
+        """
+
+        found = self
+        for key, want in values.items():
+            found = found.filter(key, _equals(want))
+        return found
+
+
+    def sort(
+            self,
+            *keys: str,
+            reverse: bool = False) -> "ColumnTable[T]":
+        """
+        Produce a new table with its rows sorted by the given keys, with
+        the first key being the most significant. None and missing
+        values are sorted last (or first, when reversed).
+        """
+
+        order = list(self._positions())
+
+        # successive stable sorts, least significant key first
+        for key in reversed(keys):
+            sort_keys = self._columns[key].sort_keys()
+            order.sort(key=sort_keys.__getitem__, reverse=reverse)
+
+        return self._select(order)
+
+
+    def to_dicts(self) -> List[T]:
+        """
+        Materialize the rows of this table as a list of dicts
+        """
+
+        positions = self._positions()
+        found: List[Dict[str, Any]] = [{} for _ in positions]
+
+        for key, col in self._columns.items():
+            for row, pos in zip(found, positions):
+                val = col[pos]
+                if val is not MISSING:
+                    row[key] = val
+
+        return cast(List[T], found)
+
+
+# The end.
@@ -0,0 +1,596 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - concurrent, resumable downloads
+
+A `Downloader` fetches the files of RPMs and archives from a koji
+topurl, in the manner of ``koji_cli.lib.download_rpm`` and
+``download_archive``, with a few differences.
+
+* Several files are fetched at once, each worker thread reusing its
+  own keep-alive HTTP connections from one ``requests.Session``.
+
+* The file is checked against the RPM's ``payloadhash`` or the
+  archive's ``checksum`` as it arrives, rather than by reading it back
+  once written.
+
+* A file which is already present and matches its checksum is not
+  fetched again.
+
+* Each file is first written to a ``.part`` file next to it. A partial
+  file left by an interrupted download, or by a connection dropped
+  mid-transfer, is continued with a ``Range`` request.
+
+::
+
+    downloader = Downloader(topurl, dest="outdir", workers=4)
+    report = downloader.download_rpms(build, session.listRPMs(build["id"]))
+    print(f"{report.received} bytes at {report.throughput:.0f} bytes/s")
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import hashlib
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from struct import unpack_from
+from threading import Lock, local
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Sequence, Tuple, )
+
+from . import ArchiveInfo, BuildInfo, ChecksumType, RPMInfo
+
+
+if TYPE_CHECKING:
+    from requests import Response, Session
+    from typing_extensions import Protocol
+else:
+    Protocol = object
+
+
+__all__ = (
+    "DEFAULT_CHUNK_SIZE",
+    "Download",
+    "DownloadReport",
+    "DownloadResult",
+    "Downloader",
+)
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+"""
+The number of bytes read from a response at a time, the same as
+``koji_cli.lib.download_file``
+"""
+
+
+# hashlib names of the koji.CHECKSUM_TYPES
+_CHECKSUMS = {
+    0: "md5",
+    1: "sha1",
+    2: "sha256",
+}
+
+
+# hashlib names of the labelled digests of koji.make_rpm_ident
+_RPM_IDENTS = {
+    "sha3-256": "sha3_256",
+    "sha256": "sha256",
+    "sha1": "sha1",
+}
+
+
+class _Hasher(Protocol):
+
+    def update(self, data: memoryview) -> None:
+        ...
+
+    def hexdigest(self) -> str:
+        ...
+
+
+class Download(NamedTuple):
+    url: str
+    """ the URL to fetch the file from """
+
+    filename: str
+    """ where to save the file, relative to the downloader's dest """
+
+    size: Optional[int]
+    """ the expected size of the file in bytes, if known """
+
+    checksum: str
+    """ the expected checksum of the file """
+
+    checksum_type: Optional[ChecksumType]
+    """ the type of the checksum, or None if the checksum is an RPM's
+    ``payloadhash`` """
+
+
+class DownloadResult(NamedTuple):
+    download: Download
+    """ the download this is the result of """
+
+    path: str
+    """ the local file """
+
+    size: int
+    """ the size of the file in bytes """
+
+    received: int
+    """ the number of bytes fetched by this download """
+
+    resumed: int
+    """ the number of bytes of a partial file which were kept, rather
+    than being fetched again """
+
+    retried: int
+    """ the number of times the download was continued after its
+    connection failed """
+
+    skipped: bool
+    """ whether the file was already present and matched its checksum """
+
+    seconds: float
+    """ the time taken by the download """
+
+
+class DownloadReport(NamedTuple):
+    results: List[DownloadResult]
+    """ the result of each download, in the order they were given """
+
+    seconds: float
+    """ the time taken by all of the downloads """
+
+    @property
+    def received(self) -> int:
+        """
+        The total number of bytes fetched
+        """
+
+        return sum(result.received for result in self.results)
+
+    @property
+    def skipped(self) -> int:
+        """
+        The number of files which were already present
+        """
+
+        return sum(1 for result in self.results if result.skipped)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Bytes fetched per second
+        """
+
+        return self.received / max(self.seconds, 0.00001)
+
+
+class _RPMIdent:
+    """
+    Computes the ident of an RPM, as stored in its ``payloadhash``, from
+    the content of the file as it is fed in order. This is the md5 of
+    the header and payload, or for RPMs without one, a labelled digest
+    of the header alone.
+    """
+
+    def __init__(self, payloadhash: str):
+        label, sep, _hexdigest = payloadhash.rpartition("::")
+        if not sep:
+            self._label = ""
+            self._hash = hashlib.md5()
+        elif label in _RPM_IDENTS:
+            self._label = label
+            self._hash = hashlib.new(_RPM_IDENTS[label])
+        else:
+            raise ValueError(f"unsupported RPM ident {payloadhash!r}")
+
+        # until the bounds of the header are known, the start of the
+        # file is kept in _head
+        self._head = bytearray()
+        self._start = -1
+        self._end = -1
+        self._seen = 0
+
+    def _locate(self) -> bool:
+        head = self._head
+
+        # the 96 byte lead is followed by the signature header, which
+        # is padded to a multiple of eight bytes
+        if len(head) < 112:
+            return False
+        count, store = unpack_from("!II", head, 104)
+        length = 16 + 16 * count + store
+        start = 96 + length + (8 - length % 8) % 8
+
+        if not self._label:
+            # the md5 is of everything from the header on
+            self._start, self._end = start, -1
+            return True
+
+        if len(head) < start + 16:
+            return False
+        count, store = unpack_from("!II", head, start + 8)
+        self._start, self._end = start, start + 16 + 16 * count + store
+        return True
+
+    def update(self, data: memoryview) -> None:
+        pos = self._seen
+        if self._start < 0:
+            self._head += data
+            if not self._locate():
+                self._seen += len(data)
+                return
+            data = memoryview(bytes(self._head))
+            self._head = bytearray()
+            pos = 0
+
+        self._seen = pos + len(data)
+        low = max(self._start - pos, 0)
+        high = len(data) if self._end < 0 else min(self._end - pos, len(data))
+        if low < high:
+            self._hash.update(data[low:high])
+
+    def hexdigest(self) -> str:
+        if self._start < 0 or self._seen < max(self._start, self._end):
+            # too short to be an RPM
+            return ""
+        value = self._hash.hexdigest()
+        return f"{self._label}::{value}" if self._label else value
+
+
+def _hasher(download: Download) -> "_Hasher":
+    if download.checksum_type is None:
+        return _RPMIdent(download.checksum)
+
+    name = _CHECKSUMS.get(download.checksum_type)
+    if name is None:
+        raise ValueError(
+            f"unknown checksum type {download.checksum_type!r}")
+    return hashlib.new(name)
+
+
+class Downloader:
+    """
+    Downloads the files of RPMs and archives from a koji topurl,
+    several at once, verifying and resuming each
+
+    :param topurl: the base URL of the koji files, as in the
+      ``topurl`` setting of a koji profile
+
+    :param dest: the directory to save files into
+
+    :param workers: the number of files `download_all` fetches at once
+
+    :param chunk_size: the number of bytes read from a response at a
+      time
+
+    :param retries: the number of times a download is continued after
+      its connection fails
+
+    :param timeout: seconds to wait for the server to respond
+    """
+
+    def __init__(
+            self,
+            topurl: str,
+            dest: str = ".",
+            workers: int = 4,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            retries: int = 3,
+            timeout: float = 60.0):
+
+        from koji import PathInfo
+
+        if chunk_size < 1:
+            raise ValueError(f"invalid chunk size {chunk_size!r}")
+
+        self.pathinfo = PathInfo(topdir=topurl)
+        self.dest = dest
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.timeout = timeout
+
+        self._local = local()
+        self._lock = Lock()
+        self._created: List["Session"] = []
+
+    def rpm(
+            self,
+            build: BuildInfo,
+            rpm: RPMInfo,
+            sigkey: Optional[str] = None) -> Download:
+        """
+        The download of an RPM of a build, saved by its base name
+
+        :param build: the build owning the RPM
+
+        :param rpm: the RPM, as from ``listRPMs``
+
+        :param sigkey: fetch the copy signed with this key, rather than
+          the unsigned RPM
+        """
+
+        pathinfo = self.pathinfo
+        if sigkey:
+            relpath = pathinfo.signed(rpm, sigkey)
+            # only the size of the unsigned copy is known
+            size = None
+        else:
+            relpath = pathinfo.rpm(rpm)
+            size = rpm["size"]
+
+        url = f"{pathinfo.build(build)}/{relpath}"
+        return Download(url, os.path.basename(relpath), size,
+                        rpm["payloadhash"], None)
+
+    def archive(
+            self,
+            build: BuildInfo,
+            archive: ArchiveInfo) -> Download:
+        """
+        The download of an archive of a build, saved by the same
+        relative path as ``koji download-build`` uses
+
+        :param build: the build owning the archive
+
+        :param archive: the archive, as from ``listArchives``
+        """
+
+        pathinfo = self.pathinfo
+        btype = archive["btype"]
+        if btype == "maven":
+            relpath = pathinfo.mavenfile(archive)
+            url = f"{pathinfo.mavenbuild(build)}/{relpath}"
+        elif btype == "win":
+            relpath = pathinfo.winfile(archive)
+            url = f"{pathinfo.winbuild(build)}/{relpath}"
+        elif btype == "image":
+            relpath = archive["filename"]
+            url = f"{pathinfo.imagebuild(build)}/{relpath}"
+        else:
+            relpath = archive["filename"]
+            url = f"{pathinfo.typedir(build, btype)}/{relpath}"
+
+        return Download(url, relpath, archive["size"],
+                        archive["checksum"], archive["checksum_type"])
+
+    def _session(self) -> "Session":
+        session = getattr(self._local, "session", None)
+        if session is None:
+            from koji import request_with_retry
+
+            session = self._local.session = request_with_retry()
+            with self._lock:
+                self._created.append(session)
+        return session
+
+    def close(self) -> None:
+        """
+        Closes the HTTP connections of every worker
+        """
+
+        with self._lock:
+            created, self._created = self._created, []
+        for session in created:
+            session.close()
+        self._local = local()
+
+    def _matches(self, download: Download, path: str) -> bool:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        if download.size is not None and size != download.size:
+            return False
+
+        found = _hasher(download)
+        self._read_into(path, found, size)
+        return found.hexdigest() == download.checksum
+
+    def _read_into(
+            self,
+            path: str,
+            found: "_Hasher",
+            length: int) -> None:
+
+        with open(path, "rb", buffering=0) as fo, \
+                memoryview(bytearray(self.chunk_size)) as view:
+            while length > 0:
+                count = fo.readinto(view[:min(length, len(view))])
+                if not count:
+                    break
+                with view[:count] as chunk:
+                    found.update(chunk)
+                length -= count
+
+    def _fetch(
+            self,
+            download: Download,
+            partial: str,
+            found: "_Hasher") -> Tuple[bool, "_Hasher"]:
+        """
+        Continues the download into the partial file. Returns whether
+        the server ignored the range and sent the whole file, and the
+        hasher, which is replaced if it did.
+        """
+
+        from koji import GenericError
+
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        response: "Response"
+        with self._session().get(download.url, headers=headers,
+                                 stream=True,
+                                 timeout=self.timeout) as response:
+
+            if response.status_code == 416 and offset:
+                # nothing past the end of the partial file, which is
+                # either complete or will fail verification
+                return False, found
+
+            response.raise_for_status()
+            restarted = response.status_code != 206
+            if restarted:
+                found = _hasher(download)
+            elif not response.headers.get(
+                    "Content-Range", "").startswith(f"bytes {offset}-"):
+                raise GenericError(f"Unexpected range from {download.url}:"
+                                   f" {response.headers.get('Content-Range')}")
+
+            with open(partial, "wb" if restarted else "ab") as fo:
+                for data in response.iter_content(self.chunk_size):
+                    fo.write(data)
+                    found.update(memoryview(data))
+
+        return restarted, found
+
+    def download(self, download: Download) -> DownloadResult:
+        """
+        Fetches a single file, unless it is already present, verifying
+        its checksum as it arrives. Raises a ``koji.GenericError`` if the
+        file does not match its size or checksum, in which case the
+        partial file is removed so that the next attempt starts over.
+
+        :param download: the file to fetch, as from `rpm` or `archive`
+        """
+
+        from koji import GenericError
+        from requests import RequestException
+
+        start = perf_counter()
+        path = os.path.join(self.dest, download.filename)
+        if self._matches(download, path):
+            size = os.path.getsize(path)
+            return DownloadResult(download, path, size, 0, 0, 0, True,
+                                  perf_counter() - start)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # a partial file from an earlier attempt is continued from
+        # where it stopped, once its content is fed to the hasher
+        partial = f"{path}.part"
+        found = _hasher(download)
+        resumed = 0
+        if os.path.exists(partial):
+            resumed = os.path.getsize(partial)
+            if download.size is not None and resumed > download.size:
+                os.unlink(partial)
+                resumed = 0
+            else:
+                self._read_into(partial, found, resumed)
+
+        tries = 0
+        while download.size is None or resumed < download.size:
+            try:
+                restarted, found = self._fetch(download, partial, found)
+            except RequestException:
+                # a dropped connection leaves what was received in the
+                # partial file, which the next try continues from
+                if tries >= self.retries:
+                    raise
+                tries += 1
+                found = _hasher(download)
+                if os.path.exists(partial):
+                    self._read_into(partial, found,
+                                    os.path.getsize(partial))
+                continue
+
+            if restarted:
+                resumed = 0
+            break
+
+        size = os.path.getsize(partial)
+        if download.size is not None and size != download.size:
+            os.unlink(partial)
+            raise GenericError(f"Downloaded file {path} is wrong length:"
+                               f" {size} != {download.size}")
+        if found.hexdigest() != download.checksum:
+            os.unlink(partial)
+            raise GenericError(f"Downloaded file {path} does not match"
+                               f" its checksum {download.checksum}")
+
+        os.replace(partial, path)
+        return DownloadResult(download, path, size, size - resumed, resumed,
+                              tries, False, perf_counter() - start)
+
+    def download_all(self, downloads: Iterable[Download]) -> DownloadReport:
+        """
+        Fetches several files at once. Returns a report of the results
+        in the same order as the downloads were given, raising the
+        first error encountered once the others have finished.
+
+        :param downloads: the files to fetch, as from `rpm` or `archive`
+        """
+
+        todo = list(downloads)
+        start = perf_counter()
+        try:
+            if self.workers < 2 or len(todo) < 2:
+                results = [self.download(item) for item in todo]
+            else:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    futures = [pool.submit(self.download, item)
+                               for item in todo]
+                results = [future.result() for future in futures]
+        finally:
+            self.close()
+
+        return DownloadReport(results, perf_counter() - start)
+
+    def download_rpms(
+            self,
+            build: BuildInfo,
+            rpms: Sequence[RPMInfo],
+            sigkey: Optional[str] = None) -> DownloadReport:
+        """
+        Fetches the given RPMs of a build
+
+        :param build: the build owning the RPMs
+
+        :param rpms: the RPMs, as from ``listRPMs``
+
+        :param sigkey: fetch the copies signed with this key
+        """
+
+        return self.download_all(self.rpm(build, rpm, sigkey)
+                                 for rpm in rpms)
+
+    def download_archives(
+            self,
+            build: BuildInfo,
+            archives: Sequence[ArchiveInfo]) -> DownloadReport:
+        """
+        Fetches the given archives of a build
+
+        :param build: the build owning the archives
+
+        :param archives: the archives, as from ``listArchives``
+        """
+
+        return self.download_all(self.archive(build, archive)
+                                 for archive in archives)
+
+
+# The end.
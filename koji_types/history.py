@@ -0,0 +1,287 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - history change feed
+
+A `ChangeFeed` turns the hub's ``queryHistory`` into a stream of
+`Change` events. Each poll picks up from a stored event watermark,
+walks forward to the hub's latest event in bounded windows of events,
+and fetches only the history entries created or revoked within each
+window. The watermark is advanced only once the changes of a window
+have been handed to the consumer, so a consumer which is interrupted
+will see those changes again rather than lose them.
+
+::
+
+    feed = ChangeFeed(session, store=FileWatermarks("feed.json"))
+
+    for change in feed.changes():
+        if change.table == "tag_listing":
+            entry = cast(TagListingHistory, change.entry)
+            print(change.action, entry["tag.name"], entry["build_id"])
+
+The store may be any object with ``watermark`` and ``set_watermark``
+methods, such as a `koji_types.mirror.BuildMirror`.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import json
+import os
+
+from time import sleep
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple,
+    Optional, Tuple, Type, cast, )
+from typing_extensions import Literal
+
+from . import (
+    BuildTargetConfigHistory, EventID, HistoryRecord, TagInheritanceHistory,
+    TagListingHistory, TagPackagesHistory, UserPermsHistory, )
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+    from typing_extensions import Protocol
+else:
+    Protocol = object
+
+
+__all__ = (
+    "Change",
+    "ChangeFeed",
+    "DEFAULT_TABLES",
+    "FileWatermarks",
+    "HISTORY_TYPES",
+    "WatermarkStore",
+)
+
+
+HISTORY_TYPES: Dict[str, Type[Any]] = {
+    "build_target_config": BuildTargetConfigHistory,
+    "tag_inheritance": TagInheritanceHistory,
+    "tag_listing": TagListingHistory,
+    "tag_packages": TagPackagesHistory,
+    "user_perms": UserPermsHistory,
+}
+"""
+The typed history entry for each of the ``queryHistory`` tables that
+has one
+"""
+
+
+DEFAULT_TABLES: Tuple[str, ...] = tuple(sorted(HISTORY_TYPES))
+
+
+class Change(NamedTuple):
+    table: str
+    """ the history table the entry belongs to """
+
+    action: Literal["create", "revoke"]
+    """ whether the entry was created or revoked """
+
+    event: EventID
+    """ the event at which the entry was created or revoked """
+
+    entry: HistoryRecord
+    """ the history entry, of the type given for its table in
+    `HISTORY_TYPES` """
+
+
+class WatermarkStore(Protocol):
+    """
+    Anything which can persist named watermarks between runs
+    """
+
+    def watermark(self, name: str) -> Optional[float]:
+        ...
+
+    def set_watermark(self, name: str, value: float) -> None:
+        ...
+
+
+class FileWatermarks:
+    """
+    Named watermarks kept in a small JSON file, which is rewritten
+    atomically each time a watermark is set
+
+    :param filename: the JSON file, which is created if it does not
+      exist
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        try:
+            with open(filename) as fd:
+                self._values: Dict[str, float] = json.load(fd)
+        except FileNotFoundError:
+            self._values = {}
+
+    def watermark(self, name: str) -> Optional[float]:
+        return self._values.get(name)
+
+    def set_watermark(self, name: str, value: float) -> None:
+        self._values[name] = value
+        partial = f"{self.filename}.partial"
+        with open(partial, "w") as fd:
+            json.dump(self._values, fd)
+        os.replace(partial, self.filename)
+
+
+def _window_changes(
+        history: Dict[str, List[Any]],
+        after: int,
+        upto: int) -> List[Change]:
+
+    changes = []
+    for table, entries in history.items():
+        for entry in entries:
+            created = entry["create_event"]
+            if after < created <= upto:
+                changes.append(Change(table, "create", created, entry))
+            revoked = entry.get("revoke_event")
+            if revoked is not None and after < revoked <= upto:
+                changes.append(Change(table, "revoke", revoked, entry))
+
+    # within an event, revokes come before creates, so that an entry
+    # which was replaced is removed before its replacement is added
+    changes.sort(key=lambda c: (c.event, c.action != "revoke"))
+    return changes
+
+
+class ChangeFeed:
+    """
+    Streams the changes recorded by the hub's ``queryHistory`` call,
+    resuming from a stored event watermark
+
+    :param session: the session to query with
+
+    :param tables: the history tables to follow
+
+    :param store: where the watermark is kept between runs. If None,
+      the watermark is only kept by this feed.
+
+    :param name: the name of the watermark in the store
+
+    :param start: the event to start after when the store has no
+      watermark. If None, the hub's latest event at the first poll is
+      used, so that only changes from then on are seen.
+
+    :param batch: the number of events covered by each
+      ``queryHistory`` call. When a window holds no changes the next
+      is twice as wide, up to ``max_batch``.
+
+    :param max_batch: the widest window of events to query at once
+
+    :param filters: further ``queryHistory`` keyword arguments, eg.
+      ``tag`` or ``package``, applied to every query
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            tables: Iterable[str] = DEFAULT_TABLES,
+            store: Optional[WatermarkStore] = None,
+            name: str = "history",
+            start: Optional[EventID] = None,
+            batch: int = 1000,
+            max_batch: int = 100000,
+            **filters: Any):
+
+        self.session = session
+        self.tables = list(tables)
+        self.store = store
+        self.name = name
+        self.batch = batch
+        self.max_batch = max(batch, max_batch)
+        self.filters = filters
+
+        found = store.watermark(name) if store is not None else None
+        self._position = int(found) if found is not None else start
+
+    @property
+    def position(self) -> Optional[EventID]:
+        """
+        The event up to which all changes have been delivered, or None
+        if the feed has not yet been polled and had no starting point
+        """
+
+        return cast(Optional[EventID], self._position)
+
+    def _advance(self, event: int) -> None:
+        self._position = event
+        if self.store is not None:
+            self.store.set_watermark(self.name, event)
+
+    def fetch(self, after: int, upto: int) -> List[Change]:
+        """
+        The changes which happened after event ``after`` up to and
+        including event ``upto``, in event order. Does not move the
+        watermark.
+        """
+
+        history = self.session.queryHistory(
+            tables=self.tables, afterEvent=after, beforeEvent=upto + 1,
+            **self.filters)
+        return _window_changes(history, after, upto)
+
+    def poll(self) -> Iterator[List[Change]]:
+        """
+        Yields the changes since the watermark, one non-empty batch
+        per window of events, up to the hub's latest event as of the
+        start of the poll. The watermark is moved past a batch when
+        the next one is requested, or the poll completes.
+        """
+
+        last = self.session.getLastEvent()["id"]
+        after = self._position
+        if after is None:
+            self._advance(last)
+            return
+
+        window = self.batch
+        while after < last:
+            upto = min(after + window, last)
+            changes = self.fetch(after, upto)
+            if changes:
+                yield changes
+                window = self.batch
+            else:
+                window = min(window * 2, self.max_batch)
+            self._advance(upto)
+            after = upto
+
+    def changes(self) -> Iterator[Change]:
+        """
+        As `poll`, but yields the changes one at a time
+        """
+
+        for batch in self.poll():
+            yield from batch
+
+    def follow(self, interval: float = 60.0) -> Iterator[List[Change]]:
+        """
+        Polls forever, waiting ``interval`` seconds whenever the feed
+        has caught up with the hub
+        """
+
+        while True:
+            yield from self.poll()
+            sleep(interval)
+
+
+# The end.
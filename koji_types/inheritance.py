@@ -0,0 +1,493 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - local tag inheritance
+
+An `InheritanceGraph` holds the ``getInheritanceData`` links of many
+tags at a single event, and computes full inheritance from them
+locally, in the same order and with the same ``maxdepth``,
+``intransitive``, ``noconfig``, and ``pkg_filter`` handling as the
+hub's ``getFullInheritance``. Each result is memoised until a link it
+depends upon is changed via `InheritanceGraph.update`.
+
+An `InheritanceResolver` fills graphs from a session, fetching the
+links of every tag it needs with as few multicalls as possible, and
+keeps one graph per event.
+
+::
+
+    resolver = InheritanceResolver(session, event=snap.event)
+    resolver.load()
+
+    for tag in tags:
+        parents = resolver.full_inheritance(tag)
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import re
+
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Pattern,
+    Set, Tuple, Union, cast, )
+
+from . import (
+    EventID, TagFullInheritance, TagFullInheritanceEntry, TagID,
+    TagInheritance, TagInheritanceEntry, )
+from .multicall import multicall_map
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+
+
+__all__ = (
+    "InheritanceGraph",
+    "InheritanceResolver",
+    "config_inheritance",
+    "package_allowed",
+)
+
+
+TagSpec = Union[str, TagID]
+
+
+_MemoKey = Tuple[TagID, bool]
+
+
+@lru_cache(maxsize=1024)
+def _compile(pattern: str) -> Pattern:
+    return re.compile(pattern)
+
+
+def package_allowed(entry: TagFullInheritanceEntry, package: str) -> bool:
+    """
+    True if the named package may be inherited via a full inheritance
+    entry, ie. if it matches every ``pkg_filter`` pattern accumulated
+    along the path to that entry
+    """
+
+    for pattern in entry["filter"]:
+        if not _compile(pattern).match(package):
+            return False
+    return True
+
+
+def config_inheritance(
+        inheritance: TagFullInheritance) -> TagFullInheritance:
+    """
+    The entries of a full inheritance from which tag configuration,
+    such as extras and groups, is inherited
+    """
+
+    return [entry for entry in inheritance if not entry["noconfig"]]
+
+
+class InheritanceGraph:
+    """
+    The inheritance links of a set of tags at a single event
+
+    :param event: the event the links were read at, or None if they
+      are current
+    """
+
+    def __init__(self, event: Optional[EventID] = None):
+        self.event = event
+        self.complete = False
+
+        self._parents: Dict[TagID, TagInheritance] = {}
+        self._children: Dict[TagID, List[TagInheritanceEntry]] = {}
+        self._names: Dict[str, TagID] = {}
+
+        self._memo: Dict[_MemoKey, TagFullInheritance] = {}
+        self._readers: Dict[_MemoKey, Set[_MemoKey]] = {}
+
+    def __contains__(self, tag: TagSpec) -> bool:
+        try:
+            self.resolve(tag)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def add_name(self, name: str, tag: TagID) -> None:
+        """
+        Record the name of a tag, so that it may be given by name
+        """
+
+        self._names[name] = tag
+
+    def resolve(self, tag: TagSpec) -> TagID:
+        """
+        The ID of a tag given by name or ID. Raises a KeyError if the
+        tag is unknown to this graph.
+        """
+
+        if isinstance(tag, str):
+            return self._names[tag]
+        elif tag in self._parents:
+            return tag
+        else:
+            raise KeyError(tag)
+
+    def parents(self, tag: TagSpec) -> TagInheritance:
+        """
+        The inheritance links of a tag, as from ``getInheritanceData``
+        """
+
+        return self._parents[self.resolve(tag)]
+
+    def missing(self, tags: Iterable[TagID]) -> Set[TagID]:
+        """
+        The tags reachable from the given tags via their parent links
+        which have no links in this graph
+        """
+
+        found = set()
+        seen: Set[TagID] = set()
+        todo = list(tags)
+        while todo:
+            tag = todo.pop()
+            if tag in seen:
+                continue
+            seen.add(tag)
+            links = self._parents.get(tag)
+            if links is None:
+                found.add(tag)
+            else:
+                todo.extend(link["parent_id"] for link in links)
+        return found
+
+    def update(self, tag: TagID, links: TagInheritance) -> None:
+        """
+        Set the inheritance links of a tag, as from
+        ``getInheritanceData``, replacing any it had. Only the
+        memoised results which depend upon the tag's old or new links
+        are discarded.
+        """
+
+        old = self._parents.get(tag, ())
+        links = sorted(links, key=lambda link: link["priority"])
+
+        stale: Set[_MemoKey] = set()
+        stale.update(self._readers.pop((tag, False), ()))
+        for link in old:
+            stale.update(self._readers.pop((link["parent_id"], True), ()))
+            found = self._children.get(link["parent_id"])
+            if found:
+                found[:] = [c for c in found if c["child_id"] != tag]
+        for link in links:
+            stale.update(self._readers.pop((link["parent_id"], True), ()))
+            found = self._children.setdefault(link["parent_id"], [])
+            found.append(link)
+            found.sort(key=lambda link: (link["priority"], link["child_id"]))
+            self._names.setdefault(link["name"], link["parent_id"])
+
+        self._parents[tag] = links
+        for key in stale:
+            self._memo.pop(key, None)
+
+    def remove(self, tag: TagID) -> None:
+        """
+        Forget a tag and its links, as when it has been deleted
+        """
+
+        if tag in self._parents:
+            self.update(tag, [])
+            del self._parents[tag]
+        for name, found in list(self._names.items()):
+            if found == tag:
+                del self._names[name]
+
+    def clear(self) -> None:
+        """
+        Discard every memoised result
+        """
+
+        self._memo.clear()
+        self._readers.clear()
+
+    def full_inheritance(
+            self,
+            tag: TagSpec,
+            reverse: bool = False) -> TagFullInheritance:
+        """
+        The full inheritance of a tag, as from ``getFullInheritance``.
+        Results are memoised, and should not be modified.
+
+        Raises a KeyError if the links of any tag in the inheritance
+        are not in this graph. A reverse inheritance is only accurate
+        if the graph is complete.
+
+        :param tag: the tag to find the inheritance of
+
+        :param reverse: find the tags which inherit from this tag,
+          rather than those it inherits from
+        """
+
+        tag_id = self.resolve(tag)
+        key = (tag_id, reverse)
+
+        found = self._memo.get(key)
+        if found is None:
+            found = []
+            self._walk(key, found, tag_id, frozenset(), {}, 0, None,
+                       False, [])
+            self._memo[key] = found
+        return found
+
+    def _walk(
+            self,
+            key: _MemoKey,
+            order: TagFullInheritance,
+            tag_id: TagID,
+            top: FrozenSet[TagID],
+            hist: Dict[TagID, List[TagFullInheritanceEntry]],
+            currdepth: int,
+            maxdepth: Optional[int],
+            noconfig: bool,
+            pfilter: List[str]) -> None:
+
+        # mirrors the hub's readFullInheritanceRecurse. maxdepth is
+        # relative to the current tag, while currdepth is absolute
+        # from the top
+
+        if maxdepth is not None and maxdepth < 1:
+            return
+
+        reverse = key[1]
+        currdepth += 1
+        top = top | {tag_id}
+
+        self._readers.setdefault((tag_id, reverse), set()).add(key)
+        if reverse:
+            links = self._children.get(tag_id, [])
+        else:
+            links = self._parents[tag_id]
+
+        for link in links:
+            other = link["child_id"] if reverse else link["parent_id"]
+            if other in top:
+                # a loop
+                continue
+
+            if link["intransitive"] and currdepth > 1 and not reverse:
+                # only followed from the original tag
+                continue
+
+            nextdepth = link["maxdepth"]
+            if nextdepth is None:
+                if maxdepth is not None:
+                    nextdepth = maxdepth - 1
+            elif maxdepth is not None:
+                nextdepth = min(nextdepth, maxdepth) - 1
+
+            if link["noconfig"]:
+                # as in the hub, this also carries over to the links
+                # after this one
+                noconfig = True
+            nextfilter = list(pfilter)
+            if link["pkg_filter"]:
+                nextfilter.append(link["pkg_filter"])
+
+            previous = hist.get(other)
+            if previous is not None:
+                # already visited, but perhaps with a greater depth or
+                # fewer restrictions, in which case it is rescanned
+                for prior in previous:
+                    lastdepth = prior["nextdepth"]
+                    if nextdepth is None:
+                        if lastdepth is not None:
+                            continue
+                    elif lastdepth is not None and nextdepth > lastdepth:
+                        continue
+                    if prior["noconfig"] and not noconfig:
+                        continue
+                    if prior["filter"]:
+                        continue
+                    break
+                else:
+                    previous = None
+                if previous is not None:
+                    continue
+
+            entry = cast(TagFullInheritanceEntry, dict(link))
+            entry["currdepth"] = currdepth
+            entry["nextdepth"] = cast(int, nextdepth)
+            entry["filter"] = nextfilter
+
+            hist.setdefault(other, []).append(entry)
+            order.append(entry)
+
+            if link["intransitive"] and reverse:
+                # included, but not followed
+                continue
+
+            if not reverse and other not in self._parents:
+                raise KeyError(other)
+
+            self._walk(key, order, other, top, hist, currdepth, nextdepth,
+                       noconfig, nextfilter)
+
+
+class InheritanceResolver:
+    """
+    Computes full inheritance locally from the links of many tags,
+    which are fetched from a session by multicall. One graph is kept
+    for each event.
+
+    :param session: the session to fetch inheritance links with
+
+    :param event: the default event to resolve inheritance at. If
+      None, the current links are used, and these may be refreshed
+      via `invalidate`.
+
+    :param size: the number of calls in each multicall
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            event: Optional[EventID] = None,
+            size: int = 1000):
+
+        self.session = session
+        self.event = event
+        self.size = size
+        self._graphs: Dict[Optional[EventID], InheritanceGraph] = {}
+
+    def graph(self, event: Optional[EventID] = None) -> InheritanceGraph:
+        """
+        The graph of links for an event, which defaults to the
+        resolver's event. It holds only the links fetched so far.
+        """
+
+        if event is None:
+            event = self.event
+        found = self._graphs.get(event)
+        if found is None:
+            found = self._graphs[event] = InheritanceGraph(event)
+        return found
+
+    def _fetch(self, graph: InheritanceGraph, tags: Iterable[TagID]):
+        tags = list(tags)
+        event = graph.event
+
+        found: Iterable[TagInheritance] = multicall_map(
+            self.session,
+            lambda mc, tag: mc.getInheritanceData(tag, event),
+            tags, size=self.size, strict=True)
+
+        for tag, links in zip(tags, found):
+            graph.update(tag, links)
+
+    def load(self, event: Optional[EventID] = None) -> InheritanceGraph:
+        """
+        Fetch the links of every tag, with one call to ``listTags``
+        and then a multicall of ``getInheritanceData``. Returns the
+        now complete graph.
+        """
+
+        graph = self.graph(event)
+
+        tags = self.session.listTags()
+        for tag in tags:
+            graph.add_name(tag["name"], tag["id"])
+        self._fetch(graph, (tag["id"] for tag in tags))
+
+        # parents which are not in listTags, eg. deleted since the
+        # graph's event
+        self._fill(graph, list(graph._parents))
+
+        graph.complete = True
+        return graph
+
+    def _fill(self, graph: InheritanceGraph, tags: Iterable[TagID]):
+        # fetch any missing tags, one level of the inheritance at a
+        # time
+        missing = graph.missing(tags)
+        while missing:
+            self._fetch(graph, missing)
+            missing = graph.missing(missing)
+
+    def _resolve(self, graph: InheritanceGraph, tag: TagSpec) -> TagID:
+        if isinstance(tag, str):
+            found = graph._names.get(tag)
+            if found is None:
+                info = self.session.getTag(tag, event=graph.event)
+                if info is None:
+                    raise KeyError(tag)
+                found = info["id"]
+                graph.add_name(tag, found)
+            return found
+        return tag
+
+    def prefetch(
+            self,
+            tags: Iterable[TagSpec],
+            event: Optional[EventID] = None) -> None:
+        """
+        Fetch the links needed for the full inheritance of each of
+        tags, with one multicall per level of inheritance
+        """
+
+        graph = self.graph(event)
+        self._fill(graph, [self._resolve(graph, tag) for tag in tags])
+
+    def full_inheritance(
+            self,
+            tag: TagSpec,
+            event: Optional[EventID] = None,
+            reverse: bool = False) -> TagFullInheritance:
+        """
+        The full inheritance of a tag, as from ``getFullInheritance``,
+        computed locally. Any links which are needed but not yet known
+        are fetched first. A reverse inheritance requires the links of
+        every tag, which are loaded if necessary.
+        """
+
+        graph = self.graph(event)
+        tag_id = self._resolve(graph, tag)
+
+        if reverse:
+            if not graph.complete:
+                self.load(event)
+        else:
+            self._fill(graph, (tag_id, ))
+
+        return graph.full_inheritance(tag_id, reverse)
+
+    def invalidate(
+            self,
+            tags: Iterable[TagID],
+            event: Optional[EventID] = None) -> None:
+        """
+        Re-fetch the links of the given tags, as after they were
+        changed by ``setInheritanceData``, discarding only the results
+        which depended upon them
+        """
+
+        graph = self.graph(event)
+        tags = list(tags)
+        self._fetch(graph, tags)
+        self._fill(graph, tags)
+
+
+# The end.
@@ -0,0 +1,521 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - hub call profiling
+
+A `ProfiledSession` wraps a `koji.ClientSession` (or anything else
+providing the `koji_types.protocols.ClientSession` protocol) and
+records, for each hub method called through it, the number of calls
+and errors, a histogram of call latency, the request and response
+sizes on the wire, and the number of rows in the results. The
+statistics are held by a `CallProfiler`, which can be shared between
+many sessions, and exported as JSON or in the Prometheus text format.
+
+::
+
+    profiler = CallProfiler()
+    session = ProfiledSession(koji.ClientSession(url), profiler)
+
+    session.getBuild("bash-5.2.26-3.fc40")
+    with session.multicall() as mc:
+        tags = [mc.getTag(name) for name in names]
+
+    print(profiler.to_prometheus())
+
+Only the hub methods declared by the generated protocols (see
+`koji_types.protocols.registry`) are profiled. All other attributes
+are passed through to the wrapped session. While the profiler is
+disabled, hub method calls go straight to the wrapped session, adding
+well under a microsecond each (see `benchmarks/profiler.py`).
+
+Request and response sizes are taken from the session's requests
+session, and so are only available for a `koji.ClientSession`. The
+calls within a multicall are sent together, so each is attributed an
+equal share of the time taken by the whole multicall, while the sizes
+are recorded against ``multiCall`` itself.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import threading
+
+from bisect import bisect_left
+from itertools import chain
+from json import dumps
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple, )
+
+from .protocols import (
+    ClientSession as ClientSessionProtocol,
+    MultiCallSession as MultiCallSessionProtocol, )
+from .protocols.registry import HOST_METHODS, SESSION_METHODS
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+
+
+__all__ = (
+    "DEFAULT_BUCKETS",
+    "CallProfiler",
+    "MethodStats",
+    "ProfiledMultiCall",
+    "ProfiledSession",
+    "hub_methods",
+)
+
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, )
+"""
+The default upper bounds, in seconds, of the latency histogram
+buckets. These are the same as the Prometheus client defaults.
+"""
+
+
+def hub_methods() -> FrozenSet[str]:
+    """
+    The names of every hub method declared by the generated session
+    protocols, with those of the Host protocol prefixed by ``host.``
+    """
+
+    return frozenset(chain(chain.from_iterable(SESSION_METHODS.values()),
+                           (f"host.{name}" for name in HOST_METHODS)))
+
+
+def _rows(result: Any) -> int:
+    if result is None:
+        return 0
+    elif isinstance(result, (list, tuple)):
+        return len(result)
+    else:
+        return 1
+
+
+class MethodStats:
+    """
+    The statistics collected for a single hub method
+    """
+
+    __slots__ = ("count", "errors", "seconds", "buckets",
+                 "request_bytes", "response_bytes", "rows", "max_rows", )
+
+    def __init__(self, buckets: int):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets: List[int] = [0] * (buckets + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.rows = 0
+        self.max_rows = 0
+
+
+class _Wire(threading.local):
+    request = 0
+    response = 0
+
+
+class CallProfiler:
+    """
+    Collects per-method statistics for hub calls made through any
+    number of `ProfiledSession` wrappers
+
+    :param enabled: whether to record calls initially
+
+    :param buckets: the upper bounds of the latency histogram buckets,
+      in seconds and in ascending order
+    """
+
+    def __init__(
+            self,
+            enabled: bool = True,
+            buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+
+        self.enabled = enabled
+        self.bounds = tuple(buckets)
+        self.methods = hub_methods()
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, MethodStats] = {}
+        self._wire = _Wire()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Discard all of the collected statistics
+        """
+
+        with self._lock:
+            self._stats.clear()
+
+    def record(
+            self,
+            method: str,
+            seconds: float,
+            result: Any = None,
+            error: bool = False,
+            request_bytes: int = 0,
+            response_bytes: int = 0) -> None:
+        """
+        Record a single call of method
+        """
+
+        rows = 0 if error else _rows(result)
+        bucket = bisect_left(self.bounds, seconds)
+
+        with self._lock:
+            stats = self._stats.get(method)
+            if stats is None:
+                stats = self._stats[method] = MethodStats(len(self.bounds))
+
+            stats.count += 1
+            stats.seconds += seconds
+            stats.buckets[bucket] += 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.rows += rows
+            if rows > stats.max_rows:
+                stats.max_rows = rows
+            if error:
+                stats.errors += 1
+
+    def _on_response(self, response, *args, **kwds):
+        # requests response hook, installed on the requests session of
+        # each profiled koji.ClientSession
+        wire = self._wire
+        body = response.request.body
+        wire.request += len(body) if body else 0
+        wire.response += int(response.headers.get("Content-Length") or 0)
+
+    def _take_wire(self) -> Tuple[int, int]:
+        wire = self._wire
+        found = (wire.request, wire.response)
+        wire.request = wire.response = 0
+        return found
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        The collected statistics, by method name, as plain data. The
+        histogram buckets are cumulative, keyed by their upper bound.
+        """
+
+        bounds = [str(bound) for bound in self.bounds] + ["+Inf"]
+
+        with self._lock:
+            found = {}
+            for method, stats in sorted(self._stats.items()):
+                total = 0
+                buckets = {}
+                for bound, count in zip(bounds, stats.buckets):
+                    total += count
+                    buckets[bound] = total
+
+                found[method] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "seconds": stats.seconds,
+                    "buckets": buckets,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                    "rows": stats.rows,
+                    "max_rows": stats.max_rows,
+                }
+
+        return found
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """
+        The collected statistics as a JSON document
+        """
+
+        return dumps({"methods": self.snapshot()}, indent=indent)
+
+    def to_prometheus(self, prefix: str = "koji_client") -> str:
+        """
+        The collected statistics in the Prometheus text exposition
+        format
+        """
+
+        snap = self.snapshot()
+        lines: List[str] = []
+
+        def metric(name, kind, desc, samples):
+            lines.append(f"# HELP {prefix}_{name} {desc}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(f"{prefix}_{sample}" for sample in samples)
+
+        metric("calls_total", "counter", "Hub calls made, by method",
+               (f'calls_total{{method="{m}"}} {s["count"]}'
+                for m, s in snap.items()))
+
+        metric("call_errors_total", "counter",
+               "Hub calls which raised an exception, by method",
+               (f'call_errors_total{{method="{m}"}} {s["errors"]}'
+                for m, s in snap.items()))
+
+        def histogram():
+            for m, s in snap.items():
+                for bound, count in s["buckets"].items():
+                    yield (f'call_seconds_bucket{{method="{m}",'
+                           f'le="{bound}"}} {count}')
+                yield f'call_seconds_sum{{method="{m}"}} {s["seconds"]}'
+                yield f'call_seconds_count{{method="{m}"}} {s["count"]}'
+
+        metric("call_seconds", "histogram",
+               "Latency of hub calls in seconds, by method", histogram())
+
+        metric("request_bytes_total", "counter",
+               "Bytes sent in hub call requests, by method",
+               (f'request_bytes_total{{method="{m}"}}'
+                f' {s["request_bytes"]}' for m, s in snap.items()))
+
+        metric("response_bytes_total", "counter",
+               "Bytes received in hub call responses, by method",
+               (f'response_bytes_total{{method="{m}"}}'
+                f' {s["response_bytes"]}' for m, s in snap.items()))
+
+        metric("result_rows_total", "counter",
+               "Rows in the results of hub calls, by method",
+               (f'result_rows_total{{method="{m}"}} {s["rows"]}'
+                for m, s in snap.items()))
+
+        lines.append("")
+        return "\n".join(lines)
+
+
+class _ProfiledMethod:
+
+    __slots__ = ("_profiler", "_session", "_name", "_fn", )
+
+    def __init__(self, profiler: CallProfiler, session, name: str, fn):
+        self._profiler = profiler
+        self._session = session
+        self._name = name
+        self._fn = fn
+
+    def __call__(self, *args, **kwds):
+        profiler = self._profiler
+        if not profiler.enabled:
+            return self._fn(*args, **kwds)
+
+        rsession = getattr(self._session, "rsession", None)
+        if rsession is not None:
+            hooks = rsession.hooks["response"]
+            if profiler._on_response not in hooks:
+                hooks.append(profiler._on_response)
+            profiler._take_wire()
+
+        start = perf_counter()
+        try:
+            result = self._fn(*args, **kwds)
+        except Exception:
+            sent, received = profiler._take_wire()
+            profiler.record(self._name, perf_counter() - start, error=True,
+                            request_bytes=sent, response_bytes=received)
+            raise
+
+        sent, received = profiler._take_wire()
+        profiler.record(self._name, perf_counter() - start, result,
+                        request_bytes=sent, response_bytes=received)
+        return result
+
+    def __repr__(self):
+        return f"<_ProfiledMethod {self._name}>"
+
+
+class _ProfiledHost:
+
+    __slots__ = ("_outer", "_host", )
+
+    def __init__(self, outer: "ProfiledSession", host):
+        self._outer = outer
+        self._host = host
+
+    def __getattr__(self, name: str) -> Any:
+        fn = getattr(self._host, name)
+
+        outer = self._outer
+        method = f"host.{name}"
+        if method in outer.profiler.methods:
+            fn = _ProfiledMethod(outer.profiler, outer.session, method, fn)
+        return fn
+
+
+class ProfiledSession(ClientSessionProtocol):
+    """
+    Wraps a session, recording the statistics of each hub method
+    called through it into a `CallProfiler`
+
+    :param session: the session to wrap
+
+    :param profiler: the profiler to record into. A new one is created
+      if not given.
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            profiler: Optional[CallProfiler] = None):
+
+        self.session = session
+        self.profiler = profiler if profiler is not None else CallProfiler()
+
+    def __getattr__(self, name: str) -> Any:
+        fn = getattr(self.session, name)
+
+        profiler = self.profiler
+        if name in profiler.methods:
+            # kept on the instance, so that later lookups of the same
+            # hub method never reach __getattr__ again
+            fn = _ProfiledMethod(profiler, self.session, name, fn)
+            self.__dict__[name] = fn
+        return fn
+
+    @property
+    def host(self):
+        return _ProfiledHost(self, self.session.host)
+
+    def callMethod(self, name: str, *args, **kwds) -> Any:
+        """
+        Invoke the named hub method, recording its statistics if it is
+        one declared by the protocols
+        """
+
+        profiler = self.profiler
+        fn = self.session.callMethod
+        if profiler.enabled and name in profiler.methods:
+            return _ProfiledMethod(profiler, self.session, name, fn)(
+                name, *args, **kwds)
+        return fn(name, *args, **kwds)
+
+    def multicall(self, *args, **kwds) -> "ProfiledMultiCall":
+        """
+        Start a multicall on the wrapped session, as with
+        `koji.ClientSession.multicall`, recording the statistics of
+        each call within it
+        """
+
+        return ProfiledMultiCall(self.session.multicall(*args, **kwds),
+                                 self.profiler, self.session)
+
+
+class ProfiledMultiCall(MultiCallSessionProtocol):
+    """
+    Wraps a `koji.MultiCallSession`. Each hub method called through it
+    is counted, and once the multicall has been sent, is given an equal
+    share of the time it took, along with the number of rows in its
+    own result. The multicall itself is recorded as ``multiCall``.
+
+    :param mc: the multicall session to wrap
+
+    :param profiler: the profiler to record into
+
+    :param session: the session the multicall was started from, which
+      is used to measure the size of the multicall on the wire
+    """
+
+    def __init__(
+            self,
+            mc,
+            profiler: CallProfiler,
+            session: Optional["ClientSession"] = None):
+
+        self.mc = mc
+        self.profiler = profiler
+        self.session = session
+        self._pending: List[Tuple[str, Any]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        fn = getattr(self.mc, name)
+
+        profiler = self.profiler
+        if profiler.enabled and name in profiler.methods:
+            return _QueuedMethod(self, name, fn)
+        return fn
+
+    def _queue(self, name, vcall):
+        self._pending.append((name, vcall))
+
+    def call_all(self, strict: Optional[bool] = None) -> List[Any]:
+        """
+        Send the queued calls, as with
+        `koji.MultiCallSession.call_all`, and record their statistics
+        """
+
+        profiler = self.profiler
+        pending, self._pending = self._pending, []
+
+        if not (profiler.enabled and pending):
+            return self.mc.call_all(strict=strict)
+
+        rsession = getattr(self.session, "rsession", None)
+        if rsession is not None:
+            hooks = rsession.hooks["response"]
+            if profiler._on_response not in hooks:
+                hooks.append(profiler._on_response)
+        profiler._take_wire()
+
+        start = perf_counter()
+        try:
+            return self.mc.call_all(strict=strict)
+
+        finally:
+            elapsed = perf_counter() - start
+            sent, received = profiler._take_wire()
+            profiler.record("multiCall", elapsed, pending,
+                            request_bytes=sent, response_bytes=received)
+
+            share = elapsed / len(pending)
+            for name, vcall in pending:
+                try:
+                    result = vcall.result
+                except Exception:
+                    profiler.record(name, share, error=True)
+                else:
+                    profiler.record(name, share, result)
+
+    def __enter__(self) -> "ProfiledMultiCall":
+        return self
+
+    def __exit__(self, _type, value, _tb) -> None:
+        if _type is None:
+            self.call_all()
+
+
+class _QueuedMethod:
+
+    __slots__ = ("_outer", "_name", "_fn", )
+
+    def __init__(self, outer: ProfiledMultiCall, name: str, fn):
+        self._outer = outer
+        self._name = name
+        self._fn = fn
+
+    def __call__(self, *args, **kwds):
+        vcall = self._fn(*args, **kwds)
+        self._outer._queue(self._name, vcall)
+        return vcall
+
+
+# The end.
@@ -0,0 +1,363 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - local build metadata mirror
+
+A `BuildMirror` keeps `BuildInfo`, `RPMInfo`, and `ArchiveInfo` records
+in a SQLite database, keyed by their IDs, with secondary indexes on
+build NVR and package name, RPM NVRA and payload hash, and archive
+checksum. Once populated, lookups by any of these are answered from
+the local file rather than the hub.
+
+The mirror is brought up to date by `BuildMirror.sync`, which fetches
+only the builds completed since the previous sync, along with their
+RPMs and archives, and re-fetches any builds tagged or untagged since
+the previous sync's event, as reported by ``queryHistory``.
+
+::
+
+    mirror = BuildMirror("builds.sqlite")
+    mirror.sync(session)
+
+    bld = mirror.get_build_by_nvr("bash-5.2.26-3.fc40")
+    rpms = mirror.rpms_by_payloadhash(sigmd5)
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import sqlite3
+
+from datetime import datetime, timezone
+from threading import Lock
+from typing import (
+    TYPE_CHECKING, Any, Iterable, List, NamedTuple, Optional, Set, )
+
+from . import (
+    ArchiveID, ArchiveInfo, BuildID, BuildInfo, EventID, RPMID, RPMInfo, )
+from .cache import decode_result, encode_result
+from .multicall import multicall_map
+from .paging import paginate
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+
+
+__all__ = (
+    "BuildMirror",
+    "SyncResult",
+)
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS builds ("
+    " id INTEGER PRIMARY KEY,"
+    " nvr TEXT NOT NULL,"
+    " package_name TEXT NOT NULL,"
+    " completion_ts REAL,"
+    " data BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS builds_nvr ON builds (nvr)",
+    "CREATE INDEX IF NOT EXISTS builds_package ON builds (package_name)",
+
+    "CREATE TABLE IF NOT EXISTS rpms ("
+    " id INTEGER PRIMARY KEY,"
+    " build_id INTEGER,"
+    " nvra TEXT NOT NULL,"
+    " payloadhash TEXT,"
+    " data BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS rpms_build ON rpms (build_id)",
+    "CREATE INDEX IF NOT EXISTS rpms_nvra ON rpms (nvra)",
+    "CREATE INDEX IF NOT EXISTS rpms_payloadhash ON rpms (payloadhash)",
+
+    "CREATE TABLE IF NOT EXISTS archives ("
+    " id INTEGER PRIMARY KEY,"
+    " build_id INTEGER,"
+    " filename TEXT NOT NULL,"
+    " checksum TEXT,"
+    " data BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS archives_build ON archives (build_id)",
+    "CREATE INDEX IF NOT EXISTS archives_checksum ON archives (checksum)",
+
+    "CREATE TABLE IF NOT EXISTS watermarks ("
+    " name TEXT PRIMARY KEY,"
+    " value REAL NOT NULL)",
+)
+
+
+class SyncResult(NamedTuple):
+    builds: int
+    """ the number of builds added or updated """
+
+    rpms: int
+    """ the number of RPMs added or updated """
+
+    archives: int
+    """ the number of archives added or updated """
+
+    event: EventID
+    """ the event the mirror is now current as of """
+
+
+def _nvra(rpm: RPMInfo) -> str:
+    return f"{rpm['name']}-{rpm['version']}-{rpm['release']}.{rpm['arch']}"
+
+
+class BuildMirror:
+    """
+    A local store of build, RPM, and archive metadata in a single
+    SQLite database file
+
+    :param filename: the database file, which is created if it does
+      not exist
+
+    :param mmap_size: the number of bytes of the database file for
+      SQLite to memory-map, which speeds up lookups against a large
+      mirror. Zero disables memory-mapping.
+    """
+
+    def __init__(self, filename: str, mmap_size: int = 1 << 28):
+        self.filename = filename
+        self._lock = Lock()
+        self._db = sqlite3.connect(filename, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "BuildMirror":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _select(self, query: str, *params: Any) -> List[Any]:
+        with self._lock:
+            cur = self._db.execute(query, params)
+            return [decode_result(data) for (data, ) in cur.fetchall()]
+
+    def _select_one(self, query: str, *params: Any) -> Any:
+        found = self._select(query, *params)
+        return found[0] if found else None
+
+    def watermark(self, name: str) -> Optional[float]:
+        """
+        The value of a named watermark, or None if it was never set
+        """
+
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT value FROM watermarks WHERE name = ?", (name, ))
+            found = cur.fetchone()
+        return found[0] if found else None
+
+    def set_watermark(self, name: str, value: float) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watermarks VALUES (?, ?)",
+                (name, value))
+
+    def add_builds(self, builds: Iterable[BuildInfo]) -> int:
+        """
+        Add or replace build records. Returns the number stored.
+        """
+
+        rows = [(bld["id"], bld["nvr"], bld["package_name"],
+                 bld.get("completion_ts"), encode_result(bld))
+                for bld in builds]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def add_rpms(self, rpms: Iterable[RPMInfo]) -> int:
+        """
+        Add or replace RPM records. Returns the number stored.
+        """
+
+        rows = [(rpm["id"], rpm["build_id"], _nvra(rpm),
+                 rpm.get("payloadhash"), encode_result(rpm))
+                for rpm in rpms]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO rpms VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def add_archives(self, archives: Iterable[ArchiveInfo]) -> int:
+        """
+        Add or replace archive records. Returns the number stored.
+        """
+
+        rows = [(arc["id"], arc["build_id"], arc["filename"],
+                 arc.get("checksum"), encode_result(arc))
+                for arc in archives]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?, ?)",
+                rows)
+        return len(rows)
+
+    def get_build(self, build_id: BuildID) -> Optional[BuildInfo]:
+        return self._select_one(
+            "SELECT data FROM builds WHERE id = ?", build_id)
+
+    def get_build_by_nvr(self, nvr: str) -> Optional[BuildInfo]:
+        return self._select_one(
+            "SELECT data FROM builds WHERE nvr = ?"
+            " ORDER BY id DESC LIMIT 1", nvr)
+
+    def builds_by_package(self, package_name: str) -> List[BuildInfo]:
+        """
+        The builds of a package, in order of ID
+        """
+
+        return self._select(
+            "SELECT data FROM builds WHERE package_name = ?"
+            " ORDER BY id", package_name)
+
+    def get_rpm(self, rpm_id: RPMID) -> Optional[RPMInfo]:
+        return self._select_one(
+            "SELECT data FROM rpms WHERE id = ?", rpm_id)
+
+    def rpms_by_nvra(self, nvra: str) -> List[RPMInfo]:
+        """
+        The RPMs with the given ``name-version-release.arch``. There
+        may be more than one, from different external repositories.
+        """
+
+        return self._select(
+            "SELECT data FROM rpms WHERE nvra = ? ORDER BY id", nvra)
+
+    def rpms_by_build(self, build_id: BuildID) -> List[RPMInfo]:
+        return self._select(
+            "SELECT data FROM rpms WHERE build_id = ? ORDER BY id",
+            build_id)
+
+    def rpms_by_payloadhash(self, payloadhash: str) -> List[RPMInfo]:
+        return self._select(
+            "SELECT data FROM rpms WHERE payloadhash = ? ORDER BY id",
+            payloadhash)
+
+    def get_archive(self, archive_id: ArchiveID) -> Optional[ArchiveInfo]:
+        return self._select_one(
+            "SELECT data FROM archives WHERE id = ?", archive_id)
+
+    def archives_by_build(self, build_id: BuildID) -> List[ArchiveInfo]:
+        return self._select(
+            "SELECT data FROM archives WHERE build_id = ? ORDER BY id",
+            build_id)
+
+    def archives_by_checksum(self, checksum: str) -> List[ArchiveInfo]:
+        return self._select(
+            "SELECT data FROM archives WHERE checksum = ? ORDER BY id",
+            checksum)
+
+    def sync(
+            self,
+            session: "ClientSession",
+            size: int = 100,
+            page_size: int = 1000) -> SyncResult:
+        """
+        Bring the mirror up to date. Builds completed since the latest
+        completion time already in the mirror are fetched with
+        ``listBuilds(completeAfter=...)``, then their RPMs and archives
+        by multicall. Builds tagged or untagged since the event of the
+        previous sync are found with ``queryHistory``, and re-fetched
+        in case their state has changed, eg. by being deleted.
+
+        :param session: the session to fetch with
+
+        :param size: the number of calls in each multicall
+
+        :param page_size: the number of builds fetched per page
+        """
+
+        # taken first, so that nothing between it and the end of the
+        # sync can be missed by the next one
+        event = session.getLastEvent()["id"]
+
+        completed = self.watermark("completion_ts")
+        after = None
+        if completed is not None:
+            # completeAfter is exclusive, and builds completing in the
+            # same second may not all have been seen, so step back
+            when = datetime.fromtimestamp(completed - 1, timezone.utc)
+            after = when.isoformat(" ")
+
+        builds = list(paginate(
+            session,
+            lambda s, opts: s.listBuilds(completeAfter=after, queryOpts=opts),
+            page_size=page_size, prefetch=False))
+
+        since = self.watermark("event")
+        if since is not None:
+            seen = {bld["id"] for bld in builds}
+            builds.extend(self._touched(session, int(since), seen, size))
+
+        build_ids = [bld["id"] for bld in builds]
+
+        rpms: Iterable[List[RPMInfo]] = multicall_map(
+            session, lambda mc, b: mc.listRPMs(buildID=b),
+            build_ids, size=size, strict=True)
+        rpm_count = self.add_rpms(rpm for found in rpms for rpm in found)
+
+        archives: Iterable[List[ArchiveInfo]] = multicall_map(
+            session, lambda mc, b: mc.listArchives(buildID=b),
+            build_ids, size=size, strict=True)
+        archive_count = self.add_archives(
+            arc for found in archives for arc in found)
+
+        # builds are stored last, so that an interrupted sync is
+        # repeated by the next one
+        build_count = self.add_builds(builds)
+
+        latest = max((bld.get("completion_ts") or 0 for bld in builds),
+                     default=0)
+        if latest and (completed is None or latest > completed):
+            self.set_watermark("completion_ts", latest)
+        self.set_watermark("event", event)
+
+        return SyncResult(build_count, rpm_count, archive_count, event)
+
+    def _touched(
+            self,
+            session: "ClientSession",
+            since: int,
+            seen: Set[BuildID],
+            size: int) -> List[BuildInfo]:
+
+        history = session.queryHistory(tables=["tag_listing"],
+                                       afterEvent=since)
+
+        touched = []
+        for entry in history.get("tag_listing", ()):
+            build_id = entry.get("build_id")
+            if build_id is not None and build_id not in seen:
+                seen.add(build_id)
+                touched.append(build_id)
+
+        found: Iterable[Optional[BuildInfo]] = multicall_map(
+            session, lambda mc, b: mc.getBuild(b),
+            touched, size=size, strict=True)
+        return [bld for bld in found if bld]
+
+
+# The end.
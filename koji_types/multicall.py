@@ -0,0 +1,242 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - automatic multicall batching
+
+Helpers for making a very large number of calls, such as thousands of
+``getBuild`` lookups, as a series of multicalls. The calls are
+consumed lazily and grouped into chunks of a configurable size, each
+of which becomes a single multicall. Chunks may optionally be run
+concurrently, with each worker thread using its own session.
+
+Calls are given as functions accepting a `MultiCallSession`, so that
+the type of each result is preserved from the protocol declarations,
+eg.
+
+::
+
+    builds = multicall_map(session, lambda mc, b: mc.getBuild(b), ids)
+
+    for bld in builds:
+        # bld is Optional[BuildInfo]
+        ...
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from threading import local
+from typing import (
+    TYPE_CHECKING, Any, Callable, Deque, Iterable, Iterator, List,
+    TypeVar, )
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession, VirtualCall
+    from .protocols import MultiCallSession
+
+
+__all__ = (
+    "DEFAULT_SIZE",
+    "chunked",
+    "multicall_calls",
+    "multicall_map",
+)
+
+
+A = TypeVar("A")
+T = TypeVar("T")
+
+
+DEFAULT_SIZE = 100
+"""
+The default number of calls to place in each multicall
+"""
+
+
+def chunked(data: Iterable[A], size: int) -> Iterator[List[A]]:
+    """
+    Lazily split an iterable into lists of at most size items
+    """
+
+    if size < 1:
+        raise ValueError(f"invalid chunk size {size!r}")
+
+    it = iter(data)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_chunk(
+        session: "ClientSession",
+        chunk: List[Callable[["MultiCallSession"], "VirtualCall[T]"]],
+        strict: bool) -> List["VirtualCall[T]"]:
+    """
+    Run a single chunk of calls as one multicall, returning the
+    completed VirtualCall instances
+    """
+
+    with session.multicall(strict=strict) as mc:
+        return [call(mc) for call in chunk]
+
+
+def _subsession(session: "ClientSession") -> "ClientSession":
+    """
+    A new session for use by a worker thread. For an authenticated
+    session this is a hub subsession. Anonymous sessions cannot create
+    subsessions, so a new anonymous session with the same options is
+    used instead.
+    """
+
+    if session.logged_in:
+        return session.subsession()
+    else:
+        return type(session)(session.baseurl, opts=session.opts)
+
+
+def _close(session: "ClientSession", parent: "ClientSession"):
+    if session.logged_in and session is not parent:
+        session.logout()
+
+
+class _WorkerSessions:
+    """
+    Provides a separate session for each worker thread, created on
+    first use from a parent session
+    """
+
+    def __init__(self, session: "ClientSession"):
+        self.session = session
+        self._local = local()
+        self._created: List["ClientSession"] = []
+
+    def get(self) -> "ClientSession":
+        sub = getattr(self._local, "session", None)
+        if sub is None:
+            sub = self._local.session = _subsession(self.session)
+            self._created.append(sub)
+        return sub
+
+    def close(self):
+        created, self._created = self._created, []
+        for sub in created:
+            _close(sub, self.session)
+
+
+def multicall_calls(
+        session: "ClientSession",
+        calls: Iterable[Callable[["MultiCallSession"], "VirtualCall[T]"]],
+        size: int = DEFAULT_SIZE,
+        workers: int = 1,
+        strict: bool = False) -> Iterator["VirtualCall[T]"]:
+    """
+    Invoke each of the given calls against a multicall session, in
+    chunks of at most size calls per multicall. Yields the completed
+    VirtualCall for each, in the same order as the calls were given.
+    Accessing the ``result`` of a VirtualCall whose call failed will
+    raise the appropriate koji exception.
+
+    Calls are consumed lazily, and no more than twice the number of
+    workers chunks are in flight at any one time.
+
+    :param session: the session to make the calls with
+
+    :param calls: functions which make a single call against the given
+      MultiCallSession, returning its VirtualCall
+
+    :param size: the number of calls in each multicall
+
+    :param workers: the number of chunks to run concurrently. When
+      greater than one, each worker thread uses its own session
+      obtained from ``session``, which is logged out once the calls
+      are exhausted.
+
+    :param strict: whether a failing call raises an exception as soon
+      as its chunk completes, rather than when its result is accessed
+    """
+
+    chunks = chunked(calls, size)
+
+    if workers < 2:
+        for chunk in chunks:
+            yield from _run_chunk(session, chunk, strict)
+        return
+
+    sessions = _WorkerSessions(session)
+
+    def work(chunk):
+        return _run_chunk(sessions.get(), chunk, strict)
+
+    pending: Deque[Future] = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                for chunk in chunks:
+                    pending.append(pool.submit(work, chunk))
+                    if len(pending) >= workers * 2:
+                        yield from pending.popleft().result()
+
+                while pending:
+                    yield from pending.popleft().result()
+
+            finally:
+                # if we're being abandoned early, don't bother running
+                # any chunks which haven't started yet
+                for fut in pending:
+                    fut.cancel()
+
+    finally:
+        sessions.close()
+
+
+def multicall_map(
+        session: "ClientSession",
+        fn: Callable[["MultiCallSession", A], "VirtualCall[T]"],
+        args: Iterable[A],
+        size: int = DEFAULT_SIZE,
+        workers: int = 1,
+        strict: bool = False) -> Iterator[T]:
+    """
+    Invoke fn against a multicall session once for each of args,
+    yielding the results in the same order as args. The first failed
+    call will raise its koji exception when its result is reached.
+
+    See `multicall_calls` for the size, workers, and strict options.
+
+    :param session: the session to make the calls with
+
+    :param fn: function accepting a MultiCallSession and a single
+      argument, and returning the VirtualCall for that argument
+
+    :param args: the arguments to invoke fn with
+    """
+
+    def bind(arg: A) -> Callable[[Any], "VirtualCall[T]"]:
+        return lambda mc: fn(mc, arg)
+
+    found = multicall_calls(session, map(bind, args),
+                            size=size, workers=workers, strict=strict)
+    for vc in found:
+        yield vc.result
+
+
+# The end.
@@ -0,0 +1,268 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - paginated results
+
+Iterates over the results of any hub call which accepts a
+``queryOpts`` argument, such as ``listBuilds`` or ``listRPMs``, by
+fetching them in fixed-size pages using the ``limit``, ``offset``, and
+``order`` query options. Only the current page and the next are held
+at any one time, so memory use remains bounded however large the
+full result is.
+
+The call is given as a function accepting a session and the
+`QueryOptions` for a page, so that the type of each record is
+preserved from the protocol declarations, eg.
+
+::
+
+    builds = paginate(session,
+                      lambda s, opts: s.listBuilds(state=1,
+                                                   queryOpts=opts))
+
+    for bld in builds:
+        # bld is BuildInfo
+        ...
+
+For very large results, `plan_counts` can be used to count the
+results of several queries at once, and decide how many pages to
+fetch concurrently for each.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from math import ceil
+from typing import (
+    TYPE_CHECKING, Callable, Deque, Iterable, Iterator, List,
+    NamedTuple, Optional, TypeVar, )
+
+from . import CountOnlyOptions, QueryOptions
+from .multicall import _WorkerSessions
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession, VirtualCall
+    from .protocols import MultiCallSession
+
+
+__all__ = (
+    "DEFAULT_PAGE_SIZE",
+    "FetchPlan",
+    "paginate",
+    "plan_counts",
+    "plan_fetch",
+)
+
+
+T = TypeVar("T")
+
+PageFetch = Callable[["ClientSession", QueryOptions], List[T]]
+
+CountFetch = Callable[["MultiCallSession", CountOnlyOptions],
+                      "VirtualCall[int]"]
+
+
+DEFAULT_PAGE_SIZE = 1000
+"""
+The default number of records to fetch in each page
+"""
+
+
+def _page_opts(
+        options: Optional[QueryOptions],
+        order: str,
+        limit: int,
+        offset: int) -> QueryOptions:
+
+    opts: QueryOptions = {}
+    if options:
+        opts.update(options)
+    opts["order"] = order
+    opts["limit"] = limit
+    opts["offset"] = offset
+    return opts
+
+
+def paginate(
+        session: "ClientSession",
+        fetch: PageFetch[T],
+        order: str = "id",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        options: Optional[QueryOptions] = None,
+        workers: int = 1) -> Iterator[T]:
+    """
+    Yields each record of a paginated hub call, in order.
+
+    The order should be a key which uniquely identifies each record,
+    such as ``id``, so that the pages are stable. Records created or
+    removed while paging may still cause others to be skipped or
+    repeated, as the hub only supports paging by offset.
+
+    :param session: the session to make the calls with
+
+    :param fetch: function accepting a session and the query options
+      for a page, and returning the records for that page
+
+    :param order: the key to order the records by
+
+    :param page_size: the number of records in each page
+
+    :param prefetch: whether to fetch upcoming pages in the background
+      while the current page is being consumed. The background fetches
+      are made using separate sessions obtained from ``session``, so
+      that ``session`` remains free for use by the consumer.
+
+    :param options: additional query options to apply to each page,
+      which must not include ``countOnly``
+
+    :param workers: when prefetching, the number of pages to fetch
+      concurrently. At most this many pages, plus the current page,
+      are held at once. See `plan_fetch`
+    """
+
+    if page_size < 1:
+        raise ValueError(f"invalid page size {page_size!r}")
+
+    if options and options.get("countOnly"):
+        raise ValueError("cannot paginate a countOnly query")
+
+    if not prefetch:
+        offset = 0
+        while True:
+            page = fetch(session, _page_opts(options, order,
+                                             page_size, offset))
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    sessions = _WorkerSessions(session)
+
+    def fetch_page(offset: int) -> List[T]:
+        return fetch(sessions.get(), _page_opts(options, order,
+                                                page_size, offset))
+
+    pending: Deque[Future] = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            try:
+                offset = 0
+                for _ in range(max(1, workers)):
+                    pending.append(pool.submit(fetch_page, offset))
+                    offset += page_size
+
+                while pending:
+                    page = pending.popleft().result()
+                    if len(page) < page_size:
+                        # this was the last page, so anything after it
+                        # will be empty
+                        for fut in pending:
+                            fut.cancel()
+                        pending.clear()
+                    else:
+                        pending.append(pool.submit(fetch_page, offset))
+                        offset += page_size
+
+                    yield from page
+                    del page
+
+            finally:
+                for fut in pending:
+                    fut.cancel()
+
+    finally:
+        sessions.close()
+
+
+class FetchPlan(NamedTuple):
+    """
+    How to fetch the results of a query, given its count
+    """
+
+    total: int
+    page_size: int
+    workers: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, ceil(self.total / self.page_size))
+
+
+def plan_fetch(
+        count: int,
+        max_workers: int = 4,
+        min_page_size: int = 100,
+        max_page_size: int = DEFAULT_PAGE_SIZE) -> FetchPlan:
+    """
+    Decide the page size and number of concurrent workers for
+    fetching count records.
+
+    Results small enough to fit in a single page are fetched in one
+    page by a single worker. Otherwise the page size is chosen so that
+    each worker would fetch around four pages, keeping the workers
+    evenly busy, while remaining between the minimum page size (to
+    limit the number of requests) and the maximum (to limit memory).
+    """
+
+    if count <= min_page_size:
+        return FetchPlan(count, min_page_size, 1)
+
+    page_size = ceil(count / (max_workers * 4))
+    page_size = max(min_page_size, min(max_page_size, page_size))
+
+    pages = ceil(count / page_size)
+    return FetchPlan(count, page_size, max(1, min(max_workers, pages)))
+
+
+def plan_counts(
+        session: "ClientSession",
+        counts: Iterable[CountFetch],
+        max_workers: int = 4,
+        min_page_size: int = 100,
+        max_page_size: int = DEFAULT_PAGE_SIZE) -> List[FetchPlan]:
+    """
+    Count the results of many queries in a single multicall, and
+    produce a `FetchPlan` for each via `plan_fetch`. The plans can then
+    be given to `paginate` as its page_size and workers. eg.
+
+    ::
+
+        plans = plan_counts(session, [
+            lambda mc, opts: mc.listBuilds(state=1, queryOpts=opts),
+            lambda mc, opts: mc.listRPMs(arches="src", queryOpts=opts),
+        ])
+
+    :param counts: functions accepting a MultiCallSession and the
+      countOnly query options, and returning the VirtualCall for the
+      count
+    """
+
+    opts: CountOnlyOptions = {"countOnly": True}
+
+    with session.multicall(strict=True) as mc:
+        found = [count(mc, opts) for count in counts]
+
+    return [plan_fetch(vc.result, max_workers=max_workers,
+                       min_page_size=min_page_size,
+                       max_page_size=max_page_size)
+            for vc in found]
+
+
+# The end.
@@ -22,12 +22,16 @@ all of the various methods listed. However, we don't want the abstract
 definitions of a Protocol to prevent subclass instantiation, so at
 runtime these are just empty classes.
 
+The names of the declared hub methods, grouped by domain, are provided
+at runtime by the `koji_types.protocols.registry` module
+
 :author: Christopher O'Brien  <obriencj@gmail.com>
 :license: GPL v3
 """
 
 
 __all__ = (
+    "AsyncClientSession",
     "ClientSession",
     "MultiCallSession",
 )
@@ -49,4 +53,12 @@ class MultiCallHost:
     pass
 
 
+class AsyncClientSession:
+    pass
+
+
+class AsyncHost:
+    pass
+
+
 # The end.
@@ -18,11 +18,11 @@ Koji Types - Client Session Protocol method declarations
 :author: Christopher O'Brien <obriencj@gmail.com>
 :license: GPL v3
 """
-from . import ArchiveFileInfo, ArchiveID, ArchiveInfo, ATypeID, ATypeInfo, BuildSpecifier, BuildID, BuildLogs, BuildInfo, BuildNVR, BuildrootID, BuildrootInfo, BuildrootState, BuildState, BTypeInfo, ChangelogEntry, ChannelID, ChannelInfo, ChecksumType, CGID, CGInfo, CGInitInfo, Data, ExternalRepoID, ExternalRepoInfo, EventID, EventInfo, FaultInfo, FilterOptions, HostID, HostInfo, Identifier, ListTasksOptions, MavenInfo, NamedID, NotificationID, OldNew, PackageID, PackageInfo, PermID, PermInfo, POMInfo, QueryOptions, RepoID, RepoInfo, RepoOptions, RepoState, RPMDepType, RPMDepInfo, RPMFileInfo, RPMID, RPMInfo, RPMNVRA, RPMSignature, RPMSigTag, SearchResult, SessionInfo, TagBuildInfo, TagGroupID, TagGroupInfo, TagID, TagInfo, TagInheritance, TagExternalRepos, TagPackageInfo, TagPackageSimple, TargetID, TargetInfo, TaskID, TaskInfo, UserGroup, UserID, UserInfo, UserStatusValue, UserType, WinInfo
-from .arch import Arch
+from .. import ArchiveFileInfo, ArchiveID, ArchiveInfo, ATypeID, ATypeInfo, BuildSpecifier, BuildID, BuildLogs, BuildInfo, BuildNVR, BuildrootID, BuildrootInfo, BuildrootState, BuildState, BTypeInfo, ChangelogEntry, ChannelID, ChannelInfo, ChecksumType, CGID, CGInfo, CGInitInfo, CountOnlyOptions, Data, ExternalRepoID, ExternalRepoInfo, EventID, EventInfo, FaultInfo, FilterOptions, HostID, HostInfo, Identifier, ListTasksOptions, MavenInfo, NamedID, NotificationID, OldNew, PackageID, PackageInfo, PermID, PermInfo, POMInfo, QueryOptions, RepoID, RepoInfo, RepoOptions, RepoState, RPMDepType, RPMDepInfo, RPMFileInfo, RPMID, RPMInfo, RPMNVRA, RPMSignature, RPMSigTag, SearchResult, SessionInfo, TagBuildInfo, TagGroupID, TagGroupInfo, TagID, TagInfo, TagInheritance, TagExternalRepos, TagPackageInfo, TagPackageSimple, TargetID, TargetInfo, TaskID, TaskInfo, UserGroup, UserID, UserInfo, UserStatusValue, UserType, WinInfo
+from ..arch import Arch
 from datetime import datetime
 from koji import VirtualCall
-from typing import Any, Dict, List, Literal, NoReturn, Optional, Tuple, Union, overload
+from typing import Any, Awaitable, Dict, List, Literal, NoReturn, Optional, Tuple, Union, overload
 
 class ClientSession:
 
@@ -121,7 +121,7 @@ class ClientSession:
     def checkTagPackage(self, tag: Union[str, TagID], pkg: Union[str, PackageID]) -> bool:
         ...
 
-    def checkUpload(self, path: str, name: str, verify: Optional[ChecksumType]=None, tail: Optional[int]=None, volume: Optional[str]=None) -> Data:
+    def checkUpload(self, path: str, name: str, verify: Optional[str]=None, tail: Optional[int]=None, volume: Optional[str]=None) -> Data:
         ...
 
     def count(self, methodName: str, *args: Any, **kw: Any) -> int:
@@ -323,12 +323,22 @@ class ClientSession:
     def getBuildTarget(self, info: Union[str, TargetID], event: Optional[EventID]=None, strict: bool=False) -> Optional[TargetInfo]:
         ...
 
+    @overload
+    def getBuildTargets(self, info: Union[str, TargetID, None]=None, event: Optional[EventID]=None, buildTagID: Union[str, TagID, TagInfo, None]=None, destTagID: Union[str, TagID, TagInfo, None]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def getBuildTargets(self, info: Union[str, TargetID, None]=None, event: Optional[EventID]=None, buildTagID: Union[str, TagID, TagInfo, None]=None, destTagID: Union[str, TagID, TagInfo, None]=None, queryOpts: Optional[QueryOptions]=None) -> List[TargetInfo]:
         ...
 
     def getBuildType(self, buildInfo: BuildSpecifier, strict: bool=False) -> Dict[str, dict]:
         ...
 
+    @overload
+    def getChangelogEntries(self, buildID: Optional[int]=None, taskID: Optional[int]=None, filepath: Optional[str]=None, author: Optional[str]=None, before: Union[datetime, str, int, None]=None, after: Union[datetime, str, int, None]=None, *, queryOpts: CountOnlyOptions, strict: bool=False) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def getChangelogEntries(self, buildID: Optional[int]=None, taskID: Optional[int]=None, filepath: Optional[str]=None, author: Optional[str]=None, before: Union[datetime, str, int, None]=None, after: Union[datetime, str, int, None]=None, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> List[ChangelogEntry]:
         ...
 
@@ -468,6 +478,11 @@ class ClientSession:
     def getRPMChecksums(self, rpm_id: RPMID, checksum_types: Optional[List[ChecksumType]]=None, cacheonly: bool=False) -> Dict[ChecksumType, str]:
         ...
 
+    @overload
+    def getRPMDeps(self, rpmID: RPMID, depType: Optional[RPMDepType]=None, *, queryOpts: CountOnlyOptions, strict: bool=False) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def getRPMDeps(self, rpmID: RPMID, depType: Optional[RPMDepType]=None, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> List[RPMDepInfo]:
         ...
 
@@ -607,21 +622,49 @@ class ClientSession:
     def importRPM(self, path: str, basename: str, sigkey: Optional[str]=None) -> RPMInfo:
         ...
 
+    @overload
+    def listArchives(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, type: Optional[str]=None, filename: Optional[str]=None, size: Optional[int]=None, checksum: Optional[str]=None, checksum_type: Optional[ChecksumType]=None, typeInfo: Optional[Data]=None, *, queryOpts: CountOnlyOptions, imageID: Optional[int]=None, archiveID: Optional[ArchiveID]=None, strict: bool=False) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listArchives(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, type: Optional[str]=None, filename: Optional[str]=None, size: Optional[int]=None, checksum: Optional[str]=None, checksum_type: Optional[ChecksumType]=None, typeInfo: Optional[Data]=None, queryOpts: Optional[QueryOptions]=None, imageID: Optional[int]=None, archiveID: Optional[ArchiveID]=None, strict: bool=False) -> List[ArchiveInfo]:
         ...
 
+    @overload
+    def listArchiveFiles(self, archive_id: ArchiveID, *, queryOpts: CountOnlyOptions, strict: bool=False) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listArchiveFiles(self, archive_id: ArchiveID, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> List[ArchiveFileInfo]:
         ...
 
+    @overload
+    def listBTypes(self, query: Optional[NamedID]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listBTypes(self, query: Optional[NamedID]=None, queryOpts: Optional[QueryOptions]=None) -> List[BTypeInfo]:
         ...
 
     def listBuildRPMs(self, build: BuildSpecifier) -> List[RPMInfo]:
         ...
 
+    @overload
+    def listBuildroots(self, hostID: Optional[HostID]=None, tagID: Optional[TagID]=None, state: Union[BuildrootState, List[BuildrootState], None]=None, rpmID: Optional[RPMID]=None, archiveID: Optional[ArchiveID]=None, taskID: Optional[TaskID]=None, buildrootID: Optional[BuildrootID]=None, repoID: Optional[RepoID]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listBuildroots(self, hostID: Optional[HostID]=None, tagID: Optional[TagID]=None, state: Union[BuildrootState, List[BuildrootState], None]=None, rpmID: Optional[RPMID]=None, archiveID: Optional[ArchiveID]=None, taskID: Optional[TaskID]=None, buildrootID: Optional[BuildrootID]=None, repoID: Optional[RepoID]=None, queryOpts: Optional[QueryOptions]=None) -> List[BuildrootInfo]:
         ...
 
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None, promotedBefore: Optional[str]=None, promotedAfter: Optional[str]=None, promoter: Optional[UserID]=None) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
     @overload
     def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, queryOpts: Optional[QueryOptions]=None, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None) -> List[BuildInfo]:
         ...
@@ -636,21 +679,51 @@ class ClientSession:
     def listChannels(self, hostID: Optional[HostID]=None, event: Optional[EventID]=None, enabled: Optional[bool]=None) -> List[ChannelInfo]:
         ...
 
+    @overload
+    def listExternalRepos(self, info: Union[str, ExternalRepoID, None]=None, url: Optional[str]=None, event: Optional[EventID]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listExternalRepos(self, info: Union[str, ExternalRepoID, None]=None, url: Optional[str]=None, event: Optional[EventID]=None, queryOpts: Optional[QueryOptions]=None) -> List[ExternalRepoInfo]:
         ...
 
+    @overload
+    def listHosts(self, arches: Optional[List[str]]=None, channelID: Union[str, ChannelID, None]=None, ready: Optional[bool]=None, enabled: Optional[bool]=None, userID: Optional[UserID]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listHosts(self, arches: Optional[List[str]]=None, channelID: Union[str, ChannelID, None]=None, ready: Optional[bool]=None, enabled: Optional[bool]=None, userID: Optional[UserID]=None, queryOpts: Optional[QueryOptions]=None) -> List[HostInfo]:
         ...
 
+    @overload
+    def listPackages(self, tagID: Union[str, TagID, None]=None, userID: Union[str, UserID, None]=None, pkgID: Union[str, PackageID, None]=None, prefix: Optional[str]=None, inherited: bool=False, with_dups: bool=False, event: Optional[EventID]=None, *, queryOpts: CountOnlyOptions, with_owners: bool=True, with_blocked: bool=True) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listPackages(self, tagID: Union[str, TagID, None]=None, userID: Union[str, UserID, None]=None, pkgID: Union[str, PackageID, None]=None, prefix: Optional[str]=None, inherited: bool=False, with_dups: bool=False, event: Optional[EventID]=None, queryOpts: Optional[QueryOptions]=None, with_owners: bool=True, with_blocked: bool=True) -> List[TagPackageInfo]:
         ...
 
+    @overload
+    def listPackagesSimple(self, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listPackagesSimple(self, prefix: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> List[TagPackageSimple]:
         ...
 
+    @overload
+    def listRPMFiles(self, rpmID: RPMID, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listRPMFiles(self, rpmID: RPMID, queryOpts: Optional[QueryOptions]=None) -> List[RPMFileInfo]:
         ...
 
+    @overload
+    def listRPMs(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, imageID: Optional[int]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, arches: Union[Arch, List[Arch], None]=None, *, queryOpts: CountOnlyOptions, draft: Optional[bool]=None) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listRPMs(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, imageID: Optional[int]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, arches: Union[Arch, List[Arch], None]=None, queryOpts: Optional[QueryOptions]=None, draft: Optional[bool]=None) -> List[RPMInfo]:
         ...
 
@@ -668,15 +741,33 @@ class ClientSession:
     def listTaggedRPMS(self, tag: Union[str, TagID], event: Optional[EventID]=None, inherit: bool=False, latest: bool=False, package: Optional[str]=None, arch: Optional[Arch]=None, rpmsigs: bool=False, owner: Union[str, UserID, None]=None, type: Optional[str]=None, strict: bool=True, extra: bool=True, draft: Optional[bool]=None) -> Tuple[List[RPMInfo], List[BuildInfo]]:
         ...
 
+    @overload
+    def listTags(self, build: Optional[BuildSpecifier]=None, package: Union[str, PackageID, None]=None, perms: bool=True, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listTags(self, build: Optional[BuildSpecifier]=None, package: Union[str, PackageID, None]=None, perms: bool=True, queryOpts: Optional[QueryOptions]=None, pattern: Optional[str]=None) -> List[TagInfo]:
         ...
 
     def listTaskOutput(self, taskID: TaskID, stat: bool=False, all_volumes: bool=False, strict: bool=False) -> Union[List[str], Dict[str, List[str]], Dict[str, Data], Dict[str, Dict[str, Data]]]:
         ...
 
+    @overload
+    def listTasks(self, opts: Optional[ListTasksOptions]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listTasks(self, opts: Optional[ListTasksOptions]=None, queryOpts: Optional[QueryOptions]=None) -> List[TaskInfo]:
         ...
 
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions, perm: Optional[str]=None, inherited_perm: bool=False) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
     @overload
     def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> List[UserInfo]:
         ...
@@ -739,6 +830,11 @@ class ClientSession:
     def queryHistory(self, tables: Optional[List[str]]=None, **kwargs: Any) -> Dict[str, List[Data]]:
         ...
 
+    @overload
+    def queryRPMSigs(self, rpm_id: Union[RPMID, str, BuildNVR, None]=None, sigkey: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def queryRPMSigs(self, rpm_id: Union[RPMID, str, BuildNVR, None]=None, sigkey: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> List[RPMSignature]:
         ...
 
@@ -787,6 +883,11 @@ class ClientSession:
     def revokePermission(self, userinfo: Union[str, UserID], permission: Union[str, PermID]) -> None:
         ...
 
+    @overload
+    def search(self, terms: str, type: str, matchType: str, *, queryOpts: CountOnlyOptions) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def search(self, terms: str, type: str, matchType: str, queryOpts: Optional[QueryOptions]=None) -> List[SearchResult]:
         ...
 
@@ -856,6 +957,11 @@ class ClientSession:
     def untagBuildBypass(self, tag: Union[str, TagID], build: Union[str, BuildID], strict: bool=True, force: bool=False, notify: bool=False) -> None:
         ...
 
+    @overload
+    def untaggedBuilds(self, name: Optional[str]=None, *, queryOpts: CountOnlyOptions, draft: Optional[bool]=None) -> int: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def untaggedBuilds(self, name: Optional[str]=None, queryOpts: Optional[QueryOptions]=None, draft: Optional[bool]=None) -> List[BuildNVR]:
         ...
 
@@ -1288,7 +1394,7 @@ class MultiCallSession:
     def checkTagPackage(self, tag: Union[str, TagID], pkg: Union[str, PackageID]) -> VirtualCall[bool]:
         ...
 
-    def checkUpload(self, path: str, name: str, verify: Optional[ChecksumType]=None, tail: Optional[int]=None, volume: Optional[str]=None) -> VirtualCall[Data]:
+    def checkUpload(self, path: str, name: str, verify: Optional[str]=None, tail: Optional[int]=None, volume: Optional[str]=None) -> VirtualCall[Data]:
         ...
 
     def count(self, methodName: str, *args: Any, **kw: Any) -> VirtualCall[int]:
@@ -1490,12 +1596,22 @@ class MultiCallSession:
     def getBuildTarget(self, info: Union[str, TargetID], event: Optional[EventID]=None, strict: bool=False) -> VirtualCall[Optional[TargetInfo]]:
         ...
 
+    @overload
+    def getBuildTargets(self, info: Union[str, TargetID, None]=None, event: Optional[EventID]=None, buildTagID: Union[str, TagID, TagInfo, None]=None, destTagID: Union[str, TagID, TagInfo, None]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def getBuildTargets(self, info: Union[str, TargetID, None]=None, event: Optional[EventID]=None, buildTagID: Union[str, TagID, TagInfo, None]=None, destTagID: Union[str, TagID, TagInfo, None]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[TargetInfo]]:
         ...
 
     def getBuildType(self, buildInfo: BuildSpecifier, strict: bool=False) -> VirtualCall[Dict[str, dict]]:
         ...
 
+    @overload
+    def getChangelogEntries(self, buildID: Optional[int]=None, taskID: Optional[int]=None, filepath: Optional[str]=None, author: Optional[str]=None, before: Union[datetime, str, int, None]=None, after: Union[datetime, str, int, None]=None, *, queryOpts: CountOnlyOptions, strict: bool=False) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def getChangelogEntries(self, buildID: Optional[int]=None, taskID: Optional[int]=None, filepath: Optional[str]=None, author: Optional[str]=None, before: Union[datetime, str, int, None]=None, after: Union[datetime, str, int, None]=None, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> VirtualCall[List[ChangelogEntry]]:
         ...
 
@@ -1635,6 +1751,11 @@ class MultiCallSession:
     def getRPMChecksums(self, rpm_id: RPMID, checksum_types: Optional[List[ChecksumType]]=None, cacheonly: bool=False) -> VirtualCall[Dict[ChecksumType, str]]:
         ...
 
+    @overload
+    def getRPMDeps(self, rpmID: RPMID, depType: Optional[RPMDepType]=None, *, queryOpts: CountOnlyOptions, strict: bool=False) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def getRPMDeps(self, rpmID: RPMID, depType: Optional[RPMDepType]=None, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> VirtualCall[List[RPMDepInfo]]:
         ...
 
@@ -1774,21 +1895,49 @@ class MultiCallSession:
     def importRPM(self, path: str, basename: str, sigkey: Optional[str]=None) -> VirtualCall[RPMInfo]:
         ...
 
+    @overload
+    def listArchives(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, type: Optional[str]=None, filename: Optional[str]=None, size: Optional[int]=None, checksum: Optional[str]=None, checksum_type: Optional[ChecksumType]=None, typeInfo: Optional[Data]=None, *, queryOpts: CountOnlyOptions, imageID: Optional[int]=None, archiveID: Optional[ArchiveID]=None, strict: bool=False) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listArchives(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, type: Optional[str]=None, filename: Optional[str]=None, size: Optional[int]=None, checksum: Optional[str]=None, checksum_type: Optional[ChecksumType]=None, typeInfo: Optional[Data]=None, queryOpts: Optional[QueryOptions]=None, imageID: Optional[int]=None, archiveID: Optional[ArchiveID]=None, strict: bool=False) -> VirtualCall[List[ArchiveInfo]]:
         ...
 
+    @overload
+    def listArchiveFiles(self, archive_id: ArchiveID, *, queryOpts: CountOnlyOptions, strict: bool=False) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listArchiveFiles(self, archive_id: ArchiveID, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> VirtualCall[List[ArchiveFileInfo]]:
         ...
 
+    @overload
+    def listBTypes(self, query: Optional[NamedID]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listBTypes(self, query: Optional[NamedID]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[BTypeInfo]]:
         ...
 
     def listBuildRPMs(self, build: BuildSpecifier) -> VirtualCall[List[RPMInfo]]:
         ...
 
+    @overload
+    def listBuildroots(self, hostID: Optional[HostID]=None, tagID: Optional[TagID]=None, state: Union[BuildrootState, List[BuildrootState], None]=None, rpmID: Optional[RPMID]=None, archiveID: Optional[ArchiveID]=None, taskID: Optional[TaskID]=None, buildrootID: Optional[BuildrootID]=None, repoID: Optional[RepoID]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listBuildroots(self, hostID: Optional[HostID]=None, tagID: Optional[TagID]=None, state: Union[BuildrootState, List[BuildrootState], None]=None, rpmID: Optional[RPMID]=None, archiveID: Optional[ArchiveID]=None, taskID: Optional[TaskID]=None, buildrootID: Optional[BuildrootID]=None, repoID: Optional[RepoID]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[BuildrootInfo]]:
         ...
 
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None, promotedBefore: Optional[str]=None, promotedAfter: Optional[str]=None, promoter: Optional[UserID]=None) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
     @overload
     def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, queryOpts: Optional[QueryOptions]=None, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None) -> VirtualCall[List[BuildInfo]]:
         ...
@@ -1803,21 +1952,51 @@ class MultiCallSession:
     def listChannels(self, hostID: Optional[HostID]=None, event: Optional[EventID]=None, enabled: Optional[bool]=None) -> VirtualCall[List[ChannelInfo]]:
         ...
 
+    @overload
+    def listExternalRepos(self, info: Union[str, ExternalRepoID, None]=None, url: Optional[str]=None, event: Optional[EventID]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listExternalRepos(self, info: Union[str, ExternalRepoID, None]=None, url: Optional[str]=None, event: Optional[EventID]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[ExternalRepoInfo]]:
         ...
 
+    @overload
+    def listHosts(self, arches: Optional[List[str]]=None, channelID: Union[str, ChannelID, None]=None, ready: Optional[bool]=None, enabled: Optional[bool]=None, userID: Optional[UserID]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listHosts(self, arches: Optional[List[str]]=None, channelID: Union[str, ChannelID, None]=None, ready: Optional[bool]=None, enabled: Optional[bool]=None, userID: Optional[UserID]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[HostInfo]]:
         ...
 
+    @overload
+    def listPackages(self, tagID: Union[str, TagID, None]=None, userID: Union[str, UserID, None]=None, pkgID: Union[str, PackageID, None]=None, prefix: Optional[str]=None, inherited: bool=False, with_dups: bool=False, event: Optional[EventID]=None, *, queryOpts: CountOnlyOptions, with_owners: bool=True, with_blocked: bool=True) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listPackages(self, tagID: Union[str, TagID, None]=None, userID: Union[str, UserID, None]=None, pkgID: Union[str, PackageID, None]=None, prefix: Optional[str]=None, inherited: bool=False, with_dups: bool=False, event: Optional[EventID]=None, queryOpts: Optional[QueryOptions]=None, with_owners: bool=True, with_blocked: bool=True) -> VirtualCall[List[TagPackageInfo]]:
         ...
 
+    @overload
+    def listPackagesSimple(self, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listPackagesSimple(self, prefix: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[TagPackageSimple]]:
         ...
 
+    @overload
+    def listRPMFiles(self, rpmID: RPMID, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listRPMFiles(self, rpmID: RPMID, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[RPMFileInfo]]:
         ...
 
+    @overload
+    def listRPMs(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, imageID: Optional[int]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, arches: Union[Arch, List[Arch], None]=None, *, queryOpts: CountOnlyOptions, draft: Optional[bool]=None) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listRPMs(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, imageID: Optional[int]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, arches: Union[Arch, List[Arch], None]=None, queryOpts: Optional[QueryOptions]=None, draft: Optional[bool]=None) -> VirtualCall[List[RPMInfo]]:
         ...
 
@@ -1835,15 +2014,33 @@ class MultiCallSession:
     def listTaggedRPMS(self, tag: Union[str, TagID], event: Optional[EventID]=None, inherit: bool=False, latest: bool=False, package: Optional[str]=None, arch: Optional[Arch]=None, rpmsigs: bool=False, owner: Union[str, UserID, None]=None, type: Optional[str]=None, strict: bool=True, extra: bool=True, draft: Optional[bool]=None) -> VirtualCall[Tuple[List[RPMInfo], List[BuildInfo]]]:
         ...
 
+    @overload
+    def listTags(self, build: Optional[BuildSpecifier]=None, package: Union[str, PackageID, None]=None, perms: bool=True, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listTags(self, build: Optional[BuildSpecifier]=None, package: Union[str, PackageID, None]=None, perms: bool=True, queryOpts: Optional[QueryOptions]=None, pattern: Optional[str]=None) -> VirtualCall[List[TagInfo]]:
         ...
 
     def listTaskOutput(self, taskID: TaskID, stat: bool=False, all_volumes: bool=False, strict: bool=False) -> VirtualCall[Union[List[str], Dict[str, List[str]], Dict[str, Data], Dict[str, Dict[str, Data]]]]:
         ...
 
+    @overload
+    def listTasks(self, opts: Optional[ListTasksOptions]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def listTasks(self, opts: Optional[ListTasksOptions]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[TaskInfo]]:
         ...
 
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions, perm: Optional[str]=None, inherited_perm: bool=False) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
     @overload
     def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[UserInfo]]:
         ...
@@ -1906,6 +2103,11 @@ class MultiCallSession:
     def queryHistory(self, tables: Optional[List[str]]=None, **kwargs: Any) -> VirtualCall[Dict[str, List[Data]]]:
         ...
 
+    @overload
+    def queryRPMSigs(self, rpm_id: Union[RPMID, str, BuildNVR, None]=None, sigkey: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def queryRPMSigs(self, rpm_id: Union[RPMID, str, BuildNVR, None]=None, sigkey: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[RPMSignature]]:
         ...
 
@@ -1954,6 +2156,11 @@ class MultiCallSession:
     def revokePermission(self, userinfo: Union[str, UserID], permission: Union[str, PermID]) -> VirtualCall[None]:
         ...
 
+    @overload
+    def search(self, terms: str, type: str, matchType: str, *, queryOpts: CountOnlyOptions) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def search(self, terms: str, type: str, matchType: str, queryOpts: Optional[QueryOptions]=None) -> VirtualCall[List[SearchResult]]:
         ...
 
@@ -2023,6 +2230,11 @@ class MultiCallSession:
     def untagBuildBypass(self, tag: Union[str, TagID], build: Union[str, BuildID], strict: bool=True, force: bool=False, notify: bool=False) -> VirtualCall[None]:
         ...
 
+    @overload
+    def untaggedBuilds(self, name: Optional[str]=None, *, queryOpts: CountOnlyOptions, draft: Optional[bool]=None) -> VirtualCall[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
     def untaggedBuilds(self, name: Optional[str]=None, queryOpts: Optional[QueryOptions]=None, draft: Optional[bool]=None) -> VirtualCall[List[BuildNVR]]:
         ...
 
@@ -2044,5 +2256,1123 @@ class MultiCallSession:
     def writeSignedRPM(self, an_rpm: str, sigkey: str, force: bool=False) -> VirtualCall[None]:
         ...
 
+class AsyncHost:
+
+    def assertPolicy(self, name, data: Data, default: str='deny') -> Awaitable[None]:
+        ...
+
+    def checkPolicy(self, name: str, data: Data, default: str='deny', strict: bool=False) -> Awaitable[Tuple[bool, str]]:
+        ...
+
+    def closeTask(self, task_id: TaskID, response: Any) -> Awaitable[None]:
+        ...
+
+    def completeBuild(self, task_id: TaskID, build_id: BuildID, srpm: str, rpms: List[str], brmap: Optional[Dict[str, BuildrootID]]=None, logs: Optional[Dict[Arch, List[str]]]=None) -> Awaitable[BuildInfo]:
+        ...
+
+    def completeImageBuild(self, task_id: TaskID, build_id: BuildID, results: Dict[str, Data]) -> Awaitable[None]:
+        ...
+
+    def completeMavenBuild(self, task_id: TaskID, build_id: BuildID, maven_results: Any, rpm_results: Any) -> Awaitable[None]:
+        ...
+
+    def completeWinBuild(self, task_id: TaskID, build_id: BuildID, results: Dict[str, Data], rpm_results: Any) -> Awaitable[None]:
+        ...
+
+    def createMavenBuild(self, build_info: BuildInfo, maven_info: MavenInfo) -> Awaitable[None]:
+        ...
+
+    def distRepoMove(self, repo_id: RepoID, uploadpath: str, arch: Arch) -> Awaitable[None]:
+        ...
+
+    def evalPolicy(self, name: str, data: Data) -> Awaitable[str]:
+        ...
+
+    def failBuild(self, task_id: TaskID, build_id: BuildID) -> Awaitable[None]:
+        ...
+
+    def failTask(self, task_id: TaskID, response: Any) -> Awaitable[None]:
+        ...
+
+    def freeTasks(self, tasks: List[TaskID]) -> Awaitable[None]:
+        ...
+
+    def getID(self) -> Awaitable[HostID]:
+        ...
+
+    def getHost(self) -> Awaitable[Tuple[List[HostID], List[TaskID]]]:
+        ...
+
+    def getHostTasks(self) -> Awaitable[List[TaskInfo]]:
+        ...
+
+    def getLoadData(self) -> Awaitable[Tuple[List[HostInfo], List[TaskInfo]]]:
+        ...
+
+    def getTasks(self) -> Awaitable[List[TaskInfo]]:
+        ...
+
+    def importArchive(self, filepath: str, buildinfo: BuildInfo, type: str, typeInfo: Data) -> Awaitable[None]:
+        ...
+
+    def importImage(self, task_id: TaskID, build_info: BuildInfo, results: Dict[str, Data]) -> Awaitable[None]:
+        ...
+
+    def importWrapperRPMs(self, task_id: TaskID, build_id: BuildID, rpm_results: Dict[str, List[str]]) -> Awaitable[None]:
+        ...
+
+    def initBuild(self, data: Data) -> Awaitable[BuildID]:
+        ...
+
+    def initImageBuild(self, task_id: TaskID, build_info: BuildInfo) -> Awaitable[BuildInfo]:
+        ...
+
+    def initMavenBuild(self, task_id: TaskID, build_info: BuildInfo, maven_info: MavenInfo) -> Awaitable[BuildInfo]:
+        ...
+
+    def initWinBuild(self, task_id: TaskID, build_info: BuildInfo, win_info: WinInfo) -> Awaitable[BuildInfo]:
+        ...
+
+    def isEnabled(self) -> Awaitable[bool]:
+        ...
+
+    def moveBuildToScratch(self, task_id: TaskID, srpm: str, rpms: List[str], logs: Optional[Dict[str, List[str]]]=None) -> Awaitable[None]:
+        ...
+
+    def moveImageBuildToScratch(self, task_id: TaskID, results: Data) -> Awaitable[None]:
+        ...
+
+    def moveMavenBuildToScratch(self, task_id: TaskID, results: Data, rpm_results: Data) -> Awaitable[None]:
+        ...
+
+    def moveWinBuildToScratch(self, task_id: TaskID, results: Data, rpm_results: Data) -> Awaitable[None]:
+        ...
+
+    def newBuildRoot(self, repo: RepoID, arch: Arch, task_id: Optional[TaskID]=None) -> Awaitable[BuildrootID]:
+        ...
+
+    def openTask(self, task_id: TaskID) -> Awaitable[Optional[Data]]:
+        ...
+
+    def refuseTask(self, task_id: TaskID, soft: bool=True, msg: str='') -> Awaitable[None]:
+        ...
+
+    def repoDone(self, repo_id: RepoID, data: Dict[Arch, Tuple[str, List[str]]], expire: bool=False, repo_json_updates: Optional[Data]=None) -> Awaitable[None]:
+        ...
+
+    def repoInit(self, tag: Union[str, TagID], task_id: Optional[TaskID]=None, event: Optional[EventID]=None, opts: Optional[RepoOptions]=None) -> Awaitable[Tuple[RepoID, EventID]]:
+        ...
+
+    def setBuildRootList(self, brootid: BuildrootID, rpmlist: List[RPMInfo], task_id: Optional[TaskID]=None) -> Awaitable[None]:
+        ...
+
+    def setBuildRootState(self, brootid: BuildrootID, state: BuildrootState, task_id: Optional[TaskID]=None) -> Awaitable[None]:
+        ...
+
+    def setHostData(self, hostdata: Data) -> Awaitable[None]:
+        ...
+
+    def setTaskWeight(self, task_id: TaskID, weight: float) -> Awaitable[None]:
+        ...
+
+    def subtask(self, method: str, arglist: List, parent: TaskID, **opts) -> Awaitable[TaskID]:
+        ...
+
+    def subtask2(self, __parent: TaskID, __taskopts: Data, __method: str, *args, **opts) -> Awaitable[TaskID]:
+        ...
+
+    def tagBuild(self, task_id: TaskID, tag: Union[str, TagID], build: BuildSpecifier, force: bool=False, fromtag: Union[str, TagID, None]=None) -> Awaitable[None]:
+        ...
+
+    def tagNotification(self, is_successful: bool, tag_id: Union[str, TagID, None], from_id: Union[str, TagID, None], build_id: BuildID, user_id: Union[str, UserID, None], ignore_success: bool=False, failure_msg: str='') -> Awaitable[None]:
+        ...
+
+    def taskSetWait(self, parent: TaskID, tasks: Optional[List[TaskID]]) -> Awaitable[None]:
+        ...
+
+    def taskWait(self, parent: TaskID) -> Awaitable[Tuple[List[int], List[int]]]:
+        ...
+
+    def taskWaitResults(self, parent: TaskID, tasks: Optional[List[TaskID]], canfail: Optional[List[int]]=None) -> Awaitable[List[Tuple[int, Any]]]:
+        ...
+
+    def updateBuildrootArchives(self, brootid: BuildrootID, task_id: TaskID, archives: List[ArchiveInfo], project: bool=False) -> Awaitable[None]:
+        ...
+
+    def updateBuildRootList(self, brootid: BuildrootID, rpmlist: List[RPMInfo], task_id: Optional[TaskID]=None) -> Awaitable[None]:
+        ...
+
+    def updateHost(self, task_load: float, ready: bool, data: Optional[Data]=None) -> Awaitable[None]:
+        ...
+
+    def updateMavenBuildRootList(self, brootid: BuildrootID, task_id: TaskID, mavenlist: List[Data], ignore: Optional[List[Union[int, str]]]=None, project: bool=False, ignore_unknown: bool=False, extra_deps: Optional[List[Union[int, str]]]=None) -> Awaitable[None]:
+        ...
+
+    def writeSignedRPM(self, an_rpm: str, sigkey: str, force: bool=False) -> Awaitable[None]:
+        ...
+
+class AsyncClientSession:
+
+    @property
+    def host(self) -> AsyncHost:
+        ...
+
+    def CGImport(self, metadata: Union[str, Data], directory: str, token: Optional[str]=None) -> Awaitable[BuildInfo]:
+        ...
+
+    def CGInitBuild(self, cg: str, data: Data) -> Awaitable[CGInitInfo]:
+        ...
+
+    def CGRefundBuild(self, cg: str, build_id: BuildID, token: str, state: BuildState=BuildState.FAILED) -> Awaitable[None]:
+        ...
+
+    def addArchiveType(self, name: str, description: str, extensions: str, compression_type: Optional[str]=None) -> Awaitable[None]:
+        ...
+
+    def addBType(self, name: str) -> Awaitable[None]:
+        ...
+
+    def addChannel(self, channel_name: str, description: Optional[str]=None) -> Awaitable[ChannelID]:
+        ...
+
+    def addExternalRepoToTag(self, tag_info: Union[str, TagID], repo_info: Union[str, ExternalRepoID], priority: int, merge_mode: str='koji', arches: Optional[str]=None) -> Awaitable[None]:
+        ...
+
+    def addExternalRPM(self, rpminfo: Data, external_repo: Union[str, ExternalRepoID], strict: bool=True) -> Awaitable[None]:
+        ...
+
+    def addGroupMember(self, group: Union[str, UserID], user: Union[str, UserID], strict: bool=True) -> Awaitable[None]:
+        ...
+
+    def addHost(self, hostname: str, arches: List[Arch], krb_principal: Optional[str]=None, force: bool=False) -> Awaitable[HostID]:
+        ...
+
+    def addHostToChannel(self, hostname: Union[str, HostID], channel_name: str, create: bool=False, force: bool=False) -> Awaitable[None]:
+        ...
+
+    @overload
+    def addRPMSig(self, an_rpm: str, data: bytes) -> Awaitable[None]:
+        ...
+
+    @overload
+    def addRPMSig(self, an_rpm: str, data: bytes, sigkey: Optional[str]=None) -> Awaitable[None]:
+        ...
+
+    def addUserKrbPrincipal(self, user: Union[str, UserID], krb_principal: str) -> Awaitable[int]:
+        ...
+
+    def addVolume(self, name: str, strict: bool=True) -> Awaitable[NamedID]:
+        ...
+
+    def applyVolumePolicy(self, build: BuildSpecifier, strict: bool=False) -> Awaitable[None]:
+        ...
+
+    def assignTask(self, task_id: TaskID, host: str, force: bool=False, override: bool=False) -> Awaitable[bool]:
+        ...
+
+    def build(self, src: str, target: str, opts: Optional[Data]=None, priority: Optional[int]=None, channel: Optional[str]=None) -> Awaitable[int]:
+        ...
+
+    def buildImage(self, name: str, version: str, arch: Arch, target: str, ksfile: str, img_type: str, opts: Optional[Data]=None, priority: Optional[int]=None) -> Awaitable[int]:
+        ...
+
+    def buildImageIndirection(self, opts: Optional[Data]=None, priority: Optional[int]=None) -> Awaitable[TaskID]:
+        ...
+
+    def buildImageOz(self, name: str, version: str, arches: List[Arch], target: str, inst_tree: str, opts: Optional[Data]=None, priority: Optional[int]=None) -> Awaitable[TaskID]:
+        ...
+
+    def buildReferences(self, build: BuildID, limit: Optional[int]=None, lazy: bool=False) -> Awaitable[Data]:
+        ...
+
+    def cancelBuild(self, buildID: BuildID, strict: bool=False) -> Awaitable[bool]:
+        ...
+
+    def cancelTask(self, task_id: TaskID, recurse: bool=True) -> Awaitable[None]:
+        ...
+
+    def cancelTaskChildren(self, task_id: TaskID) -> Awaitable[None]:
+        ...
+
+    def cancelTaskFull(self, task_id: TaskID, strict: bool=True) -> Awaitable[None]:
+        ...
+
+    def chainBuild(self, srcs: List[str], target: str, opts: Optional[Data]=None, priority: Optional[int]=None, channel: Optional[str]=None) -> Awaitable[int]:
+        ...
+
+    def chainMaven(self, builds: List[Data], target: str, opts: Optional[Data]=None, priority: Optional[int]=None, channel: Optional[str]=...) -> Awaitable[int]:
+        ...
+
+    def changeBuildVolume(self, build: Union[str, BuildID], volume: str, strict: bool=True) -> Awaitable[None]:
+        ...
+
+    def checkTagAccess(self, tag_id: Union[str, TagID], user_id: Union[str, UserID, None]=None) -> Awaitable[Tuple[bool, bool, str]]:
+        ...
+
+    def checkTagPackage(self, tag: Union[str, TagID], pkg: Union[str, PackageID]) -> Awaitable[bool]:
+        ...
+
+    def checkUpload(self, path: str, name: str, verify: Optional[str]=None, tail: Optional[int]=None, volume: Optional[str]=None) -> Awaitable[Data]:
+        ...
+
+    def count(self, methodName: str, *args: Any, **kw: Any) -> Awaitable[int]:
+        ...
+
+    @overload
+    def countAndFilterResults(self, methodName: str, *args, filterOpts: FilterOptions, **kw) -> Awaitable[Tuple[int, List[Data]]]:
+        ...
+
+    @overload
+    def countAndFilterResults(self, methodName: str, *args, **kw) -> Awaitable[Tuple[int, List[Data]]]:
+        ...
+
+    def createBuildTarget(self, name: str, build_tag: Union[str, TagID], dest_tag: Union[str, TagID]) -> Awaitable[None]:
+        ...
+
+    def createEmptyBuild(self, name: str, version: str, release: str, epoch: str, owner: Union[str, UserID, None]=None, draft: bool=False) -> Awaitable[BuildID]:
+        ...
+
+    def createExternalRepo(self, name: str, url: str) -> Awaitable[ExternalRepoInfo]:
+        ...
+
+    def createImageBuild(self, build_info: BuildSpecifier) -> Awaitable[None]:
+        ...
+
+    def createMavenBuild(self, build_info: BuildSpecifier, maven_info: MavenInfo) -> Awaitable[None]:
+        ...
+
+    def createNotification(self, user_id: UserID, package_id: PackageID, tag_id: TagID, success_only: bool) -> Awaitable[None]:
+        ...
+
+    def createNotificationBlock(self, user_id: UserID, package_id: Optional[PackageID]=None, tag_id: Optional[TagID]=None) -> Awaitable[None]:
+        ...
+
+    def createTag(self, name: str, parent: Optional[Union[str, TagID]]=None, arches: Optional[str]=None, perm: Optional[str]=None, locked: bool=False, maven_support: bool=False, maven_include_all: bool=False, extra: Optional[Dict[str, str]]=None) -> Awaitable[TagID]:
+        ...
+
+    def createUser(self, username: str, status: Optional[UserStatusValue]=None, krb_principal: Optional[str]=None) -> Awaitable[UserID]:
+        ...
+
+    def createWinBuild(self, build_info: BuildSpecifier, win_info: WinInfo) -> Awaitable[None]:
+        ...
+
+    def deleteBuild(self, build: BuildSpecifier, strict: bool=True, min_ref_age: int=604800) -> Awaitable[bool]:
+        ...
+
+    def deleteBuildTarget(self, buildTargetInfo: Union[str, TargetID]) -> Awaitable[None]:
+        ...
+
+    def deleteExternalRepo(self, info: Union[str, ExternalRepoID]) -> Awaitable[None]:
+        ...
+
+    def deleteNotification(self, id: int) -> Awaitable[None]:
+        ...
+
+    def deleteNotificationBlock(self, id: int) -> Awaitable[None]:
+        ...
+
+    def deleteRPMSig(self, rpminfo: Union[str, RPMID, RPMNVRA], sigkey: Optional[str]=None, all_sigs: bool=False) -> Awaitable[None]:
+        ...
+
+    def deleteTag(self, tagInfo: Union[str, TagID]) -> Awaitable[None]:
+        ...
+
+    def disableChannel(self, channelname: Union[str, ChannelID], comment: Optional[str]=None) -> Awaitable[None]:
+        ...
+
+    def disableHost(self, hostname: Union[str, HostID]) -> Awaitable[None]:
+        ...
+
+    def disableUser(self, username: Union[str, UserID]) -> Awaitable[None]:
+        ...
+
+    def distRepo(self, tag: Union[str, TagID], keys: List[str], **task_opts) -> Awaitable[TaskID]:
+        ...
+
+    def downloadTaskOutput(self, taskID: TaskID, fileName: str, offset: int=0, size: int=-1, volume: Optional[str]=None) -> Awaitable[str]:
+        ...
+
+    def dropGroupMember(self, group: Union[str, UserID], user: Union[str, UserID]) -> Awaitable[None]:
+        ...
+
+    def echo(self, *args) -> Awaitable[List]:
+        ...
+
+    def editBuildTarget(self, buildTargetInfo: Union[str, TargetID], name: str, build_tag: Union[str, TagID], dest_tag: Union[str, TagID]) -> Awaitable[None]:
+        ...
+
+    def editChannel(self, channelInfo: Union[str, ChannelID], **kw) -> Awaitable[bool]:
+        ...
+
+    def editExternalRepo(self, info: Union[str, ExternalRepoID], name: Optional[str]=None, url: Optional[str]=None) -> Awaitable[None]:
+        ...
+
+    def editHost(self, hostInfo: Union[str, HostID], **kw) -> Awaitable[bool]:
+        ...
+
+    def editPermission(self, permission: Union[str, PermID], description: str) -> Awaitable[None]:
+        ...
+
+    def editTag(self, tagInfo: Union[str, TagID], name: Optional[str], arches: Optional[str], locked: Optional[bool], permissionID: Optional[PermID], extra: Optional[Dict[str, str]]=None) -> Awaitable[None]:
+        ...
+
+    def editTag2(self, tagInfo: Union[str, TagID], **kwargs) -> Awaitable[None]:
+        ...
+
+    def editTagExternalRepo(self, tag_info: Union[str, TagID], repo_info: Union[str, ExternalRepoID], priority: Optional[int]=None, merge_mode: Optional[str]=None, arches: Optional[str]=None) -> Awaitable[bool]:
+        ...
+
+    def editUser(self, userInfo: Union[str, UserID], name: Optional[str]=None, krb_principal_mappings: Optional[List[OldNew]]=None) -> Awaitable[None]:
+        ...
+
+    def enableChannel(self, channelname: str, comment: Optional[str]=None) -> Awaitable[None]:
+        ...
+
+    def enableHost(self, hostname: str) -> Awaitable[None]:
+        ...
+
+    def enableUser(self, username: Union[str, UserID]) -> Awaitable[None]:
+        ...
+
+    def error(self) -> Awaitable[NoReturn]:
+        ...
+
+    def evalPolicy(self, name: str, data: Data) -> Awaitable[str]:
+        ...
+
+    def fault(self) -> Awaitable[NoReturn]:
+        ...
+
+    @overload
+    def filterResults(self, methodName: str, *args, filterOpts: FilterOptions, **kw) -> Awaitable[List[Data]]:
+        ...
+
+    @overload
+    def filterResults(self, methodName: str, *args, **kw) -> Awaitable[List[Data]]:
+        ...
+
+    def findBuildID(self, X: BuildSpecifier, strict: bool=False) -> Awaitable[Optional[BuildID]]:
+        ...
+
+    def freeTask(self, task_id: TaskID) -> Awaitable[None]:
+        ...
+
+    def getActiveRepos(self) -> Awaitable[List[RepoInfo]]:
+        ...
+
+    def getAllArches(self) -> Awaitable[List[Arch]]:
+        ...
+
+    def getAllPerms(self) -> Awaitable[List[PermInfo]]:
+        ...
+
+    def getAPIVersion(self) -> Awaitable[int]:
+        ...
+
+    def getArchive(self, archive_id: ArchiveID, strict: bool=False) -> Awaitable[Optional[ArchiveInfo]]:
+        ...
+
+    def getArchiveFile(self, archive_id: ArchiveID, filename: str, strict: bool=False) -> Awaitable[Optional[ArchiveFileInfo]]:
+        ...
+
+    def getArchiveType(self, filename: Optional[str]=None, type_name: Optional[str]=None, type_id: Optional[ATypeID]=None, strict: bool=False) -> Awaitable[Optional[ATypeInfo]]:
+        ...
+
+    def getArchiveTypes(self) -> Awaitable[List[ATypeInfo]]:
+        ...
+
+    def getAverageBuildDuration(self, package: Union[str, PackageID], age: Optional[int]=None) -> Awaitable[Optional[float]]:
+        ...
+
+    def getBuild(self, buildInfo: BuildSpecifier, strict: bool=False) -> Awaitable[Optional[BuildInfo]]:
+        ...
+
+    def getBuildConfig(self, tag: Union[str, TagID], event: Optional[EventID]=None) -> Awaitable[TagInfo]:
+        ...
+
+    def getBuildLogs(self, build: BuildSpecifier) -> Awaitable[BuildLogs]:
+        ...
+
+    def getBuildNotification(self, id: int, strict: bool=False) -> Awaitable[Optional[Data]]:
+        ...
+
+    def getBuildNotificationBlock(self, id: int, strict: bool=False) -> Awaitable[Optional[Data]]:
+        ...
+
+    def getBuildNotificationBlocks(self, userID: Union[str, UserID, None]=None) -> Awaitable[Data]:
+        ...
+
+    def getBuildNotifications(self, userID: Union[str, UserID, None]=None) -> Awaitable[Data]:
+        ...
+
+    def getBuildroot(self, buildrootID: BuildrootID, strict: bool=False) -> Awaitable[Optional[BuildrootInfo]]:
+        ...
+
+    def getBuildrootListing(self, id: BuildrootID) -> Awaitable[List[RPMInfo]]:
+        ...
+
+    def getBuildTarget(self, info: Union[str, TargetID], event: Optional[EventID]=None, strict: bool=False) -> Awaitable[Optional[TargetInfo]]:
+        ...
+
+    @overload
+    def getBuildTargets(self, info: Union[str, TargetID, None]=None, event: Optional[EventID]=None, buildTagID: Union[str, TagID, TagInfo, None]=None, destTagID: Union[str, TagID, TagInfo, None]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def getBuildTargets(self, info: Union[str, TargetID, None]=None, event: Optional[EventID]=None, buildTagID: Union[str, TagID, TagInfo, None]=None, destTagID: Union[str, TagID, TagInfo, None]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[TargetInfo]]:
+        ...
+
+    def getBuildType(self, buildInfo: BuildSpecifier, strict: bool=False) -> Awaitable[Dict[str, dict]]:
+        ...
+
+    @overload
+    def getChangelogEntries(self, buildID: Optional[int]=None, taskID: Optional[int]=None, filepath: Optional[str]=None, author: Optional[str]=None, before: Union[datetime, str, int, None]=None, after: Union[datetime, str, int, None]=None, *, queryOpts: CountOnlyOptions, strict: bool=False) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def getChangelogEntries(self, buildID: Optional[int]=None, taskID: Optional[int]=None, filepath: Optional[str]=None, author: Optional[str]=None, before: Union[datetime, str, int, None]=None, after: Union[datetime, str, int, None]=None, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> Awaitable[List[ChangelogEntry]]:
+        ...
+
+    def getChannel(self, channelInfo: Union[str, ChannelID], strict: bool=False) -> Awaitable[ChannelInfo]:
+        ...
+
+    @overload
+    def getEvent(self, id: EventID) -> Awaitable[Optional[EventInfo]]:
+        ...
+
+    @overload
+    def getEvent(self, id: EventID, strict: Literal[True]) -> Awaitable[EventInfo]:
+        ...
+
+    @overload
+    def getEvent(self, id: EventID, strict: bool=False) -> Awaitable[Optional[EventInfo]]:
+        ...
+
+    def getExternalRepo(self, info: Union[str, ExternalRepoID], strict: bool=False, event: Optional[EventID]=None) -> Awaitable[ExternalRepoInfo]:
+        ...
+
+    def getExternalRepoList(self, tag_info: Union[str, TagID], event: Optional[EventID]=None) -> Awaitable[TagExternalRepos]:
+        ...
+
+    def getFullInheritance(self, tag: Union[str, TagID], event: Optional[EventID]=None, reverse: bool=False) -> Awaitable[TagInheritance]:
+        ...
+
+    def getGroupMembers(self, group: Union[str, UserID]) -> Awaitable[List[UserInfo]]:
+        ...
+
+    def getHost(self, hostInfo: Union[str, HostID], strict: bool=False, event: Optional[EventID]=None) -> Awaitable[HostInfo]:
+        ...
+
+    def getImageArchive(self, archive_id: ArchiveID, strict: bool=False) -> Awaitable[Optional[ArchiveInfo]]:
+        ...
+
+    def getImageBuild(self, buildInfo: BuildSpecifier, strict: bool=False) -> Awaitable[Optional[Dict[str, BuildID]]]:
+        ...
+
+    def getInheritanceData(self, tag: Union[str, TagID], event: Optional[EventID]=None) -> Awaitable[TagInheritance]:
+        ...
+
+    def getKojiVersion(self) -> Awaitable[str]:
+        ...
+
+    @overload
+    def getLastEvent(self, before: Union[int, float, None]=None) -> Awaitable[EventInfo]:
+        ...
+
+    @overload
+    def getLastEvent(self, before: Union[int, float, None]=None, strict: bool=True) -> Awaitable[EventInfo]:
+        ...
+
+    @overload
+    def getLastHostUpdate(self, hostID: HostID) -> Awaitable[Union[str, None]]:
+        ...
+
+    @overload
+    def getLastHostUpdate(self, hostID: HostID, ts: Literal[False]) -> Awaitable[Union[str, None]]:
+        ...
+
+    @overload
+    def getLastHostUpdate(self, hostID: HostID, ts: Literal[True]) -> Awaitable[Union[float, None]]:
+        ...
+
+    @overload
+    def getLastHostUpdate(self, hostID: HostID, ts: bool=False) -> Awaitable[Union[str, float, None]]:
+        ...
+
+    @overload
+    def getLatestBuilds(self, tag: Union[str, TagID], event: Optional[EventID]=None, package: Optional[str]=None, type: Optional[str]=None) -> Awaitable[List[TagBuildInfo]]:
+        ...
+
+    @overload
+    def getLatestBuilds(self, tag: Union[str, TagID], event: Optional[EventID]=None, package: Optional[str]=None, type: Optional[str]=None, draft: Optional[bool]=None) -> Awaitable[List[TagBuildInfo]]:
+        ...
+
+    def getLatestMavenArchives(self, tag: Union[int, str], event: Optional[int]=None, inherit: bool=True) -> Awaitable[List[ArchiveInfo]]:
+        ...
+
+    @overload
+    def getLatestRPMS(self, tag: Union[str, TagID], package: Optional[str]=None, arch: Union[Arch, List[Arch], None]=None, event: Optional[EventID]=None, rpmsigs: bool=False, type: Optional[str]=None) -> Awaitable[Tuple[List[RPMInfo], List[BuildInfo]]]:
+        ...
+
+    @overload
+    def getLatestRPMS(self, tag: Union[str, TagID], package: Optional[str]=None, arch: Union[Arch, List[Arch], None]=None, event: Optional[EventID]=None, rpmsigs: bool=False, type: Optional[str]=None, draft: Optional[bool]=None) -> Awaitable[Tuple[List[RPMInfo], List[BuildInfo]]]:
+        ...
+
+    def getLoggedInUser(self) -> Awaitable[UserInfo]:
+        ...
+
+    def getMavenArchive(self, archive_id: ArchiveID, strict: bool=False) -> Awaitable[ArchiveInfo]:
+        ...
+
+    def getMavenBuild(self, buildInfo: Union[str, BuildID], strict: bool=False) -> Awaitable[Data]:
+        ...
+
+    def getNextRelease(self, build_info: BuildNVR, incr: int=1) -> Awaitable[str]:
+        ...
+
+    def getPackage(self, info: Union[str, PackageID], strict: bool=False, create: bool=False) -> Awaitable[Optional[NamedID]]:
+        ...
+
+    def getPackageConfig(self, tag: Union[str, TagID], pkg: Union[str, PackageID], event: Optional[EventID]=None) -> Awaitable[Optional[TagPackageInfo]]:
+        ...
+
+    def getPackageID(self, name: str, strict: bool=False) -> Awaitable[Optional[PackageID]]:
+        ...
+
+    def getPerms(self) -> Awaitable[List[str]]:
+        ...
+
+    @overload
+    def getRepo(self, tag: Union[str, TagID], state: Optional[RepoState]=None, event: Optional[EventID]=None, dist: bool=False) -> Awaitable[RepoInfo]:
+        ...
+
+    @overload
+    def getRepo(self, tag: Union[str, TagID], state: Optional[RepoState]=None, event: Optional[EventID]=None, dist: bool=False, min_event: Optional[EventID]=None) -> Awaitable[RepoInfo]:
+        ...
+
+    @overload
+    def getRPM(self, rpminfo: Union[str, RPMID, RPMNVRA], strict: bool=False) -> Awaitable[Optional[RPMInfo]]:
+        ...
+
+    @overload
+    def getRPM(self, rpminfo: Union[str, RPMID, RPMNVRA], strict: bool=False, *, multi: Literal[False]) -> Awaitable[Optional[RPMInfo]]:
+        ...
+
+    @overload
+    def getRPM(self, rpminfo: Union[str, RPMID, RPMNVRA], strict: bool=False, *, multi: Literal[True]) -> Awaitable[List[RPMInfo]]:
+        ...
+
+    @overload
+    def getRPM(self, rpminfo: Union[str, RPMID, RPMNVRA], strict: bool=False, multi: bool=False) -> Awaitable[Union[RPMInfo, List[RPMInfo], None]]:
+        ...
+
+    def getRPMChecksums(self, rpm_id: RPMID, checksum_types: Optional[List[ChecksumType]]=None, cacheonly: bool=False) -> Awaitable[Dict[ChecksumType, str]]:
+        ...
+
+    @overload
+    def getRPMDeps(self, rpmID: RPMID, depType: Optional[RPMDepType]=None, *, queryOpts: CountOnlyOptions, strict: bool=False) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def getRPMDeps(self, rpmID: RPMID, depType: Optional[RPMDepType]=None, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> Awaitable[List[RPMDepInfo]]:
+        ...
+
+    def getRPMFile(self, rpmID: RPMID, filename: str, strict: bool=False) -> Awaitable[Optional[RPMFileInfo]]:
+        ...
+
+    @overload
+    def getRPMHeaders(self, rpmID: Optional[RPMID]=None, taskID: Optional[TaskID]=None, filepath: Optional[str]=None, headers: Optional[List[str]]=None) -> Awaitable[Data]:
+        ...
+
+    @overload
+    def getRPMHeaders(self, rpmID: Optional[RPMID]=None, taskID: Optional[TaskID]=None, filepath: Optional[str]=None, headers: Optional[List[str]]=None, strict: Optional[bool]=False) -> Awaitable[Data]:
+        ...
+
+    def getSessionInfo(self, details: bool=False, user_id: Optional[UserID]=None) -> Awaitable[Union[None, SessionInfo, List[SessionInfo]]]:
+        ...
+
+    def getTag(self, tagInfo: Union[str, TagID], strict: bool=False, event: Optional[EventID]=None, blocked: bool=False) -> Awaitable[Optional[TagInfo]]:
+        ...
+
+    def getTagID(self, info: Union[str, TagID, Data], strict: bool=False, create: bool=False) -> Awaitable[Optional[TagID]]:
+        ...
+
+    def getTagExternalRepos(self, tag_info: Union[str, TagID, None]=None, repo_info: Union[str, ExternalRepoID, None]=None, event: Optional[EventID]=None) -> Awaitable[TagExternalRepos]:
+        ...
+
+    def getTagGroups(self, tag: Union[str, TagID], event: Optional[EventID]=None, inherit: bool=True, incl_pkgs: bool=True, incl_reqs: bool=True, incl_blocked: bool=False) -> Awaitable[List[TagGroupInfo]]:
+        ...
+
+    def getTaskChildren(self, task_id: TaskID, request: Optional[bool]=False, strict: Optional[bool]=False) -> Awaitable[List[TaskInfo]]:
+        ...
+
+    def getTaskDescendents(self, task_id: TaskID, request: bool=False) -> Awaitable[Dict[str, List[TaskInfo]]]:
+        ...
+
+    @overload
+    def getTaskInfo(self, task_id: List[TaskID], request: bool=False, strict: bool=False) -> Awaitable[List[TaskInfo]]:
+        ...
+
+    @overload
+    def getTaskInfo(self, task_id: TaskID, request: bool=False, strict: bool=False) -> Awaitable[TaskInfo]:
+        ...
+
+    def getTaskRequest(self, taskId: TaskID) -> Awaitable[Data]:
+        ...
+
+    def getTaskResult(self, taskId: TaskID, raise_fault: bool=True) -> Awaitable[Any]:
+        ...
+
+    @overload
+    def getUser(self, userInfo: Union[str, UserID, None]=None, strict: bool=False, krb_princs: bool=True) -> Awaitable[UserInfo]:
+        ...
+
+    @overload
+    def getUser(self, userInfo: Union[str, UserID, None]=None, strict: bool=False, krb_princs: bool=True, groups: bool=False) -> Awaitable[UserInfo]:
+        ...
+
+    def getUserGroups(self, user: Union[int, str]) -> Awaitable[List[UserGroup]]:
+        ...
+
+    @overload
+    def getUserPerms(self, userID: Union[str, UserID, None]=None) -> Awaitable[List[str]]:
+        ...
+
+    @overload
+    def getUserPerms(self, userID: Union[str, UserID, None]=None, with_groups: bool=True) -> Awaitable[List[str]]:
+        ...
+
+    def getUserPermsInheritance(self, userID: Union[str, UserID]) -> Awaitable[Dict[str, List[str]]]:
+        ...
+
+    def getVolume(self, volume: str, strict: bool=False) -> Awaitable[Optional[NamedID]]:
+        ...
+
+    def getWinArchive(self, archive_id: ArchiveID, strict: bool=False) -> Awaitable[ArchiveInfo]:
+        ...
+
+    def getWinBuild(self, buildInfo: Union[str, BuildID], strict: bool=False) -> Awaitable[Data]:
+        ...
+
+    def grantCGAccess(self, user: Union[str, UserID], cg: Union[str, CGID], create: bool=False) -> Awaitable[None]:
+        ...
+
+    def grantPermission(self, userinfo: Union[str, UserID], permission: Union[str, PermID], create: bool=False, description: Optional[str]=None) -> Awaitable[None]:
+        ...
+
+    def groupListAdd(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], block: bool=False, force: bool=False, **opts) -> Awaitable[None]:
+        ...
+
+    def groupListBlock(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID]) -> Awaitable[None]:
+        ...
+
+    def groupListRemove(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], force: bool=False) -> Awaitable[None]:
+        ...
+
+    def groupListUnblock(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID]) -> Awaitable[None]:
+        ...
+
+    def groupPackageListAdd(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], pkg_name: str, block: bool=False, force: bool=False, **opts) -> Awaitable[None]:
+        ...
+
+    def groupPackageListBlock(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], pkg_name: str) -> Awaitable[None]:
+        ...
+
+    def groupPackageListRemove(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], pkg_name: str) -> Awaitable[None]:
+        ...
+
+    def groupPackageListUnblock(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], pkg_name: str) -> Awaitable[None]:
+        ...
+
+    def groupReqListAdd(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], reqinfo: str, block: bool=False, force: bool=False, **opts) -> Awaitable[None]:
+        ...
+
+    def groupReqListBlock(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], reqinfo: str) -> Awaitable[None]:
+        ...
+
+    def groupReqListRemove(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], reqinfo: str, force: Optional[bool]=None) -> Awaitable[None]:
+        ...
+
+    def groupReqListUnblock(self, taginfo: Union[str, TagID], grpinfo: Union[str, TagGroupID], reqinfo: str) -> Awaitable[None]:
+        ...
+
+    def hasPerm(self, perm: str, strict: bool=False) -> Awaitable[bool]:
+        ...
+
+    def hello(self, *args) -> Awaitable[str]:
+        ...
+
+    def importArchive(self, filepath: str, buildinfo: BuildInfo, type: str, typeInfo: Data) -> Awaitable[ArchiveInfo]:
+        ...
+
+    @overload
+    def importRPM(self, path: str, basename: str) -> Awaitable[RPMInfo]:
+        ...
+
+    @overload
+    def importRPM(self, path: str, basename: str, sigkey: Optional[str]=None) -> Awaitable[RPMInfo]:
+        ...
+
+    @overload
+    def listArchives(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, type: Optional[str]=None, filename: Optional[str]=None, size: Optional[int]=None, checksum: Optional[str]=None, checksum_type: Optional[ChecksumType]=None, typeInfo: Optional[Data]=None, *, queryOpts: CountOnlyOptions, imageID: Optional[int]=None, archiveID: Optional[ArchiveID]=None, strict: bool=False) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listArchives(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, type: Optional[str]=None, filename: Optional[str]=None, size: Optional[int]=None, checksum: Optional[str]=None, checksum_type: Optional[ChecksumType]=None, typeInfo: Optional[Data]=None, queryOpts: Optional[QueryOptions]=None, imageID: Optional[int]=None, archiveID: Optional[ArchiveID]=None, strict: bool=False) -> Awaitable[List[ArchiveInfo]]:
+        ...
+
+    @overload
+    def listArchiveFiles(self, archive_id: ArchiveID, *, queryOpts: CountOnlyOptions, strict: bool=False) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listArchiveFiles(self, archive_id: ArchiveID, queryOpts: Optional[QueryOptions]=None, strict: bool=False) -> Awaitable[List[ArchiveFileInfo]]:
+        ...
+
+    @overload
+    def listBTypes(self, query: Optional[NamedID]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listBTypes(self, query: Optional[NamedID]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[BTypeInfo]]:
+        ...
+
+    def listBuildRPMs(self, build: BuildSpecifier) -> Awaitable[List[RPMInfo]]:
+        ...
+
+    @overload
+    def listBuildroots(self, hostID: Optional[HostID]=None, tagID: Optional[TagID]=None, state: Union[BuildrootState, List[BuildrootState], None]=None, rpmID: Optional[RPMID]=None, archiveID: Optional[ArchiveID]=None, taskID: Optional[TaskID]=None, buildrootID: Optional[BuildrootID]=None, repoID: Optional[RepoID]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listBuildroots(self, hostID: Optional[HostID]=None, tagID: Optional[TagID]=None, state: Union[BuildrootState, List[BuildrootState], None]=None, rpmID: Optional[RPMID]=None, archiveID: Optional[ArchiveID]=None, taskID: Optional[TaskID]=None, buildrootID: Optional[BuildrootID]=None, repoID: Optional[RepoID]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[BuildrootInfo]]:
+        ...
+
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None, promotedBefore: Optional[str]=None, promotedAfter: Optional[str]=None, promoter: Optional[UserID]=None) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, queryOpts: Optional[QueryOptions]=None, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None) -> Awaitable[List[BuildInfo]]:
+        ...
+
+    @overload
+    def listBuilds(self, packageID: Optional[PackageID]=None, userID: Optional[UserID]=None, taskID: Optional[TaskID]=None, prefix: Optional[str]=None, state: Optional[BuildState]=None, volumeID: Optional[int]=None, source: Optional[str]=None, createdBefore: Optional[str]=None, createdAfter: Optional[str]=None, completeBefore: Optional[str]=None, completeAfter: Optional[str]=None, type: Optional[str]=None, typeInfo: Optional[Dict]=None, queryOpts: Optional[QueryOptions]=None, pattern: Optional[str]=None, cgID: Optional[CGID]=None, draft: Optional[bool]=None, promotedBefore: Optional[str]=None, promotedAfter: Optional[str]=None, promoter: Optional[UserID]=None) -> Awaitable[List[BuildInfo]]:
+        ...
+
+    def listCGs(self) -> Awaitable[Dict[str, CGInfo]]:
+        ...
+
+    def listChannels(self, hostID: Optional[HostID]=None, event: Optional[EventID]=None, enabled: Optional[bool]=None) -> Awaitable[List[ChannelInfo]]:
+        ...
+
+    @overload
+    def listExternalRepos(self, info: Union[str, ExternalRepoID, None]=None, url: Optional[str]=None, event: Optional[EventID]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listExternalRepos(self, info: Union[str, ExternalRepoID, None]=None, url: Optional[str]=None, event: Optional[EventID]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[ExternalRepoInfo]]:
+        ...
+
+    @overload
+    def listHosts(self, arches: Optional[List[str]]=None, channelID: Union[str, ChannelID, None]=None, ready: Optional[bool]=None, enabled: Optional[bool]=None, userID: Optional[UserID]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listHosts(self, arches: Optional[List[str]]=None, channelID: Union[str, ChannelID, None]=None, ready: Optional[bool]=None, enabled: Optional[bool]=None, userID: Optional[UserID]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[HostInfo]]:
+        ...
+
+    @overload
+    def listPackages(self, tagID: Union[str, TagID, None]=None, userID: Union[str, UserID, None]=None, pkgID: Union[str, PackageID, None]=None, prefix: Optional[str]=None, inherited: bool=False, with_dups: bool=False, event: Optional[EventID]=None, *, queryOpts: CountOnlyOptions, with_owners: bool=True, with_blocked: bool=True) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listPackages(self, tagID: Union[str, TagID, None]=None, userID: Union[str, UserID, None]=None, pkgID: Union[str, PackageID, None]=None, prefix: Optional[str]=None, inherited: bool=False, with_dups: bool=False, event: Optional[EventID]=None, queryOpts: Optional[QueryOptions]=None, with_owners: bool=True, with_blocked: bool=True) -> Awaitable[List[TagPackageInfo]]:
+        ...
+
+    @overload
+    def listPackagesSimple(self, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listPackagesSimple(self, prefix: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[TagPackageSimple]]:
+        ...
+
+    @overload
+    def listRPMFiles(self, rpmID: RPMID, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listRPMFiles(self, rpmID: RPMID, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[RPMFileInfo]]:
+        ...
+
+    @overload
+    def listRPMs(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, imageID: Optional[int]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, arches: Union[Arch, List[Arch], None]=None, *, queryOpts: CountOnlyOptions, draft: Optional[bool]=None) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listRPMs(self, buildID: Optional[BuildID]=None, buildrootID: Optional[BuildrootID]=None, imageID: Optional[int]=None, componentBuildrootID: Optional[BuildrootID]=None, hostID: Optional[HostID]=None, arches: Union[Arch, List[Arch], None]=None, queryOpts: Optional[QueryOptions]=None, draft: Optional[bool]=None) -> Awaitable[List[RPMInfo]]:
+        ...
+
+    def listTagged(self, tag: Union[str, TagID], event: Optional[EventID]=None, inherit: bool=False, prefix: Optional[str]=None, latest: bool=False, package: Optional[str]=None, owner: Optional[Union[str, UserID]]=None, type: Optional[str]=None, strict: bool=True, extra: bool=False, draft: Optional[bool]=None) -> Awaitable[List[TagBuildInfo]]:
+        ...
+
+    def listTaggedArchives(self, tag: Union[str, TagID], event: Optional[EventID]=None, inherit: bool=False, latest: bool=False, package: Optional[str]=None, type: Optional[str]=None, strict: bool=True, extra: bool=True) -> Awaitable[Tuple[List[ArchiveInfo], List[BuildInfo]]]:
+        ...
+
+    @overload
+    def listTaggedRPMS(self, tag: Union[str, TagID], event: Optional[EventID]=None, inherit: bool=False, latest: bool=False, package: Optional[str]=None, arch: Optional[Arch]=None, rpmsigs: bool=False, owner: Union[str, UserID, None]=None, type: Optional[str]=None, strict: bool=True, extra: bool=True) -> Awaitable[Tuple[List[RPMInfo], List[BuildInfo]]]:
+        ...
+
+    @overload
+    def listTaggedRPMS(self, tag: Union[str, TagID], event: Optional[EventID]=None, inherit: bool=False, latest: bool=False, package: Optional[str]=None, arch: Optional[Arch]=None, rpmsigs: bool=False, owner: Union[str, UserID, None]=None, type: Optional[str]=None, strict: bool=True, extra: bool=True, draft: Optional[bool]=None) -> Awaitable[Tuple[List[RPMInfo], List[BuildInfo]]]:
+        ...
+
+    @overload
+    def listTags(self, build: Optional[BuildSpecifier]=None, package: Union[str, PackageID, None]=None, perms: bool=True, *, queryOpts: CountOnlyOptions, pattern: Optional[str]=None) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listTags(self, build: Optional[BuildSpecifier]=None, package: Union[str, PackageID, None]=None, perms: bool=True, queryOpts: Optional[QueryOptions]=None, pattern: Optional[str]=None) -> Awaitable[List[TagInfo]]:
+        ...
+
+    def listTaskOutput(self, taskID: TaskID, stat: bool=False, all_volumes: bool=False, strict: bool=False) -> Awaitable[Union[List[str], Dict[str, List[str]], Dict[str, Data], Dict[str, Dict[str, Data]]]]:
+        ...
+
+    @overload
+    def listTasks(self, opts: Optional[ListTasksOptions]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listTasks(self, opts: Optional[ListTasksOptions]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[TaskInfo]]:
+        ...
+
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, *, queryOpts: CountOnlyOptions, perm: Optional[str]=None, inherited_perm: bool=False) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[UserInfo]]:
+        ...
+
+    @overload
+    def listUsers(self, userType: UserType=UserType.NORMAL, prefix: Optional[str]=None, queryOpts: Optional[QueryOptions]=None, perm: Optional[str]=None, inherited_perm: bool=False) -> Awaitable[List[UserInfo]]:
+        ...
+
+    def listVolumes(self) -> Awaitable[List[NamedID]]:
+        ...
+
+    def makeTask(self, *args, **opts) -> Awaitable[TaskID]:
+        ...
+
+    def massTag(self, tag: Union[str, TagID], builds: List[Union[str, BuildID]]) -> Awaitable[None]:
+        ...
+
+    def mavenBuild(self, url: str, target: str, opts: Optional[Data]=None, priority: Optional[int]=None, channel: Optional[str]=...) -> Awaitable[TaskID]:
+        ...
+
+    def mavenEnabled(self) -> Awaitable[bool]:
+        ...
+
+    def mergeScratch(self, task_id: TaskID) -> Awaitable[BuildID]:
+        ...
+
+    def moveAllBuilds(self, tag1: Union[str, TagID], tag2: Union[str, TagID], package: Union[str, PackageID], force: bool=False) -> Awaitable[TaskID]:
+        ...
+
+    def moveBuild(self, tag1: Union[str, TagID], tag2: Union[str, TagID], build: BuildSpecifier, force: bool=False) -> Awaitable[TaskID]:
+        ...
+
+    def newGroup(self, name: str) -> Awaitable[UserID]:
+        ...
+
+    def newRepo(self, tag: Union[str, TagID], event: Optional[EventID]=None, src: bool=False, debuginfo: bool=False, separate_src: bool=False) -> Awaitable[TaskID]:
+        ...
+
+    def packageListAdd(self, taginfo: Union[str, TagID], pkginfo: Union[str, PackageID], owner: Union[str, UserID, None]=None, block: Optional[bool]=None, extra_arches: Optional[str]=None, force: bool=False, update: bool=False) -> Awaitable[None]:
+        ...
+
+    def packageListBlock(self, taginfo: Union[str, TagID], pkginfo: Union[str, PackageID], force: bool=False) -> Awaitable[None]:
+        ...
+
+    def packageListRemove(self, taginfo: Union[str, TagID], pkginfo: Union[str, PackageID], force: bool=False) -> Awaitable[None]:
+        ...
+
+    def packageListSetArches(self, taginfo: Union[str, TagID], pkginfo: Union[str, PackageID], arches: str, force: bool=False) -> Awaitable[None]:
+        ...
+
+    def packageListSetOwner(self, taginfo: Union[str, TagID], pkginfo: Union[str, PackageID], owner: Union[str, UserID], force: bool=False) -> Awaitable[None]:
+        ...
+
+    def packageListUnblock(self, taginfo: Union[str, TagID], pkginfo: Union[str, PackageID], force: bool=False) -> Awaitable[None]:
+        ...
+
+    def promoteBuild(self, build: Union[str, BuildID], force: bool=False) -> Awaitable[BuildInfo]:
+        ...
+
+    def queryHistory(self, tables: Optional[List[str]]=None, **kwargs: Any) -> Awaitable[Dict[str, List[Data]]]:
+        ...
+
+    @overload
+    def queryRPMSigs(self, rpm_id: Union[RPMID, str, BuildNVR, None]=None, sigkey: Optional[str]=None, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def queryRPMSigs(self, rpm_id: Union[RPMID, str, BuildNVR, None]=None, sigkey: Optional[str]=None, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[RPMSignature]]:
+        ...
+
+    def removeExternalRepoFromTag(self, tag_info: Union[str, TagID], repo_info: Union[str, int]) -> Awaitable[None]:
+        ...
+
+    def removeHostFromChannel(self, hostname: str, channel_name: str) -> Awaitable[None]:
+        ...
+
+    def removeUserKrbPrincipal(self, user: Union[str, UserID], krb_principal: str) -> Awaitable[UserID]:
+        ...
+
+    def removeVolume(self, volume: str) -> Awaitable[None]:
+        ...
+
+    def renameRPMSig(self, rpminfo: Union[str, RPMID, RPMNVRA], oldkey: str, newkey: str) -> Awaitable[None]:
+        ...
+
+    def renameChannel(self, old: str, new: str) -> Awaitable[None]:
+        ...
+
+    def repoDelete(self, repo_id: RepoID) -> Awaitable[int]:
+        ...
+
+    def repoExpire(self, repo_id: RepoID) -> Awaitable[None]:
+        ...
+
+    def repoInfo(self, repo_id: RepoID, strict: bool=False) -> Awaitable[RepoInfo]:
+        ...
+
+    def repoProblem(self, repo_id: RepoID) -> Awaitable[None]:
+        ...
+
+    def resetBuild(self, build: Union[str, BuildID]) -> Awaitable[None]:
+        ...
+
+    def restartHosts(self, priority: int=5, options: Optional[Data]=None) -> Awaitable[TaskID]:
+        ...
+
+    def resubmitTask(self, taskID: TaskID) -> Awaitable[TaskID]:
+        ...
+
+    def revokeCGAccess(self, user: Union[str, UserID], cg: Union[str, CGID]) -> Awaitable[None]:
+        ...
+
+    def revokePermission(self, userinfo: Union[str, UserID], permission: Union[str, PermID]) -> Awaitable[None]:
+        ...
+
+    @overload
+    def search(self, terms: str, type: str, matchType: str, *, queryOpts: CountOnlyOptions) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def search(self, terms: str, type: str, matchType: str, queryOpts: Optional[QueryOptions]=None) -> Awaitable[List[SearchResult]]:
+        ...
+
+    def setBuildOwner(self, build: BuildSpecifier, user: Union[str, UserID]) -> Awaitable[None]:
+        ...
+
+    def setBuildTimestamp(self, build: BuildSpecifier, ts: Union[int, float]) -> Awaitable[None]:
+        ...
+
+    @overload
+    def setInheritanceData(self, tag: Union[str, TagID], data: List[Dict[str, Any]], clear: bool=False) -> Awaitable[None]:
+        ...
+
+    @overload
+    def setInheritanceData(self, tag: Union[str, TagID], data: TagInheritance, clear: bool=False) -> Awaitable[None]:
+        ...
+
+    def setTaskPriority(self, task_id: TaskID, priority: int, recurse: bool=True) -> Awaitable[None]:
+        ...
+
+    @overload
+    def showOpts(self) -> Awaitable[str]:
+        ...
+
+    @overload
+    def showOpts(self, as_string: Literal[True]) -> Awaitable[str]:
+        ...
+
+    @overload
+    def showOpts(self, as_string: Literal[False]) -> Awaitable[Data]:
+        ...
+
+    @overload
+    def showOpts(self, as_string: bool=True) -> Awaitable[Union[str, Data]]:
+        ...
+
+    def showSession(self) -> Awaitable[str]:
+        ...
+
+    def snapshotTag(self, src: Union[str, TagID], dst: Union[str, TagID], config: bool=True, pkgs: bool=True, builds: bool=True, groups: bool=True, latest_only: bool=True, inherit_builds: bool=True, event: Optional[EventID]=None, force: bool=False) -> Awaitable[None]:
+        ...
+
+    def snapshotTagModify(self, src: Union[str, TagID], dst: Union[str, TagID], config: bool=True, pkgs: bool=True, builds: bool=True, groups: bool=True, latest_only: bool=True, inherit_builds: bool=True, event: Optional[EventID]=None, force: bool=False, remove: bool=False) -> Awaitable[None]:
+        ...
+
+    def tagBuild(self, tag: Union[str, TagID], build: Union[str, BuildID], force: bool=False, fromtag: Union[str, TagID, None]=None) -> Awaitable[None]:
+        ...
+
+    def tagBuildBypass(self, tag: Union[str, TagID], build: Union[str, BuildID], force: bool=False, notify: bool=False) -> Awaitable[None]:
+        ...
+
+    def tagChangedSinceEvent(self, event: EventID, taglist: List[TagID]) -> Awaitable[bool]:
+        ...
+
+    def tagFirstChangeEvent(self, tag: Union[str, TagID], after: Optional[EventID]=None, inherit: bool=True) -> Awaitable[Optional[EventID]]:
+        ...
+
+    def tagLastChangeEvent(self, tag: Union[str, TagID], before: Optional[EventID]=None, inherit: bool=True) -> Awaitable[Optional[EventID]]:
+        ...
+
+    def taskFinished(self, taskId: TaskID) -> Awaitable[bool]:
+        ...
+
+    def untagBuild(self, tag: Union[str, TagID], build: Union[str, BuildID], strict: bool=True, force: bool=False) -> Awaitable[None]:
+        ...
+
+    def untagBuildBypass(self, tag: Union[str, TagID], build: Union[str, BuildID], strict: bool=True, force: bool=False, notify: bool=False) -> Awaitable[None]:
+        ...
+
+    @overload
+    def untaggedBuilds(self, name: Optional[str]=None, *, queryOpts: CountOnlyOptions, draft: Optional[bool]=None) -> Awaitable[int]: # type: ignore[overload-overlap, misc]
+        ...
+
+    @overload
+    def untaggedBuilds(self, name: Optional[str]=None, queryOpts: Optional[QueryOptions]=None, draft: Optional[bool]=None) -> Awaitable[List[BuildNVR]]:
+        ...
+
+    def updateNotification(self, id: NotificationID, package_id: Union[str, PackageID, None], tag_id: Union[str, TagID, None], success_only: bool) -> Awaitable[None]:
+        ...
+
+    def uploadFile(self, path: str, name: str, size: int, md5sum: str, offset: int, data: str, volume: Optional[str]=None, checksum: Union[str, Tuple[ChecksumType, str], None]=None) -> Awaitable[bool]:
+        ...
+
+    def winBuild(self, vm: str, url: str, target: str, opts: Optional[Data]=None, priority: Optional[int]=None, channel: Optional[str]=...) -> Awaitable[int]:
+        ...
+
+    def winEnabled(self) -> Awaitable[bool]:
+        ...
+
+    def wrapperRPM(self, build: Union[int, str], url: str, target: str, priority: Optional[int]=None, channel: Optional[str]=..., opts: Optional[Data]=None) -> Awaitable[TaskID]:
+        ...
+
+    def writeSignedRPM(self, an_rpm: str, sigkey: str, force: bool=False) -> Awaitable[None]:
+        ...
+
 
 # The end.
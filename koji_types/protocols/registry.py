@@ -0,0 +1,348 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - Client Session Protocol method registry
+
+The names of the hub methods declared by the session protocols,
+grouped by domain, and by the Host protocol
+"""
+
+
+from typing import Dict, Tuple
+
+
+__all__ = (
+    "HOST_METHODS",
+    "SESSION_METHODS",
+)
+
+
+SESSION_METHODS: Dict[str, Tuple[str, ...]] = {
+    "builds": (
+        "CGImport",
+        "CGInitBuild",
+        "CGRefundBuild",
+        "addBType",
+        "addVolume",
+        "applyVolumePolicy",
+        "cancelBuild",
+        "changeBuildVolume",
+        "createEmptyBuild",
+        "createImageBuild",
+        "createMavenBuild",
+        "createWinBuild",
+        "deleteBuild",
+        "findBuildID",
+        "getAverageBuildDuration",
+        "getBuild",
+        "getBuildLogs",
+        "getBuildType",
+        "getBuildroot",
+        "getBuildrootListing",
+        "getImageBuild",
+        "getMavenBuild",
+        "getNextRelease",
+        "getVolume",
+        "getWinBuild",
+        "listBTypes",
+        "listBuildroots",
+        "listBuilds",
+        "listVolumes",
+        "promoteBuild",
+        "removeVolume",
+        "resetBuild",
+        "setBuildOwner",
+        "setBuildTimestamp",
+        "untaggedBuilds",
+    ),
+    "tags": (
+        "checkTagAccess",
+        "checkTagPackage",
+        "createBuildTarget",
+        "createTag",
+        "deleteBuildTarget",
+        "deleteTag",
+        "editBuildTarget",
+        "editTag",
+        "editTag2",
+        "getBuildConfig",
+        "getBuildTarget",
+        "getBuildTargets",
+        "getFullInheritance",
+        "getInheritanceData",
+        "getLatestBuilds",
+        "getLatestMavenArchives",
+        "getLatestRPMS",
+        "getPackage",
+        "getPackageConfig",
+        "getPackageID",
+        "getTag",
+        "getTagGroups",
+        "getTagID",
+        "groupListAdd",
+        "groupListBlock",
+        "groupListRemove",
+        "groupListUnblock",
+        "groupPackageListAdd",
+        "groupPackageListBlock",
+        "groupPackageListRemove",
+        "groupPackageListUnblock",
+        "groupReqListAdd",
+        "groupReqListBlock",
+        "groupReqListRemove",
+        "groupReqListUnblock",
+        "listPackages",
+        "listPackagesSimple",
+        "listTagged",
+        "listTaggedArchives",
+        "listTaggedRPMS",
+        "listTags",
+        "massTag",
+        "moveAllBuilds",
+        "moveBuild",
+        "packageListAdd",
+        "packageListBlock",
+        "packageListRemove",
+        "packageListSetArches",
+        "packageListSetOwner",
+        "packageListUnblock",
+        "setInheritanceData",
+        "snapshotTag",
+        "snapshotTagModify",
+        "tagBuild",
+        "tagBuildBypass",
+        "tagChangedSinceEvent",
+        "tagFirstChangeEvent",
+        "tagLastChangeEvent",
+        "untagBuild",
+        "untagBuildBypass",
+    ),
+    "tasks": (
+        "assignTask",
+        "build",
+        "buildImage",
+        "buildImageIndirection",
+        "buildImageOz",
+        "cancelTask",
+        "cancelTaskChildren",
+        "cancelTaskFull",
+        "chainBuild",
+        "chainMaven",
+        "downloadTaskOutput",
+        "freeTask",
+        "getTaskChildren",
+        "getTaskDescendents",
+        "getTaskInfo",
+        "getTaskRequest",
+        "getTaskResult",
+        "listTaskOutput",
+        "listTasks",
+        "makeTask",
+        "mavenBuild",
+        "resubmitTask",
+        "setTaskPriority",
+        "taskFinished",
+        "winBuild",
+        "wrapperRPM",
+    ),
+    "archives": (
+        "addArchiveType",
+        "addExternalRPM",
+        "addRPMSig",
+        "deleteRPMSig",
+        "getArchive",
+        "getArchiveFile",
+        "getArchiveType",
+        "getArchiveTypes",
+        "getChangelogEntries",
+        "getImageArchive",
+        "getMavenArchive",
+        "getRPM",
+        "getRPMChecksums",
+        "getRPMDeps",
+        "getRPMFile",
+        "getRPMHeaders",
+        "getWinArchive",
+        "importArchive",
+        "importRPM",
+        "listArchiveFiles",
+        "listArchives",
+        "listBuildRPMs",
+        "listRPMFiles",
+        "listRPMs",
+        "queryRPMSigs",
+        "renameRPMSig",
+        "writeSignedRPM",
+    ),
+    "users": (
+        "addGroupMember",
+        "addUserKrbPrincipal",
+        "createNotification",
+        "createNotificationBlock",
+        "createUser",
+        "deleteNotification",
+        "deleteNotificationBlock",
+        "disableUser",
+        "dropGroupMember",
+        "editPermission",
+        "editUser",
+        "enableUser",
+        "getAllPerms",
+        "getBuildNotification",
+        "getBuildNotificationBlock",
+        "getBuildNotificationBlocks",
+        "getBuildNotifications",
+        "getGroupMembers",
+        "getLoggedInUser",
+        "getPerms",
+        "getUser",
+        "getUserGroups",
+        "getUserPerms",
+        "getUserPermsInheritance",
+        "grantCGAccess",
+        "grantPermission",
+        "hasPerm",
+        "listCGs",
+        "listUsers",
+        "newGroup",
+        "removeUserKrbPrincipal",
+        "revokeCGAccess",
+        "revokePermission",
+        "updateNotification",
+    ),
+    "hosts": (
+        "addChannel",
+        "addHost",
+        "addHostToChannel",
+        "disableChannel",
+        "disableHost",
+        "editChannel",
+        "editHost",
+        "enableChannel",
+        "enableHost",
+        "getAllArches",
+        "getChannel",
+        "getHost",
+        "getLastHostUpdate",
+        "listChannels",
+        "listHosts",
+        "removeHostFromChannel",
+        "renameChannel",
+        "restartHosts",
+    ),
+    "repos": (
+        "addExternalRepoToTag",
+        "createExternalRepo",
+        "deleteExternalRepo",
+        "distRepo",
+        "editExternalRepo",
+        "editTagExternalRepo",
+        "getActiveRepos",
+        "getExternalRepo",
+        "getExternalRepoList",
+        "getRepo",
+        "getTagExternalRepos",
+        "listExternalRepos",
+        "newRepo",
+        "removeExternalRepoFromTag",
+        "repoDelete",
+        "repoExpire",
+        "repoInfo",
+        "repoProblem",
+    ),
+    "core": (
+        "buildReferences",
+        "checkUpload",
+        "count",
+        "countAndFilterResults",
+        "echo",
+        "error",
+        "evalPolicy",
+        "fault",
+        "filterResults",
+        "getAPIVersion",
+        "getEvent",
+        "getKojiVersion",
+        "getLastEvent",
+        "getSessionInfo",
+        "hello",
+        "mavenEnabled",
+        "mergeScratch",
+        "queryHistory",
+        "search",
+        "showOpts",
+        "showSession",
+        "uploadFile",
+        "winEnabled",
+    ),
+}
+
+
+HOST_METHODS: Tuple[str, ...] = (
+    "assertPolicy",
+    "checkPolicy",
+    "closeTask",
+    "completeBuild",
+    "completeImageBuild",
+    "completeMavenBuild",
+    "completeWinBuild",
+    "createMavenBuild",
+    "distRepoMove",
+    "evalPolicy",
+    "failBuild",
+    "failTask",
+    "freeTasks",
+    "getHost",
+    "getHostTasks",
+    "getID",
+    "getLoadData",
+    "getTasks",
+    "importArchive",
+    "importImage",
+    "importWrapperRPMs",
+    "initBuild",
+    "initImageBuild",
+    "initMavenBuild",
+    "initWinBuild",
+    "isEnabled",
+    "moveBuildToScratch",
+    "moveImageBuildToScratch",
+    "moveMavenBuildToScratch",
+    "moveWinBuildToScratch",
+    "newBuildRoot",
+    "openTask",
+    "refuseTask",
+    "repoDone",
+    "repoInit",
+    "setBuildRootList",
+    "setBuildRootState",
+    "setHostData",
+    "setTaskWeight",
+    "subtask",
+    "subtask2",
+    "tagBuild",
+    "tagNotification",
+    "taskSetWait",
+    "taskWait",
+    "taskWaitResults",
+    "updateBuildRootList",
+    "updateBuildrootArchives",
+    "updateHost",
+    "updateMavenBuildRootList",
+    "writeSignedRPM",
+)
+
+
+# The end.
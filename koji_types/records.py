@@ -0,0 +1,459 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - compact records
+
+Optional `__slots__` based record classes mirroring the TypedDict
+declarations from `koji_types`. A record holds the same fields as the
+dict it was created from, but without a per-instance hash table, which
+makes a considerable difference when holding many thousands of results
+from calls such as ``listTagged`` or ``listRPMs`` in memory.
+
+Records support read-only item access (``rec["nvr"]``) in addition to
+attribute access (``rec.nvr``), so code which only reads from the
+original dicts can usually accept records without modification.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from keyword import iskeyword
+from typing import (
+    Any, Callable, ClassVar, Dict, FrozenSet, Iterable, Iterator, List,
+    Mapping, Optional, Tuple, Type, TypeVar, cast, )
+from typing_extensions import is_typeddict
+
+from . import (
+    ArchiveFileInfo, ArchiveInfo, ATypeInfo, BuildInfo, BuildLogEntry,
+    BuildNVR, BuildrootInfo, BuildrootReference, BTypeInfo,
+    ChangelogEntry, ChannelInfo, CGInfo, CGInitInfo, EventInfo,
+    ExternalRepoInfo, HostInfo, MavenInfo, NamedID, OldNew, PackageInfo,
+    PermInfo, POMInfo, RepoInfo, RPMDepInfo, RPMFileInfo, RPMInfo,
+    RPMNVRA, RPMSignature, SearchResult, SessionInfo, TagBuildInfo,
+    TagExternalRepoEntry, TagFullInheritanceEntry, TagGroupInfo,
+    TagGroupPackage, TagGroupReq, TagInfo, TagInheritanceEntry,
+    TagPackageInfo, TagPackageSimple, TargetInfo, TaskInfo, UserData,
+    UserGroup, UserInfo, WinInfo, )
+
+
+__all__ = (
+    "Record",
+    "from_dicts",
+    "record_class",
+    "to_dicts",
+
+    "ArchiveFileRecord",
+    "ArchiveRecord",
+    "ATypeRecord",
+    "BuildLogRecord",
+    "BuildNVRRecord",
+    "BuildRecord",
+    "BuildrootRecord",
+    "BuildrootReferenceRecord",
+    "BTypeRecord",
+    "ChangelogRecord",
+    "ChannelRecord",
+    "CGRecord",
+    "CGInitRecord",
+    "EventRecord",
+    "ExternalRepoRecord",
+    "HostRecord",
+    "MavenRecord",
+    "NamedIDRecord",
+    "OldNewRecord",
+    "PackageRecord",
+    "PermRecord",
+    "POMRecord",
+    "RepoRecord",
+    "RPMDepRecord",
+    "RPMFileRecord",
+    "RPMNVRARecord",
+    "RPMRecord",
+    "RPMSignatureRecord",
+    "SearchResultRecord",
+    "SessionRecord",
+    "TagBuildRecord",
+    "TagExternalRepoRecord",
+    "TagFullInheritanceRecord",
+    "TagGroupPackageRecord",
+    "TagGroupRecord",
+    "TagGroupReqRecord",
+    "TagInheritanceRecord",
+    "TagPackageRecord",
+    "TagPackageSimpleRecord",
+    "TagRecord",
+    "TargetRecord",
+    "TaskRecord",
+    "UserDataRecord",
+    "UserGroupRecord",
+    "UserRecord",
+    "WinRecord",
+)
+
+
+R = TypeVar("R", bound="Record")
+
+Shape = Tuple[str, ...]
+
+
+_MAX_SHAPES = 32
+"""
+The maximum number of distinct key layouts for which a record class
+will compile a specialised loader. Results from a given hub will
+normally only ever produce one or two layouts per type.
+"""
+
+
+class Record:
+    """
+    Base class for the generated record types. Subclasses are produced
+    via `record_class` and declare one slot per key of their TypedDict,
+    plus an ``_extra`` slot which collects any keys the TypedDict does
+    not declare (eg. fields added by a newer hub), and a ``_shape``
+    slot holding the ordered keys of the originating dict.
+
+    A key which was absent from the originating dict leaves its slot
+    unset, so that `to_dict` reproduces the original dict exactly.
+    Records should be treated as read-only.
+    """
+
+    __slots__ = ("_extra", "_shape", )
+
+    _fields: ClassVar[FrozenSet[str]] = frozenset()
+    _loaders: ClassVar[Dict[Shape, Callable[[Mapping[str, Any]], Any]]]
+    _dumpers: ClassVar[Dict[Shape, Callable[[Any], Dict[str, Any]]]]
+    _typeddict: ClassVar[Optional[type]] = None
+
+    _extra: Optional[Dict[str, Any]]
+    _shape: Shape
+
+
+    def __init__(self, **kwds: Any):
+        self._load(kwds)
+
+
+    def _load(self, data: Mapping[str, Any]) -> None:
+        # the generic, uncompiled loader
+        fields = self._fields
+        extra = None
+
+        for key, value in data.items():
+            if key in fields:
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+
+        self._extra = extra
+        self._shape = tuple(data)
+
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Mapping[str, Any]) -> R:
+        """
+        Create a new record from a result dict
+        """
+
+        shape = tuple(data)
+        loader = cls._loaders.get(shape)
+
+        if loader is None:
+            if len(cls._loaders) >= _MAX_SHAPES:
+                rec = cls.__new__(cls)
+                rec._load(data)
+                return rec
+
+            loader = cls._loaders[shape] = _compile_loader(cls, shape)
+
+        return loader(data)
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Produce a new dict with the same keys, values, and key order as
+        the dict this record was created from
+        """
+
+        shape = self._shape
+        dumper = self._dumpers.get(shape)
+
+        if dumper is None:
+            if len(self._dumpers) >= _MAX_SHAPES:
+                return dict(self.items())
+
+            dumper = self._dumpers[shape] = \
+                _compile_dumper(type(self), shape)
+
+        return dumper(self)
+
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._shape)
+
+
+    def values(self) -> Iterator[Any]:
+        return (val for _key, val in self.items())
+
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        fields = self._fields
+        extra = self._extra
+
+        for key in self._shape:
+            if key in fields:
+                yield key, getattr(self, key)
+            else:
+                yield key, extra[key]  # type: ignore
+
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._fields:
+            return getattr(self, key, default)
+        elif self._extra:
+            return self._extra.get(key, default)
+        else:
+            return default
+
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._shape:
+            return self.get(key)
+        raise KeyError(key)
+
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape)
+
+
+    def __len__(self) -> int:
+        return len(self._shape)
+
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+
+    __hash__ = None  # type: ignore
+
+
+    def __getstate__(self):
+        return self.to_dict()
+
+
+    def __setstate__(self, state):
+        self._load(state)
+
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _compile_loader(
+        rcls: Type[R],
+        shape: Shape) -> Callable[[Mapping[str, Any]], R]:
+    """
+    Generates a function which loads a dict with exactly the given key
+    layout into a new instance of rcls, using plain attribute stores
+    rather than a loop over the keys.
+    """
+
+    fields = rcls._fields
+    lines = ["def load(data):",
+             "    rec = new(rcls)"]
+
+    extra = []
+    for key in shape:
+        if key in fields:
+            lines.append(f"    rec.{key} = data[{key!r}]")
+        else:
+            extra.append(f"{key!r}: data[{key!r}]")
+
+    lines.append(f"    rec._extra = {{{', '.join(extra)}}}" if extra else
+                 "    rec._extra = None")
+    lines.append("    rec._shape = shape")
+    lines.append("    return rec")
+
+    found: Dict[str, Any] = {
+        "new": object.__new__, "rcls": rcls, "shape": shape}
+    exec("\n".join(lines), found)  # nosec: keys are validated identifiers
+    return found["load"]
+
+
+def _compile_dumper(
+        rcls: Type[R],
+        shape: Shape) -> Callable[[R], Dict[str, Any]]:
+    """
+    Generates a function which produces a dict with the given key
+    layout from an instance of rcls
+    """
+
+    fields = rcls._fields
+
+    items = []
+    for key in shape:
+        if key in fields:
+            items.append(f"{key!r}: rec.{key}")
+        else:
+            items.append(f"{key!r}: rec._extra[{key!r}]")
+
+    source = f"def dump(rec):\n    return {{{', '.join(items)}}}"
+
+    found: Dict[str, Any] = {}
+    exec(source, found)  # nosec: keys are validated identifiers
+    return found["dump"]
+
+
+_record_classes: Dict[type, Type[Record]] = {}
+
+_reserved = frozenset(dir(Record))
+
+
+def record_class(
+        typeddict: type,
+        name: Optional[str] = None) -> Type[Record]:
+    """
+    Produces a `Record` subclass with a slot for each key declared by
+    the given TypedDict, including those it inherits. The same class is
+    returned for repeated calls with the same TypedDict.
+
+    :param typeddict: a TypedDict from `koji_types`
+
+    :param name: name for the new class, defaults to the name of the
+      TypedDict with ``Record`` appended
+    """
+
+    found = _record_classes.get(typeddict)
+    if found is not None:
+        return found
+
+    if not is_typeddict(typeddict):
+        raise TypeError(f"{typeddict!r} is not a TypedDict")
+
+    # keys which aren't identifiers (or which are keywords) can't be
+    # slots, so those will be kept in the _extra dict instead
+    fields = tuple(key for key in typeddict.__annotations__
+                   if key.isidentifier() and not iskeyword(key))
+
+    clashes = _reserved.intersection(fields)
+    if clashes:
+        raise ValueError(f"{typeddict.__name__} declares keys which clash"
+                         f" with Record attributes: {sorted(clashes)}")
+
+    if name is None:
+        name = f"{typeddict.__name__}Record"
+
+    body = {
+        "__slots__": fields,
+        "__module__": __name__,
+        "__qualname__": name,
+        "__doc__": f"Compact record form of `koji_types.{typeddict.__name__}`",
+        "_fields": frozenset(fields),
+        "_loaders": {},
+        "_dumpers": {},
+        "_typeddict": typeddict,
+    }
+    cls = cast(Type[Record], type(name, (Record, ), body))
+
+    _record_classes[typeddict] = cls
+    return cls
+
+
+def from_dicts(
+        rcls: Type[R],
+        data: Iterable[Mapping[str, Any]]) -> List[R]:
+    """
+    Convert a list of result dicts into a list of records
+
+    :param rcls: a record class, as produced by `record_class`
+
+    :param data: the dicts to convert
+    """
+
+    return list(map(rcls.from_dict, data))
+
+
+def to_dicts(records: Iterable[Record]) -> List[Dict[str, Any]]:
+    """
+    Convert a sequence of records back into a list of dicts
+    """
+
+    return [rec.to_dict() for rec in records]
+
+
+ArchiveFileRecord = record_class(ArchiveFileInfo, "ArchiveFileRecord")
+ArchiveRecord = record_class(ArchiveInfo, "ArchiveRecord")
+ATypeRecord = record_class(ATypeInfo, "ATypeRecord")
+BuildLogRecord = record_class(BuildLogEntry, "BuildLogRecord")
+BuildNVRRecord = record_class(BuildNVR, "BuildNVRRecord")
+BuildRecord = record_class(BuildInfo, "BuildRecord")
+BuildrootRecord = record_class(BuildrootInfo, "BuildrootRecord")
+BuildrootReferenceRecord = record_class(BuildrootReference,
+                                        "BuildrootReferenceRecord")
+BTypeRecord = record_class(BTypeInfo, "BTypeRecord")
+ChangelogRecord = record_class(ChangelogEntry, "ChangelogRecord")
+ChannelRecord = record_class(ChannelInfo, "ChannelRecord")
+CGRecord = record_class(CGInfo, "CGRecord")
+CGInitRecord = record_class(CGInitInfo, "CGInitRecord")
+EventRecord = record_class(EventInfo, "EventRecord")
+ExternalRepoRecord = record_class(ExternalRepoInfo, "ExternalRepoRecord")
+HostRecord = record_class(HostInfo, "HostRecord")
+MavenRecord = record_class(MavenInfo, "MavenRecord")
+NamedIDRecord = record_class(NamedID, "NamedIDRecord")
+OldNewRecord = record_class(OldNew, "OldNewRecord")
+PackageRecord = record_class(PackageInfo, "PackageRecord")
+PermRecord = record_class(PermInfo, "PermRecord")
+POMRecord = record_class(POMInfo, "POMRecord")
+RepoRecord = record_class(RepoInfo, "RepoRecord")
+RPMDepRecord = record_class(RPMDepInfo, "RPMDepRecord")
+RPMFileRecord = record_class(RPMFileInfo, "RPMFileRecord")
+RPMNVRARecord = record_class(RPMNVRA, "RPMNVRARecord")
+RPMRecord = record_class(RPMInfo, "RPMRecord")
+RPMSignatureRecord = record_class(RPMSignature, "RPMSignatureRecord")
+SearchResultRecord = record_class(SearchResult, "SearchResultRecord")
+SessionRecord = record_class(SessionInfo, "SessionRecord")
+TagBuildRecord = record_class(TagBuildInfo, "TagBuildRecord")
+TagExternalRepoRecord = record_class(TagExternalRepoEntry,
+                                     "TagExternalRepoRecord")
+TagFullInheritanceRecord = record_class(TagFullInheritanceEntry,
+                                        "TagFullInheritanceRecord")
+TagGroupPackageRecord = record_class(TagGroupPackage,
+                                     "TagGroupPackageRecord")
+TagGroupRecord = record_class(TagGroupInfo, "TagGroupRecord")
+TagGroupReqRecord = record_class(TagGroupReq, "TagGroupReqRecord")
+TagInheritanceRecord = record_class(TagInheritanceEntry,
+                                    "TagInheritanceRecord")
+TagPackageRecord = record_class(TagPackageInfo, "TagPackageRecord")
+TagPackageSimpleRecord = record_class(TagPackageSimple,
+                                      "TagPackageSimpleRecord")
+TagRecord = record_class(TagInfo, "TagRecord")
+TargetRecord = record_class(TargetInfo, "TargetRecord")
+TaskRecord = record_class(TaskInfo, "TaskRecord")
+UserDataRecord = record_class(UserData, "UserDataRecord")
+UserGroupRecord = record_class(UserGroup, "UserGroupRecord")
+UserRecord = record_class(UserInfo, "UserRecord")
+WinRecord = record_class(WinInfo, "WinRecord")
+
+
+# The end.
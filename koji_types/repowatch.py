@@ -0,0 +1,385 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - shared repo watching
+
+A `RepoWatcher` waits for repos on behalf of any number of callers at
+once. Where each ``koji.util.RepoWatcher`` polls the hub for its own
+tag, this watcher collects every waiter and checks all of the watched
+tags with a single multicall per tick. Waiters asking for the same
+tag, minimum event, and builds share a single `Future`, which is
+resolved with the `RepoInfo` of the first ready repo which satisfies
+them.
+
+::
+
+    with RepoWatcher(session, interval=5) as watcher:
+        futures = [watcher.watch(tag, min_event=event)
+                   for tag, event in needed]
+
+        for future in futures:
+            repo = future.result(timeout=3600)
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from concurrent.futures import Future
+from threading import Event, Lock, Thread
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Union,
+    cast, )
+
+from . import EventID, RepoID, RepoInfo, TagID
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession, VirtualCall
+
+
+__all__ = (
+    "RepoWatcher",
+    "WaitKey",
+)
+
+
+TagSpec = Union[str, TagID]
+
+WaitKey = Tuple[TagSpec, Optional[EventID], Tuple[str, ...]]
+"""
+The identity of a waiter, as its tag, minimum event, and the sorted
+NVRs of the builds it needs
+"""
+
+
+class _Waiter:
+
+    __slots__ = ("key", "builds", "future", "candidate", "rejected")
+
+    def __init__(self, key: WaitKey, builds: List[Tuple[str, str, str]]):
+        self.key = key
+        self.builds = builds
+        self.future: "Future[RepoInfo]" = Future()
+
+        # a repo which is new enough, but whose builds have not yet
+        # been checked
+        self.candidate: Optional[RepoInfo] = None
+
+        # repos found to be missing builds
+        self.rejected: Set[RepoID] = set()
+
+    @property
+    def tag(self) -> TagSpec:
+        return self.key[0]
+
+    @property
+    def min_event(self) -> Optional[EventID]:
+        return self.key[1]
+
+
+def _parse_nvr(nvr: str) -> Tuple[str, str, str]:
+    from koji import parse_NVR
+
+    found = parse_NVR(nvr)
+    return str(found["name"]), str(found["version"]), str(found["release"])
+
+
+def _settle(
+        future: "Future[RepoInfo]",
+        repo: Optional[RepoInfo],
+        error: Optional[Exception] = None) -> None:
+
+    try:
+        if error is None:
+            future.set_result(cast(RepoInfo, repo))
+        else:
+            future.set_exception(error)
+    except Exception:
+        # the future was cancelled by its caller in the meantime
+        pass
+
+
+class RepoWatcher:
+    """
+    Waits for repos on behalf of many callers, checking all of the
+    watched tags in one multicall per tick
+
+    :param session: the session to poll with. When the watcher is
+      started, this session is used only by the watcher's thread.
+
+    :param interval: the number of seconds between ticks
+
+    :param retries: the number of ticks in a row which may fail, eg.
+      because the hub is unreachable, before every pending future is
+      given the error
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            interval: float = 6.0,
+            retries: int = 5):
+
+        self.session = session
+        self.interval = interval
+        self.retries = retries
+
+        self._lock = Lock()
+        self._waiters: Dict[WaitKey, _Waiter] = {}
+
+        # the versions and releases of the builds of a package tagged
+        # in a tag as of an event, keyed by (tag, event, package)
+        self._tagged: Dict[Tuple[TagSpec, EventID, str],
+                           Set[Tuple[str, str]]] = {}
+
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def watch(
+            self,
+            tag: TagSpec,
+            min_event: Optional[EventID] = None,
+            nvrs: Iterable[str] = ()) -> "Future[RepoInfo]":
+        """
+        A future which will be given the first ready repo for tag
+        which was created at or after min_event, and which contains
+        all of the given builds. Callers waiting with the same tag,
+        min_event, and nvrs are given the same future.
+
+        Cancelling the future stops the watch for every caller which
+        shares it.
+
+        :param tag: the tag name or ID
+
+        :param min_event: the earliest acceptable repo event, or None
+          to accept the current repo
+
+        :param nvrs: the NVRs of builds which must be in the repo
+        """
+
+        wanted = tuple(sorted(set(nvrs)))
+        key: WaitKey = (tag, min_event, wanted)
+
+        with self._lock:
+            waiter = self._waiters.get(key)
+            if waiter is None or waiter.future.done():
+                builds = [_parse_nvr(nvr) for nvr in wanted]
+                waiter = self._waiters[key] = _Waiter(key, builds)
+            return waiter.future
+
+    def pending(self) -> int:
+        """
+        The number of distinct waits not yet resolved
+        """
+
+        with self._lock:
+            return sum(1 for w in self._waiters.values()
+                       if not w.future.done())
+
+    def _present(self, waiter: _Waiter, repo: RepoInfo) -> Optional[bool]:
+        """
+        Whether all of the waiter's builds are in the repo, or None if
+        that is not yet known
+        """
+
+        event = repo["create_event"]
+        for name, version, release in waiter.builds:
+            found = self._tagged.get((waiter.tag, event, name))
+            if found is None:
+                return None
+            if (version, release) not in found:
+                return False
+        return True
+
+    def _checks(
+            self,
+            waiters: List[_Waiter]) -> Set[Tuple[TagSpec, EventID, str]]:
+
+        checks = set()
+        for waiter in waiters:
+            if waiter.candidate is None:
+                continue
+            event = waiter.candidate["create_event"]
+            for name, _version, _release in waiter.builds:
+                check = (waiter.tag, event, name)
+                if check not in self._tagged:
+                    checks.add(check)
+        return checks
+
+    def _offer(self, waiter: _Waiter, repo: RepoInfo) -> None:
+        if repo["id"] in waiter.rejected:
+            return
+        min_event = waiter.min_event
+        if min_event is not None and repo["create_event"] < min_event:
+            return
+
+        present = self._present(waiter, repo)
+        if present is None:
+            # check the builds in the next tick
+            waiter.candidate = repo
+        elif present:
+            waiter.candidate = None
+            _settle(waiter.future, repo)
+        else:
+            waiter.candidate = None
+            waiter.rejected.add(repo["id"])
+
+    def tick(self) -> int:
+        """
+        Checks the current repo of every watched tag, along with the
+        builds in any repos which are candidates for waiters needing
+        builds, in a single multicall. Resolves the futures of the
+        waiters which are satisfied, and returns how many were.
+        """
+
+        with self._lock:
+            for key, waiter in list(self._waiters.items()):
+                if waiter.future.done():
+                    del self._waiters[key]
+            waiters = list(self._waiters.values())
+
+        if not waiters:
+            return 0
+
+        tags = list(dict.fromkeys(waiter.tag for waiter in waiters))
+        checks = list(self._checks(waiters))
+
+        with self.session.multicall() as mc:
+            repo_calls: List["VirtualCall"] = [
+                mc.getRepo(tag) for tag in tags]
+            check_calls: List["VirtualCall"] = [
+                mc.listTagged(tag, event=event, package=name, inherit=True)
+                for tag, event, name in checks]
+
+        for check, call in zip(checks, check_calls):
+            try:
+                found: List[Any] = call.result
+            except Exception:
+                # eg. the package does not exist yet, so its builds
+                # cannot be present either
+                found = []
+            self._tagged[check] = {(b["version"], b["release"])
+                                   for b in found}
+
+        repos: Dict[TagSpec, Optional[RepoInfo]] = {}
+        errors: Dict[TagSpec, Exception] = {}
+        for tag, call in zip(tags, repo_calls):
+            try:
+                repos[tag] = call.result
+            except Exception as error:
+                errors[tag] = error
+
+        resolved = 0
+        for waiter in waiters:
+            if waiter.future.done():
+                continue
+
+            failure = errors.get(waiter.tag)
+            if failure is not None:
+                _settle(waiter.future, None, failure)
+                continue
+
+            # the candidate may have been superseded by a newer repo,
+            # but is still acceptable if its builds are present
+            repo = repos.get(waiter.tag)
+            if waiter.candidate is not None:
+                self._offer(waiter, waiter.candidate)
+            if repo and not waiter.future.done():
+                self._offer(waiter, repo)
+
+            if waiter.future.done():
+                resolved += 1
+
+        self._prune(repos)
+        return resolved
+
+    def _prune(self, repos: Dict[TagSpec, Optional[RepoInfo]]) -> None:
+        # build checks against repos older than the current repo of
+        # their tag, and which no waiter is considering, are dropped
+        with self._lock:
+            wanted = {(w.tag, w.candidate["create_event"])
+                      for w in self._waiters.values() if w.candidate}
+
+        for check in list(self._tagged):
+            tag, event, _name = check
+            repo = repos.get(tag)
+            if (repo and event < repo["create_event"] and
+                    (tag, event) not in wanted):
+                del self._tagged[check]
+
+    def run(self) -> None:
+        """
+        Ticks every interval until `stop` is called. Errors raised by a
+        tick are retried at the next.
+        """
+
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as error:
+                # the hub may be briefly unreachable, so only give up
+                # once it has been for a number of ticks in a row
+                failures += 1
+                if failures >= self.retries:
+                    self._fail(error)
+                    failures = 0
+            else:
+                failures = 0
+            self._stop.wait(self.interval)
+
+    def _fail(self, error: Exception) -> None:
+        with self._lock:
+            waiters, self._waiters = self._waiters, {}
+        for waiter in waiters.values():
+            _settle(waiter.future, None, error)
+
+    def start(self) -> None:
+        """
+        Runs the watcher in a daemon thread
+        """
+
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = Thread(target=self.run, daemon=True,
+                                  name="RepoWatcher")
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the watcher's thread, and cancels any waits which have
+        not been resolved
+        """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._lock:
+            waiters, self._waiters = self._waiters, {}
+        for waiter in waiters.values():
+            waiter.future.cancel()
+
+    def __enter__(self) -> "RepoWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# The end.
@@ -0,0 +1,120 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - event-pinned snapshots
+
+A `SnapshotSession` pins every event-scoped call, such as
+``listTagged`` or ``getFullInheritance``, to a single `EventID`. The
+answers to such calls can never change, so they are memoised
+permanently, and may be stored on disk via a `CacheBackend` in order
+to be reused by later jobs against the same event.
+
+::
+
+    snap = SnapshotSession(session, backend=SQLiteBackend("snap.db"))
+    builds = snap.listTagged("f40-build", latest=True)
+    inheritance = snap.getFullInheritance("f40-build")
+
+    # later, and in another process, this is answered from disk
+    again = SnapshotSession(session, snap.event,
+                            backend=SQLiteBackend("snap.db"))
+    builds = again.listTagged("f40-build", latest=True)
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from . import EventID
+from .cache import (
+    CacheBackend, Cacheability, CachingSession, cacheability, )
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+
+
+__all__ = (
+    "SnapshotSession",
+)
+
+
+class SnapshotSession(CachingSession):
+    """
+    Wraps a `koji.ClientSession`, pinning every event-scoped call to
+    a single event. Calls which are given an explicit event keep it.
+    The results of event-scoped and immutable calls are memoised per
+    method, arguments, and event, without expiry. Volatile calls are
+    passed through to the wrapped session unchanged, and so are not
+    consistent with the snapshot.
+
+    :param session: the session to wrap
+
+    :param event: the event to pin calls to. If None, the most recent
+      event from ``getLastEvent`` is used.
+
+    :param maxsize: the number of results held in memory
+
+    :param backend: optional persistent store for results
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            event: Optional[EventID] = None,
+            maxsize: int = 10000,
+            backend: Optional[CacheBackend] = None):
+
+        super().__init__(session, maxsize=maxsize, ttl=None,
+                         backend=backend)
+
+        if event is None:
+            event = session.getLastEvent()["id"]
+        self.event: EventID = event
+
+    def _pin(
+            self,
+            name: str,
+            args: Tuple[Any, ...],
+            kwds: Dict[str, Any]) -> Tuple[Tuple[Any, ...],
+                                           Dict[str, Any]]:
+
+        found = cacheability(name)
+        if found.cacheability is not Cacheability.EVENT:
+            return args, kwds
+
+        index = found.event_index
+        if index is not None and len(args) > index:
+            if args[index] is None:
+                args = args[:index] + (self.event, ) + args[index + 1:]
+        elif kwds.get("event") is None:
+            kwds = dict(kwds, event=self.event)
+
+        return args, kwds
+
+    def callMethod(self, name: str, *args, **kwds) -> Any:
+        """
+        Invoke the named hub method, pinned to the snapshot's event
+        when it is event-scoped, and using a memoised result if one is
+        available
+        """
+
+        args, kwds = self._pin(name, args, kwds)
+        return super().callMethod(name, *args, **kwds)
+
+
+# The end.
@@ -0,0 +1,344 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - streaming hub responses
+
+A `ClientSession` reads the whole XML-RPC response of a call and
+unmarshals it into one list before returning, so the first record of
+a large ``listTagged`` or ``listRPMs`` is only seen once the last has
+arrived, and every record is held in memory at once. A
+`StreamingSession` sends its calls over the same session, but feeds
+the response to the parser as it arrives and yields each record of
+the result as soon as it is complete.
+
+::
+
+    streaming = StreamingSession(session)
+    for rpm in streaming.listRPMs(buildID=1234):
+        print(rpm["nvr"], rpm["payloadhash"])
+
+The records are decoded by the same unmarshaller as koji uses, so
+koji's ``<nil/>`` and ``<i8>`` extensions are supported. Calls are
+made once, without the retries of `ClientSession.callMethod`, since
+any records already yielded cannot be taken back.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import xmlrpc.client
+
+from collections import deque
+from typing import (
+    TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Optional,
+    Tuple, Union, cast, )
+
+from . import (
+    ArchiveID, ArchiveInfo, BuildID, BuildrootID, ChecksumType, Data,
+    EventID, HistoryRecord, HostID, QueryOptions, RPMInfo, TagBuildInfo,
+    TagID, UserID, )
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+    from requests import Session
+
+    from .arch import Arch
+
+
+__all__ = (
+    "DEFAULT_CHUNK_SIZE",
+    "StreamingSession",
+    "StreamingUnmarshaller",
+)
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""
+The number of bytes of a response fed to the parser at a time
+"""
+
+
+class StreamingUnmarshaller(xmlrpc.client.Unmarshaller):
+    """
+    An XML-RPC unmarshaller which removes each value of the top-level
+    array of a response as soon as it is complete, and places it in
+    the ``records`` queue instead. The array itself is left empty.
+
+    With members enabled, the response is instead expected to be a
+    struct of arrays, as from ``queryHistory``, and the queue is given
+    a tuple of the member name and value for each value of those
+    arrays.
+    """
+
+    dispatch: Dict[str, Callable[[Any, str], None]] = \
+        xmlrpc.client.Unmarshaller.dispatch.copy()
+
+    def __init__(self, members: bool = False):
+        super().__init__()
+
+        self.records: Deque[Any] = deque()
+        self._members = members
+        self._level = 2 if members else 1
+
+        # whether the top-level value is a struct, which is only
+        # tracked when streaming its members
+        self._outer_struct = False
+        if members:
+            self.dispatch = self._members_dispatch
+
+    def end_value(self, data: str) -> None:
+        xmlrpc.client.Unmarshaller.end_value(self, data)
+
+        # this is called for every value in the response, so the
+        # common case of a value nested deeper is dismissed first
+        marks = self._marks
+        if len(marks) != self._level:
+            return
+
+        # a completed value of an array is the only item on the stack
+        # past the mark of the array, as the earlier ones have been
+        # removed. In a struct there is also at least the member name.
+        stack = self._stack
+        mark = marks[-1]
+        if len(stack) != mark + 1:
+            return
+
+        if not self._members:
+            self.records.append(stack.pop())
+        elif self._outer_struct:
+            # the member name precedes the array in its struct
+            value = stack.pop()
+            self.records.append((stack[mark - 1], value))
+
+    dispatch["value"] = end_value
+
+    def end_name(self, data: str) -> None:
+        if len(self._marks) == 1:
+            self._outer_struct = True
+        self.end_string(data)
+
+    _members_dispatch = dispatch.copy()
+    _members_dispatch["name"] = end_name
+
+
+def _given(**kwargs: Any) -> Dict[str, Any]:
+    # arguments left as None are not sent, so that hubs which predate
+    # an argument still accept the call
+    return {key: value for key, value in kwargs.items()
+            if value is not None}
+
+
+class StreamingSession:
+    """
+    Makes calls over a session whose array results are yielded one
+    record at a time, as the response arrives
+
+    :param session: the session to make the calls with. Its
+      connection, options, and login are used for each call.
+
+    :param chunk_size: the number of bytes of the response fed to the
+      parser at a time
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            chunk_size: int = DEFAULT_CHUNK_SIZE):
+
+        self.session = session
+        self.chunk_size = chunk_size
+
+    def _post(self, name: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        session = self.session
+        if session.rsession is None:
+            session.new_session()
+        rsession = cast("Session", session.rsession)
+
+        handler, headers, request = session._prepCall(name, args, kwargs)
+
+        # the same request options as ClientSession._sendOneCall
+        opts = session.opts
+        callopts: Dict[str, Any] = {
+            "headers": dict(headers),
+            "data": request,
+            "stream": True,
+        }
+        if opts.get("serverca"):
+            callopts["verify"] = opts["serverca"]
+        elif opts.get("no_ssl_verify"):
+            callopts["verify"] = False
+        for key in ("cert", "auth", "timeout"):
+            if opts.get(key):
+                callopts[key] = opts[key]
+
+        response = rsession.post(handler, **callopts)
+        response.raise_for_status()
+        return response
+
+    def _stream(
+            self,
+            name: str,
+            args: Tuple,
+            kwargs: Dict[str, Any],
+            members: bool) -> Iterator[Any]:
+
+        from koji import GenericError, convertFault
+        from koji.xmlrpcplus import Fault
+
+        # importing koji has installed defusedxml's parser as the
+        # FastParser of xmlrpc.client, as used by koji's getparser
+        target = StreamingUnmarshaller(members)
+        parser_type = getattr(xmlrpc.client, "FastParser", None)
+        parser = (parser_type or xmlrpc.client.ExpatParser)(target)
+        records = target.records
+
+        response = self._post(name, args, kwargs)
+        try:
+            for chunk in response.iter_content(self.chunk_size):
+                parser.feed(chunk)
+                while records:
+                    yield records.popleft()
+
+            parser.close()
+            while records:
+                yield records.popleft()
+        finally:
+            response.close()
+
+        try:
+            result = target.close()
+        except Fault as fault:
+            raise convertFault(fault) from None
+
+        # anything left was not in the expected shape
+        found = result[0] if len(result) == 1 else result
+        if members:
+            ok = isinstance(found, dict) and \
+                all(value == [] for value in found.values())
+        else:
+            ok = found == []
+        if not ok:
+            expected = "a struct of arrays" if members else "an array"
+            raise GenericError(f"{name} did not return {expected}, but"
+                               f" {type(found).__name__}")
+
+    def stream(self, name: str, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        """
+        Invokes the named hub method, which must return an array, and
+        yields each of its values as it arrives. Raises a
+        ``koji.GenericError`` once the response is complete if the
+        result was not an array.
+        """
+
+        return self._stream(name, args, kwargs, False)
+
+    def stream_members(
+            self,
+            name: str,
+            *args: Any,
+            **kwargs: Any) -> Iterator[Tuple[str, Any]]:
+        """
+        Invokes the named hub method, which must return a struct whose
+        members are arrays, and yields a tuple of the member name and
+        value for each of the values of those arrays as it arrives
+        """
+
+        return self._stream(name, args, kwargs, True)
+
+    def listTagged(
+            self,
+            tag: Union[str, TagID],
+            event: Optional[EventID] = None,
+            inherit: bool = False,
+            prefix: Optional[str] = None,
+            latest: bool = False,
+            package: Optional[str] = None,
+            owner: Optional[Union[str, UserID]] = None,
+            type: Optional[str] = None,
+            strict: bool = True,
+            extra: bool = False,
+            draft: Optional[bool] = None) -> Iterator[TagBuildInfo]:
+        """
+        Streams the results of ``listTagged``
+        """
+
+        return self.stream("listTagged", tag, **_given(
+            event=event, inherit=inherit, prefix=prefix, latest=latest,
+            package=package, owner=owner, type=type, strict=strict,
+            extra=extra, draft=draft))
+
+    def listRPMs(
+            self,
+            buildID: Optional[BuildID] = None,
+            buildrootID: Optional[BuildrootID] = None,
+            imageID: Optional[int] = None,
+            componentBuildrootID: Optional[BuildrootID] = None,
+            hostID: Optional[HostID] = None,
+            arches: Union["Arch", List["Arch"], None] = None,
+            queryOpts: Optional[QueryOptions] = None,
+            draft: Optional[bool] = None) -> Iterator[RPMInfo]:
+        """
+        Streams the results of ``listRPMs``
+        """
+
+        return self.stream("listRPMs", **_given(
+            buildID=buildID, buildrootID=buildrootID, imageID=imageID,
+            componentBuildrootID=componentBuildrootID, hostID=hostID,
+            arches=arches, queryOpts=queryOpts, draft=draft))
+
+    def listArchives(
+            self,
+            buildID: Optional[BuildID] = None,
+            buildrootID: Optional[BuildrootID] = None,
+            componentBuildrootID: Optional[BuildrootID] = None,
+            hostID: Optional[HostID] = None,
+            type: Optional[str] = None,
+            filename: Optional[str] = None,
+            size: Optional[int] = None,
+            checksum: Optional[str] = None,
+            checksum_type: Optional[ChecksumType] = None,
+            typeInfo: Optional[Data] = None,
+            queryOpts: Optional[QueryOptions] = None,
+            imageID: Optional[int] = None,
+            archiveID: Optional[ArchiveID] = None,
+            strict: bool = False) -> Iterator[ArchiveInfo]:
+        """
+        Streams the results of ``listArchives``
+        """
+
+        return self.stream("listArchives", **_given(
+            buildID=buildID, buildrootID=buildrootID,
+            componentBuildrootID=componentBuildrootID, hostID=hostID,
+            type=type, filename=filename, size=size, checksum=checksum,
+            checksum_type=checksum_type, typeInfo=typeInfo,
+            queryOpts=queryOpts, imageID=imageID, archiveID=archiveID,
+            strict=strict))
+
+    def queryHistory(
+            self,
+            tables: Optional[List[str]] = None,
+            **kwargs: Any) -> Iterator[Tuple[str, HistoryRecord]]:
+        """
+        Streams the results of ``queryHistory`` as tuples of the table
+        name and the history entry. See `koji_types.history.HISTORY_TYPES`
+        for the type of the entries of each table.
+        """
+
+        return self.stream_members("queryHistory", tables=tables, **kwargs)
+
+
+# The end.
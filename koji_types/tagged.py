@@ -0,0 +1,509 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - local latest builds
+
+A `TagBuildIndex` holds the builds tagged into, and the package lists
+of, a number of tags at a single event, along with an
+`InheritanceGraph` of their links. From these it answers
+``listTagged`` and ``getLatestBuilds`` queries for any tag in those
+inheritance trees locally, with the same semantics as the hub's
+``readTaggedBuilds``:
+
+* builds are taken from the tag and then from each tag in its full
+  inheritance, in order
+* within each tag, more recently tagged builds come first
+* builds of packages which are blocked in, or absent from, the
+  inherited package list of the tag are omitted
+* the draft filter is applied before the latest builds are chosen
+
+The latest builds of each tag are kept in an index by package name,
+so that repeated lookups do not walk the builds again.
+
+::
+
+    index = TagBuildIndex.load(session, ["f40-build"], event=event)
+    for tag in index.tags():
+        bld = index.latest_build(tag, "bash")
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Union, )
+
+from . import (
+    BuildID, EventID, PackageID, TagBuildInfo, TagFullInheritance, TagID,
+    TagPackageInfo, UserID, )
+from .inheritance import (
+    InheritanceGraph, InheritanceResolver, TagSpec, package_allowed, )
+from .multicall import multicall_map
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+
+
+__all__ = (
+    "TagBuildIndex",
+)
+
+
+_ListKey = Tuple[TagID, bool, int, Optional[bool]]
+
+
+class _Memo:
+
+    __slots__ = ("inheritance", "tags", "value", )
+
+    def __init__(self, inheritance: Optional[TagFullInheritance],
+                 tags: Set[TagID], value):
+        self.inheritance = inheritance
+        self.tags = tags
+        self.value = value
+
+
+def _discard(memos: Dict[Any, _Memo], tag: TagID):
+    # drop the memos which depend upon tag
+    for key, memo in list(memos.items()):
+        if tag in memo.tags:
+            del memos[key]
+
+
+class TagBuildIndex:
+    """
+    Answers ``listTagged`` and ``getLatestBuilds`` queries locally,
+    from the tagged builds and package lists of a set of tags
+
+    A snapshot from ``listTagged(tag, inherit=True)`` only includes
+    the builds of packages which are unblocked in that tag's package
+    list. A tag in its inheritance which unblocks a package the
+    snapshot omitted needs a snapshot of its own, as reported by
+    `incomplete`.
+
+    :param graph: the inheritance links of the tags, at the same event
+      as the builds and package lists
+    """
+
+    def __init__(self, graph: InheritanceGraph):
+        self.graph = graph
+
+        self._tagged: Dict[TagID, List[TagBuildInfo]] = {}
+        self._tagged_pkgs: Dict[TagID, Set[PackageID]] = {}
+        self._packages: Dict[TagID, List[TagPackageInfo]] = {}
+        self._bases: Dict[TagID, bool] = {}
+        self._complete: Set[TagID] = set()
+
+        self._lists: Dict[_ListKey, _Memo] = {}
+        self._pkglists: Dict[TagID, _Memo] = {}
+        self._latest: Dict[Tuple[TagID, Optional[bool]], _Memo] = {}
+
+    @property
+    def event(self) -> Optional[EventID]:
+        return self.graph.event
+
+    def tags(self) -> List[TagID]:
+        """
+        The tags with a package list in this index
+        """
+
+        return list(self._packages)
+
+    def add_snapshot(
+            self,
+            tag: TagID,
+            builds: Iterable[TagBuildInfo],
+            inherit: bool = True) -> None:
+        """
+        Add the builds from a ``listTagged(tag, inherit=inherit)``
+        call, which must not have been given the latest option or any
+        filters. Builds are grouped by the tag they are actually
+        tagged into. Packages already known for that tag are kept as
+        they were, and the builds of any further packages follow them,
+        so the order of builds across packages may then differ from
+        the hub's.
+        """
+
+        self._bases[tag] = self._bases.get(tag, False) or inherit
+
+        found: Dict[TagID, List[TagBuildInfo]] = {}
+        for bld in builds:
+            found.setdefault(bld["tag_id"], []).append(bld)
+
+        for other, blds in found.items():
+            known = self._tagged_pkgs.get(other)
+            if known is None:
+                self._set_tagged(other, blds)
+            else:
+                more = [bld for bld in blds if bld["package_id"] not in known]
+                if more:
+                    self._set_tagged(other, self._tagged[other] + more)
+
+    def set_tagged(self, tag: TagID, builds: List[TagBuildInfo]) -> None:
+        """
+        Set every build tagged into a tag, most recently tagged first,
+        replacing any it had. Unlike the results of ``listTagged``,
+        these must include the builds of packages which are blocked in
+        the tag.
+        """
+
+        self._complete.add(tag)
+        self._set_tagged(tag, builds)
+
+    def _set_tagged(self, tag: TagID, builds: List[TagBuildInfo]):
+        self._tagged[tag] = builds
+        self._tagged_pkgs[tag] = {bld["package_id"] for bld in builds}
+        self._discard(tag)
+
+    def tag_build(self, tag: TagID, build: TagBuildInfo) -> None:
+        """
+        Record a build as having just been tagged into a tag
+        """
+
+        builds = [bld for bld in self._tagged.get(tag, ())
+                  if bld["id"] != build["id"]]
+        builds.insert(0, build)
+        self._set_tagged(tag, builds)
+
+    def untag_build(self, tag: TagID, build_id: BuildID) -> None:
+        """
+        Record a build as having been untagged from a tag
+        """
+
+        builds = self._tagged.get(tag, [])
+        if any(bld["id"] == build_id for bld in builds):
+            self._set_tagged(tag, [bld for bld in builds
+                                   if bld["id"] != build_id])
+
+    def _allowed(self, tag: TagID) -> Set[PackageID]:
+        return {pkg_id for pkg_id, pkg in self.package_list(tag).items()
+                if not pkg["blocked"]}
+
+    def incomplete(self) -> List[TagID]:
+        """
+        The tags whose latest builds may be missing builds of packages
+        which no snapshot included. Adding a snapshot of each will
+        complete them.
+        """
+
+        covered: Dict[TagID, Set[PackageID]] = {}
+        for base, inherit in self._bases.items():
+            allowed = self._allowed(base)
+            covered.setdefault(base, set()).update(allowed)
+            if not inherit:
+                continue
+            for link in self.graph.full_inheritance(base):
+                covered.setdefault(link["parent_id"], set()).update(allowed)
+
+        found = []
+        for tag in self.tags():
+            if self._bases.get(tag):
+                # an inherited snapshot is always complete for its tag
+                continue
+            allowed = self._allowed(tag)
+            taglist = [tag]
+            taglist.extend(link["parent_id"]
+                           for link in self.graph.full_inheritance(tag))
+            for other in taglist:
+                if other not in self._complete and \
+                   not allowed <= covered.get(other, set()):
+                    found.append(tag)
+                    break
+
+        return found
+
+    def set_packages(
+            self,
+            tag: TagID,
+            packages: List[TagPackageInfo]) -> None:
+        """
+        Set the package list of a tag, as from ``listPackages`` without
+        inherited, replacing any it had
+        """
+
+        self._packages[tag] = packages
+        self._discard(tag)
+
+    def _discard(self, tag: TagID):
+        _discard(self._lists, tag)
+        _discard(self._pkglists, tag)
+        _discard(self._latest, tag)
+
+    def _fresh(self, memo: _Memo, inheritance: TagFullInheritance) -> bool:
+        # a memo is only valid while the graph's memoised inheritance
+        # it was computed from is current
+        return memo.inheritance is inheritance
+
+    def package_list(self, tag: TagSpec) -> Dict[PackageID, TagPackageInfo]:
+        """
+        The package list of a tag, including inherited entries, as
+        from ``listPackages(tag, inherited=True)``, by package ID.
+        Blocked entries are included.
+        """
+
+        tag_id = self.graph.resolve(tag)
+        inheritance = self.graph.full_inheritance(tag_id)
+
+        memo = self._pkglists.get(tag_id)
+        if memo is not None and self._fresh(memo, inheritance):
+            return memo.value
+
+        found: Dict[PackageID, TagPackageInfo] = {}
+        for pkg in self._packages.get(tag_id, ()):
+            found.setdefault(pkg["package_id"], pkg)
+
+        tags = {tag_id}
+        for link in inheritance:
+            parent = link["parent_id"]
+            tags.add(parent)
+            for pkg in self._packages.get(parent, ()):
+                if pkg["package_id"] not in found and \
+                   package_allowed(link, pkg["package_name"]):
+                    found[pkg["package_id"]] = pkg
+
+        self._pkglists[tag_id] = _Memo(inheritance, tags, found)
+        return found
+
+    def list_tagged(
+            self,
+            tag: TagSpec,
+            inherit: bool = False,
+            latest: Union[bool, int] = False,
+            package: Optional[str] = None,
+            prefix: Optional[str] = None,
+            owner: Union[str, UserID, None] = None,
+            draft: Optional[bool] = None) -> List[TagBuildInfo]:
+        """
+        The builds tagged into a tag, as from ``listTagged``. Results
+        are memoised, and should not be modified.
+
+        :param tag: the tag to list builds from
+
+        :param inherit: include builds from the tag's full inheritance
+
+        :param latest: only the most recently tagged build of each
+          package if True, or that many if an int
+
+        :param package: only builds of this package
+
+        :param prefix: only builds of packages with this prefix
+
+        :param owner: only builds owned by this user name or ID
+
+        :param draft: only draft builds if True, or only non-draft
+          builds if False
+        """
+
+        tag_id = self.graph.resolve(tag)
+        limit = 1 if latest is True else int(latest)
+        key: _ListKey = (tag_id, inherit, limit, draft)
+
+        inheritance = self.graph.full_inheritance(tag_id)
+        memo = self._lists.get(key)
+        if memo is None or not self._fresh(memo, inheritance):
+            memo = self._lists[key] = self._list(
+                tag_id, inheritance, inherit, limit, draft)
+
+        found: List[TagBuildInfo] = memo.value
+
+        if package is not None:
+            found = [bld for bld in found if bld["package_name"] == package]
+        if prefix:
+            found = [bld for bld in found
+                     if bld["package_name"].startswith(prefix)]
+        if isinstance(owner, str):
+            found = [bld for bld in found if bld["owner_name"] == owner]
+        elif owner is not None:
+            found = [bld for bld in found if bld["owner_id"] == owner]
+
+        return found
+
+    def _list(
+            self,
+            tag_id: TagID,
+            inheritance: TagFullInheritance,
+            inherit: bool,
+            limit: int,
+            draft: Optional[bool]) -> _Memo:
+
+        # mirrors the hub's readTaggedBuilds. The package list is always
+        # read with inheritance, and takes priority over the builds
+
+        packages = self.package_list(tag_id)
+
+        taglist = [tag_id]
+        if inherit:
+            taglist.extend(link["parent_id"] for link in inheritance)
+
+        found = []
+        seen: Dict[PackageID, int] = {}
+        for tag in taglist:
+            for bld in self._tagged.get(tag, ()):
+                pkg_id = bld["package_id"]
+                pinfo = packages.get(pkg_id)
+                if pinfo is None or pinfo["blocked"]:
+                    continue
+                if draft is not None and bool(bld.get("draft")) != draft:
+                    continue
+                if limit:
+                    count = seen.get(pkg_id, 0)
+                    if count >= limit:
+                        continue
+                    seen[pkg_id] = count + 1
+                found.append(bld)
+
+        tags = set(taglist)
+        tags.update(self._pkglists[tag_id].tags)
+        return _Memo(inheritance, tags, found)
+
+    def latest_builds(
+            self,
+            tag: TagSpec,
+            package: Optional[str] = None,
+            draft: Optional[bool] = None) -> List[TagBuildInfo]:
+        """
+        The latest build of each package in a tag and its
+        inheritance, as from ``getLatestBuilds``
+        """
+
+        return self.list_tagged(tag, inherit=True, latest=True,
+                                package=package, draft=draft)
+
+    def latest_index(
+            self,
+            tag: TagSpec,
+            draft: Optional[bool] = None) -> Dict[str, TagBuildInfo]:
+        """
+        The latest builds of a tag and its inheritance, by package
+        name. Memoised, and should not be modified.
+        """
+
+        tag_id = self.graph.resolve(tag)
+        inheritance = self.graph.full_inheritance(tag_id)
+
+        memo = self._latest.get((tag_id, draft))
+        if memo is None or not self._fresh(memo, inheritance):
+            builds = self.latest_builds(tag_id, draft=draft)
+            found = {bld["package_name"]: bld for bld in builds}
+            tags = self._lists[(tag_id, True, 1, draft)].tags
+            memo = self._latest[(tag_id, draft)] = \
+                _Memo(inheritance, tags, found)
+
+        return memo.value
+
+    def latest_build(
+            self,
+            tag: TagSpec,
+            package: str,
+            draft: Optional[bool] = None) -> Optional[TagBuildInfo]:
+        """
+        The latest build of a package in a tag and its inheritance, or
+        None if there is no such build
+        """
+
+        return self.latest_index(tag, draft).get(package)
+
+    @classmethod
+    def load(
+            cls,
+            session: "ClientSession",
+            tags: Iterable[TagSpec],
+            event: Optional[EventID] = None,
+            resolver: Optional[InheritanceResolver] = None,
+            size: int = 100,
+            inherit: bool = True) -> "TagBuildIndex":
+        """
+        Create an index from one ``listTagged(tag, inherit=True)``
+        snapshot of each of the given tags, along with the package
+        list of every tag in their inheritance, and in the inheritance
+        of those tags in turn. Each step is a single multicall. A final
+        multicall takes snapshots of any tags in the inheritance which
+        unblock packages that the base tags did not.
+
+        Where the inheritance of the base tags overlaps, the same
+        builds are sent in each of their snapshots. Without inherit,
+        the builds of each tag are instead fetched only once, with
+        ``listTagged(tag)``, at the cost of a few more snapshots of
+        tags which unblock packages.
+
+        :param session: the session to fetch with
+
+        :param tags: the base tags to take snapshots of
+
+        :param event: the event to take the snapshots at. If None, the
+          last event is used, so that all the data is consistent.
+
+        :param resolver: an inheritance resolver to share, whose
+          graph for the event is used
+
+        :param size: the number of calls in each multicall
+
+        :param inherit: whether to take inherited snapshots of the
+          base tags, or snapshots of every tag without inherit
+        """
+
+        if event is None:
+            event = session.getLastEvent()["id"]
+        if resolver is None:
+            resolver = InheritanceResolver(session, event)
+
+        # tags may be a one-shot iterator, and is walked twice
+        tags = list(tags)
+
+        graph = resolver.graph(event)
+        resolver.prefetch(tags, event)
+        bases = [graph.resolve(tag) for tag in tags]
+
+        index = cls(graph)
+
+        def snapshot(tags: List[TagID], inherit: bool):
+            found: Iterable[List[TagBuildInfo]] = multicall_map(
+                session,
+                lambda mc, tag: mc.listTagged(tag, event, inherit),
+                tags, size=size, strict=True)
+            for tag, builds in zip(tags, found):
+                index.add_snapshot(tag, builds, inherit)
+
+        if inherit:
+            snapshot(bases, True)
+
+        # each tag in an inheritance may have an inheritance of its own
+        # which reaches further, eg. past a maxdepth
+        every: Dict[TagID, None] = {}
+        todo = list(bases)
+        while todo:
+            tag = todo.pop()
+            if tag not in every:
+                every[tag] = None
+                todo.extend(link["parent_id"]
+                            for link in graph.full_inheritance(tag))
+
+        pkglists: Iterable[List[TagPackageInfo]] = multicall_map(
+            session,
+            lambda mc, tag: mc.listPackages(tagID=tag, event=event),
+            list(every), size=size, strict=True)
+        for tag, packages in zip(every, pkglists):
+            index.set_packages(tag, packages)
+
+        if not inherit:
+            snapshot(list(every), False)
+        snapshot(index.incomplete(), True)
+
+        return index
+
+
+# The end.
@@ -0,0 +1,452 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - batched task tree watching
+
+A `TaskTreeWatcher` follows one or more tasks and all of their
+descendants. Where ``koji_cli.lib.watch_tasks`` makes a ``getTaskInfo``
+and a ``getTaskChildren`` call for every task at every interval, the
+watcher refreshes every unfinished task of every tree that is due in a
+single multicall per tick, and discovers new subtasks with one
+``listTasks`` query per tree.
+
+Each tree is polled on its own schedule. A tree whose tasks have not
+changed is polled less and less often, up to a limit, and is polled
+at the base interval again as soon as anything in it changes. Once
+every task in a tree has reached a terminal state, the tree is no
+longer polled at all.
+
+The individual tasks are `WatchedTask` instances, which offer the
+same ``is_done``, ``is_success``, and ``get_failure`` methods as
+``koji_cli.lib.TaskWatcher``.
+
+::
+
+    watcher = TaskTreeWatcher(session, [task_id])
+
+    for changes in watcher.watch():
+        for change in changes:
+            print(change.task, change.old, "->", change.new)
+
+    if not watcher.is_success():
+        for task in watcher.failed():
+            print(task, task.get_failure())
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from time import monotonic, sleep
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, NamedTuple,
+    Optional, Set, Tuple, )
+
+from . import ListTasksOptions, TaskID, TaskInfo
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession, VirtualCall
+
+
+__all__ = (
+    "TaskChange",
+    "TaskTreeWatcher",
+    "WatchedTask",
+)
+
+
+# the values of TaskState, which are not imported here so that koji
+# itself is only loaded when it is needed
+_CLOSED = 2
+_CANCELED = 3
+_FAILED = 5
+_DONE = frozenset((_CLOSED, _CANCELED, _FAILED))
+
+
+class WatchedTask:
+    """
+    A single task within a watched tree
+
+    :param session: the session used to fetch the task's failure
+
+    :param task_id: the task's ID
+
+    :param level: the depth of the task below the root of its tree
+
+    :param parent: the task's parent, if it is not the root
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            task_id: TaskID,
+            level: int = 0,
+            parent: Optional["WatchedTask"] = None):
+
+        self.session = session
+        self.id = task_id
+        self.level = level
+        self.parent = parent
+        self.info: Optional[TaskInfo] = None
+        self.children: List["WatchedTask"] = []
+        self._failure: Optional[str] = None
+
+    @property
+    def state(self) -> Optional[int]:
+        """
+        The task's state, or None if it has not yet been fetched
+        """
+
+        return self.info["state"] if self.info else None
+
+    def __str__(self) -> str:
+        return self.str()
+
+    def __repr__(self) -> str:
+        return f"<WatchedTask {self.id} state={self.state}>"
+
+    def is_done(self) -> bool:
+        return self.state in _DONE
+
+    def is_success(self) -> bool:
+        return self.state == _CLOSED
+
+    def get_failure(self) -> str:
+        """
+        A description of the error the task failed with, or an empty
+        string if it did not fail
+        """
+
+        if self.state != _FAILED:
+            return ''
+        if self._failure is None:
+            from koji import GenericError
+            from xmlrpc.client import Fault
+            try:
+                self.session.getTaskResult(self.id)
+                self._failure = ''
+            except (Fault, GenericError) as error:
+                self._set_failure(error)
+        return self._failure or ''
+
+    def _set_failure(self, error: Exception) -> None:
+        self._failure = f"{error.__class__.__name__}: {str(error).strip()}"
+
+    # defined last, as it hides the str type from the annotations of
+    # any methods after it
+    def str(self) -> str:
+        if self.info:
+            from koji import taskLabel
+            label = taskLabel(self.info)
+            return f"{'  ' * self.level}{self.id} {label}"
+        else:
+            return f"{'  ' * self.level}{self.id}"
+
+
+class TaskChange(NamedTuple):
+    task: WatchedTask
+    """ the task whose state changed """
+
+    old: Optional[int]
+    """ the previous state, or None if the task was newly discovered """
+
+    new: int
+    """ the current state """
+
+
+class _Tree:
+    """
+    A root task and its descendants, with their polling schedule
+    """
+
+    __slots__ = ("root", "tasks", "explore", "since", "interval", "due")
+
+    def __init__(self, root: WatchedTask, interval: float):
+        self.root = root
+        self.tasks: Dict[TaskID, WatchedTask] = {root.id: root}
+
+        # tasks whose subtasks have not been listed since they were
+        # discovered, which may have spawned subtasks even if they
+        # were already finished when found
+        self.explore: Set[TaskID] = set()
+
+        # subtasks created after this timestamp are listed
+        self.since = 0.0
+
+        self.interval = interval
+        self.due = 0.0
+
+    def pending(self) -> List[TaskID]:
+        return [tid for tid, task in self.tasks.items()
+                if not task.is_done()]
+
+    def finished(self) -> bool:
+        return not self.explore and all(
+            task.is_done() for task in self.tasks.values())
+
+    def newest(self) -> float:
+        return max((task.info["create_ts"] for task in self.tasks.values()
+                    if task.info), default=0.0)
+
+
+class TaskTreeWatcher:
+    """
+    Watches the trees of tasks beneath a set of root tasks, refreshing
+    all of the unfinished tasks of the trees that are due with a
+    single multicall per tick
+
+    :param session: the session to poll with
+
+    :param task_ids: the root tasks to watch
+
+    :param interval: the base number of seconds between polls of a
+      tree
+
+    :param max_interval: the largest number of seconds between polls
+      of a tree which has not changed
+
+    :param backoff: the factor by which the interval of an unchanged
+      tree grows after each poll
+
+    :param request: whether to fetch each task's request, which is
+      needed to give some tasks a meaningful label
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            task_ids: Iterable[TaskID],
+            interval: float = 5.0,
+            max_interval: float = 60.0,
+            backoff: float = 1.5,
+            request: bool = True,
+            clock: Callable[[], float] = monotonic):
+
+        self.session = session
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.backoff = backoff
+        self.request = request
+        self._clock = clock
+
+        self.tasks: Dict[TaskID, WatchedTask] = {}
+        self.roots: List[WatchedTask] = []
+        self._trees: List[_Tree] = []
+
+        for task_id in task_ids:
+            if task_id not in self.tasks:
+                root = WatchedTask(session, task_id)
+                self.tasks[task_id] = root
+                self.roots.append(root)
+                self._trees.append(_Tree(root, interval))
+
+        self._loaded = False
+
+    def _add(self, tree: _Tree, info: TaskInfo) -> Optional[WatchedTask]:
+        parent = tree.tasks.get(info["parent"]) if info["parent"] else None
+        if info["id"] in tree.tasks or parent is None:
+            return None
+
+        task = WatchedTask(self.session, info["id"], parent.level + 1, parent)
+        task.info = info
+        parent.children.append(task)
+        tree.tasks[task.id] = task
+        self.tasks[task.id] = task
+        return task
+
+    def load(self) -> List[TaskChange]:
+        """
+        Fetches the root tasks and their full trees of descendants, in
+        a single multicall. Raises a KeyError if a root task does not
+        exist. Returns a change for each task found.
+        """
+
+        ids = [root.id for root in self.roots]
+        with self.session.multicall(strict=True) as mc:
+            infos = mc.getTaskInfo(ids, request=self.request)
+            descendents = [mc.getTaskDescendents(tid, request=self.request)
+                           for tid in ids]
+
+        changes = []
+        now = self._clock()
+        for tree, info, found in zip(self._trees, infos.result, descendents):
+            if info is None:
+                raise KeyError(f"No such task: {tree.root.id}")
+            tree.root.info = info
+            changes.append(TaskChange(tree.root, None, info["state"]))
+
+            # the children of each task are keyed by the task's ID as a
+            # string, so walk down from the root to give each its level
+            unvisited = [tree.root.id]
+            while unvisited:
+                parent_id = unvisited.pop()
+                for child in found.result.get(str(parent_id), ()):
+                    task = self._add(tree, child)
+                    if task is not None:
+                        changes.append(TaskChange(task, None, child["state"]))
+                        unvisited.append(task.id)
+
+            tree.since = tree.newest() - 1.0
+            tree.due = now + self.interval
+
+        self._loaded = True
+        return changes
+
+    def next_due(self) -> Optional[float]:
+        """
+        The clock time at which the next tree is due to be polled, or
+        None if every tree has finished
+        """
+
+        return min((tree.due for tree in self._trees
+                    if not tree.finished()), default=None)
+
+    def tick(self) -> List[TaskChange]:
+        """
+        Polls every unfinished tree which is due, in a single
+        multicall, and returns the changes found. Trees with changes
+        are next polled after the base interval, and trees without
+        after a longer one.
+        """
+
+        if not self._loaded:
+            return self.load()
+
+        now = self._clock()
+        due = [tree for tree in self._trees
+               if not tree.finished() and tree.due <= now]
+        if not due:
+            return []
+
+        calls: List[Tuple[_Tree, Optional["VirtualCall"],
+                          Optional["VirtualCall"]]] = []
+
+        with self.session.multicall(strict=True) as mc:
+            for tree in due:
+                pending = tree.pending()
+                parents: List[int] = [*pending]
+                parents.extend(tid for tid in tree.explore
+                               if tid not in pending)
+
+                # the info is fetched before the subtasks are listed,
+                # so any subtask spawned by a task before it finished
+                # is listed in the same poll that sees it finish
+                info_call = mc.getTaskInfo(
+                    pending, request=self.request) if pending else None
+                opts: ListTasksOptions = {
+                    "parent": parents,
+                    "createdAfter": tree.since,
+                    "decode": self.request,
+                }
+                child_call = mc.listTasks(opts) if parents else None
+                calls.append((tree, info_call, child_call))
+
+        changes: List[TaskChange] = []
+        for tree, info_call, child_call in calls:
+            found = []
+
+            if info_call is not None:
+                for info in info_call.result:
+                    task = tree.tasks[info["id"]]
+                    old = task.state
+                    task.info = info
+                    if old != info["state"]:
+                        found.append(TaskChange(task, old, info["state"]))
+
+            tree.explore.clear()
+            since = tree.newest() - 1.0
+
+            if child_call is not None:
+                for info in child_call.result:
+                    added = self._add(tree, info)
+                    if added is not None:
+                        found.append(TaskChange(added, None, info["state"]))
+                        tree.explore.add(added.id)
+                        # subtasks of a new task are no older than it
+                        since = min(since, info["create_ts"] - 1.0)
+
+            tree.since = since
+            if found:
+                tree.interval = self.interval
+            else:
+                tree.interval = min(tree.interval * self.backoff,
+                                    self.max_interval)
+            tree.due = now + tree.interval
+            changes.extend(found)
+
+        return changes
+
+    def watch(self) -> Iterator[List[TaskChange]]:
+        """
+        Ticks until every tree has finished, sleeping until the next
+        tree is due between ticks. Yields each non-empty list of
+        changes.
+        """
+
+        while True:
+            changes = self.tick()
+            if changes:
+                yield changes
+
+            due = self.next_due()
+            if due is None:
+                return
+
+            wait = due - self._clock()
+            if wait > 0:
+                sleep(wait)
+
+    def is_done(self) -> bool:
+        """
+        True once every task in every tree has finished
+        """
+
+        return self._loaded and all(tree.finished() for tree in self._trees)
+
+    def is_success(self) -> bool:
+        """
+        True once every root task has closed successfully. As with
+        ``koji_cli.lib.watch_tasks``, failed subtasks do not count
+        against this unless their failure failed the root.
+        """
+
+        return all(root.is_success() for root in self.roots)
+
+    def failed(self) -> List[WatchedTask]:
+        """
+        Every task which has failed, with their failures fetched in a
+        single multicall
+        """
+
+        failed = [task for task in self.tasks.values()
+                  if task.state == _FAILED]
+        unknown = [task for task in failed if task._failure is None]
+        if unknown:
+            from koji import GenericError
+            from xmlrpc.client import Fault
+
+            with self.session.multicall() as mc:
+                results = [mc.getTaskResult(task.id) for task in unknown]
+            for task, result in zip(unknown, results):
+                try:
+                    result.result
+                    task._failure = ''
+                except (Fault, GenericError) as error:
+                    task._set_failure(error)
+        return failed
+
+
+# The end.
@@ -0,0 +1,444 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - chunked, resumable, concurrent uploads
+
+A `ChunkedUploader` sends files to the hub with ``rawUpload``, in the
+manner of ``ClientSession.fastUpload`` and
+``koji.daemon.fast_incremental_upload``, with a few differences.
+
+* Chunks are sent straight from a memory map of the file, or from a
+  single reused buffer filled by ``readinto``, rather than from a new
+  bytes object for each chunk.
+
+* Each chunk is verified against the adler32 checksum the hub
+  reports for it, and a failed chunk is sent again from the same
+  offset, up to a number of retries.
+
+* An upload which was interrupted is resumed from the end of what the
+  hub already has, once ``checkUpload`` has confirmed that it matches
+  the start of the local file.
+
+* `ChunkedUploader.upload_all` sends several files at once, each
+  worker thread using its own subsession.
+
+The hub truncates a file at the offset of each chunk written to it,
+and locks the file while writing, so the chunks of any one file are
+always sent in order. Concurrency is therefore between files, and
+the latency cost within a file is reduced with larger chunks.
+
+::
+
+    uploader = ChunkedUploader(session, workers=4)
+    results = uploader.upload_all((fn, "tasks/1234/5678") for fn in found)
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import FileIO
+from mmap import ACCESS_READ, mmap
+from time import perf_counter, sleep
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator,
+    List, NamedTuple, Optional, Tuple, )
+
+from .multicall import _WorkerSessions
+
+
+if TYPE_CHECKING:
+    from koji import ClientSession
+    from koji.util import adler32_constructor
+
+
+__all__ = (
+    "ChunkedUploader",
+    "DEFAULT_CHUNK_SIZE",
+    "UploadResult",
+)
+
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+"""
+The default number of bytes sent in each ``rawUpload`` call. This is
+eight times the ``upload_blocksize`` default of a ``ClientSession``,
+so that fewer round trips are needed for a large file.
+"""
+
+
+UploadCallback = Callable[[int, int, int, float, float], None]
+"""
+Called after each chunk with the same arguments as the callback of
+``ClientSession.fastUpload``: the bytes uploaded so far, the file
+size, the size of the chunk, and the seconds taken by the chunk and
+by the upload so far
+"""
+
+
+class UploadResult(NamedTuple):
+    localfile: str
+    """ the local file which was uploaded """
+
+    path: str
+    """ the hub's upload directory """
+
+    name: str
+    """ the name of the file in the upload directory """
+
+    size: int
+    """ the size of the file in bytes """
+
+    resumed: int
+    """ the number of bytes which were already on the hub and verified,
+    rather than being sent again """
+
+    retried: int
+    """ the number of chunks which had to be sent more than once """
+
+    hexdigest: str
+    """ adler32 checksum of the file """
+
+    seconds: float
+    """ the time taken by the upload """
+
+
+@contextmanager
+def _mapped(fd: int, size: int) -> Iterator[memoryview]:
+    mapped = mmap(fd, size, access=ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        view.release()
+        mapped.close()
+
+
+def _adler32(
+        data: memoryview,
+        into: Optional["adler32_constructor"] = None) -> "adler32_constructor":
+
+    from koji.util import adler32_constructor
+
+    if into is None:
+        into = adler32_constructor()
+    into.update(data)
+    return into
+
+
+class ChunkedUploader:
+    """
+    Uploads files to the hub in fixed-size chunks, verifying each, and
+    resuming interrupted uploads
+
+    :param session: a logged-in session
+
+    :param workers: the number of files `upload_all` sends at once
+
+    :param chunk_size: the number of bytes sent in each ``rawUpload``
+
+    :param retries: the number of times a chunk is sent again after
+      its checksum does not match, or the hub reports a `koji.LockError`
+
+    :param retry_interval: seconds to wait before sending a chunk again
+
+    :param use_mmap: whether to send chunks from a memory map of the
+      file. If False, chunks are read into a reused buffer instead.
+    """
+
+    def __init__(
+            self,
+            session: "ClientSession",
+            workers: int = 4,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            retries: int = 5,
+            retry_interval: float = 2.0,
+            use_mmap: bool = True):
+
+        if chunk_size < 1:
+            raise ValueError(f"invalid chunk size {chunk_size!r}")
+
+        self.session = session
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.retry_interval = retry_interval
+        self.use_mmap = use_mmap
+
+    def _chunks(
+            self,
+            fo: FileIO,
+            size: int,
+            offset: int) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Yields (offset, chunk) from offset to the end of the file. Each
+        chunk is only valid until the next is requested.
+        """
+
+        step = self.chunk_size
+
+        if self.use_mmap and size:
+            with _mapped(fo.fileno(), size) as view:
+                while offset < size:
+                    with view[offset:offset + step] as chunk:
+                        yield offset, chunk
+                    offset += step
+            return
+
+        with memoryview(bytearray(step)) as view:
+            fo.seek(offset)
+            while offset < size:
+                count = fo.readinto(view)
+                if not count:
+                    break
+                with view[:count] as chunk:
+                    yield offset, chunk
+                offset += count
+
+    def _prefix(
+            self,
+            fo: FileIO,
+            size: int,
+            length: int) -> "adler32_constructor":
+        """
+        adler32 of the first length bytes of the file
+        """
+
+        value = _adler32(memoryview(b""))
+        for offset, chunk in self._chunks(fo, size, 0):
+            if offset + len(chunk) > length:
+                with chunk[:length - offset] as part:
+                    _adler32(part, value)
+                break
+            _adler32(chunk, value)
+        return value
+
+    def _resume_from(
+            self,
+            session: "ClientSession",
+            fo: FileIO,
+            size: int,
+            path: str,
+            name: str,
+            volume: Optional[str]) -> Tuple[int, "adler32_constructor"]:
+        """
+        The offset up to which the hub already has a verified copy of
+        the file, and the adler32 of the file up to that point
+        """
+
+        remote = session.checkUpload(path, name, verify="adler32",
+                                     volume=volume)
+        if remote:
+            length = int(remote["size"])
+            if 0 < length <= size:
+                value = self._prefix(fo, size, length)
+                if value.hexdigest() == remote["hexdigest"]:
+                    return length, value
+
+        return 0, _adler32(memoryview(b""))
+
+    def _send(
+            self,
+            session: "ClientSession",
+            chunk: memoryview,
+            offset: int,
+            path: str,
+            name: str,
+            callopts: Dict[str, Any]) -> int:
+        """
+        Sends a single chunk, verifying the hub's checksum of it, and
+        sending it again if needed. Returns the number of retries.
+        """
+
+        from koji import GenericError, LockError
+
+        expected = _adler32(chunk).hexdigest()
+        tries = 0
+        while True:
+            try:
+                result = session.rawUpload(chunk, offset, path, name,
+                                           **callopts)
+            except LockError:
+                # another call holds the upload's lock, which is
+                # temporary. Any other fault is raised at once.
+                if tries >= self.retries:
+                    raise
+            else:
+                if (int(result["size"]) == len(chunk) and
+                        result["hexdigest"] == expected):
+                    return tries
+                if tries >= self.retries:
+                    raise GenericError(
+                        f"upload checksum failed for {path}/{name} at"
+                        f" offset {offset}: {result['hexdigest']} !="
+                        f" {expected}")
+            tries += 1
+            sleep(self.retry_interval)
+
+    def _upload(
+            self,
+            session: "ClientSession",
+            localfile: str,
+            path: str,
+            name: Optional[str],
+            overwrite: bool,
+            volume: Optional[str],
+            resume: bool,
+            callback: Optional[UploadCallback]) -> UploadResult:
+
+        from koji import ActionNotAllowed, GenericError
+
+        if not session.logged_in:
+            raise ActionNotAllowed("You must be logged in to upload files")
+
+        if name is None:
+            name = os.path.basename(localfile)
+
+        if volume == "DEFAULT":
+            volume = None
+
+        start = perf_counter()
+        with open(localfile, "rb", buffering=0) as fo:
+            size = os.fstat(fo.fileno()).st_size
+
+            offset = 0
+            value = _adler32(memoryview(b""))
+            if resume:
+                offset, value = self._resume_from(
+                    session, fo, size, path, name, volume)
+            resumed = offset
+
+            # the chunk at offset zero truncates the file, so it is
+            # only allowed to replace an existing one if overwriting
+            callopts = {"overwrite": overwrite or bool(offset),
+                        "volume": volume}
+
+            if callback:
+                callback(offset, size, 0, 0.0, 0.0)
+
+            retried = 0
+            if not size:
+                # an empty file still needs to be created
+                if self._send(session, memoryview(b""), 0,
+                              path, name, callopts):
+                    retried += 1
+
+            for offset, chunk in self._chunks(fo, size, offset):
+                lap = perf_counter()
+                if self._send(session, chunk, offset, path, name, callopts):
+                    retried += 1
+                _adler32(chunk, value)
+
+                if callback:
+                    now = perf_counter()
+                    callback(offset + len(chunk), size, len(chunk),
+                             max(now - lap, 0.00001),
+                             max(now - start, 0.00001))
+
+        # as with fastUpload, the hub is only asked to checksum the
+        # whole file if there was any reason to doubt it
+        verify = bool(retried or resumed)
+        found = session.checkUpload(
+            path, name, verify="adler32" if verify else None,
+            volume=volume)
+        if found is None:
+            raise GenericError(f"File upload failed: {path}/{name}")
+        if int(found["size"]) != size:
+            raise GenericError(
+                f"Uploaded file is wrong length: {path}/{name},"
+                f" {found['size']} != {size}")
+        if verify and found["hexdigest"] != value.hexdigest():
+            raise GenericError(
+                f"Uploaded file has wrong checksum: {path}/{name},"
+                f" {found['hexdigest']} != {value.hexdigest()}")
+
+        return UploadResult(localfile, path, name, size, resumed, retried,
+                            value.hexdigest(), perf_counter() - start)
+
+    def upload(
+            self,
+            localfile: str,
+            path: str,
+            name: Optional[str] = None,
+            overwrite: bool = False,
+            volume: Optional[str] = None,
+            resume: bool = True,
+            callback: Optional[UploadCallback] = None) -> UploadResult:
+        """
+        Uploads a single file using this uploader's session
+
+        :param localfile: the file to upload
+
+        :param path: the upload directory on the hub
+
+        :param name: the name to upload as. Defaults to the base name of
+          localfile.
+
+        :param overwrite: whether an existing file on the hub may be
+          replaced, rather than resumed
+
+        :param volume: the hub volume to upload to
+
+        :param resume: whether to continue a previous upload of the
+          same file, if the hub's copy matches the start of it
+
+        :param callback: called after each chunk, see `UploadCallback`
+        """
+
+        return self._upload(self.session, localfile, path, name,
+                            overwrite, volume, resume, callback)
+
+    def upload_all(
+            self,
+            uploads: Iterable[Tuple[str, str]],
+            overwrite: bool = False,
+            volume: Optional[str] = None,
+            resume: bool = True) -> List[UploadResult]:
+        """
+        Uploads several files at once, each worker using its own
+        subsession of this uploader's session. Returns the results in
+        the same order as the uploads were given, raising the first
+        error encountered once the others have finished.
+
+        :param uploads: pairs of the local file and the hub's upload
+          directory for it
+        """
+
+        todo = list(uploads)
+        if self.workers < 2 or len(todo) < 2:
+            return [self.upload(localfile, path, overwrite=overwrite,
+                                volume=volume, resume=resume)
+                    for localfile, path in todo]
+
+        sessions = _WorkerSessions(self.session)
+
+        def work(upload: Tuple[str, str]) -> UploadResult:
+            localfile, path = upload
+            return self._upload(sessions.get(), localfile, path, None,
+                                overwrite, volume, resume, None)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(work, upload) for upload in todo]
+            return [future.result() for future in futures]
+        finally:
+            sessions.close()
+
+
+# The end.
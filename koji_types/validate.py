@@ -0,0 +1,404 @@
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Koji Types - runtime validation
+
+Validates (and optionally coerces) XML-RPC results against the
+TypedDict declarations in `koji_types`. Each TypedDict is compiled
+once into a specialised checking function, which can then be applied
+to large lists of results at little cost.
+
+Coercion happens in-place on the checked dict. Integer state fields
+are converted into their enumeration (eg. `BuildState`), integers in
+float fields are converted to floats, and keys which older hubs do not
+provide are filled in from `DEFAULTS` when possible.
+
+The NewType identifiers such as `BuildID` have no runtime
+representation, so these are simply checked to be ints.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+from enum import IntEnum
+from typing import (
+    Any, Callable, Dict, ForwardRef, FrozenSet, Iterable, List, Mapping,
+    Optional, Tuple, Type, TypeVar, Union, )
+from typing_extensions import get_args, get_origin, is_typeddict
+
+from . import (
+    ArchiveInfo, BuildInfo, RepoInfo, TagBuildInfo, TaskInfo, UserData,
+    UserInfo, )
+
+
+__all__ = (
+    "DEFAULTS",
+    "OPTIONAL_KEYS",
+    "ValidationError",
+    "validate",
+    "validate_all",
+    "validator",
+)
+
+
+T = TypeVar("T")
+
+Validator = Callable[[Any], Any]
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a result does not conform to its TypedDict
+    """
+
+    def __init__(self, typename: str, key: Optional[str], message: str):
+        self.typename = typename
+        self.key = key
+        if key is None:
+            super().__init__(f"{typename}: {message}")
+        else:
+            super().__init__(f"{typename}[{key!r}]: {message}")
+
+
+OPTIONAL_KEYS: Dict[type, FrozenSet[str]] = {
+    ArchiveInfo: frozenset((
+        "artifact_id", "group_id", "version",
+        "platforms", "relpath", "flags",
+        "arch", )),
+    BuildInfo: frozenset((
+        "maven_group_id", "maven_artifact_id", "maven_version",
+        "platform", )),
+    RepoInfo: frozenset((
+        "tag_id", "tag_name", )),
+    TagBuildInfo: frozenset((
+        "maven_group_id", "maven_artifact_id", "maven_version",
+        "platform", )),
+    TaskInfo: frozenset((
+        "request", )),
+    UserData: frozenset((
+        "status", )),
+    UserInfo: frozenset((
+        "authtype", "groups", "krb_principal", "krb_principals",
+        "status", )),
+}
+"""
+Keys which are declared by a TypedDict, but which are only present in
+some results. For example, the maven fields of an `ArchiveInfo` are
+only present for maven archives. Keys of TypedDicts declared with
+``total=False`` are always considered optional.
+"""
+
+
+DEFAULTS: Dict[type, Dict[str, Any]] = {
+    BuildInfo: {
+        "draft": False,  # since koji 1.34
+    },
+    TagBuildInfo: {
+        "draft": False,  # since koji 1.34
+    },
+}
+"""
+Values to fill in for keys which are absent from results from older
+hubs, when coercion is enabled.
+"""
+
+
+_NoneType = type(None)
+
+
+def _field_check(
+        hint: Any,
+        strict: bool,
+        coerce: bool,
+        namespace: Dict[str, Any]) -> Tuple[List[str], bool]:
+    """
+    Produces the lines of code which check (and possibly coerce) a
+    present value ``v`` against the given type hint. Any helper values
+    which the code refers to are added to namespace. Also returns
+    whether None is acceptable.
+
+    The lines may use the placeholders ``KEY`` for the name of the
+    variable holding the key, and ``FAIL`` for the statement raising
+    a `ValidationError`
+    """
+
+    nullable = not strict
+
+    while hasattr(hint, "__supertype__"):
+        hint = hint.__supertype__
+
+    if isinstance(hint, ForwardRef):
+        hint = hint.__forward_arg__
+
+    if isinstance(hint, str):
+        return [], True
+
+    origin = get_origin(hint)
+    if origin is Union:
+        args = get_args(hint)
+        if _NoneType in args:
+            nullable = True
+        args = tuple(a for a in args if a is not _NoneType)
+        if len(args) != 1:
+            # a proper union, such as Union[str, UserID]. We don't
+            # attempt to check these
+            return [], True
+        hint = args[0]
+        origin = get_origin(hint)
+
+    if hint is Any:
+        return [], True
+
+    if isinstance(hint, type) and issubclass(hint, IntEnum):
+        # a value-to-member table, so that coercion is a dict lookup
+        # rather than a call through the enum metaclass
+        name = f"enum_{hint.__name__}"
+        table: Dict[Any, Any] = {m.value: m for m in hint}
+        namespace[name] = table
+
+        # an unhashable value, such as a list or dict, can't be looked
+        # up in the table at all
+        if coerce:
+            return ["try:",
+                    f"    c = {name}.get(v)",
+                    "except TypeError:",
+                    "    c = None",
+                    "if c is None:",
+                    "    FAIL",
+                    "data[KEY] = c"], nullable
+        else:
+            return ["try:",
+                    f"    c = v in {name}",
+                    "except TypeError:",
+                    "    c = False",
+                    "if not c:",
+                    "    FAIL"], nullable
+
+    if hint is int:
+        return ["if type(v) is not int and"
+                " (type(v) is bool or not isinstance(v, int)):",
+                "    FAIL"], nullable
+
+    if hint is float:
+        if coerce:
+            return ["if type(v) is not float:",
+                    "    if type(v) is int:",
+                    "        data[KEY] = float(v)",
+                    "    else:",
+                    "        FAIL"], nullable
+        else:
+            return ["if type(v) is not float and type(v) is not int:",
+                    "    FAIL"], nullable
+
+    if hint is bool:
+        return ["if type(v) is not bool:",
+                "    FAIL"], nullable
+
+    if hint is str:
+        return ["if type(v) is not str and not isinstance(v, str):",
+                "    FAIL"], nullable
+
+    if hint is dict or origin is dict:
+        return ["if not isinstance(v, dict):",
+                "    FAIL"], nullable
+
+    if hint is list or origin is list:
+        args = get_args(hint)
+        if args and is_typeddict(args[0]):
+            name = f"check_{args[0].__name__}"
+            namespace[name] = validator(args[0], strict, coerce)
+            return ["if not isinstance(v, list):",
+                    "    FAIL",
+                    "for item in v:",
+                    f"    {name}(item)"], nullable
+        else:
+            return ["if not isinstance(v, list):",
+                    "    FAIL"], nullable
+
+    if is_typeddict(hint):
+        name = f"check_{hint.__name__}"
+        namespace[name] = validator(hint, strict, coerce)
+        return [f"{name}(v)"], nullable
+
+    if isinstance(hint, type):
+        name = f"type_{hint.__name__}"
+        namespace[name] = hint
+        return [f"if not isinstance(v, {name}):",
+                "    FAIL"], nullable
+
+    return [], True
+
+
+def _compile(
+        typeddict: type,
+        strict: bool,
+        coerce: bool) -> Validator:
+
+    typename = typeddict.__name__
+
+    if getattr(typeddict, "__total__", True):
+        optional = OPTIONAL_KEYS.get(typeddict, frozenset())
+    else:
+        optional = frozenset(typeddict.__annotations__)
+
+    defaults = DEFAULTS.get(typeddict, {}) if coerce else {}
+
+    namespace: Dict[str, Any] = {
+        "MISSING": _MISSING,
+        "ValidationError": ValidationError,
+        "typename": typename,
+    }
+
+    lines = [
+        "def check(data):",
+        "    if not isinstance(data, dict):",
+        "        raise ValidationError(typename, None,"
+        " f'expected dict, got {type(data).__name__}')",
+        "    get = data.get",
+    ]
+
+    for index, (key, hint) in enumerate(typeddict.__annotations__.items()):
+        body, nullable = _field_check(hint, strict, coerce, namespace)
+
+        # the key is referred to via the namespace rather than being
+        # embedded as a literal
+        kname = f"k{index}"
+        namespace[kname] = key
+        fail = (f"raise ValidationError(typename, {kname},"
+                f" f'invalid value {{v!r}}')")
+
+        lines.append(f"    v = get({kname}, MISSING)")
+        lines.append("    if v is MISSING:")
+        if key in defaults:
+            namespace[f"d{index}"] = defaults[key]
+            lines.append(f"        data[{kname}] = d{index}")
+        elif key in optional:
+            lines.append("        pass")
+        else:
+            lines.append(f"        raise ValidationError(typename, {kname},"
+                         " 'missing')")
+
+        if not body:
+            continue
+
+        if nullable:
+            lines.append("    elif v is None:")
+            lines.append("        pass")
+
+        lines.append("    else:")
+        for line in body:
+            line = line.replace("KEY", kname).replace("FAIL", fail)
+            lines.append(f"        {line}")
+
+    lines.append("    return data")
+
+    source = "\n".join(lines)
+    code = compile(source, f"<validator {typename}>", "exec")
+    exec(code, namespace)  # nosec: generated from TypedDict declarations
+
+    found = namespace["check"]
+    found.__name__ = f"check_{typename}"
+    found.__qualname__ = found.__name__
+    found.__doc__ = f"validates a `koji_types.{typename}` result"
+    return found
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+_validators: Dict[Tuple[type, bool, bool], Validator] = {}
+
+
+def validator(
+        typeddict: Type[T],
+        strict: bool = False,
+        coerce: bool = True) -> Callable[[Any], T]:
+    """
+    Obtain the compiled validator function for a TypedDict. The
+    function accepts a single result, and returns it once validated and
+    coerced, or raises a `ValidationError`. Validators are compiled on
+    first use and then cached.
+
+    :param typeddict: the TypedDict to validate against
+
+    :param strict: whether to reject None for keys which are not
+      declared as `Optional`. As many of the koji results will provide
+      None for fields which are only set in some circumstances (eg.
+      ``completion_ts`` for a task which has not completed), this is
+      disabled by default.
+
+    :param coerce: whether to coerce values to their declared types,
+      and to fill in missing values from `DEFAULTS`
+    """
+
+    if not is_typeddict(typeddict):
+        raise TypeError(f"{typeddict!r} is not a TypedDict")
+
+    key = (typeddict, strict, coerce)
+    found = _validators.get(key)
+    if found is None:
+        found = _validators[key] = _compile(typeddict, strict, coerce)
+    return found
+
+
+def validate(
+        typeddict: Type[T],
+        data: Mapping[str, Any],
+        strict: bool = False,
+        coerce: bool = True) -> T:
+    """
+    Validate a single result against a TypedDict. See `validator`
+    """
+
+    return validator(typeddict, strict, coerce)(data)
+
+
+def validate_all(
+        typeddict: Type[T],
+        data: Iterable[Mapping[str, Any]],
+        strict: bool = False,
+        coerce: bool = True) -> List[T]:
+    """
+    Validate a list of results against a TypedDict. See `validator`.
+    The `ValidationError` raised for a failing result will have an
+    additional ``index`` attribute indicating its offset in the list.
+    """
+
+    check = validator(typeddict, strict, coerce)
+    data = list(data)
+
+    try:
+        return list(map(check, data))
+
+    except ValidationError as ve:
+        # find where we failed, rather than paying to track it as we go
+        for index, row in enumerate(data):
+            try:
+                check(row)
+            except ValidationError:
+                ve.index = index  # type: ignore
+                break
+        raise
+
+
+# The end.
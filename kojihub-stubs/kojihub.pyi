@@ -1052,7 +1052,7 @@ class RootExports:
             self,
             path: str,
             name: str,
-            verify: Optional[ChecksumType] = None,
+            verify: Optional[str] = None,
             tail: Optional[int] = None,
             volume: Optional[str] = None) -> Data:
         ...
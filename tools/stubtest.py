@@ -0,0 +1,609 @@
+#! /usr/bin/env python3
+
+# This library is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Parallel, sharded stubtest runner
+
+This is a development tool which runs `mypy.stubtest` against the
+`koji`, `koji_cli`, and `kojihub` stubs of this checkout, one module at
+a time, with the modules divided into shards across a process pool.
+
+The errors found in each module are cached, keyed by a hash of the
+module's stub, its runtime source, the stub and `koji_types` files of
+this checkout which that stub transitively imports, the versions of
+koji, mypy, and python, and the mypy configuration. Only the modules
+whose key has changed since the previous run are checked again. The
+allowlists are applied afterwards to the merged errors of every
+module, cached or not, so changing an allowlist never requires
+checking anything again.
+
+For example, the equivalent of the mypy tox environment is
+
+::
+
+    python3 tools/stubtest.py koji koji_cli \\
+        --allowlist allowlist --allowlist futurelist \\
+        --ignore-unused-allowlist
+
+The stubs are taken from this checkout rather than from any installed
+copy, but the runtime packages must be importable.
+
+:author: Christopher O'Brien <obriencj@gmail.com>
+:license: GPL v3
+"""
+
+
+import ast
+import json
+import os
+import pkgutil
+import re
+import sys
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from importlib import import_module
+from importlib.util import find_spec
+from os.path import abspath, join, splitext
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+CACHE_PATH = ".stubtest-cache.json"
+
+CACHE_VERSION = 1
+
+CONFIG_PATH = "setup.cfg"
+
+DEFAULT_ALLOWLISTS = ("allowlist", "futurelist")
+
+
+# the stub packages of this checkout, by the name they are imported as
+STUB_PACKAGES = (
+    ("koji", "koji-stubs"),
+    ("koji_cli", "koji_cli-stubs"),
+    ("kojihub", "kojihub-stubs"),
+)
+
+# packages the stubs depend upon, which must also be found by mypy
+SUPPORT_PACKAGES = (
+    ("koji_types", "koji_types"),
+)
+
+
+def digest(*parts):
+    h = sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def read_bytes(filename):
+    try:
+        with open(filename, "rb") as f:
+            return f.read()
+    except (FileNotFoundError, TypeError):
+        return b""
+
+
+def stub_modules(package, dirname):
+    """
+    Map each module name with a stub in dirname to its stub file
+    """
+
+    found = {}
+    for path, _dirs, files in os.walk(dirname):
+        parts = [package] + os.path.relpath(path, dirname).split(os.sep)
+        parts = [part for part in parts if part != "."]
+
+        for filename in files:
+            name, ext = splitext(filename)
+            if ext != ".pyi":
+                continue
+            module = ".".join(parts if name == "__init__"
+                              else parts + [name])
+            found[module] = join(path, filename)
+
+    return found
+
+
+def runtime_modules(package):
+    """
+    The names of the runtime submodules of package, as stubtest would
+    find them. Empty if the package can't be imported.
+    """
+
+    try:
+        runtime = import_module(package)
+        return [m.name for m in
+                pkgutil.walk_packages(runtime.__path__, f"{package}.")]
+    except Exception:
+        return []
+
+
+def discover(requested):
+    """
+    Expand the requested package and module names into every module
+    to be checked, mapped to its stub file (or None if it has no stub)
+    """
+
+    stubs = {}
+    for package, dirname in STUB_PACKAGES:
+        stubs.update(stub_modules(package, dirname))
+
+    found = {}
+    for name in requested:
+        found[name] = stubs.get(name)
+        if name in dict(STUB_PACKAGES):
+            # a whole package, so all of its submodules too
+            for module, filename in stubs.items():
+                if module.startswith(f"{name}."):
+                    found[module] = filename
+            for module in runtime_modules(name):
+                found.setdefault(module, None)
+
+    return found
+
+
+def runtime_source(module):
+    try:
+        spec = find_spec(module)
+    except Exception:
+        return b""
+    return read_bytes(spec.origin if spec else None)
+
+
+def versions():
+    from mypy.version import __version__ as mypy_version
+
+    try:
+        from importlib.metadata import version
+        koji_version = version("koji")
+    except Exception:
+        koji_version = "unknown"
+
+    return f"koji {koji_version}, mypy {mypy_version}, {sys.version}"
+
+
+def source_files():
+    """
+    Map each module of the stub and support packages of this checkout
+    to its ``.py`` and ``.pyi`` files
+    """
+
+    found = {}
+    for package, dirname in STUB_PACKAGES + SUPPORT_PACKAGES:
+        for path, dirs, files in os.walk(dirname):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            parts = [package] + os.path.relpath(path, dirname).split(os.sep)
+            parts = [part for part in parts if part != "."]
+
+            for filename in sorted(files):
+                name, ext = splitext(filename)
+                if ext not in (".py", ".pyi"):
+                    continue
+                module = ".".join(parts if name == "__init__"
+                                  else parts + [name])
+                found.setdefault(module, []).append(join(path, filename))
+
+    return found
+
+
+def imported(module, filenames, known):
+    """
+    The names of the known modules which the files of module import,
+    including submodules named by a ``from`` import
+    """
+
+    is_package = any(splitext(os.path.basename(filename))[0] == "__init__"
+                     for filename in filenames)
+    package = module if is_package else module.rpartition(".")[0]
+
+    found = set()
+    for filename in filenames:
+        try:
+            tree = ast.parse(read_bytes(filename), filename)
+        except SyntaxError:
+            continue
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    parts = package.split(".")
+                    parts = parts[:len(parts) - (node.level - 1)]
+                    base = ".".join(parts + ([base] if base else []))
+                names = [base]
+                names.extend(f"{base}.{alias.name}" for alias in node.names)
+            else:
+                continue
+
+            for name in names:
+                # importing a submodule also imports its parents
+                while name:
+                    if name in known:
+                        found.add(name)
+                    name = name.rpartition(".")[0]
+
+    found.discard(module)
+    return found
+
+
+class Dependencies:
+    """
+    Finds the digest of the files of a module and of every module of
+    this checkout which it transitively imports, so that a module's
+    cached errors are discarded when a stub it depends upon changes,
+    but not when an unrelated stub does
+    """
+
+    def __init__(self):
+        self.files = source_files()
+        self._imports = {}
+        self._digests = {}
+
+    def imports(self, module):
+        found = self._imports.get(module)
+        if found is None:
+            found = imported(module, self.files.get(module, ()), self.files)
+            self._imports[module] = found
+        return found
+
+    def closure(self, module):
+        """
+        The module and every module of this checkout which it
+        transitively imports
+        """
+
+        found = {module}
+        todo = [module]
+        while todo:
+            for name in self.imports(todo.pop()):
+                if name not in found:
+                    found.add(name)
+                    todo.append(name)
+        return found
+
+    def file_digest(self, module):
+        found = self._digests.get(module)
+        if found is None:
+            parts = []
+            for filename in self.files.get(module, ()):
+                parts.extend((filename, read_bytes(filename)))
+            found = self._digests[module] = digest(*parts)
+        return found
+
+    def digest(self, module):
+        parts = []
+        for name in sorted(self.closure(module)):
+            parts.extend((name, self.file_digest(name)))
+        return digest(*parts)
+
+
+def module_key(module, stubfile, environ, deps):
+    return digest(module, read_bytes(stubfile), runtime_source(module),
+                  environ, deps.digest(module))
+
+
+def load_cache(filename):
+    found = read_bytes(filename) if filename else b""
+    if found:
+        try:
+            cache = json.loads(found)
+        except ValueError:
+            cache = None
+        if isinstance(cache, dict) and \
+           cache.get("version") == CACHE_VERSION:
+            return cache
+
+    return {"version": CACHE_VERSION, "modules": {}}
+
+
+def save_cache(filename, cache):
+    partial = f"{filename}.tmp"
+    with open(partial, "wt") as f:
+        json.dump(cache, f, sort_keys=True)
+    os.replace(partial, filename)
+
+
+def shard(modules, stubs, count):
+    """
+    Divide modules into at most count shards of roughly even size,
+    largest stubs first
+    """
+
+    sizes = {module: len(read_bytes(stubs.get(module)))
+             for module in modules}
+
+    shards = [[] for _ in range(min(count, len(modules)))]
+    totals = [0] * len(shards)
+
+    for module in sorted(modules, key=sizes.get, reverse=True):
+        index = totals.index(min(totals))
+        shards[index].append(module)
+        totals[index] += sizes[module] or 1
+
+    return [found for found in shards if found]
+
+
+def stubtest_options(config_file, mypy_path):
+    """
+    mypy options configured as `mypy.stubtest` would configure them
+    """
+
+    from mypy.config_parser import parse_config_file
+    from mypy.options import Options
+
+    options = Options()
+    options.incremental = False
+    options.config_file = config_file
+    options.pos_only_special_methods = False
+
+    if config_file:
+        parse_config_file(options, lambda: None, config_file,
+                          sys.stdout, sys.stderr)
+
+    options.mypy_path = [mypy_path] + list(options.mypy_path)
+
+    def error_callback(msg):
+        raise Exception(msg)
+
+    options.process_error_codes(error_callback=error_callback)
+    options.process_incomplete_features(
+        error_callback=error_callback,
+        warning_callback=lambda msg: None)
+
+    if hasattr(options, "process_strict_bytes"):
+        options.process_strict_bytes()
+
+    return options
+
+
+def check_shard(modules, config_file, mypy_path):
+    """
+    Run stubtest over the modules of one shard, in a worker process.
+    Returns a dict of module name to the list of its errors, each a
+    tuple of the object description, and the concise and full
+    descriptions of the error.
+    """
+
+    from mypy.stubtest import StubtestFailure, build_stubs, test_module
+
+    options = stubtest_options(config_file, mypy_path)
+
+    try:
+        build_stubs(modules, options, find_submodules=False)
+    except StubtestFailure as failure:
+        message = f"{', '.join(modules)}: not checked due to {failure}"
+        return {module: [(module, message, message)]
+                for module in modules}
+
+    found = {}
+    for module in modules:
+        errors = found[module] = []
+        for error in test_module(module):
+            # stubtest skips these unless --strict-type-check-only
+            check = getattr(error, "is_private_type_check_only_related",
+                            None)
+            if check is not None and check():
+                continue
+
+            errors.append((error.object_desc,
+                           error.get_description(concise=True),
+                           error.get_description(concise=False)))
+
+    return found
+
+
+def link_stubs(work):
+    """
+    Create a search path in work with each of the stub packages under
+    the name it's imported as
+    """
+
+    for name, dirname in STUB_PACKAGES + SUPPORT_PACKAGES:
+        os.symlink(abspath(dirname), join(work, name))
+    return work
+
+
+def run_shards(shards, config_file, jobs):
+    found = {}
+
+    with TemporaryDirectory() as work:
+        mypy_path = link_stubs(work)
+
+        if jobs == 1 or len(shards) == 1:
+            for modules in shards:
+                found.update(check_shard(modules, config_file, mypy_path))
+            return found
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(check_shard, modules, config_file,
+                                   mypy_path)
+                       for modules in shards]
+            for fut in futures:
+                found.update(fut.result())
+
+    return found
+
+
+class Allowlist:
+    """
+    The merged entries of several stubtest allowlist files, tracking
+    which entries were used
+    """
+
+    def __init__(self, filenames):
+        from mypy.stubtest import get_allowlist_entries
+
+        self.entries = {}
+        for filename in filenames:
+            for entry in get_allowlist_entries(filename):
+                self.entries[entry] = re.compile(entry)
+        self.used = set()
+
+    def allows(self, object_desc):
+        if object_desc in self.entries:
+            self.used.add(object_desc)
+            return True
+
+        for entry, regex in self.entries.items():
+            if regex.fullmatch(object_desc):
+                self.used.add(entry)
+                return True
+
+        return False
+
+    def unused(self):
+        # as with stubtest, an entry which matches the empty string is
+        # never considered unused
+        return [entry for entry, regex in self.entries.items()
+                if entry not in self.used and not regex.fullmatch("")]
+
+
+def cli(options):
+    start = perf_counter()
+
+    requested = options.modules or [name for name, _d in STUB_PACKAGES]
+    allowlists = options.allowlist or list(DEFAULT_ALLOWLISTS)
+    cache_path = None if options.no_cache else options.cache
+
+    stubs = discover(requested)
+    environ = digest(versions(), read_bytes(options.mypy_config_file))
+    deps = Dependencies()
+
+    cache = load_cache(cache_path)
+    cached = cache["modules"]
+
+    keys = {module: module_key(module, stubs[module], environ, deps)
+            for module in stubs}
+
+    errors = {}
+    stale = []
+    for module, key in keys.items():
+        entry = cached.get(module)
+        if entry and entry.get("key") == key:
+            errors[module] = [tuple(err) for err in entry["errors"]]
+        else:
+            stale.append(module)
+
+    shards = shard(stale, stubs, options.jobs)
+    if shards:
+        errors.update(run_shards(shards, options.mypy_config_file,
+                                 options.jobs))
+
+    if cache_path:
+        for module in stale:
+            cached[module] = {"key": keys[module],
+                              "errors": errors.get(module, [])}
+        save_cache(cache_path, cache)
+
+    allowed = Allowlist(allowlists)
+
+    report = []
+    for module in sorted(errors):
+        for object_desc, concise, full in errors[module]:
+            if not allowed.allows(object_desc):
+                report.append({"module": module, "object": object_desc,
+                               "concise": concise, "description": full})
+
+    for found in report:
+        print(found["concise" if options.concise else "description"])
+
+    unused = [] if options.ignore_unused_allowlist else allowed.unused()
+    for entry in unused:
+        print(f"note: unused allowlist entry {entry}")
+
+    if options.json:
+        with open(options.json, "wt") as f:
+            json.dump({"errors": report, "unused_allowlist": unused,
+                       "modules": sorted(stubs)}, f, indent=2)
+
+    elapsed = perf_counter() - start
+    print(f"Found {len(report) + len(unused)} errors (checked"
+          f" {len(stubs)} modules, {len(stubs) - len(stale)} from cache,"
+          f" {len(stale)} in {len(shards)} shards) in {elapsed:.2f}s",
+          file=sys.stderr)
+
+    return bool(report or unused)
+
+
+def create_parser(name):
+    parser = ArgumentParser(name)
+
+    parser.add_argument("modules", nargs="*", metavar="MODULE",
+                        help="packages or modules to check (default: all"
+                        " of the stub packages)")
+
+    parser.add_argument("-j", "--jobs", action="store", type=int,
+                        default=os.cpu_count() or 1,
+                        help="number of worker processes")
+
+    parser.add_argument("--allowlist", action="append", default=[],
+                        help="stubtest allowlist file, may be given more"
+                        " than once (default: "
+                        f"{', '.join(DEFAULT_ALLOWLISTS)})")
+
+    parser.add_argument("--ignore-unused-allowlist", action="store_true",
+                        default=False,
+                        help="don't report unused allowlist entries")
+
+    parser.add_argument("--mypy-config-file", action="store",
+                        default=CONFIG_PATH,
+                        help=f"mypy configuration (default: {CONFIG_PATH})")
+
+    parser.add_argument("--concise", action="store_true", default=False,
+                        help="report each error on a single line")
+
+    parser.add_argument("--json", action="store", default=None,
+                        help="also write the merged report as JSON")
+
+    parser.add_argument("--cache", action="store", default=CACHE_PATH,
+                        help=f"path of the results cache (default:"
+                        f" {CACHE_PATH})")
+
+    parser.add_argument("--no-cache", action="store_true", default=False,
+                        help="check every module, without reading or"
+                        " writing the cache")
+
+    return parser
+
+
+def main(argv):
+
+    called_by, *args = argv
+    parser = create_parser(called_by)
+    options = parser.parse_args(args)
+
+    try:
+        failed = cli(options)
+
+    except KeyboardInterrupt:
+        return 130
+
+    else:
+        return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+
+
+# The end.
@@ -17,21 +17,35 @@
 """
 Transmute RootExports into ClientSession protocols
 
-This is a development tool which generates `koji_types/protocols.pyi`
-based on the type signatures found in `kojihub-stubs/kojihub.pyi`
+This is a development tool which generates
+`koji_types/protocols/__init__.pyi` based on the type signatures found
+in `kojihub-stubs/kojihub.pyi`, along with the
+`koji_types.protocols.registry` module naming the generated hub
+methods, grouped by domain (builds, tags, tasks, and so on).
 
 This script is meant to be invoked by the top-level Makefile, via eg.
 `make protocols`
 
-The generated `protocols.pyi` file should be committed in git when it
+The generated protocols files should be committed in git when it
 changes. This script is only a dependency for active development of
 this project, not for the build or packaging processes.
 
+The unparsed form of each generated method is kept in a cache, keyed
+by a hash of the source of the RootExports or HostExports method it
+was produced from. Only the methods which have changed since the
+previous run are unparsed again, and if neither input has changed then
+nothing is parsed at all. The output is only written when its content
+differs, so that the mtime of each file (and hence the mypy cache of
+anything depending on it) is left alone otherwise.
+
 :author: Christopher O'Brien <obriencj@gmail.com>
 :license: GPL v3
 """
 
 
+import json
+import os
+import re
 import sys
 
 from argparse import ArgumentParser
@@ -39,12 +53,74 @@ from ast import (
     arg, parse, ClassDef, Constant, Expr, FunctionDef,
     Name, Subscript, _Unparser
 )
+from contextlib import contextmanager
 from copy import copy
+from hashlib import sha256
+from time import perf_counter
 
 
 TEMPLATE_PATH = "koji_types/protocols.in"
 KOJIHUB_PATH = "kojihub-stubs/kojihub.pyi"
-OUTPUT_PATH = "koji_types/protocols.pyi"
+OUTPUT_DIR = "koji_types/protocols"
+OUTPUT_PATH = f"{OUTPUT_DIR}/__init__.pyi"
+REGISTRY_PATH = f"{OUTPUT_DIR}/registry.py"
+CACHE_PATH = ".transmute-cache.json"
+
+CACHE_VERSION = 2
+
+FOOTER = "\n\n\n# The end.\n"
+
+
+# The domains which the RootExports methods are grouped into by the
+# registry: builds, build types, volumes, and content generators; tags,
+# targets, inheritance, and package lists; tasks, and the methods which
+# create them; RPMs, archives, and their signatures; users, groups,
+# permissions, and notifications; hosts, channels, and arches; repos
+# and external repos; and sessions, events, history, and general
+# queries
+DOMAINS = (
+    "builds",
+    "tags",
+    "tasks",
+    "archives",
+    "users",
+    "hosts",
+    "repos",
+    "core",
+)
+
+DEFAULT_DOMAIN = "core"
+
+# methods which the patterns below would place in the wrong domain
+DOMAIN_OVERRIDES = {
+    "addExternalRPM": "archives",
+    "checkUpload": "core",
+    "getAllArches": "hosts",
+    "getBuildConfig": "tags",
+    "getChangelogEntries": "archives",
+    "getLoggedInUser": "users",
+    "importArchive": "archives",
+    "moveAllBuilds": "tags",
+    "moveBuild": "tags",
+    "uploadFile": "core",
+}
+
+# the first matching pattern decides a method's domain, otherwise it
+# belongs to the DEFAULT_DOMAIN
+DOMAIN_PATTERNS = (
+    ("repos", re.compile(r"Repo|^repo")),
+    ("users", re.compile(r"User|Perm|CGAccess|GroupMember|^newGroup"
+                         r"|KrbPrincipal|^listCGs$|Notification")),
+    ("hosts", re.compile(r"Host|Channel")),
+    ("tasks", re.compile(r"Task|^task|^build$|^chainBuild$|^chainMaven$"
+                         r"|^mavenBuild$|^winBuild$|^wrapperRPM$"
+                         r"|^buildImage")),
+    ("tags", re.compile(r"Tag|^(un)?tag[A-Z]|Inheritance|^packageList"
+                        r"|^group(Package|Req)?List|Package|BuildTarget"
+                        r"|^getLatest")),
+    ("archives", re.compile(r"RPM|Archive")),
+    ("builds", re.compile(r"Build|^CG|Volume|^getNextRelease|BType")),
+)
 
 
 class UnparseBetter(_Unparser):
@@ -54,6 +130,65 @@ class UnparseBetter(_Unparser):
     pass
 
 
+class CachingUnparse(UnparseBetter):
+    """
+    Unparses methods which carry a ``transmute_key`` attribute by
+    reusing their text from a previous run where possible. The text
+    of every keyed method is collected into ``blocks``, to be cached
+    for the next run.
+    """
+
+    def __init__(self, cached):
+        super().__init__()
+        self.cached = cached
+        self.blocks = {}
+        self.reused = 0
+
+    def visit_FunctionDef(self, node):
+        key = getattr(node, "transmute_key", None)
+        if key is None:
+            super().visit_FunctionDef(node)
+            return
+
+        # the indentation is the only state of the unparser that the
+        # text of a method depends upon
+        key = f"{key}:{self._indent}"
+
+        text = self.cached.get(key)
+        if text is None:
+            start = len(self._source)
+            super().visit_FunctionDef(node)
+            text = "".join(self._source[start:])
+        else:
+            self.write(text)
+            self.reused += 1
+
+        self.blocks[key] = text
+
+
+class Timings:
+    """
+    Collects the elapsed time of each phase of a run
+    """
+
+    def __init__(self):
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, perf_counter() - start))
+
+    def report(self, out=sys.stderr):
+        for name, elapsed in self.phases:
+            print(f"{name:>10}: {elapsed * 1000:8.2f} ms", file=out)
+        total = sum(elapsed for _name, elapsed in self.phases)
+        print(f"{'total':>10}: {total * 1000:8.2f} ms", file=out)
+
+
 def load_heading(filename):
     """
     Just reading all of the leading non-empty lines from the given
@@ -71,11 +206,96 @@ def load_ast(filename):
         return parse(f.read(), filename=filename, type_comments=True)
 
 
-def dump_ast(filename, tree, heading, footer):
-    with open(filename, "wt") as f:
-        f.write(heading)
-        f.write(UnparseBetter().visit(tree))
-        f.write(footer)
+def digest(*parts):
+    h = sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def read_bytes(filename):
+    try:
+        with open(filename, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def tool_digest():
+    """
+    A hash identifying this script and the python running it, as a
+    change to either may alter the output for any method
+    """
+
+    return digest(read_bytes(__file__), sys.version)
+
+
+def load_cache(filename, tool):
+    """
+    Load the cache from a previous run. Returns an empty cache if there
+    was none, or if it was produced by a different version of this
+    script.
+    """
+
+    found = read_bytes(filename) if filename else None
+    if found:
+        try:
+            cache = json.loads(found)
+        except ValueError:
+            cache = None
+        if isinstance(cache, dict) and \
+           cache.get("version") == CACHE_VERSION and \
+           cache.get("tool") == tool:
+            return cache
+
+    return {"version": CACHE_VERSION, "tool": tool, "blocks": {}}
+
+
+def save_cache(filename, cache):
+    partial = f"{filename}.tmp"
+    with open(partial, "wt") as f:
+        json.dump(cache, f, sort_keys=True)
+    os.replace(partial, filename)
+
+
+def write_if_changed(filename, data):
+    """
+    Writes data to filename unless it already holds exactly that
+    content. Returns True if the file was written.
+    """
+
+    if read_bytes(filename) == data:
+        return False
+
+    with open(filename, "wb") as f:
+        f.write(data)
+    return True
+
+
+def key_methods(classdef, lines):
+    """
+    Marks each method of classdef with a ``transmute_key`` attribute,
+    being a hash of its source lines (including any decorators).
+    """
+
+    for fn in classdef.body:
+        if isinstance(fn, FunctionDef):
+            first = min([fn.lineno] +
+                        [dec.lineno for dec in fn.decorator_list])
+            source = "".join(lines[first - 1:fn.end_lineno])
+            fn.transmute_key = digest(classdef.name, source)
+
+
+def derive_key(node, orig, variant):
+    """
+    Marks node as a variant of orig for caching purposes
+    """
+
+    key = getattr(orig, "transmute_key", None)
+    if key is not None:
+        key = f"{key}:{variant}"
+    node.transmute_key = key
 
 
 def find_classdef(mod, name):
@@ -132,11 +352,78 @@ def pop_ellipsis(node):
             node.body.pop()
 
 
+def is_overload(node):
+    return any(isinstance(dec, Name) and dec.id == "overload"
+               for dec in node.decorator_list)
+
+
+def is_count_overload(node):
+    return any(a.arg == "queryOpts" and
+               isinstance(a.annotation, Name) and
+               a.annotation.id == "CountOnlyOptions"
+               for a in node.args.kwonlyargs)
+
+
+def count_overload(node):
+    """
+    If the method accepts a queryOpts parameter, produce an overload
+    of it for use with ``countOnly``. The overload has queryOpts as a
+    required keyword-only parameter of type `CountOnlyOptions`, and
+    returns an int. Returns None for methods without queryOpts.
+    """
+
+    args = node.args
+    names = [a.arg for a in args.args]
+    if "queryOpts" not in names:
+        return None
+
+    index = names.index("queryOpts")
+
+    # the defaults align with the last of the positional args
+    first_default = len(args.args) - len(args.defaults)
+
+    counted = copy(node)
+    counted.args = copy(args)
+    counted.args.args = copy(args.args)
+    counted.args.defaults = copy(args.defaults)
+    counted.args.kwonlyargs = copy(args.kwonlyargs)
+    counted.args.kw_defaults = copy(args.kw_defaults)
+
+    qopts = copy(counted.args.args.pop(index))
+    qopts.annotation = Name("CountOnlyOptions")
+    if index >= first_default:
+        counted.args.defaults.pop(index - first_default)
+
+    # the parameters which followed queryOpts can no longer be given
+    # positionally, as queryOpts is now keyword-only
+    moved = counted.args.args[index:]
+    moved_defaults = counted.args.defaults[-len(moved):] if moved else []
+    del counted.args.args[index:]
+    if moved:
+        del counted.args.defaults[-len(moved):]
+
+    counted.args.kwonlyargs[0:0] = [qopts] + moved
+    counted.args.kw_defaults[0:0] = [None] + moved_defaults
+
+    counted.returns = Name("int")
+
+    # a dict given as queryOpts could match both CountOnlyOptions and
+    # QueryOptions as far as the overlap check is concerned, but the
+    # Literal countOnly makes this overload the correct choice
+    counted.type_comment = "ignore[overload-overlap, misc]"
+
+    if not is_overload(counted):
+        counted.decorator_list = [Name("overload")] + counted.decorator_list
+
+    return counted
+
+
 def update_session(node, orig):
     """
     Copy methods from orig onto node. If a method is decorated as
     a `@staticmethod`, it will be converted to a normal method with
-    the self argument injected in.
+    the self argument injected in. Methods accepting a queryOpts
+    parameter gain an additional overload for ``countOnly`` queries.
     """
 
     # our originals will have an ellipses body in order to still be
@@ -148,9 +435,27 @@ def update_session(node, orig):
         if not isinstance(fn, FunctionDef):
             continue
 
-        fn = copy(fn)
+        orig_fn, fn = fn, copy(fn)
         if pop_staticmethod(fn):
             inject_self(fn)
+        derive_key(fn, orig_fn, "session")
+
+        counted = count_overload(fn)
+        if counted is not None:
+            derive_key(counted, fn, "count")
+            if not is_overload(fn):
+                fn.decorator_list = [Name("overload")] + fn.decorator_list
+
+            # all of the countOnly overloads of a method need to come
+            # before any of its general overloads, or else they'll
+            # never be selected
+            offset = len(node.body)
+            while offset and node.body[offset - 1].name == fn.name:
+                offset -= 1
+            while offset < len(node.body) and \
+                    is_count_overload(node.body[offset]):
+                offset += 1
+            node.body.insert(offset, counted)
 
         node.body.append(fn)
 
@@ -173,18 +478,45 @@ def update_multicall(node, orig):
         if not isinstance(fn, FunctionDef):
             continue
 
-        fn = copy(fn)
+        orig_fn, fn = fn, copy(fn)
         fn.returns = Subscript(vc, fn.returns)
+        derive_key(fn, orig_fn, "multicall")
+
+        node.body.append(fn)
+
+
+def update_async(node, orig):
+    """
+    Copy methods from orig onto node. The method type signature
+    will be altered from an original return type of `X` to a new
+    return type of `Awaitable[X]`
+    """
+
+    # our originals will have an ellipses body in order to still be
+    # well-formed python. We won't need that with the methods
+    # injected, so pop it off
+    pop_ellipsis(node)
+
+    aw = Name("Awaitable")
+
+    for fn in orig.body:
+        if not isinstance(fn, FunctionDef):
+            continue
+
+        orig_fn, fn = fn, copy(fn)
+        fn.returns = Subscript(aw, fn.returns)
+        derive_key(fn, orig_fn, "async")
 
         node.body.append(fn)
 
 
 def transmute(tmpl, root):
     """
-    Here we'll produce four class definitions: ClientSession,
-    Host, MultiCallSession, and MultiCallHost. These will be generated
-    by modifying the original definitions found in the RootExports and
-    HostExports classes in kojihub.
+    Here we'll produce six class definitions: ClientSession, Host,
+    MultiCallSession, MultiCallHost, AsyncClientSession, and
+    AsyncHost. These will be generated by modifying the original
+    definitions found in the RootExports and HostExports classes in
+    kojihub.
     """
 
     session = find_classdef(tmpl, "ClientSession")
@@ -204,24 +536,170 @@ def transmute(tmpl, root):
     update_multicall(find_classdef(tmpl, "MultiCallHost"),
                      host)
 
+    # and the asyncio variations, which have their return types
+    # wrapped up in an Awaitable
+    update_async(find_classdef(tmpl, "AsyncClientSession"),
+                 session)
+    update_async(find_classdef(tmpl, "AsyncHost"),
+                 host)
 
-def cli(options):
-    heading = load_heading(TEMPLATE_PATH)
-    tmpl = load_ast(TEMPLATE_PATH)
-    root = load_ast(KOJIHUB_PATH)
 
-    transmute(tmpl, root)
+def classify(name):
+    """
+    The domain of the named RootExports method
+    """
+
+    found = DOMAIN_OVERRIDES.get(name)
+    if found is not None:
+        return found
 
-    dump_ast(OUTPUT_PATH, tmpl,
-             heading=heading,
-             footer="\n\n\n# The end.\n")
+    for domain, pattern in DOMAIN_PATTERNS:
+        if pattern.search(name):
+            return domain
+
+    return DEFAULT_DOMAIN
+
+
+def group_domains(tmpl, root):
+    """
+    The sorted names of the RootExports methods of the ClientSession
+    protocol, grouped by domain. The other session protocols have the
+    same methods.
+    """
+
+    exported = {fn.name for fn in find_classdef(root, "RootExports").body
+                if isinstance(fn, FunctionDef)}
+    names = method_names(find_classdef(tmpl, "ClientSession"))
+
+    found = {domain: [] for domain in DOMAINS}
+    for name in names:
+        if name in exported:
+            found[classify(name)].append(name)
+    return found
+
+
+def method_names(node):
+    """
+    The sorted names of the methods of a class, without duplicates
+    from overloads
+    """
+
+    return sorted({fn.name for fn in node.body
+                   if isinstance(fn, FunctionDef)})
+
+
+def name_tuple(names, indent):
+    pad = " " * indent
+    return "".join(f'{pad}"{name}",\n' for name in names)
+
+
+def registry_module(heading, found, host):
+    """
+    Source for the runtime registry of hub method names, by domain
+    """
+
+    domains = "".join(
+        f'    "{domain}": (\n{name_tuple(names, 8)}    ),\n'
+        for domain, names in found.items())
+
+    return (f'{heading}"""\nKoji Types - Client Session Protocol method'
+            f" registry\n\nThe names of the hub methods declared by the"
+            f" session protocols,\ngrouped by domain, and by the Host"
+            f' protocol\n"""\n\n\n'
+            f"from typing import Dict, Tuple\n\n\n"
+            f'__all__ = (\n    "HOST_METHODS",\n'
+            f'    "SESSION_METHODS",\n)\n\n\n'
+            f"SESSION_METHODS: Dict[str, Tuple[str, ...]] = {{\n"
+            f"{domains}}}\n\n\n"
+            f"HOST_METHODS: Tuple[str, ...] = (\n"
+            f"{name_tuple(method_names(host), 4)}){FOOTER}")
+
+
+def cli(options):
+    timings = Timings()
+    cache_path = None if options.no_cache else options.cache
+
+    with timings.phase("load"):
+        tool = tool_digest()
+        cache = load_cache(cache_path, tool)
+        template = read_bytes(TEMPLATE_PATH)
+        kojihub = read_bytes(KOJIHUB_PATH)
+        inputs = digest(tool, template, kojihub)
+
+    with timings.phase("check"):
+        outputs = cache.get("outputs") or {}
+        unchanged = (cache.get("inputs") == inputs and
+                     bool(outputs) and
+                     all(digest(read_bytes(path) or b"") == found
+                         for path, found in outputs.items()))
+
+    if unchanged:
+        # neither input has changed since the outputs were produced,
+        # so there's nothing to do
+        if options.timing:
+            print(f"{OUTPUT_DIR} is up to date", file=sys.stderr)
+            timings.report()
+        return
+
+    with timings.phase("parse"):
+        heading = load_heading(TEMPLATE_PATH)
+        tmpl = load_ast(TEMPLATE_PATH)
+        root = load_ast(KOJIHUB_PATH)
+
+        lines = kojihub.decode("utf-8").splitlines(keepends=True)
+        key_methods(find_classdef(root, "RootExports"), lines)
+        key_methods(find_classdef(root, "HostExports"), lines)
+
+    with timings.phase("transmute"):
+        transmute(tmpl, root)
+        found = group_domains(tmpl, root)
+
+    with timings.phase("unparse"):
+        unparser = CachingUnparse(cache["blocks"])
+
+        produced = {}
+        body = unparser.visit(tmpl)
+        produced[OUTPUT_PATH] = f"{heading}{body}{FOOTER}"
+
+        produced[REGISTRY_PATH] = registry_module(
+            heading, found, find_classdef(tmpl, "Host"))
+
+    with timings.phase("write"):
+        written = 0
+        outputs = {}
+        for path, text in produced.items():
+            data = text.encode("utf-8")
+            written += write_if_changed(path, data)
+            outputs[path] = digest(data)
+
+        if cache_path:
+            # only the blocks used in this run are kept, so that the
+            # cache doesn't accumulate methods which no longer exist
+            cache["blocks"] = unparser.blocks
+            cache["inputs"] = inputs
+            cache["outputs"] = outputs
+            save_cache(cache_path, cache)
+
+    if options.timing:
+        print(f"{OUTPUT_DIR}: {written} of {len(produced)} files"
+              f" written, reused {unparser.reused} of"
+              f" {len(unparser.blocks)} method blocks", file=sys.stderr)
+        timings.report()
 
 
 def create_parser(name):
     parser = ArgumentParser(name)
 
-    # just in case I have any ideas for the future. For now this takes
-    # no arguments.
+    parser.add_argument("--cache", action="store", default=CACHE_PATH,
+                        help="path of the method cache (default:"
+                        f" {CACHE_PATH})")
+
+    parser.add_argument("--no-cache", action="store_true", default=False,
+                        help="regenerate every method, without reading"
+                        " or writing the cache")
+
+    parser.add_argument("--timing", action="store_true", default=False,
+                        help="report the time taken by each phase")
 
     return parser
 